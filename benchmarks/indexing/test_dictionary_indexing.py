@@ -17,6 +17,7 @@
 
 import numpy as np
 from orix.sampling import get_sample_fundamental
+import pytest
 
 import kikuchipy as kp
 
@@ -61,3 +62,98 @@ def test_dictionary_indexing(benchmark):
     # Relaxed check of results, just to make sure results are not way
     # off
     assert np.isclose(xmap.scores.mean(), 0.1887, atol=1e-4)
+
+
+@pytest.mark.parametrize("n_components, n_candidates", [(100, 50), (400, 200)])
+def test_dictionary_indexing_pca(benchmark, n_components, n_candidates):
+    """Benchmark dictionary indexing of nine (60, 60) EBSD patterns to
+    a dictionary of about 3600 patterns in a reduced basis.
+
+    The fraction of patterns with the same best match as with the exact
+    normalized cross-correlation metric is stored in the benchmark's
+    extra info, to record the trade-off between speed and accuracy. The
+    metric is created in every round, so that fitting the basis is part
+    of the benchmark.
+    """
+    s = kp.data.nickel_ebsd_small()
+    s.remove_static_background()
+    s.remove_dynamic_background()
+
+    mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+    rot = get_sample_fundamental(resolution=6, point_group=mp.phase.point_group)
+    sig_shape = s.axes_manager.signal_shape[::-1]
+    detector = kp.detectors.EBSDDetector(
+        shape=sig_shape,
+        pc=(0.42, 0.22, 0.50),
+        sample_tilt=70,
+    )
+    s_dict = mp.get_patterns(rot, detector, compute=True)
+    signal_mask = ~kp.filters.Window("circular", sig_shape).astype(bool)
+
+    xmap_exact = s.dictionary_indexing(s_dict, signal_mask=signal_mask, keep_n=1)
+
+    def index_with_pca():
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            n_components=n_components, n_candidates=n_candidates
+        )
+        return s.dictionary_indexing(
+            s_dict, metric=metric, signal_mask=signal_mask, keep_n=1
+        )
+
+    xmap = benchmark(index_with_pca)
+
+    same_best = xmap.simulation_indices == xmap_exact.simulation_indices
+    benchmark.extra_info["n_components"] = n_components
+    benchmark.extra_info["n_candidates"] = n_candidates
+    benchmark.extra_info["fraction_same_best_match"] = float(same_best.mean())
+    assert np.allclose(xmap.scores[same_best], xmap_exact.scores[same_best])
+
+
+@pytest.mark.parametrize("n_probe", [4, 16])
+def test_dictionary_indexing_inverted_file_index(benchmark, n_probe):
+    """Benchmark dictionary indexing of nine (60, 60) EBSD patterns to
+    a dictionary of about 3600 patterns via an approximate nearest
+    neighbour index with 64 clusters.
+
+    The recall of the exact best matches and the throughput are stored
+    in the benchmark's extra info.
+    """
+    s = kp.data.nickel_ebsd_small()
+    s.remove_static_background()
+    s.remove_dynamic_background()
+
+    mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+    rot = get_sample_fundamental(resolution=6, point_group=mp.phase.point_group)
+    sig_shape = s.axes_manager.signal_shape[::-1]
+    detector = kp.detectors.EBSDDetector(
+        shape=sig_shape,
+        pc=(0.42, 0.22, 0.50),
+        sample_tilt=70,
+    )
+    s_dict = mp.get_patterns(rot, detector, compute=True)
+    signal_mask = ~kp.filters.Window("circular", sig_shape).astype(bool)
+
+    keep_n = 10
+    xmap_exact = s.dictionary_indexing(s_dict, signal_mask=signal_mask, keep_n=keep_n)
+
+    index = kp.indexing.InvertedFileIndex(n_clusters=64, n_probe=n_probe)
+    index.fit(s_dict.data, signal_mask=signal_mask)
+    xmap = benchmark(
+        s.dictionary_indexing,
+        dictionary=s_dict,
+        signal_mask=signal_mask,
+        keep_n=keep_n,
+        index=index,
+    )
+
+    idx_exact = xmap_exact.simulation_indices
+    idx = xmap.simulation_indices
+    recall = np.mean([np.isin(i, j).mean() for i, j in zip(idx_exact, idx)])
+    recall_best = np.mean(idx_exact[:, 0] == idx[:, 0])
+    benchmark.extra_info["n_probe"] = n_probe
+    benchmark.extra_info[f"recall_at_{keep_n}"] = float(recall)
+    benchmark.extra_info["recall_at_1"] = float(recall_best)
+    benchmark.extra_info["patterns_per_second"] = xmap.size / benchmark.stats["mean"]
+
+    # Approximate best matches cannot be better than exact ones
+    assert np.all(xmap.scores[:, 0] <= xmap_exact.scores[:, 0] + 1e-5)
@@ -0,0 +1,84 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+"""Benchmarks of merging of single phase crystal maps of increasing
+size.
+
+Maps of up to 100 000 points are benchmarked by default. Set the
+environment variable ``KIKUCHIPY_BENCHMARK_SIZE=production`` to also
+benchmark maps of one and ten million points, which requires about
+10 GB of memory.
+"""
+
+import os
+
+import numpy as np
+from orix.crystal_map import CrystalMap, Phase, PhaseList
+from orix.quaternion import Rotation
+import pytest
+
+import kikuchipy as kp
+
+MAP_SHAPES = [(100, 100), (250, 400)]
+if os.environ.get("KIKUCHIPY_BENCHMARK_SIZE") == "production":  # pragma: no cover
+    MAP_SHAPES += [(1000, 1000), (2500, 4000)]
+
+
+@pytest.fixture(scope="module", params=MAP_SHAPES, ids=lambda s: f"{s[0]}x{s[1]}")
+def crystal_maps(request) -> list[CrystalMap]:
+    """Five single phase crystal maps with five rotations, scores and
+    simulation indices per point.
+    """
+    ny, nx = request.param
+    n_points = ny * nx
+    n_per_point = 5
+    rng = np.random.default_rng(42)
+    y, x = np.divmod(np.arange(n_points), nx)
+    rotations = Rotation(np.tile([1.0, 0, 0, 0], (n_points, n_per_point, 1)))
+
+    xmaps = []
+    for i in range(5):
+        scores = rng.random((n_points, n_per_point), dtype=np.float32)
+        xmap = CrystalMap(
+            rotations=rotations,
+            x=x,
+            y=y,
+            phase_list=PhaseList(Phase(f"phase{i}", point_group="m-3m")),
+            prop={
+                "scores": -np.sort(-scores, axis=1),
+                "simulation_indices": rng.integers(0, 100_000, scores.shape),
+            },
+        )
+        xmaps.append(xmap)
+
+    return xmaps
+
+
+@pytest.mark.parametrize("best_only", [False, True])
+def test_merge_crystal_maps(benchmark_patterns, crystal_maps, best_only):
+    """Benchmark merging of five crystal maps, keeping either all
+    merged scores and simulation indices or only the best match.
+    """
+    n_points = crystal_maps[0].size
+    xmap = benchmark_patterns(
+        kp.indexing.merge_crystal_maps,
+        n_points,
+        crystal_maps,
+        simulation_indices_prop="simulation_indices",
+        best_only=best_only,
+    )
+    assert xmap.size == n_points
+    assert ("merged_scores" in xmap.prop) != best_only
@@ -0,0 +1,83 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks of writing and reading synthetic EBSD signals of
+increasing size with each plugin supporting both.
+
+Patterns per second and peak memory are stored in each benchmark's
+extra info.
+"""
+
+import numpy as np
+import pytest
+
+import kikuchipy as kp
+
+EXTENSIONS = [
+    "h5",
+    "dat",
+    pytest.param(
+        "zarr",
+        marks=pytest.mark.skipif(
+            not kp.constants.installed["zarr"], reason="zarr is not installed"
+        ),
+    ),
+]
+
+
+def load(filename, s, lazy):
+    """Return a signal read from file, passing the scan and pattern
+    shape to the NORDIF reader, which otherwise reads these from a
+    setting file.
+    """
+    kwargs = {}
+    if filename.suffix == ".dat":
+        kwargs = dict(
+            scan_size=s.axes_manager.navigation_shape,
+            pattern_size=s.axes_manager.signal_shape,
+        )
+    return kp.load(filename, lazy=lazy, **kwargs)
+
+
+@pytest.mark.parametrize("extension", EXTENSIONS)
+def test_save(benchmark_patterns, tmp_path, synthetic_ebsd, extension):
+    """Benchmark writing patterns to file."""
+    s = synthetic_ebsd
+    filename = tmp_path / f"patterns.{extension}"
+    benchmark_patterns(s.save, s.axes_manager.navigation_size, filename, overwrite=True)
+
+
+@pytest.mark.parametrize("extension", EXTENSIONS)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_load(benchmark_patterns, tmp_path, synthetic_ebsd, extension, lazy):
+    """Benchmark reading patterns from file into memory, either
+    directly or by computing a lazy signal.
+    """
+    s = synthetic_ebsd
+    filename = tmp_path / f"patterns.{extension}"
+    s.save(filename)
+
+    def read():
+        s2 = load(filename, s, lazy)
+        if lazy:
+            s2.compute(show_progressbar=False)
+        # Touch all patterns, in case they are memory mapped
+        _ = s2.data.max()
+        return s2
+
+    s2 = benchmark_patterns(read, s.axes_manager.navigation_size)
+    assert np.array_equal(s2.data, s.data)
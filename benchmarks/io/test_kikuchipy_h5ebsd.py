@@ -0,0 +1,90 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+import h5py
+import numpy as np
+import pytest
+
+import kikuchipy as kp
+
+COMPRESSION = [
+    (None, False),
+    ("gzip", True),
+    ("lzf", True),
+    pytest.param(
+        "blosc",
+        True,
+        marks=pytest.mark.skipif(
+            not kp.constants.installed["hdf5plugin"],
+            reason="hdf5plugin is not installed",
+        ),
+    ),
+]
+
+
+@pytest.fixture(params=["small", "large"])
+def nickel_ebsd(request):
+    if request.param == "small":
+        return kp.data.nickel_ebsd_small()
+    try:
+        return kp.data.nickel_ebsd_large()
+    except ValueError:
+        pytest.skip("Large Ni dataset is not downloaded")
+
+
+def add_throughput_info(benchmark, s, filename):
+    """Add write/read throughput in MB/s and the compression ratio of
+    the patterns to the benchmark results.
+    """
+    with h5py.File(filename) as f:
+        n_bytes_stored = f["Scan 1/EBSD/Data/patterns"].id.get_storage_size()
+    n_bytes = s.data.nbytes
+    benchmark.extra_info["MB"] = n_bytes / 1e6
+    benchmark.extra_info["MB/s"] = n_bytes / 1e6 / benchmark.stats.stats.mean
+    benchmark.extra_info["compression_ratio"] = n_bytes / n_bytes_stored
+
+
+@pytest.mark.parametrize("compression, shuffle", COMPRESSION)
+def test_write(benchmark, tmp_path, nickel_ebsd, compression, shuffle):
+    """Benchmark writing Ni EBSD patterns to a kikuchipy h5ebsd file
+    with different compression filters.
+    """
+    s = nickel_ebsd
+    filename = tmp_path / "patterns.h5"
+    benchmark(
+        s.save,
+        filename,
+        overwrite=True,
+        compression=compression,
+        shuffle=shuffle,
+        chunk_bytes="8 MB",
+    )
+    add_throughput_info(benchmark, s, filename)
+
+
+@pytest.mark.parametrize("compression, shuffle", COMPRESSION)
+def test_read(benchmark, tmp_path, nickel_ebsd, compression, shuffle):
+    """Benchmark reading Ni EBSD patterns from a kikuchipy h5ebsd file
+    with different compression filters.
+    """
+    s = nickel_ebsd
+    filename = tmp_path / "patterns.h5"
+    s.save(filename, compression=compression, shuffle=shuffle, chunk_bytes="8 MB")
+    s2 = benchmark(kp.load, filename)
+    add_throughput_info(benchmark, s, filename)
+
+    assert np.allclose(s.data, s2.data)
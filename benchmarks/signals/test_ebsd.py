@@ -0,0 +1,148 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmarks of scan processing steps on synthetic EBSD signals of
+increasing size.
+
+Patterns per second and peak memory are stored in each benchmark's
+extra info. Set the environment variable
+``KIKUCHIPY_BENCHMARK_SIZE=production`` to benchmark maps of up to
+(300, 300) patterns of up to (240, 240) pixels.
+"""
+
+import pytest
+
+import kikuchipy as kp
+
+
+def test_remove_static_background(benchmark_patterns, synthetic_ebsd):
+    """Benchmark static background removal by subtraction."""
+    s = synthetic_ebsd
+    kwargs = dict(inplace=False, show_progressbar=False)
+    s2 = benchmark_patterns(
+        s.remove_static_background, s.axes_manager.navigation_size, **kwargs
+    )
+    assert s2.data.dtype == s.data.dtype
+
+
+@pytest.mark.parametrize("filter_domain", ["frequency", "spatial"])
+def test_remove_dynamic_background(benchmark_patterns, synthetic_ebsd, filter_domain):
+    """Benchmark dynamic background removal by subtraction of a
+    Gaussian blurred pattern.
+    """
+    s = synthetic_ebsd
+    kwargs = dict(filter_domain=filter_domain, inplace=False, show_progressbar=False)
+    s2 = benchmark_patterns(
+        s.remove_dynamic_background, s.axes_manager.navigation_size, **kwargs
+    )
+    assert s2.data.dtype == s.data.dtype
+
+
+def test_average_neighbour_patterns(benchmark_patterns, synthetic_ebsd):
+    """Benchmark averaging of each pattern with its (3, 3) nearest
+    neighbours.
+    """
+    s = synthetic_ebsd
+    kwargs = dict(inplace=False, show_progressbar=False)
+    s2 = benchmark_patterns(
+        s.average_neighbour_patterns, s.axes_manager.navigation_size, **kwargs
+    )
+    assert s2.data.shape == s.data.shape
+
+
+def test_get_image_quality(benchmark_patterns, synthetic_ebsd):
+    """Benchmark computation of the image quality map."""
+    s = synthetic_ebsd
+    iq = benchmark_patterns(
+        s.get_image_quality,
+        s.axes_manager.navigation_size,
+        show_progressbar=False,
+    )
+    assert iq.shape == s._navigation_shape_rc
+
+
+def test_get_neighbour_dot_product_matrices(benchmark_patterns, synthetic_ebsd):
+    """Benchmark computation of dot products between each pattern and
+    its four nearest neighbours.
+    """
+    s = synthetic_ebsd
+    dp_matrices = benchmark_patterns(
+        s.get_neighbour_dot_product_matrices,
+        s.axes_manager.navigation_size,
+        show_progressbar=False,
+    )
+    assert dp_matrices.shape == s._navigation_shape_rc + (3, 3)
+
+
+def test_get_average_neighbour_dot_product_map(benchmark_patterns, synthetic_ebsd):
+    """Benchmark computation of the average neighbour dot product map
+    from patterns.
+    """
+    s = synthetic_ebsd
+    adp = benchmark_patterns(
+        s.get_average_neighbour_dot_product_map,
+        s.axes_manager.navigation_size,
+        show_progressbar=False,
+    )
+    assert adp.shape == s._navigation_shape_rc
+
+
+def test_vbse_images_from_grid(benchmark_patterns, synthetic_ebsd):
+    """Benchmark generation of (5, 5) virtual backscatter electron
+    images from a grid on the detector.
+    """
+    s = synthetic_ebsd
+    vbse_imager = kp.imaging.VirtualBSEImager(s)
+    vbse = benchmark_patterns(
+        vbse_imager.get_images_from_grid, s.axes_manager.navigation_size
+    )
+    assert vbse.data.shape == (5, 5) + s._navigation_shape_rc
+
+
+@pytest.mark.skipif(
+    not kp.constants.installed["pyebsdindex"], reason="pyebsdindex is not installed"
+)
+class TestHoughIndexing:
+    def setup_method(self):
+        self.phase_list = kp.data.nickel_ebsd_small().xmap.phases
+
+    def test_get_indexer(self, benchmark, synthetic_ebsd):
+        """Benchmark creation of a PyEBSDIndex indexer for the
+        detector.
+        """
+        detector = synthetic_ebsd.detector
+        indexer = benchmark(detector.get_indexer, self.phase_list)
+        assert type(indexer).__name__ == "EBSDIndexer"
+
+    @pytest.mark.parametrize("n_processes", [1, 4])
+    def test_hough_indexing(self, benchmark_patterns, synthetic_ebsd, n_processes):
+        """Benchmark Hough indexing of background corrected patterns in
+        one or more processes.
+        """
+        s = synthetic_ebsd.remove_static_background(inplace=False)
+        s.remove_dynamic_background(show_progressbar=False)
+        indexer = s.detector.get_indexer(self.phase_list)
+
+        xmap = benchmark_patterns(
+            s.hough_indexing,
+            s.axes_manager.navigation_size,
+            self.phase_list,
+            indexer,
+            verbose=0,
+            n_processes=n_processes,
+        )
+        assert xmap.size == s.axes_manager.navigation_size
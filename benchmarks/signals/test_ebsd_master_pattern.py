@@ -0,0 +1,76 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
+from orix.quaternion import Rotation
+import pytest
+
+import kikuchipy as kp
+
+
+@pytest.mark.parametrize("lookup_table", [False, True])
+def test_get_patterns(benchmark, lookup_table):
+    """Benchmark projection of 1000 (240, 240) EBSD patterns from a
+    master pattern, either directly or via a cube map lookup table.
+
+    The mean and maximum absolute pixel errors relative to the
+    intensity range of the directly projected patterns are stored in
+    the benchmark's extra info.
+    """
+    mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+    rot = Rotation.random(1000)
+    detector = kp.detectors.EBSDDetector(
+        shape=(240, 240),
+        pc=(0.42, 0.22, 0.50),
+        sample_tilt=70,
+    )
+    kwargs = dict(compute=True, show_progressbar=False)
+
+    # Prime the Numba cache by running once
+    _ = mp.get_patterns(rot[:1], detector, lookup_table=lookup_table, **kwargs)
+
+    s = benchmark(mp.get_patterns, rot, detector, lookup_table=lookup_table, **kwargs)
+
+    s_exact = mp.get_patterns(rot, detector, **kwargs)
+    patterns = s.data.reshape((rot.size, -1))
+    patterns_exact = s_exact.data.reshape((rot.size, -1))
+    intensity_range = np.ptp(patterns_exact, axis=1, keepdims=True)
+    error = np.abs(patterns - patterns_exact) / intensity_range
+    benchmark.extra_info["lookup_table"] = lookup_table
+    benchmark.extra_info["mean_relative_pixel_error"] = float(error.mean())
+    benchmark.extra_info["max_relative_pixel_error"] = float(error.max())
+    benchmark.extra_info["patterns_per_second"] = rot.size / benchmark.stats["mean"]
+
+    assert error.mean() < 0.005
+
+
+@pytest.mark.parametrize("shape", [(60, 60), (120, 120), (240, 240)])
+def test_get_patterns_detector_shape(benchmark_patterns, shape):
+    """Benchmark projection of 1000 EBSD patterns from a master pattern
+    onto detectors of increasing size.
+    """
+    mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+    rot = Rotation.random(1000)
+    detector = kp.detectors.EBSDDetector(
+        shape=shape, pc=(0.42, 0.22, 0.50), sample_tilt=70
+    )
+    kwargs = dict(compute=True, show_progressbar=False)
+
+    # Prime the Numba cache by running once
+    _ = mp.get_patterns(rot[:1], detector, **kwargs)
+
+    s = benchmark_patterns(mp.get_patterns, rot.size, rot, detector, **kwargs)
+    assert s.data.shape == (rot.size,) + shape
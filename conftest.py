@@ -25,6 +25,7 @@ from numbers import Number
 import os
 from pathlib import Path
 import tempfile
+import tracemalloc
 from typing import Callable, Generator
 
 import dask.array as da
@@ -822,3 +823,103 @@ def bruker_h5ebsd_nonrectangular_roi_file(tmpdir) -> Generator[Path, None, None]
     path = tmpdir / "patterns_roi_nonrectangular.h5"
     create_dummy_bruker_h5ebsd_nonrectangular_roi_file(path)
     yield path
+
+
+# ------------------------ Benchmark fixtures ------------------------ #
+
+# Map and detector shapes of synthetic scans to benchmark with. The
+# production shapes are only used if the environment variable
+# KIKUCHIPY_BENCHMARK_SIZE is set to "production", since creating and
+# processing them takes a long time and requires several GB of memory.
+if os.environ.get("KIKUCHIPY_BENCHMARK_SIZE") == "production":  # pragma: no cover
+    BENCHMARK_SCAN_SHAPES = [
+        ((100, 100), (60, 60)),
+        ((100, 100), (240, 240)),
+        ((300, 300), (60, 60)),
+        ((300, 300), (240, 240)),
+    ]
+else:
+    BENCHMARK_SCAN_SHAPES = [((20, 20), (60, 60))]
+
+
+@pytest.fixture(
+    scope="session",
+    params=BENCHMARK_SCAN_SHAPES,
+    ids=[f"{n[0]}x{n[1]}-{s[0]}x{s[1]}" for n, s in BENCHMARK_SCAN_SHAPES],
+)
+def synthetic_ebsd(request) -> Generator[kp.signals.EBSD, None, None]:
+    """Synthetic EBSD signal of a polycrystal with about ten patterns
+    per grain, with a static background and noise added.
+
+    Patterns are projected once per grain from the small Ni master
+    pattern with :meth:`~kikuchipy.signals.EBSDMasterPattern.get_patterns`.
+    The signal has a detector and a static background, and is only
+    created once per shape per session.
+    """
+    (ny, nx), (sy, sx) = request.param
+    rng = np.random.default_rng(42)
+
+    # Voronoi tessellation of the map into grains
+    n_grains = max(ny * nx // 10, 1)
+    grain_centers = rng.random((n_grains, 2)) * (ny, nx)
+    yx = np.stack(np.indices((ny, nx)), axis=-1).reshape((-1, 2))
+    grain_ids = np.zeros(ny * nx, dtype=int)
+    for i in range(0, ny * nx, 10_000):
+        dist = np.linalg.norm(yx[i : i + 10_000, None] - grain_centers, axis=-1)
+        grain_ids[i : i + 10_000] = np.argmin(dist, axis=1)
+    grain_ids = grain_ids.reshape((ny, nx))
+
+    mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+    detector = kp.detectors.EBSDDetector(
+        shape=(sy, sx), pc=(0.42, 0.22, 0.50), sample_tilt=70
+    )
+    rot = Rotation.from_euler(rng.random((n_grains, 3)) * (2 * np.pi, np.pi, 2 * np.pi))
+    grain_patterns = mp.get_patterns(
+        rot, detector, compute=True, show_progressbar=False
+    ).data
+
+    # Static background of a Gaussian intensity distribution
+    r, c = np.indices((sy, sx)) / max(sy, sx)
+    static_bg = np.exp(-((r - 0.3) ** 2 + (c - 0.5) ** 2) / 0.3)
+    static_bg = (200 * static_bg).astype(np.uint8)
+
+    data = np.zeros((ny, nx, sy, sx), dtype=np.uint8)
+    for i in range(ny):
+        row = grain_patterns[grain_ids[i]] * static_bg / 255 + static_bg / 2
+        row += rng.normal(scale=5, size=row.shape)
+        data[i] = np.clip(row, 0, 255)
+
+    s = kp.signals.EBSD(data, detector=detector, static_background=static_bg)
+    s.axes_manager.navigation_axes[0].name = "x"
+    s.axes_manager.navigation_axes[1].name = "y"
+
+    yield s
+
+
+@pytest.fixture
+def benchmark_patterns(benchmark) -> Callable:
+    """Return a function benchmarking a function processing a number
+    of patterns, storing the number of patterns per second and the peak
+    memory traced by :mod:`tracemalloc` in one extra call in the
+    benchmark's extra info.
+    """
+
+    def _benchmark_patterns(func: Callable, n_patterns: int, *args, **kwargs):
+        result = benchmark(func, *args, **kwargs)
+
+        tracemalloc.start()
+        try:
+            _ = func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info["n_patterns"] = int(n_patterns)
+        benchmark.extra_info["patterns_per_second"] = (
+            n_patterns / benchmark.stats["mean"]
+        )
+        benchmark.extra_info["peak_memory_MB"] = peak / 1e6
+
+        return result
+
+    return _benchmark_patterns
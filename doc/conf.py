@@ -81,6 +81,7 @@ intersphinx_mapping = {
     "diffsims": ("https://diffsims.readthedocs.io/en/latest", None),
     "hyperspy": ("https://hyperspy.org/hyperspy-doc/current", None),
     "h5py": ("https://docs.h5py.org/en/stable", None),
+    "hdf5plugin": ("https://hdf5plugin.readthedocs.io/en/stable", None),
     "imageio": ("https://imageio.readthedocs.io/en/stable", None),
     "matplotlib": ("https://matplotlib.org/stable", None),
     "numba": ("https://numba.readthedocs.io/en/latest", None),
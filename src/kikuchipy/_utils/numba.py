@@ -56,6 +56,101 @@ def rotation_from_euler(alpha: float, beta: float, gamma: float) -> np.ndarray:
     return rot
 
 
+@nb.njit(
+    "float64[:, :](float64, float64, float64)", cache=True, fastmath=True, nogil=True
+)
+def rotation_from_euler_derivatives(
+    alpha: float, beta: float, gamma: float
+) -> np.ndarray:
+    """Return the derivatives of the quaternion returned from
+    :func:`rotation_from_euler` with respect to each Euler angle, one
+    per row.
+    """
+    sigma = 0.5 * (alpha + gamma)
+    delta = 0.5 * (alpha - gamma)
+    c = np.cos(0.5 * beta)
+    s = np.sin(0.5 * beta)
+    cos_sigma = np.cos(sigma)
+    sin_sigma = np.sin(sigma)
+    cos_delta = np.cos(delta)
+    sin_delta = np.sin(delta)
+    drot = 0.5 * np.array(
+        [
+            [-c * sin_sigma, s * sin_delta, -s * cos_delta, -c * cos_sigma],
+            [-s * cos_sigma, -c * cos_delta, -c * sin_delta, s * sin_sigma],
+            [-c * sin_sigma, -s * sin_delta, s * cos_delta, -c * cos_sigma],
+        ],
+        dtype=np.float64,
+    )
+    # Follow the sign of the quaternion
+    if c * cos_sigma < 0:
+        drot = -drot
+    return drot
+
+
+@nb.njit("float64[:, :](float64[:])", cache=True, fastmath=True, nogil=True)
+def rotation_to_matrix(rotation: np.ndarray) -> np.ndarray:
+    a, b, c, d = rotation
+    return np.array(
+        [
+            [a**2 + b**2 - c**2 - d**2, 2 * (b * c - a * d), 2 * (a * c + b * d)],
+            [2 * (a * d + b * c), a**2 - b**2 + c**2 - d**2, 2 * (c * d - a * b)],
+            [2 * (b * d - a * c), 2 * (a * b + c * d), a**2 - b**2 - c**2 + d**2],
+        ],
+        dtype=np.float64,
+    )
+
+
+@nb.njit("float64[:, :](float64[:], float64[:])", cache=True, fastmath=True, nogil=True)
+def rotation_to_matrix_derivative(
+    rotation: np.ndarray, rotation_derivative: np.ndarray
+) -> np.ndarray:
+    """Return the derivative of the matrix returned from
+    :func:`rotation_to_matrix` given the derivative of the quaternion.
+    """
+    a, b, c, d = rotation
+    da, db, dc, dd = rotation_derivative
+    return 2 * np.array(
+        [
+            [
+                a * da + b * db - c * dc - d * dd,
+                b * dc + db * c - a * dd - da * d,
+                a * dc + da * c + b * dd + db * d,
+            ],
+            [
+                a * dd + da * d + b * dc + db * c,
+                a * da - b * db + c * dc - d * dd,
+                c * dd + dc * d - a * db - da * b,
+            ],
+            [
+                b * dd + db * d - a * dc - da * c,
+                a * db + da * b + c * dd + dc * d,
+                a * da - b * db - c * dc + d * dd,
+            ],
+        ],
+        dtype=np.float64,
+    )
+
+
+@nb.njit("float64[:](float64[:], float64[:])", cache=True, fastmath=True, nogil=True)
+def rotation_multiply(rotation1: np.ndarray, rotation2: np.ndarray) -> np.ndarray:
+    a1, b1, c1, d1 = rotation1
+    a2, b2, c2, d2 = rotation2
+    rot = np.array(
+        [
+            a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2,
+            a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2,
+            a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2,
+            a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2,
+        ],
+        dtype=np.float64,
+    )
+    if rot[0] < 0:
+        for i in range(4):
+            rot[i] = -rot[i]
+    return rot
+
+
 @nb.njit(
     "float64[:, :](float64[:], float64[:, :])", cache=True, fastmath=True, nogil=True
 )
@@ -22,9 +22,11 @@ from importlib.metadata import version
 
 # NB! Update project config file if this list is updated!
 optional_deps: list[str] = [
+    "hdf5plugin",
     "pyvista",
     "nlopt",
     "pyebsdindex",
+    "zarr",
 ]
 installed: dict[str, bool] = {}
 for pkg in optional_deps:
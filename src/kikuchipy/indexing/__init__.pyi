@@ -16,6 +16,7 @@
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
 from ._hough_indexing import xmap_from_hough_indexing_data
+from ._inverted_file_index import InvertedFileIndex
 from ._merge_crystal_maps import merge_crystal_maps
 from ._orientation_similarity_map import orientation_similarity_map
 from ._refinement._refinement import (
@@ -27,11 +28,16 @@ from .similarity_metrics._normalized_cross_correlation import (
     NormalizedCrossCorrelationMetric,
 )
 from .similarity_metrics._normalized_dot_product import NormalizedDotProductMetric
+from .similarity_metrics._pca_normalized_cross_correlation import (
+    PCANormalizedCrossCorrelationMetric,
+)
 from .similarity_metrics._similarity_metric import SimilarityMetric
 
 __all__ = [
+    "InvertedFileIndex",
     "NormalizedCrossCorrelationMetric",
     "NormalizedDotProductMetric",
+    "PCANormalizedCrossCorrelationMetric",
     "SimilarityMetric",
     "compute_refine_orientation_projection_center_results",
     "compute_refine_orientation_results",
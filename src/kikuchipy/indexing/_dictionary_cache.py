@@ -0,0 +1,183 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Private tools for caching prepared dictionary patterns projected
+from a master pattern on disk, to be reused in dictionary indexing.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+import shutil
+from typing import TYPE_CHECKING
+
+import dask.array as da
+from dask.utils import parse_bytes
+import numpy as np
+
+from kikuchipy.indexing.similarity_metrics._similarity_metric import SimilarityMetric
+
+if TYPE_CHECKING:  # pragma: no cover
+    from kikuchipy.indexing._dictionary_indexing import _ProjectedDictionary
+
+# Increase whenever the way tiles are stored changes, so that old
+# tiles are not read
+CACHE_VERSION = 1
+
+
+class _DictionaryCache:
+    """On-disk cache of prepared (masked and normalized) dictionary
+    patterns projected from a master pattern.
+
+    Each dictionary is stored in a separate directory named after a
+    hash of everything the prepared patterns depend on. The patterns
+    are stored in tiles along the dictionary axis as NumPy ``.npy``
+    files, which are memory-mapped when read. When the total size of
+    the cache exceeds the maximum size, the least recently used
+    dictionaries are removed.
+
+    Parameters
+    ----------
+    path
+        Cache directory. Created if it does not exist.
+    key
+        Hash identifying the dictionary in the cache, as returned from
+        :func:`_get_dictionary_cache_key`.
+    max_size
+        Maximum size of the cache directory. Either a number of bytes or
+        a string like ``"20 GB"``.
+    """
+
+    def __init__(self, path: str | Path, key: str, max_size: int | str) -> None:
+        """Set up the cache of one dictionary."""
+        self.path = Path(path)
+        self.key = key
+        self.max_size = parse_bytes(max_size) if isinstance(max_size, str) else max_size
+        self.dictionary_path = self.path / key
+        self.dictionary_path.mkdir(parents=True, exist_ok=True)
+        # Mark the dictionary as most recently used
+        os.utime(self.dictionary_path)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}: {self.dictionary_path}"
+
+    def _tile_path(self, start: int, end: int) -> Path:
+        return self.dictionary_path / f"tile_{start}_{end}.npy"
+
+    def get_tile(self, start: int, end: int) -> np.ndarray | None:
+        """Return a memory-mapped tile of prepared dictionary patterns,
+        or ``None`` if it is not in the cache.
+        """
+        fpath = self._tile_path(start, end)
+        if not fpath.is_file():
+            return None
+        return np.load(fpath, mmap_mode="r")
+
+    def set_tile(self, start: int, end: int, patterns: np.ndarray | da.Array) -> None:
+        """Write a tile of prepared dictionary patterns to the cache and
+        remove the least recently used dictionaries if the cache is too
+        large.
+
+        Patterns in a Dask array are computed and written block by
+        block into a memory-mapped file, so that the full tile is never
+        kept in memory.
+        """
+        fpath = self._tile_path(start, end)
+        # Write to a temporary file first so that a tile is never read
+        # while partly written
+        fpath_tmp = fpath.with_suffix(".tmp")
+        if isinstance(patterns, da.Array):
+            out = np.lib.format.open_memmap(
+                fpath_tmp, mode="w+", dtype=patterns.dtype, shape=patterns.shape
+            )
+            da.store(patterns, out, lock=False)
+            out.flush()
+            del out
+        else:
+            with open(fpath_tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(patterns))
+        os.replace(fpath_tmp, fpath)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used dictionaries, except this one,
+        until the cache is not larger than the maximum size.
+        """
+        entries = []
+        total_size = 0
+        for entry in self.path.iterdir():
+            if not entry.is_dir():
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+            entries.append((entry.stat().st_mtime, size, entry))
+            total_size += size
+
+        for _, size, entry in sorted(entries, key=lambda x: x[0]):
+            if total_size <= self.max_size:
+                break
+            if entry == self.dictionary_path:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+
+def _get_dictionary_cache_key(
+    dictionary: "_ProjectedDictionary", metric: SimilarityMetric
+) -> str:
+    """Return a hash of everything prepared dictionary patterns
+    projected from a master pattern depend on.
+
+    Parameters
+    ----------
+    dictionary
+        Dictionary to project patterns from.
+    metric
+        Similarity metric preparing the dictionary patterns.
+
+    Returns
+    -------
+    key
+        Hexadecimal SHA-256 hash.
+    """
+    h = hashlib.sha256()
+    h.update(f"{CACHE_VERSION}".encode())
+
+    # Master pattern
+    kw = dictionary._projection_kwargs
+    for name in ["master_upper", "master_lower"]:
+        arr = np.ascontiguousarray(kw[name])
+        h.update(f"{arr.shape}{arr.dtype}".encode())
+        h.update(arr.tobytes())
+    h.update(f"{dictionary.energy}".encode())
+
+    # Detector shape and geometry (PC, tilts, binning etc.), which
+    # uniquely determine the direction cosines
+    dc = np.ascontiguousarray(dictionary.direction_cosines)
+    h.update(f"{dictionary.detector_shape}".encode())
+    h.update(dc.tobytes())
+
+    # Rotations and data type of projected patterns
+    h.update(np.ascontiguousarray(dictionary.rotations).tobytes())
+    h.update(f"{dictionary.dtype}".encode())
+
+    # Preparation of patterns by the similarity metric
+    h.update(f"{type(metric).__module__}.{type(metric).__qualname__}".encode())
+    h.update(f"{metric.dtype}".encode())
+    if metric.signal_mask is not None:
+        h.update(np.ascontiguousarray(metric.signal_mask, dtype=bool).tobytes())
+
+    return h.hexdigest()
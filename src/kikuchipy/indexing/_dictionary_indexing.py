@@ -19,27 +19,48 @@
 dictionary of simulated patterns with known orientations.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from time import sleep, time
+from typing import TYPE_CHECKING
 
 import dask.array as da
 from dask.diagnostics import ProgressBar
+from numba import njit
 import numpy as np
 from orix.crystal_map import CrystalMap, create_coordinate_arrays
 from orix.quaternion import Rotation
 from tqdm import tqdm
 
+from kikuchipy.indexing._dictionary_cache import _DictionaryCache
+from kikuchipy.indexing._merge_crystal_maps import merge_crystal_maps
+from kikuchipy.indexing._refinement._refinement import _get_master_pattern_data
+from kikuchipy.indexing.similarity_metrics._pca_normalized_cross_correlation import (
+    PCANormalizedCrossCorrelationMetric,
+)
 from kikuchipy.indexing.similarity_metrics._similarity_metric import SimilarityMetric
+from kikuchipy.signals.util._dask import get_chunking
+from kikuchipy.signals.util._master_pattern import (
+    _get_direction_cosines_from_detector,
+    _project_patterns_from_master_pattern_with_fixed_pc,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from kikuchipy.detectors.ebsd_detector import EBSDDetector
+    from kikuchipy.indexing._inverted_file_index import InvertedFileIndex
+    from kikuchipy.signals.ebsd_master_pattern import EBSDMasterPattern
 
 
 def _dictionary_indexing(
     experimental: np.ndarray | da.Array,
     experimental_nav_shape: tuple,
-    dictionary: np.ndarray | da.Array,
+    dictionary: "np.ndarray | da.Array | _ProjectedDictionary",
     step_sizes: tuple,
     dictionary_xmap: CrystalMap,
     metric: SimilarityMetric,
     keep_n: int,
     n_per_iteration: int,
+    cache: _DictionaryCache | None = None,
+    index: "InvertedFileIndex | None" = None,
 ) -> CrystalMap:
     """Dictionary indexing matching experimental patterns to a
     dictionary of simulated patterns of known orientations.
@@ -56,6 +77,14 @@ def _dictionary_indexing(
     metric
     keep_n
     n_per_iteration
+    cache
+        On-disk cache of prepared dictionary patterns to read from and
+        write to. Only used if the dictionary is projected from a master
+        pattern during indexing.
+    index
+        Approximate nearest neighbour index of the prepared dictionary
+        patterns to match experimental patterns with instead of the
+        dictionary.
 
     Returns
     -------
@@ -66,7 +95,10 @@ def _dictionary_indexing(
     n_iterations = int(np.ceil(dictionary_size / n_per_iteration))
 
     experimental = metric.prepare_experimental(experimental)
-    dictionary = dictionary.reshape((dictionary_size, -1))
+    if not isinstance(dictionary, _ProjectedDictionary):
+        dictionary = dictionary.reshape((dictionary_size, -1))
+    if index is None and isinstance(metric, PCANormalizedCrossCorrelationMetric):
+        metric.fit_basis_to_dictionary(dictionary, keep_n=keep_n)
 
     n_experimental_all = int(np.prod(experimental_nav_shape))
     n_experimental = experimental.shape[0]
@@ -83,9 +115,19 @@ def _dictionary_indexing(
     )
 
     time_start = time()
-    if dictionary_size == n_per_iteration:
+    if index is not None:
+        simulation_indices = np.zeros((n_experimental, keep_n), dtype=np.int32)
+        scores = np.zeros((n_experimental, keep_n), dtype=metric.dtype)
+        chunk_ends = np.cumsum(experimental.chunks[0])
+        chunk_starts = chunk_ends - np.array(experimental.chunks[0])
+        for i in tqdm(range(experimental.numblocks[0])):
+            start, end = chunk_starts[i], chunk_ends[i]
+            simulation_indices[start:end], scores[start:end] = index.search(
+                experimental.blocks[i].compute(), keep_n=keep_n
+            )
+    elif dictionary_size == n_per_iteration and cache is None:
         simulation_indices, scores = _match_chunk(
-            experimental, dictionary, keep_n=keep_n, metric=metric
+            experimental, dictionary[:], keep_n=keep_n, metric=metric
         )
         with ProgressBar():
             simulation_indices, scores = da.compute(simulation_indices, scores)
@@ -100,30 +142,45 @@ def _dictionary_indexing(
         chunk_starts = np.cumsum([0] + [n_per_iteration] * (n_iterations - 1))
         chunk_ends = np.cumsum([n_per_iteration] * n_iterations)
         chunk_ends[-1] = max(chunk_ends[-1], dictionary_size)
-        for start, end in tqdm(zip(chunk_starts, chunk_ends), total=n_iterations):
-            dictionary_chunk = dictionary[start:end]
-            if dictionary_is_lazy:
-                dictionary_chunk = dictionary_chunk.compute()
-
-            simulation_indices_i, scores_i = _match_chunk(
-                experimental,
-                dictionary_chunk,
-                keep_n=min(keep_n, end - start),
-                metric=metric,
-            )
 
-            simulation_indices_i, scores_i = da.compute(simulation_indices_i, scores_i)
-            simulation_indices_i += start
-
-            all_scores = np.hstack((scores, scores_i))
-            all_simulation_indices = np.hstack(
-                (simulation_indices, simulation_indices_i)
-            )
-            best_indices = np.argsort(negative_sign * all_scores, axis=1)[:, :keep_n]
-            scores = np.take_along_axis(all_scores, best_indices, axis=1)
-            simulation_indices = np.take_along_axis(
-                all_simulation_indices, best_indices, axis=1
-            )
+        # Merge the best matches of one dictionary chunk into the
+        # running best matches in a separate thread while the next
+        # chunk is matched
+        merge: Future | None = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for start, end in tqdm(zip(chunk_starts, chunk_ends), total=n_iterations):
+                if cache is not None:
+                    dictionary_chunk = _get_prepared_dictionary_chunk(
+                        dictionary, start, end, metric, cache
+                    )
+                else:
+                    dictionary_chunk = dictionary[start:end]
+                    if dictionary_is_lazy:
+                        dictionary_chunk = dictionary_chunk.compute()
+
+                simulation_indices_i, scores_i = _match_chunk(
+                    experimental,
+                    dictionary_chunk,
+                    keep_n=min(keep_n, end - start),
+                    metric=metric,
+                    prepare_dictionary=cache is None,
+                )
+                simulation_indices_i, scores_i = da.compute(
+                    simulation_indices_i, scores_i
+                )
+
+                if merge is not None:
+                    merge.result()
+                merge = executor.submit(
+                    _merge_top_k_inplace,
+                    scores,
+                    simulation_indices,
+                    np.ascontiguousarray(scores_i, dtype=scores.dtype),
+                    np.ascontiguousarray(simulation_indices_i, dtype=np.int32),
+                    int(start),
+                    int(metric.sign),
+                )
+            merge.result()
 
     total_time = time() - time_start
     patterns_per_second = n_experimental / total_time
@@ -136,9 +193,203 @@ def _dictionary_indexing(
         f"{comparisons_per_second:.5f} comparisons/s"
     )
 
+    xmap = _get_crystal_map(
+        simulation_indices=simulation_indices,
+        scores=scores,
+        dictionary_xmap=dictionary_xmap,
+        experimental_nav_shape=experimental_nav_shape,
+        step_sizes=step_sizes,
+        navigation_mask=metric.navigation_mask,
+    )
+
+    return xmap
+
+
+def _dictionary_indexing_multiple_phases(
+    experimental: np.ndarray | da.Array,
+    experimental_nav_shape: tuple,
+    dictionaries: "list[np.ndarray | da.Array | _ProjectedDictionary]",
+    step_sizes: tuple,
+    dictionary_xmaps: list[CrystalMap],
+    metrics: list[SimilarityMetric],
+    keep_n: int,
+    n_per_iteration: list[int],
+    caches: list[_DictionaryCache | None],
+) -> CrystalMap:
+    """Dictionary indexing matching experimental patterns to multiple
+    dictionaries of simulated patterns of known orientations, one per
+    phase, in one pass over the experimental patterns.
+
+    Each chunk of experimental patterns is prepared once and matched to
+    all dictionaries, keeping the best matches per phase. The single
+    phase results are then merged with
+    :func:`~kikuchipy.indexing.merge_crystal_maps`.
+
+    See :meth:`~kikuchipy.signals.EBSD.dictionary_indexing`.
+
+    Parameters
+    ----------
+    experimental
+    experimental_nav_shape
+    dictionaries
+    step_sizes
+    dictionary_xmaps
+    metrics
+        One similarity metric per dictionary. The metrics must prepare
+        experimental patterns in the same way.
+    keep_n
+    n_per_iteration
+        Number of dictionary patterns to match in each iteration per
+        dictionary.
+    caches
+        On-disk cache of prepared dictionary patterns per dictionary, or
+        ``None``.
+
+    Returns
+    -------
+    xmap
+        Multi phase crystal map.
+    """
+    n_phases = len(dictionaries)
+    dictionary_sizes = [metric.n_dictionary_patterns for metric in metrics]
+    keep_n = min([keep_n] + dictionary_sizes)
+    sign = metrics[0].sign
+
+    experimental = da.asarray(metrics[0].prepare_experimental(experimental))
+    for i in range(n_phases):
+        if not isinstance(dictionaries[i], _ProjectedDictionary):
+            dictionaries[i] = dictionaries[i].reshape((dictionary_sizes[i], -1))
+        if isinstance(metrics[i], PCANormalizedCrossCorrelationMetric):
+            metrics[i].fit_basis_to_dictionary(dictionaries[i], keep_n=keep_n)
+
+    n_experimental_all = int(np.prod(experimental_nav_shape))
+    n_experimental = experimental.shape[0]
+
+    print(
+        _dictionary_indexing_info_message(
+            metric=metrics[0],
+            n_experimental_all=n_experimental_all,
+            n_experimental=n_experimental,
+            dictionary_size=sum(dictionary_sizes),
+            phase_name=", ".join([xmap.phases.names[0] for xmap in dictionary_xmaps]),
+        )
+    )
+
+    chunks = []
+    for size, n in zip(dictionary_sizes, n_per_iteration):
+        chunk_starts = np.arange(0, size, n)
+        chunk_ends = np.minimum(chunk_starts + n, size)
+        chunks.append(list(zip(chunk_starts, chunk_ends)))
+
+    simulation_indices = []
+    scores = []
+    for _ in range(n_phases):
+        simulation_indices.append(np.zeros((n_experimental, keep_n), dtype=np.int32))
+        scores.append(np.full((n_experimental, keep_n), -sign, dtype=metrics[0].dtype))
+
+    time_start = time()
+    experimental_ends = np.cumsum(experimental.chunks[0])
+    experimental_starts = experimental_ends - np.array(experimental.chunks[0])
+    for i in tqdm(range(experimental.numblocks[0])):
+        # Load and prepare each chunk of experimental patterns only once
+        experimental_i = experimental.blocks[i].compute()
+        rows = slice(experimental_starts[i], experimental_ends[i])
+        for j in range(n_phases):
+            scores_j = scores[j][rows]
+            simulation_indices_j = simulation_indices[j][rows]
+            for start, end in chunks[j]:
+                if caches[j] is not None:
+                    dictionary_chunk = _get_prepared_dictionary_chunk(
+                        dictionaries[j], start, end, metrics[j], caches[j]
+                    )
+                else:
+                    dictionary_chunk = dictionaries[j][start:end]
+                simulation_indices_i, scores_i = _match_chunk(
+                    experimental_i,
+                    dictionary_chunk,
+                    keep_n=min(keep_n, end - start),
+                    metric=metrics[j],
+                    prepare_dictionary=caches[j] is None,
+                )
+                simulation_indices_i, scores_i = da.compute(
+                    simulation_indices_i, scores_i
+                )
+                _merge_top_k_inplace(
+                    scores_j,
+                    simulation_indices_j,
+                    np.ascontiguousarray(scores_i, dtype=scores_j.dtype),
+                    np.ascontiguousarray(simulation_indices_i, dtype=np.int32),
+                    int(start),
+                    int(sign),
+                )
+
+    total_time = time() - time_start
+    patterns_per_second = n_experimental / total_time
+    comparisons_per_second = n_experimental * sum(dictionary_sizes) / total_time
+    # Without this pause, a part of the red tqdm progressbar background
+    # is displayed below this print
+    sleep(0.2)
+    print(
+        f"  Indexing speed: {patterns_per_second:.5f} patterns/s, "
+        f"{comparisons_per_second:.5f} comparisons/s"
+    )
+
+    xmaps = []
+    for j in range(n_phases):
+        xmap_j = _get_crystal_map(
+            simulation_indices=simulation_indices[j],
+            scores=scores[j],
+            dictionary_xmap=dictionary_xmaps[j],
+            experimental_nav_shape=experimental_nav_shape,
+            step_sizes=step_sizes,
+            navigation_mask=metrics[0].navigation_mask,
+        )
+        xmaps.append(xmap_j)
+
+    xmap = merge_crystal_maps(
+        xmaps,
+        greater_is_better=sign == 1,
+        simulation_indices_prop="simulation_indices",
+    )
+
+    return xmap
+
+
+def _get_crystal_map(
+    simulation_indices: np.ndarray,
+    scores: np.ndarray,
+    dictionary_xmap: CrystalMap,
+    experimental_nav_shape: tuple,
+    step_sizes: tuple,
+    navigation_mask: np.ndarray | None = None,
+) -> CrystalMap:
+    """Return a single phase crystal map of the best matching
+    dictionary patterns.
+
+    Parameters
+    ----------
+    simulation_indices
+        Indices into the dictionary of shape
+        ``(n_experimental, keep_n)``.
+    scores
+        Scores of the best matches, of the same shape as
+        ``simulation_indices``.
+    dictionary_xmap
+    experimental_nav_shape
+    step_sizes
+    navigation_mask
+        Mask of the experimental patterns which were not matched.
+
+    Returns
+    -------
+    xmap
+    """
+    n_experimental_all = int(np.prod(experimental_nav_shape))
+    keep_n = scores.shape[1]
+
     xmap_kw, _ = create_coordinate_arrays(experimental_nav_shape, step_sizes)
-    if metric.navigation_mask is not None:
-        nav_mask = ~metric.navigation_mask.ravel()
+    if navigation_mask is not None:
+        nav_mask = ~navigation_mask.ravel()
         xmap_kw["is_in_data"] = nav_mask
 
         rot = Rotation.identity((n_experimental_all, keep_n))
@@ -167,11 +418,98 @@ def _dictionary_indexing(
     return xmap
 
 
+class _ProjectedDictionary:
+    """Dictionary of simulated patterns projected from a master pattern
+    with a fixed projection center (PC) only when sliced.
+
+    Slicing returns a lazy array of the projected patterns, split into
+    small tiles along the first axis. When matched to experimental
+    patterns, each tile is projected and immediately consumed by the
+    similarity metric, so that the full dictionary is never kept in
+    memory.
+
+    Parameters
+    ----------
+    master_pattern
+        Master pattern in the square Lambert projection.
+    rotations
+        Crystal rotations to project patterns for.
+    detector
+        EBSD detector with one PC.
+    energy
+        Acceleration voltage, in kV, of the master pattern to project
+        patterns from.
+    dtype
+        Data type of the projected patterns.
+    tile_bytes
+        Approximate number of bytes of each tile of projected patterns.
+        Default is 4 MiB.
+    """
+
+    def __init__(
+        self,
+        master_pattern: "EBSDMasterPattern",
+        rotations: Rotation,
+        detector: "EBSDDetector",
+        energy: int | float | None = None,
+        dtype: str | np.dtype | type = "float32",
+        tile_bytes: int | float | str = "4 MiB",
+    ) -> None:
+        """Set up projection of patterns from a master pattern."""
+        mpu, mpl, npx, npy, scale = _get_master_pattern_data(master_pattern, energy)
+        self.rotations = rotations.data.reshape((-1, 4))
+        self.direction_cosines = _get_direction_cosines_from_detector(detector)
+        self.detector_shape = detector.shape
+        self.energy = energy
+        self.dtype = np.dtype(dtype)
+        self.shape = (self.rotations.shape[0], detector.size)
+        self.tile_bytes = tile_bytes
+        self._projection_kwargs = dict(
+            direction_cosines=self.direction_cosines,
+            master_upper=mpu,
+            master_lower=mpl,
+            npx=int(npx),
+            npy=int(npy),
+            scale=float(scale),
+            rescale=False,
+            # Values cannot be None since they are passed to Numba
+            # accelerated functions which require ints or floats
+            out_min=1,
+            out_max=2,
+            dtype_out=self.dtype,
+        )
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: slice) -> da.Array:
+        rotations = self.rotations[key]
+        n_pixels = self.shape[1]
+        chunks = get_chunking(
+            data_shape=(rotations.shape[0], n_pixels),
+            nav_dim=1,
+            sig_dim=1,
+            chunk_bytes=self.tile_bytes,
+            dtype=self.dtype,
+        )
+        rotations = da.from_array(rotations, chunks=chunks[:-1] + (-1,))
+        return da.map_blocks(
+            _project_patterns_from_master_pattern_with_fixed_pc,
+            rotations,
+            drop_axis=1,
+            new_axis=1,
+            chunks=chunks,
+            dtype=self.dtype,
+            **self._projection_kwargs,
+        )
+
+
 def _match_chunk(
     experimental: np.ndarray | da.Array,
     simulated: np.ndarray | da.Array,
     keep_n: int,
     metric: SimilarityMetric,
+    prepare_dictionary: bool = True,
 ) -> tuple[da.Array, da.Array]:
     """Match all experimental patterns to part of or the entire
     dictionary of simulated patterns.
@@ -182,13 +520,17 @@ def _match_chunk(
     simulated
     keep_n
     metric
+    prepare_dictionary
+        Whether to prepare the simulated patterns with the metric before
+        matching. Default is ``True``.
 
     Returns
     -------
     simulation_indices
     scores
     """
-    simulated = metric.prepare_dictionary(simulated)
+    if prepare_dictionary:
+        simulated = metric.prepare_dictionary(simulated)
 
     similarities = metric.match(experimental, simulated)
 
@@ -201,6 +543,94 @@ def _match_chunk(
     return simulation_indices, scores
 
 
+def _get_prepared_dictionary_chunk(
+    dictionary: _ProjectedDictionary,
+    start: int,
+    end: int,
+    metric: SimilarityMetric,
+    cache: _DictionaryCache,
+) -> np.ndarray:
+    """Return prepared dictionary patterns from the cache, or project
+    and prepare them and write them to the cache if not there.
+
+    Parameters
+    ----------
+    dictionary
+    start
+    end
+    metric
+    cache
+
+    Returns
+    -------
+    prepared
+    """
+    end = min(end, len(dictionary))
+    prepared = cache.get_tile(start, end)
+    if prepared is None:
+        # Patterns are projected, prepared and written to the cache
+        # tile by tile before being read back memory-mapped
+        prepared = metric.prepare_dictionary(dictionary[start:end])
+        cache.set_tile(start, end, prepared)
+        prepared = cache.get_tile(start, end)
+    return prepared
+
+
+@njit(cache=True, nogil=True)
+def _merge_top_k_inplace(
+    scores: np.ndarray,
+    simulation_indices: np.ndarray,
+    new_scores: np.ndarray,
+    new_simulation_indices: np.ndarray,
+    offset: int,
+    sign: int,
+) -> None:
+    """Merge the best matches of one dictionary chunk into the running
+    best matches per experimental pattern in place.
+
+    Parameters
+    ----------
+    scores
+        Running best scores of shape ``(n_experimental, keep_n)``,
+        sorted from best to worst per pattern. Updated in place.
+    simulation_indices
+        Running dictionary indices of the best scores, of the same shape
+        as ``scores``. Updated in place.
+    new_scores
+        Best scores of one dictionary chunk of shape
+        ``(n_experimental, n)``, not necessarily sorted.
+    new_simulation_indices
+        Indices into the dictionary chunk of ``new_scores``.
+    offset
+        Index of the first pattern of the chunk in the full dictionary.
+    sign
+        Whether a greater (+1) or lower (-1) score is better.
+
+    Notes
+    -----
+    Each new score is inserted into the sorted running scores if it is
+    better than the current worst one. Since only a few scores of a
+    chunk usually make it into the running best, this is much cheaper
+    than sorting all ``keep_n + n`` scores per pattern. A new score
+    equal to a running score is placed after the latter.
+    """
+    n_experimental, keep_n = scores.shape
+    n_new = new_scores.shape[1]
+    last = keep_n - 1
+    for i in range(n_experimental):
+        for j in range(n_new):
+            score = new_scores[i, j]
+            if not sign * score > sign * scores[i, last]:
+                continue
+            k = last
+            while k > 0 and sign * score > sign * scores[i, k - 1]:
+                scores[i, k] = scores[i, k - 1]
+                simulation_indices[i, k] = simulation_indices[i, k - 1]
+                k -= 1
+            scores[i, k] = score
+            simulation_indices[i, k] = new_simulation_indices[i, j] + offset
+
+
 def _dictionary_indexing_info_message(
     metric,
     n_experimental_all: int,
@@ -0,0 +1,394 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Private tools for hierarchical (coarse-to-fine) dictionary indexing,
+where the best matches to a coarse dictionary are re-scored against
+local orientation samplings of increasing resolution.
+"""
+
+from time import sleep, time
+from typing import TYPE_CHECKING
+
+import dask.array as da
+from dask.diagnostics import ProgressBar
+from numba import njit
+import numpy as np
+from orix.crystal_map import CrystalMap, PhaseList
+from orix.quaternion import Rotation
+
+from kikuchipy._utils.numba import rotation_multiply
+from kikuchipy.indexing._dictionary_indexing import (
+    _dictionary_indexing,
+    _get_crystal_map,
+    _ProjectedDictionary,
+)
+from kikuchipy.indexing._refinement._refinement import _get_master_pattern_data
+from kikuchipy.indexing.similarity_metrics._normalized_cross_correlation import (
+    NormalizedCrossCorrelationMetric,
+)
+from kikuchipy.signals.util._master_pattern import (
+    _get_direction_cosines_from_detector,
+    _project_single_pattern_from_master_pattern,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from kikuchipy.detectors.ebsd_detector import EBSDDetector
+    from kikuchipy.signals.ebsd_master_pattern import EBSDMasterPattern
+
+
+def _hierarchical_dictionary_indexing(
+    experimental: np.ndarray | da.Array,
+    experimental_coarse: np.ndarray | da.Array,
+    experimental_nav_shape: tuple,
+    step_sizes: tuple,
+    master_pattern: "EBSDMasterPattern",
+    rotations: Rotation,
+    detector: "EBSDDetector",
+    detector_coarse: "EBSDDetector",
+    energy: int | float | None,
+    resolutions: list[float],
+    keep_n: int,
+    n_per_iteration: int,
+    metric: NormalizedCrossCorrelationMetric,
+    metric_coarse: NormalizedCrossCorrelationMetric,
+) -> CrystalMap:
+    """Hierarchical dictionary indexing matching experimental patterns
+    to a coarse dictionary projected from a master pattern, and then to
+    local orientation samplings of increasing resolution around the
+    best matches.
+
+    See :meth:`~kikuchipy.signals.EBSD.hierarchical_dictionary_indexing`.
+
+    Parameters
+    ----------
+    experimental
+        Experimental patterns at full resolution.
+    experimental_coarse
+        Experimental patterns to match to the coarse dictionary,
+        possibly binned.
+    experimental_nav_shape
+    step_sizes
+    master_pattern
+    rotations
+        Coarse rotations to project the dictionary for.
+    detector
+        Detector of the full resolution patterns.
+    detector_coarse
+        Detector of ``experimental_coarse``.
+    energy
+    resolutions
+        Angular resolution of ``rotations`` followed by the resolutions
+        of the local samplings, in degrees.
+    keep_n
+        Number of best matches to keep at each level.
+    n_per_iteration
+        Number of coarse dictionary patterns to match in each iteration.
+    metric
+        Metric preparing the full resolution patterns.
+    metric_coarse
+        Metric preparing the coarse patterns.
+
+    Returns
+    -------
+    xmap
+    """
+    dictionary = _ProjectedDictionary(
+        master_pattern=master_pattern,
+        rotations=rotations,
+        detector=detector_coarse,
+        energy=energy,
+    )
+    dictionary_xmap = CrystalMap(
+        rotations=rotations.flatten(), phase_list=PhaseList(master_pattern.phase)
+    )
+    xmap_coarse = _dictionary_indexing(
+        experimental=experimental_coarse,
+        experimental_nav_shape=experimental_nav_shape,
+        dictionary=dictionary,
+        step_sizes=step_sizes,
+        dictionary_xmap=dictionary_xmap,
+        metric=metric_coarse,
+        keep_n=keep_n,
+        n_per_iteration=n_per_iteration,
+    )
+    keep_n = min(keep_n, dictionary.shape[0])
+
+    # Only points in the data are returned from the map
+    candidates = xmap_coarse.rotations.data.reshape((-1, keep_n, 4))
+    candidate_indices = xmap_coarse.prop["simulation_indices"].reshape((-1, keep_n))
+
+    offsets = []
+    for radius, resolution in zip(resolutions[:-1], resolutions[1:]):
+        offsets.append(_get_local_rotation_offsets(resolution, radius))
+    n_per_pattern = keep_n * sum(len(offsets_i) for offsets_i in offsets)
+
+    experimental = metric.prepare_experimental(experimental)
+    chunks = experimental.chunks[0]
+    candidates = da.from_array(candidates, chunks=(chunks, -1, -1))
+    candidate_indices = da.from_array(candidate_indices, chunks=(chunks, -1))
+
+    if metric.signal_mask is not None:
+        direction_cosines = _get_direction_cosines_from_detector(
+            detector, ~metric.signal_mask.ravel()
+        )
+    else:
+        direction_cosines = _get_direction_cosines_from_detector(detector)
+    mpu, mpl, npx, npy, scale = _get_master_pattern_data(master_pattern, energy)
+
+    n_experimental = experimental.shape[0]
+    print(
+        "Hierarchical refinement information:\n"
+        f"  Matching {n_experimental} experimental pattern(s) to "
+        f"{n_per_pattern} local orientation(s) each in {len(offsets)} level(s)"
+    )
+
+    # Pack rotations, scores and indices into one array per chunk
+    results = da.blockwise(
+        _refine_candidates_chunk,
+        "ikr",
+        experimental,
+        "ij",
+        candidates,
+        "ikq",
+        candidate_indices,
+        "ik",
+        offsets=offsets,
+        direction_cosines=direction_cosines,
+        master_upper=mpu,
+        master_lower=mpl,
+        npx=int(npx),
+        npy=int(npy),
+        scale=float(scale),
+        new_axes={"r": 6},
+        concatenate=True,
+        dtype=np.float64,
+    )
+
+    time_start = time()
+    with ProgressBar():
+        results = results.compute()
+    total_time = time() - time_start
+    # Without this pause, a part of the red tqdm progressbar background
+    # is displayed below this print
+    sleep(0.2)
+    print(
+        f"  Refinement speed: {n_experimental / total_time:.5f} patterns/s, "
+        f"{n_experimental * n_per_pattern / total_time:.5f} comparisons/s"
+    )
+
+    # Since the local rotations are not in the dictionary, a temporary
+    # dictionary with one rotation per match is used to build the map
+    n_matches = n_experimental * keep_n
+    dictionary_xmap = CrystalMap(
+        rotations=Rotation(results[..., :4].reshape((-1, 4))),
+        phase_list=PhaseList(master_pattern.phase),
+    )
+    xmap = _get_crystal_map(
+        simulation_indices=np.arange(n_matches).reshape((n_experimental, keep_n)),
+        scores=results[..., 4].astype(metric.dtype),
+        dictionary_xmap=dictionary_xmap,
+        experimental_nav_shape=experimental_nav_shape,
+        step_sizes=step_sizes,
+        navigation_mask=metric.navigation_mask,
+    )
+    simulation_indices = results[..., 5].astype(np.int32)
+    xmap.prop["simulation_indices"] = simulation_indices.reshape(
+        xmap.prop["simulation_indices"].shape
+    )
+
+    return xmap
+
+
+def _get_local_rotation_offsets(resolution: float, radius: float) -> np.ndarray:
+    """Return rotations sampled on a cubic grid of rotation vectors
+    within a ball about the identity.
+
+    Parameters
+    ----------
+    resolution
+        Grid spacing in degrees.
+    radius
+        Largest rotation angle in degrees.
+
+    Returns
+    -------
+    offsets
+        Quaternions of shape (n, 4), including the identity.
+    """
+    n = int(np.floor(radius / resolution))
+    steps = np.arange(-n, n + 1) * np.deg2rad(resolution)
+    vectors = np.stack(np.meshgrid(steps, steps, steps), axis=-1).reshape((-1, 3))
+    angles = np.linalg.norm(vectors, axis=1)
+    is_inside = angles <= np.deg2rad(radius) * (1 + 1e-9)
+    vectors = vectors[is_inside]
+    angles = angles[is_inside]
+    # The axis of the identity is arbitrary
+    vectors[angles == 0] = [0, 0, 1]
+    return Rotation.from_axes_angles(vectors, angles).data
+
+
+def _refine_candidates_chunk(
+    experimental: np.ndarray,
+    candidates: np.ndarray,
+    candidate_indices: np.ndarray,
+    offsets: list[np.ndarray],
+    direction_cosines: np.ndarray,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+) -> np.ndarray:
+    """Return the best rotations, scores and dictionary indices after
+    matching a chunk of experimental patterns to local samplings around
+    their candidate rotations, one level at a time.
+
+    Parameters
+    ----------
+    experimental
+        Prepared experimental patterns of shape (n, n_pixels).
+    candidates
+        Candidate rotations of shape (n, keep_n, 4).
+    candidate_indices
+        Dictionary indices of the candidates of shape (n, keep_n).
+    offsets
+        Local rotations per level of shape (m, 4).
+    direction_cosines
+    master_upper
+    master_lower
+    npx
+    npy
+    scale
+
+    Returns
+    -------
+    results
+        Array of shape (n, keep_n, 6) with the best rotations, their
+        scores and the dictionary indices of the candidates they
+        descend from, sorted from best to worst.
+    """
+    keep_n = candidates.shape[1]
+    experimental = np.ascontiguousarray(experimental, dtype=np.float32)
+    rotations = np.ascontiguousarray(candidates, dtype=np.float64)
+    indices = candidate_indices.astype(np.int64)
+    scores = None
+    for offsets_i in offsets:
+        rotations = _get_local_rotations(rotations, offsets_i)
+        indices = np.repeat(indices, offsets_i.shape[0], axis=1)
+        scores = _match_rotations_per_pattern(
+            experimental,
+            rotations,
+            direction_cosines,
+            master_upper,
+            master_lower,
+            npx,
+            npy,
+            scale,
+        )
+        best = np.argsort(-scores, axis=1, kind="stable")[:, :keep_n]
+        rotations = np.take_along_axis(rotations, best[..., np.newaxis], axis=1)
+        indices = np.take_along_axis(indices, best, axis=1)
+        scores = np.take_along_axis(scores, best, axis=1)
+
+    results = np.zeros(candidates.shape[:2] + (6,), dtype=np.float64)
+    results[..., :4] = rotations
+    results[..., 4] = scores
+    results[..., 5] = indices
+    return results
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_local_rotations(centers: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Return the local rotations about each center rotation.
+
+    Parameters
+    ----------
+    centers
+        Rotations of shape (n, k, 4).
+    offsets
+        Rotations about the identity of shape (m, 4).
+
+    Returns
+    -------
+    rotations
+        Rotations of shape (n, k * m, 4).
+    """
+    n, k = centers.shape[:2]
+    m = offsets.shape[0]
+    rotations = np.zeros((n, k * m, 4), dtype=np.float64)
+    for i in range(n):
+        for j in range(k):
+            for o in range(m):
+                rotations[i, j * m + o] = rotation_multiply(centers[i, j], offsets[o])
+    return rotations
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _match_rotations_per_pattern(
+    experimental: np.ndarray,
+    rotations: np.ndarray,
+    direction_cosines: np.ndarray,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+) -> np.ndarray:
+    """Return the normalized cross-correlation scores between each
+    experimental pattern and patterns projected for its own rotations.
+
+    Parameters
+    ----------
+    experimental
+        Experimental patterns of shape (n, n_pixels), zero-mean and
+        normalized.
+    rotations
+        Rotations of shape (n, m, 4).
+    direction_cosines
+        Direction cosines of shape (n_pixels, 3).
+    master_upper
+    master_lower
+    npx
+    npy
+    scale
+
+    Returns
+    -------
+    scores
+        Scores of shape (n, m).
+    """
+    n, m = rotations.shape[:2]
+    scores = np.zeros((n, m), dtype=np.float32)
+    for i in range(n):
+        for j in range(m):
+            simulated = _project_single_pattern_from_master_pattern(
+                rotation=rotations[i, j],
+                direction_cosines=direction_cosines,
+                master_upper=master_upper,
+                master_lower=master_lower,
+                npx=npx,
+                npy=npy,
+                scale=scale,
+                rescale=False,
+                out_min=0,  # Required, but not used here
+                out_max=1,  # Required, but not used here
+                dtype_out=np.float32,
+            )
+            simulated -= np.mean(simulated)
+            norm = np.sqrt(np.sum(np.square(simulated)))
+            scores[i, j] = np.sum(experimental[i] * simulated) / norm
+    return scores
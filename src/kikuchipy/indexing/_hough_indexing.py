@@ -21,8 +21,11 @@ EBSD patterns.
 Most of these tools are private and not meant to be used by users.
 """
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
 from time import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 import dask.array as da
 from diffsims.crystallography import ReciprocalLatticeVector
@@ -194,6 +197,7 @@ def _hough_indexing(
     indexer: "EBSDIndexer",
     chunksize: int,
     verbose: int,
+    n_processes: int = 1,
 ) -> tuple[CrystalMap, np.ndarray, np.ndarray]:
     """Perform Hough indexing with PyEBSDIndex.
 
@@ -212,10 +216,17 @@ def _hough_indexing(
         Navigation step sizes.
     indexer
         Indexer instance.
+    chunksize
+        Number of patterns to index at a time.
     verbose
         Whether to print indexing information. 0 - no output, 1 -
         timings, 2 - timings and the Hough transform of the first
         pattern with detected bands highlighted.
+    n_processes
+        Number of processes to index chunks of patterns in. Default is
+        1. If 1 and ``patterns`` is a NumPy array, all patterns are
+        passed to the indexer at once. Otherwise, patterns are indexed
+        chunk by chunk, see :func:`_index_patterns_in_chunks`.
 
     Returns
     -------
@@ -232,13 +243,18 @@ def _hough_indexing(
     """
     n_patterns = patterns.shape[0]
 
-    info_message = _get_info_message(n_patterns, chunksize, indexer)
+    info_message = _get_info_message(n_patterns, chunksize, indexer, n_processes)
     print(info_message)
 
     tic = time()
-    index_data, band_data, _, _ = indexer.index_pats(
-        patsin=patterns, verbose=verbose, chunksize=chunksize
-    )
+    if isinstance(patterns, np.ndarray) and n_processes == 1:
+        index_data, band_data, _, _ = indexer.index_pats(
+            patsin=patterns, verbose=verbose, chunksize=chunksize
+        )
+    else:
+        index_data, band_data = _index_patterns_in_chunks(
+            patterns, indexer, chunksize, verbose, n_processes
+        )
     toc = time()
     patterns_per_second = n_patterns / (toc - tic)
     print(f"  Indexing speed: {patterns_per_second:.5f} patterns/s")
@@ -253,6 +269,172 @@ def _hough_indexing(
     return xmap, index_data, band_data
 
 
+def _index_patterns_in_chunks(
+    patterns: np.ndarray | da.Array,
+    indexer: "EBSDIndexer",
+    chunksize: int,
+    verbose: int,
+    n_processes: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return index data and band data from Hough indexing of patterns
+    one chunk at a time.
+
+    The next chunk of patterns is read, or computed if ``patterns`` is a
+    Dask array, in a separate thread while the current chunk is
+    indexed. If ``n_processes`` is greater than 1, chunks are indexed
+    in a pool of processes, each with a copy of the indexer. At most
+    ``n_processes`` chunks are indexed at a time, so that at most one
+    more chunk than this is kept in memory.
+
+    Parameters
+    ----------
+    patterns
+        Array of patterns of shape (n patterns, n detector rows, n
+        detector columns).
+    indexer
+        Indexer instance. If it has one projection center (PC) per
+        pattern, each chunk is indexed with the PCs of its patterns.
+    chunksize
+        Number of patterns per chunk.
+    verbose
+        Which information to print from PyEBSDIndex when indexing the
+        first chunk. Other chunks are indexed without output.
+    n_processes
+        Number of processes to index chunks in. Default is 1, meaning
+        chunks are indexed in this process.
+
+    Returns
+    -------
+    index_data
+        Array of index data of all patterns.
+    band_data
+        Array of detected band data of all patterns.
+    """
+    n_patterns = patterns.shape[0]
+    starts = list(range(0, n_patterns, chunksize))
+
+    pc = np.asarray(indexer.PC)
+    pc_per_pattern = pc.ndim == 2 and pc.shape[0] == n_patterns
+
+    def get_chunk(start: int) -> np.ndarray:
+        chunk = patterns[start : start + chunksize]
+        if isinstance(chunk, da.Array):
+            chunk = chunk.compute()
+        return np.asarray(chunk)
+
+    def get_index_kwargs(i: int, start: int) -> dict:
+        kwargs = {"chunksize": chunksize, "verbose": verbose if i == 0 else 0}
+        if pc_per_pattern:
+            kwargs["pc"] = pc[start : start + chunksize]
+        return kwargs
+
+    # Arrays are allocated when the data types are known from the first
+    # indexed chunk
+    results = {"index_data": None, "band_data": None}
+
+    def store_result(start: int, result: tuple[np.ndarray, np.ndarray]) -> None:
+        index_data_i, band_data_i = result
+        if results["index_data"] is None:
+            results["index_data"] = np.empty(
+                (index_data_i.shape[0], n_patterns), dtype=index_data_i.dtype
+            )
+            results["band_data"] = np.empty(
+                (n_patterns,) + band_data_i.shape[1:], dtype=band_data_i.dtype
+            )
+        end = start + index_data_i.shape[1]
+        results["index_data"][:, start:end] = index_data_i
+        results["band_data"][start:end] = band_data_i
+
+    if n_processes > 1:
+        pool = _get_process_pool(n_processes, indexer)
+    else:
+        pool = None
+
+    pending: deque[tuple[int, Future]] = deque()
+    try:
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            next_chunk = reader.submit(get_chunk, starts[0])
+            for i, start in enumerate(starts):
+                chunk = next_chunk.result()
+                if i + 1 < len(starts):
+                    next_chunk = reader.submit(get_chunk, starts[i + 1])
+
+                kwargs = get_index_kwargs(i, start)
+                if pool is None:
+                    store_result(start, _index_chunk(indexer, chunk, **kwargs))
+                    continue
+
+                pending.append(
+                    (start, pool.submit(_index_chunk_in_process, chunk, **kwargs))
+                )
+                # Limit the number of chunks in memory
+                if len(pending) >= n_processes:
+                    start_done, future = pending.popleft()
+                    store_result(start_done, future.result())
+
+            while pending:
+                start_done, future = pending.popleft()
+                store_result(start_done, future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return results["index_data"], results["band_data"]
+
+
+def _index_chunk(
+    indexer: "EBSDIndexer",
+    patterns: np.ndarray,
+    chunksize: int,
+    verbose: int,
+    pc: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return index data and band data from Hough indexing of a chunk
+    of patterns, with the patterns' projection centers if given.
+    """
+    kwargs = {}
+    if pc is not None:
+        kwargs["PC"] = pc
+    index_data, band_data, _, _ = indexer.index_pats(
+        patsin=patterns, verbose=verbose, chunksize=chunksize, **kwargs
+    )
+    return index_data, band_data
+
+
+# Indexer of a process in the pool of processes indexing chunks
+_process_indexer = None
+
+
+def _get_process_pool(n_processes: int, indexer: "EBSDIndexer") -> ProcessPoolExecutor:
+    """Return a pool of processes, each with a copy of the indexer.
+
+    Processes are started with the "spawn" method instead of "fork",
+    since forking a process using Numba's threading layer, or while
+    the next chunk of patterns is read in another thread, can leave
+    locks in the new process in an acquired state.
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_set_process_indexer,
+        initargs=(indexer,),
+    )
+
+
+def _set_process_indexer(indexer: "EBSDIndexer") -> None:
+    global _process_indexer
+    _process_indexer = indexer
+
+
+def _index_chunk_in_process(
+    patterns: np.ndarray,
+    chunksize: int,
+    verbose: int,
+    pc: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    return _index_chunk(_process_indexer, patterns, chunksize, verbose, pc)
+
+
 def _get_pyebsdindex_phaselist(
     phase_list: PhaseList,
     reflectors: (
@@ -492,7 +674,9 @@ def _phase_lists_are_compatible(
         return compatible
 
 
-def _get_info_message(nav_size: int, chunksize: int, indexer: "EBSDIndexer") -> str:
+def _get_info_message(
+    nav_size: int, chunksize: int, indexer: "EBSDIndexer", n_processes: int = 1
+) -> str:
     from kikuchipy.constants import pyopencl_context_available
 
     info = (
@@ -508,6 +692,8 @@ def _get_info_message(nav_size: int, chunksize: int, indexer: "EBSDIndexer") ->
         info += ", mean"
     pc = tuple(map(float, pc.round(4)))
     info += f"): {pc}\n  Indexing {nav_size} pattern(s) in {n_chunks} chunk(s)"
+    if n_processes > 1:
+        info += f" in {n_processes} processes"
 
     return info
 
@@ -518,10 +704,112 @@ def _optimize_pc(
     indexer: "EBSDIndexer",
     batch: bool,
     method: str,
+    n_processes: int = 1,
     **kwargs,
 ) -> np.ndarray:
     if method == "pso":
         from pyebsdindex.pcopt import optimize_pso as optimize_func
     else:
         from pyebsdindex.pcopt import optimize as optimize_func
+    if batch and n_processes > 1:
+        return _optimize_pc_in_processes(
+            optimize_func, pc0, patterns, indexer, n_processes, **kwargs
+        )
     return optimize_func(pats=patterns, indexer=indexer, PC0=pc0, batch=batch, **kwargs)
+
+
+def _optimize_pc_in_processes(
+    optimize_func: Callable,
+    pc0: list[float],
+    patterns: np.ndarray | da.Array,
+    indexer: "EBSDIndexer",
+    n_processes: int,
+    **kwargs,
+) -> np.ndarray:
+    """Return one projection center (PC) per pattern optimized
+    independently in a pool of processes.
+
+    Patterns are split into parts of consecutive patterns, a few parts
+    per process to balance the load, since the number of iterations
+    needed per pattern varies. Each part is optimized with
+    ``batch=True`` in a process holding its own copy of the indexer.
+    Parts are not larger than the chunks of a Dask array, and at most
+    ``n_processes`` parts are read and waiting to be optimized at a
+    time.
+
+    Parameters
+    ----------
+    optimize_func
+        PyEBSDIndex optimization function, either
+        :func:`~pyebsdindex.pcopt.optimize` or
+        :func:`~pyebsdindex.pcopt.optimize_pso`.
+    pc0
+        Initial guess of PC for all patterns.
+    patterns
+        Array of patterns of shape (n patterns, n detector rows, n
+        detector columns). Parts of a Dask array are computed only when
+        a process is available.
+    indexer
+        Indexer instance.
+    n_processes
+        Number of processes to optimize PCs in.
+    **kwargs
+        Keyword arguments passed on to ``optimize_func``.
+
+    Returns
+    -------
+    pc
+        Array of optimized PCs of shape (n patterns, 3).
+    """
+    n_patterns = patterns.shape[0]
+    part_size = int(np.ceil(n_patterns / (4 * n_processes)))
+    if isinstance(patterns, da.Array):
+        part_size = min(part_size, patterns.chunksize[0])
+    starts = range(0, n_patterns, part_size)
+
+    def get_part(start: int) -> np.ndarray:
+        part = patterns[start : start + part_size]
+        if isinstance(part, da.Array):
+            part = part.compute()
+        return np.asarray(part)
+
+    pc = np.zeros((n_patterns, 3))
+
+    def store_result(start: int, future: Future) -> None:
+        pc[start : start + part_size] = future.result()
+
+    pending: deque[tuple[int, Future]] = deque()
+    with _get_process_pool(n_processes, indexer) as pool:
+        for start in starts:
+            pending.append(
+                (
+                    start,
+                    pool.submit(
+                        _optimize_pc_in_process,
+                        optimize_func,
+                        get_part(start),
+                        pc0,
+                        kwargs,
+                    ),
+                )
+            )
+            # Limit the number of parts in memory
+            if len(pending) >= n_processes:
+                store_result(*pending.popleft())
+
+        while pending:
+            store_result(*pending.popleft())
+
+    return pc
+
+
+def _optimize_pc_in_process(
+    optimize_func: Callable,
+    patterns: np.ndarray,
+    pc0: list[float],
+    kwargs: dict,
+) -> np.ndarray:
+    pc = optimize_func(
+        pats=patterns, indexer=_process_indexer, PC0=pc0, batch=True, **kwargs
+    )
+    return np.reshape(pc, (-1, 3))
@@ -0,0 +1,347 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+from pathlib import Path
+
+import dask.array as da
+import numpy as np
+
+from kikuchipy.indexing._dictionary_indexing import _merge_top_k_inplace
+from kikuchipy.indexing.similarity_metrics._normalized_cross_correlation import (
+    NormalizedCrossCorrelationMetric,
+)
+from kikuchipy.indexing.similarity_metrics._normalized_dot_product import (
+    NormalizedDotProductMetric,
+)
+from kikuchipy.indexing.similarity_metrics._similarity_metric import SimilarityMetric
+
+_METRICS = {
+    "ncc": NormalizedCrossCorrelationMetric,
+    "ndp": NormalizedDotProductMetric,
+}
+
+
+class InvertedFileIndex:
+    """Approximate nearest neighbour index of prepared dictionary
+    patterns for use in
+    :meth:`~kikuchipy.signals.EBSD.dictionary_indexing`.
+
+    The prepared (masked and normalized) dictionary patterns are
+    clustered into :attr:`n_clusters` clusters with spherical k-means.
+    Each experimental pattern is then only matched to the dictionary
+    patterns in the :attr:`n_probe` clusters with centroids most similar
+    to it. The returned scores are exact, but the best matches may be
+    missed if they are in clusters which are not probed. Increasing
+    :attr:`n_probe` increases the recall at the cost of speed.
+
+    The index holds all prepared dictionary patterns, sorted by cluster,
+    in memory. It can be saved to and loaded from disk with
+    :meth:`save` and :meth:`load`, so that it only has to be built once
+    per phase and detector.
+
+    Parameters
+    ----------
+    n_clusters
+        Number of clusters. Default is 256. A common choice is about the
+        square root of the number of dictionary patterns.
+    n_probe
+        Number of clusters to match each experimental pattern to.
+        Default is 8.
+    max_iterations
+        Maximum number of k-means iterations. Default is 20.
+    random_state
+        Seed of the random number generator used to sample patterns to
+        fit the clusters to.
+
+    See Also
+    --------
+    kikuchipy.signals.EBSD.dictionary_indexing
+    """
+
+    def __init__(
+        self,
+        n_clusters: int = 256,
+        n_probe: int = 8,
+        max_iterations: int = 20,
+        random_state: int | None = None,
+    ) -> None:
+        """Create an inverted file index."""
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.max_iterations = max_iterations
+        self.random_state = random_state
+
+        self.metric_name: str | None = None
+        self.signal_mask: np.ndarray | None = None
+        self.centroids: np.ndarray | None = None
+        self.patterns: np.ndarray | None = None
+        self.simulation_indices: np.ndarray | None = None
+        self.offsets: np.ndarray | None = None
+
+    def __repr__(self) -> str:
+        string = f"{self.__class__.__name__}: "
+        if self.patterns is None:
+            string += "not fitted, "
+        else:
+            string += f"{self.size} patterns, metric: {self.metric_name}, "
+        string += f"n clusters: {self.n_clusters}, n probe: {self.n_probe}"
+        return string
+
+    @property
+    def size(self) -> int:
+        """Return the number of dictionary patterns in the index."""
+        if self.patterns is None:
+            return 0
+        return self.patterns.shape[0]
+
+    def fit(
+        self,
+        dictionary: np.ndarray | da.Array,
+        metric: SimilarityMetric | str = "ncc",
+        signal_mask: np.ndarray | None = None,
+        dtype: str | np.dtype | type = "float32",
+    ) -> "InvertedFileIndex":
+        """Prepare dictionary patterns and cluster them.
+
+        Parameters
+        ----------
+        dictionary
+            Dictionary patterns with the navigation dimension first,
+            e.g. :attr:`~kikuchipy.signals.EBSD.data` of a dictionary
+            signal.
+        metric
+            Similarity metric to prepare the patterns with, either
+            ``"ncc"`` (default) or ``"ndp"``, or an instance of either
+            metric. Indexing must use the same metric.
+        signal_mask
+            A boolean mask equal to the detector shape, where only
+            pixels equal to ``False`` are matched. Indexing must use
+            the same mask.
+        dtype
+            Data type to prepare the patterns with, by default
+            ``"float32"``. Not used if ``metric`` is an instance.
+
+        Returns
+        -------
+        index
+            This index, fitted.
+        """
+        n_patterns = dictionary.shape[0]
+        if isinstance(metric, str):
+            if metric not in _METRICS:
+                raise ValueError(f"'{metric}' must be either of {list(_METRICS)}")
+            metric = _METRICS[metric](signal_mask=signal_mask, dtype=dtype)
+        elif type(metric) not in _METRICS.values():
+            raise ValueError(
+                f"'{metric}' must be either of {list(_METRICS)} or an instance of "
+                "these metrics"
+            )
+        elif signal_mask is not None:
+            metric.signal_mask = signal_mask
+        metric.n_dictionary_patterns = n_patterns
+
+        patterns = dictionary.reshape((n_patterns, -1))
+        patterns = metric.prepare_dictionary(patterns)
+        if isinstance(patterns, da.Array):
+            patterns = patterns.compute()
+
+        rng = np.random.default_rng(self.random_state)
+        n_clusters = min(self.n_clusters, n_patterns)
+        n_fit = min(n_patterns, max(50 * n_clusters, 10_000))
+        sample = patterns[np.sort(rng.choice(n_patterns, n_fit, replace=False))]
+        centroids = _fit_spherical_kmeans(sample, n_clusters, self.max_iterations, rng)
+
+        labels = _assign_to_centroids(patterns, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_clusters)
+
+        self.n_clusters = n_clusters
+        self.metric_name = [k for k, v in _METRICS.items() if isinstance(metric, v)][0]
+        self.signal_mask = metric.signal_mask
+        self.centroids = centroids
+        self.patterns = np.ascontiguousarray(patterns[order])
+        self.simulation_indices = order.astype(np.int32)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        return self
+
+    def search(
+        self, experimental: np.ndarray, keep_n: int, n_probe: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the best matching dictionary patterns to prepared
+        experimental patterns.
+
+        Parameters
+        ----------
+        experimental
+            Experimental patterns of shape ``(n, n_pixels)`` prepared by
+            the same metric as the dictionary patterns.
+        keep_n
+            Number of best matches to keep.
+        n_probe
+            Number of clusters to match each pattern to. If not given,
+            :attr:`n_probe` is used.
+
+        Returns
+        -------
+        simulation_indices
+            Indices into the dictionary of the best matches, of shape
+            ``(n, keep_n)``, sorted from best to worst.
+        scores
+            Scores of the best matches. If fewer than ``keep_n``
+            dictionary patterns are in the probed clusters, the
+            remaining scores are ``-inf``.
+        """
+        if self.patterns is None:
+            raise ValueError("The index must be fitted with `fit()` before searching")
+
+        experimental = np.asarray(experimental, dtype=self.patterns.dtype)
+        n = experimental.shape[0]
+        if n_probe is None:
+            n_probe = self.n_probe
+        n_probe = min(n_probe, self.n_clusters)
+
+        centroid_scores = experimental @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        scores = np.full((n, keep_n), -np.inf, dtype=experimental.dtype)
+        simulation_indices = np.zeros((n, keep_n), dtype=np.int32)
+        for cluster in np.unique(probes):
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            if start == end:
+                continue
+            rows = np.nonzero(np.any(probes == cluster, axis=1))[0]
+
+            scores_c = experimental[rows] @ self.patterns[start:end].T
+            k = min(keep_n, end - start)
+            best = np.argpartition(-scores_c, k - 1, axis=1)[:, :k]
+            scores_c = np.take_along_axis(scores_c, best, axis=1)
+
+            scores_rows = scores[rows]
+            simulation_indices_rows = simulation_indices[rows]
+            _merge_top_k_inplace(
+                scores_rows,
+                simulation_indices_rows,
+                np.ascontiguousarray(scores_c),
+                self.simulation_indices[start + best],
+                0,
+                1,
+            )
+            scores[rows] = scores_rows
+            simulation_indices[rows] = simulation_indices_rows
+
+        return simulation_indices, scores
+
+    def save(self, filename: str | Path) -> None:
+        """Write the fitted index to a NumPy ``.npz`` file.
+
+        Parameters
+        ----------
+        filename
+            Name of the file to write to.
+        """
+        if self.patterns is None:
+            raise ValueError("The index must be fitted with `fit()` before saving")
+        arrays = dict(
+            n_clusters=self.n_clusters,
+            n_probe=self.n_probe,
+            max_iterations=self.max_iterations,
+            metric_name=self.metric_name,
+            centroids=self.centroids,
+            patterns=self.patterns,
+            simulation_indices=self.simulation_indices,
+            offsets=self.offsets,
+        )
+        if self.signal_mask is not None:
+            arrays["signal_mask"] = self.signal_mask
+        np.savez(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename: str | Path) -> "InvertedFileIndex":
+        """Return an index read from a NumPy ``.npz`` file written by
+        :meth:`save`.
+
+        Parameters
+        ----------
+        filename
+            Name of the file to read from.
+
+        Returns
+        -------
+        index
+            Fitted index.
+        """
+        with np.load(filename) as f:
+            index = cls(
+                n_clusters=int(f["n_clusters"]),
+                n_probe=int(f["n_probe"]),
+                max_iterations=int(f["max_iterations"]),
+            )
+            index.metric_name = str(f["metric_name"])
+            index.centroids = f["centroids"]
+            index.patterns = f["patterns"]
+            index.simulation_indices = f["simulation_indices"]
+            index.offsets = f["offsets"]
+            if "signal_mask" in f:
+                index.signal_mask = f["signal_mask"]
+        return index
+
+
+def _assign_to_centroids(
+    patterns: np.ndarray, centroids: np.ndarray, n_per_iteration: int = 10_000
+) -> np.ndarray:
+    """Return the index of the most similar centroid per pattern."""
+    n = patterns.shape[0]
+    labels = np.zeros(n, dtype=np.int64)
+    for start in range(0, n, n_per_iteration):
+        end = min(start + n_per_iteration, n)
+        labels[start:end] = np.argmax(patterns[start:end] @ centroids.T, axis=1)
+    return labels
+
+
+def _fit_spherical_kmeans(
+    patterns: np.ndarray,
+    n_clusters: int,
+    max_iterations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return normalized cluster centroids of normalized patterns
+    clustered by their dot products.
+    """
+    n = patterns.shape[0]
+    centroids = patterns[rng.choice(n, n_clusters, replace=False)].copy()
+    labels = None
+    for _ in range(max_iterations):
+        new_labels = _assign_to_centroids(patterns, centroids)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=n_clusters)
+        is_empty = counts == 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        order = np.argsort(labels, kind="stable")
+        sums = np.zeros_like(centroids)
+        sums[~is_empty] = np.add.reduceat(patterns[order], starts[~is_empty], axis=0)
+
+        # Reseed empty clusters with random patterns
+        sums[is_empty] = patterns[rng.choice(n, is_empty.sum(), replace=False)]
+
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        centroids = sums / norms
+    return centroids
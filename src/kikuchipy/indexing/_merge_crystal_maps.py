@@ -32,6 +32,8 @@ def merge_crystal_maps(
     scores_prop: str = "scores",
     simulation_indices_prop: str | None = None,
     navigation_masks: list[np.ndarray | None] | None = None,
+    best_only: bool = False,
+    chunk_size: int = 100_000,
 ) -> CrystalMap:
     """Return a multi phase :class:`~orix.crystal_map.CrystalMap` by
     merging maps of 1D or 2D navigation shape based on scores.
@@ -74,6 +76,15 @@ def merge_crystal_maps(
         order corresponds to the order in ``crystal_maps``. If not
         given, all points are used. If all points in one or more of the
         maps should be used, this map's entry can be ``None``.
+    best_only
+        Whether to keep only the best rotation, score and simulation
+        index of the best matching phase in each point. If True, the
+        merged scores and simulation indices of all phases are not
+        added to the returned map's properties. Default is False.
+    chunk_size
+        Number of map points to merge at a time. Default is 100 000.
+        Only arrays of this many points are created in addition to the
+        returned map's arrays.
 
     Returns
     -------
@@ -143,8 +154,7 @@ def merge_crystal_maps(
 
     if navigation_masks is not None:
         navigation_masks1d = []
-        for mask, map_shape in zip(navigation_masks, map_shapes):
-            map_size = int(np.prod(map_shape))
+        for mask in navigation_masks:
             if mask is None:
                 mask1d = np.ones(map_size, dtype=bool)
             else:
@@ -153,7 +163,14 @@ def merge_crystal_maps(
     else:
         navigation_masks1d = [None] * n_maps
 
-    rot_per_point_per_map = [xmap.rotations_per_point for xmap in crystal_maps]
+    # Arrays of all points in each map, also those not in the data, to
+    # pick the points of each chunk from without copying whole arrays
+    maps_data = [
+        _get_crystal_map_arrays(xmap, scores_prop, simulation_indices_prop)
+        for xmap in crystal_maps
+    ]
+
+    rot_per_point_per_map = [data["rotations_per_point"] for data in maps_data]
     if not all(np.diff(rot_per_point_per_map) == 0):
         raise ValueError(
             "Crystal maps must have the same number of rotations and scores per point"
@@ -162,7 +179,7 @@ def merge_crystal_maps(
         n_scores_per_point = rot_per_point_per_map[0]
 
     if simulation_indices_prop is not None:
-        n_sim_idx = crystal_maps[0].prop[simulation_indices_prop].shape
+        n_sim_idx = maps_data[0]["simulation_indices"].shape
         if len(n_sim_idx) > 1 and n_sim_idx[1] > n_scores_per_point:
             raise ValueError(
                 "Cannot merge maps with more simulation indices than scores per point"
@@ -179,165 +196,201 @@ def merge_crystal_maps(
 
     # Notation used in the comments below:
     # - M: number of map points
+    # - B: number of map points in a chunk
     # - N: number of scores per point
     # - I: number of simulation indices per point
     # - K: number of maps to merge
 
-    # Shape of the combined (unsorted) scores array, and the total
-    # number of scores per point. Shape: (M, N, K) or (M, K) if only one
+    # Shape of the scores per point in a map, (N,) or () if only one
     # score is available (e.g. refined dot products from EMsoft)
-    comb_shape = (map_size,)
+    point_shape = ()
     if n_scores_per_point > 1:
-        comb_shape += (n_scores_per_point,)
-    comb_shape += (n_maps,)
+        point_shape += (n_scores_per_point,)
+    new_point_shape = () if best_only else point_shape
 
-    # Combined (unsorted) scores array of shape (M, N, K) or (M, K)
-    scores_dtype = crystal_maps[0].prop[scores_prop].dtype
-    combined_scores = np.full(
-        comb_shape, np.nan, dtype=np.dtype(f"f{scores_dtype.itemsize}")
-    )
-    for i, (mask, xmap) in enumerate(zip(navigation_masks1d, crystal_maps)):
-        if mask is not None:
-            combined_scores[mask, ..., i] = xmap.prop[scores_prop]
-        else:
-            combined_scores[..., i] = xmap.prop[scores_prop]
-
-    # Best score in each map point
-    if n_scores_per_point > 1:  # (M, N, K) -> (M, K)
-        best_scores = combined_scores[:, :mean_n_best].squeeze()
-        if len(best_scores.shape) > 2:
-            best_scores = np.nanmean(best_scores, axis=1)
-    else:  # (M, K)
-        best_scores = combined_scores
-
-    # Phase of best score in each map point
-    phase_id = np.nanargmax(sign * best_scores, axis=1)
-
-    # Set the phase ID of points marked as not-indexed in all maps to -1
-    not_indexed = np.zeros((n_maps, map_size), dtype=bool)
-    for i in range(n_maps):
-        mask = navigation_masks1d[i]
-        xmap = crystal_maps[i]
-        if mask is not None:
-            not_indexed[i, mask][xmap.phase_id == -1] = True
-        else:
-            not_indexed[i, xmap.phase_id == -1] = True
-    not_indexed = np.logical_and.reduce(not_indexed)
-    phase_id[not_indexed] = -1
-
-    # Get the new crystal map's rotations, scores and indices,
-    # restricted to one phase per point (uncombined)
-    new_rotations = np.zeros(comb_shape[:-1] + (4,), dtype="float")
-    new_scores = np.zeros(comb_shape[:-1], dtype=scores_dtype)
+    scores_dtype = maps_data[0]["scores"].dtype
+    comb_scores_dtype = np.dtype(f"f{scores_dtype.itemsize}")
 
+    # Preallocated arrays of the new crystal map's phase IDs, and
+    # rotations, scores and indices restricted to one phase per point
+    phase_id = np.zeros(map_size, dtype=int)
+    new_rotations = np.zeros((map_size,) + new_point_shape + (4,), dtype="float")
+    new_scores = np.zeros((map_size,) + new_point_shape, dtype=scores_dtype)
     if simulation_indices_prop is not None:
-        new_indices = np.zeros(comb_shape[:-1], dtype="int32")
+        new_indices = np.zeros((map_size,) + new_point_shape, dtype="int32")
+
+    # Preallocated arrays of the combined, best, sorted scores and
+    # simulation indices from all maps (phases), of shape (M, N * K) or
+    # (M, K)
+    if not best_only:
+        merged_shape = (map_size, int(np.prod(point_shape + (n_maps,))))
+        merged_best_scores = np.zeros(merged_shape, dtype=comb_scores_dtype)
+        if simulation_indices_prop is not None:
+            sim_idx_increments, sim_idx_dtype = _get_simulation_indices_increments(
+                maps_data, navigation_masks is not None
+            )
+            merged_simulated_indices = np.zeros(merged_shape, dtype=sim_idx_dtype)
+            sim_idx_fill_value = np.nan if navigation_masks is not None else 0
+
+    # Number of points in the data of each map before the current chunk
+    n_in_data_before = np.zeros(n_maps, dtype=int)
+
+    for start in range(0, map_size, chunk_size):
+        end = min(start + chunk_size, map_size)
+        n_points = end - start
+
+        # Rows into each map's arrays of the points in this chunk, -1
+        # for points not in a map's data. Shape (K, B).
+        rows = np.full((n_maps, n_points), -1, dtype=int)
+        for i, mask1d in enumerate(navigation_masks1d):
+            if mask1d is None:
+                data_idx = slice(start, end)
+                rows[i] = maps_data[i]["rows"][data_idx]
+            else:
+                mask1d_i = mask1d[start:end]
+                n_in_data = np.count_nonzero(mask1d_i)
+                data_idx = slice(n_in_data_before[i], n_in_data_before[i] + n_in_data)
+                rows[i, mask1d_i] = maps_data[i]["rows"][data_idx]
+                n_in_data_before[i] += n_in_data
+        is_in_data = rows != -1
+
+        # Combined (unsorted) scores array of shape (B, N, K) or (B, K)
+        combined_scores = np.full(
+            (n_points,) + point_shape + (n_maps,), np.nan, dtype=comb_scores_dtype
+        )
+        for i in range(n_maps):
+            rows_i = rows[i, is_in_data[i]]
+            combined_scores[is_in_data[i], ..., i] = maps_data[i]["scores"][rows_i]
+
+        # Best score in each map point
+        if n_scores_per_point > 1:  # (B, N, K) -> (B, K)
+            if mean_n_best == 1:
+                best_scores = combined_scores[:, 0]
+            else:
+                with warnings.catch_warnings():
+                    # Points not in any of the maps are all NaN
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    best_scores = np.nanmean(combined_scores[:, :mean_n_best], axis=1)
+        else:  # (B, K)
+            best_scores = combined_scores
+
+        # Phase of best score in each map point. Points not in any of
+        # the maps are set as not-indexed below.
+        not_in_data = np.all(np.isnan(best_scores), axis=1)
+        best_scores = np.where(not_in_data[:, np.newaxis], 0, best_scores)
+        phase_id_chunk = np.nanargmax(sign * best_scores, axis=1)
+
+        # Set the phase ID of points marked as not-indexed in all maps
+        # to -1
+        not_indexed = ~not_in_data
+        for i in range(n_maps):
+            not_indexed_i = np.zeros(n_points, dtype=bool)
+            rows_i = rows[i, is_in_data[i]]
+            not_indexed_i[is_in_data[i]] = maps_data[i]["phase_id"][rows_i] == -1
+            not_indexed &= not_indexed_i
+        phase_id_chunk[not_indexed | not_in_data] = -1
+        phase_id[start:end] = phase_id_chunk
+
+        # Rotations, scores and indices of the best matching phase
+        for i in range(n_maps):
+            phase_mask = phase_id_chunk == i
+            if not phase_mask.any():
+                continue
+            rows_i = rows[i, phase_mask]
+            idx = np.nonzero(phase_mask)[0] + start
+
+            # Pick only the best of the N rotations per point if only
+            # the best should be kept
+            if best_only and n_scores_per_point > 1:
+                point_idx = (rows_i, 0)
+            else:
+                point_idx = rows_i
+            new_rotations[idx] = maps_data[i]["rotations"][point_idx]
+            new_scores[idx] = maps_data[i]["scores"][point_idx]
+            if simulation_indices_prop is not None:
+                sim_idx_i = maps_data[i]["simulation_indices"]
+                if best_only and sim_idx_i.ndim > 1:
+                    point_idx = (rows_i, 0)
+                new_indices[idx] = sim_idx_i[point_idx]
+
+        if best_only:
+            continue
 
+        # To get the combined, best, sorted scores and simulation
+        # indices from all maps (phases), we collapse the second and
+        # (potentially) third axis to get (B, N * K) or (B, K)
+        comb_scores_reshaped = combined_scores.reshape((n_points, -1))
+        best_sorted_idx = np.argsort(
+            sign * -comb_scores_reshaped, kind="mergesort", axis=1
+        )
+        merged_best_scores[start:end] = np.take_along_axis(
+            comb_scores_reshaped, best_sorted_idx, axis=-1
+        )
+
+        if simulation_indices_prop is not None:
+            # Combined (unsorted) simulation indices array of shape
+            # (B, N, K) or (B, K), made unique across all maps to enable
+            # calculation of an orientation similarity map from the
+            # combined, sorted simulation indices array
+            comb_sim_idx = np.full(
+                (n_points,) + point_shape + (n_maps,),
+                sim_idx_fill_value,
+                dtype=sim_idx_dtype,
+            )
+            for i in range(n_maps):
+                rows_i = rows[i, is_in_data[i]]
+                sim_idx_i = maps_data[i]["simulation_indices"][rows_i]
+                comb_sim_idx[is_in_data[i], ..., i] = sim_idx_i + sim_idx_increments[i]
+
+            # Best, sorted simulation indices in all maps (for all
+            # phases) per point
+            merged_simulated_indices[start:end] = np.take_along_axis(
+                comb_sim_idx.reshape((n_points, -1)), best_sorted_idx, axis=-1
+            )
+
+    # Phase list with identical phases merged, and the phase ID of each
+    # map's phase in this list
     phase_list = PhaseList()
     if -1 in phase_id:
         phase_list.add_not_indexed()
-    for i, (nav_mask1d, xmap) in enumerate(zip(navigation_masks1d, crystal_maps)):
-        phase_mask = phase_id == i
-
-        if phase_mask.any():
-            phase_ids = xmap.phases_in_data.ids
-            if -1 in phase_ids:
-                phase_ids.remove(-1)
-            phase = xmap.phases_in_data[phase_ids[0]].deepcopy()
-            if phase.name in phase_list.names:
-                # If they are equal, do not duplicate it in the phase
-                # list but update the phase ID
-                equal_phases, different = _equal_phase(phase, phase_list[phase.name])
-                if equal_phases:
-                    phase_id[phase_mask] = phase_list.id_from_name(phase.name)
-                else:
-                    name = phase.name
-                    phase.name = name + str(i)
-                    warnings.warn(
-                        f"There are duplicates of phase '{name}' but the phases have "
-                        f"different {different}, will therefore rename this phase's "
-                        f"name to '{phase.name}' in the merged PhaseList",
-                    )
-                    phase_list.add(phase)
-            else:
-                phase_list.add(phase)
-        else:
+    new_phase_ids = np.arange(n_maps)
+    n_points_per_map = np.bincount(phase_id[phase_id != -1], minlength=n_maps)
+    for i, xmap in enumerate(crystal_maps):
+        if n_points_per_map[i] == 0:
             continue
 
-        if nav_mask1d is not None:
-            phase_mask2 = phase_mask[nav_mask1d]
-            new_rotations[phase_mask] = xmap.rotations[phase_mask2].data
-            new_scores[phase_mask] = xmap.prop[scores_prop][phase_mask2]
+        phase_ids = xmap.phases_in_data.ids
+        if -1 in phase_ids:
+            phase_ids.remove(-1)
+        phase = xmap.phases_in_data[phase_ids[0]].deepcopy()
+        if phase.name in phase_list.names:
+            # If they are equal, do not duplicate it in the phase list
+            # but update the phase ID
+            equal_phases, different = _equal_phase(phase, phase_list[phase.name])
+            if not equal_phases:
+                name = phase.name
+                phase.name = name + str(i)
+                warnings.warn(
+                    f"There are duplicates of phase '{name}' but the phases have "
+                    f"different {different}, will therefore rename this phase's "
+                    f"name to '{phase.name}' in the merged PhaseList",
+                )
+                phase_list.add(phase)
         else:
-            # Old behavior
-            new_rotations[phase_mask] = xmap.rotations[phase_mask].data
-            new_scores[phase_mask] = xmap.prop[scores_prop][phase_mask]
+            phase_list.add(phase)
+        new_phase_ids[i] = phase_list.id_from_name(phase.name)
 
-        if simulation_indices_prop is not None:
-            if nav_mask1d is not None:
-                new_indices[phase_mask] = xmap.prop[simulation_indices_prop][
-                    phase_mask2
-                ]
-            else:
-                # Old behavior
-                new_indices[phase_mask] = xmap.prop[simulation_indices_prop][phase_mask]
-
-    # To get the combined, best, sorted scores and simulation indices
-    # from all maps (phases), we collapse the second and (potentially)
-    # third axis to get (M, N * K) or (M, K)
-    mergesort_shape = (comb_shape[0], np.prod(comb_shape[1:]))
-    comb_scores_reshaped = combined_scores.reshape(mergesort_shape)
-    best_sorted_idx = np.argsort(sign * -comb_scores_reshaped, kind="mergesort", axis=1)
-
-    # Best, sorted scores in all maps (for all phases) per point
-    merged_best_scores = np.take_along_axis(
-        comb_scores_reshaped, best_sorted_idx, axis=-1
-    )
+    is_indexed = phase_id != -1
+    phase_id[is_indexed] = new_phase_ids[phase_id[is_indexed]]
 
     # Set up merged map's properties
-    props = {scores_prop: new_scores, f"merged_{scores_prop}": merged_best_scores}
-
+    props = {scores_prop: new_scores}
+    if not best_only:
+        props[f"merged_{scores_prop}"] = merged_best_scores
     if simulation_indices_prop is not None:
-        # Combined (unsorted) simulation indices array of shape
-        # (M, N, K) or (M, K), accounting for the case where there are
-        # more simulation indices per point than scores (e.g. refined
-        # dot products from EMsoft)
-        comb_sim_idx_list = []
-        for i, (nav_mask1d, xmap) in enumerate(zip(navigation_masks1d, crystal_maps)):
-            if nav_mask1d is not None:
-                sim_idx_i = np.full(comb_shape[:-1], np.nan)
-                sim_idx_i[nav_mask1d] = xmap.prop[simulation_indices_prop]
-            else:
-                sim_idx_i = xmap.prop[simulation_indices_prop]
-            comb_sim_idx_list.append(sim_idx_i)
-
-        comb_sim_idx = np.dstack(comb_sim_idx_list)
-
-        # To enable calculation of an orientation similarity map from
-        # the combined, sorted simulation indices array, we must make
-        # the indices unique across all maps
-        for i in range(1, comb_sim_idx.shape[-1]):
-            increment = (
-                abs(
-                    np.nanmax(comb_sim_idx[..., i - 1])
-                    - np.nanmin(comb_sim_idx[..., i])
-                )
-                + 1
-            )
-            comb_sim_idx[..., i] += increment
-
-        # Collapse axes as for the combined scores array above
-        comb_sim_idx = comb_sim_idx.reshape(mergesort_shape)
-
-        # Best, sorted simulation indices in all maps (for all phases)
-        # per point
-        merged_simulated_indices = np.take_along_axis(
-            comb_sim_idx, best_sorted_idx, axis=-1
-        )
-
-        # Finally, add to properties
         props[simulation_indices_prop] = new_indices
-        props[f"merged_{simulation_indices_prop}"] = merged_simulated_indices
+        if not best_only:
+            props[f"merged_{simulation_indices_prop}"] = merged_simulated_indices
 
     step_sizes = (crystal_maps[0].dx, crystal_maps[0].dy)
     coords, _ = create_coordinate_arrays(
@@ -352,3 +405,61 @@ def merge_crystal_maps(
         scan_unit=crystal_maps[0].scan_unit,
         **coords,
     )
+
+
+def _get_crystal_map_arrays(
+    xmap: CrystalMap, scores_prop: str, simulation_indices_prop: str | None
+) -> dict:
+    """Return arrays of all points in a crystal map, also those not in
+    the data, and the rows of the points in the data.
+
+    The public attributes of a crystal map return copies of the points
+    in the data, which are avoided here.
+    """
+    rotations = xmap._rotations.data
+    arrays = {
+        "rows": np.nonzero(xmap.is_in_data)[0],
+        "rotations": rotations,
+        "rotations_per_point": rotations.shape[1] if rotations.ndim > 2 else 1,
+        "phase_id": xmap._phase_id,
+        "scores": dict.__getitem__(xmap.prop, scores_prop),
+    }
+    if simulation_indices_prop is not None:
+        arrays["simulation_indices"] = dict.__getitem__(
+            xmap.prop, simulation_indices_prop
+        )
+    return arrays
+
+
+def _get_simulation_indices_increments(
+    maps_data: list[dict], has_masks: bool
+) -> tuple[np.ndarray, np.dtype]:
+    """Return increments to add to the simulation indices of each map
+    to make them unique across all maps, and the data type of the
+    merged indices.
+
+    Simulation indices of a map are incremented so that its lowest
+    index is one above the highest, incremented index of the previous
+    map. Indices are merged as floating point if any maps are masked,
+    so that masked out points can be set to NaN.
+    """
+    # Lowest and highest index per map, copying the indices of only one
+    # map at a time if not all its points are in the data
+    min_max = []
+    for data in maps_data:
+        sim_idx = data["simulation_indices"]
+        if data["rows"].size != sim_idx.shape[0]:
+            sim_idx = sim_idx[data["rows"]]
+        min_max.append((np.nanmin(sim_idx), np.nanmax(sim_idx)))
+
+    if has_masks:
+        dtype = np.dtype("float64")
+    else:
+        dtype = np.result_type(*[data["simulation_indices"] for data in maps_data])
+
+    increments = np.zeros(len(maps_data), dtype=dtype)
+    for i in range(1, len(maps_data)):
+        previous_max = min_max[i - 1][1] + increments[i - 1]
+        increments[i] = abs(previous_max - min_max[i][0]) + 1
+
+    return increments, dtype
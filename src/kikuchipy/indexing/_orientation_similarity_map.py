@@ -22,9 +22,10 @@ is compared to the corresponding lists in the nearest neighbour points.
 
 # TODO: Consider moving to orix.
 
+import numba as nb
+from numba import njit
 import numpy as np
 from orix.crystal_map import CrystalMap
-from scipy.ndimage import generic_filter
 
 
 def orientation_similarity_map(
@@ -35,6 +36,7 @@ def orientation_similarity_map(
     from_n_best: int | None = None,
     footprint: np.ndarray | None = None,
     center_index: int = 2,
+    navigation_mask: np.ndarray | None = None,
 ) -> np.ndarray:
     r"""Compute an orientation similarity map (OSM) where the ranked
     list of the dictionary indices of the best matching simulated
@@ -65,6 +67,12 @@ def orientation_similarity_map(
     center_index
         Flat index of central navigation point in the truthy values of
         footprint, by default ``2``.
+    navigation_mask
+        A boolean mask of the map shape, where only points equal to
+        ``False`` are compared to their neighbours. Masked out points,
+        and points not in the data of ``xmap``, are not used as
+        neighbours and are NaN in the returned map(s). If not given, all
+        points are compared.
 
     Returns
     -------
@@ -73,6 +81,12 @@ def orientation_similarity_map(
         returned array has three dimensions, where ``n_best`` is at
         ``osm[:, :, 0]`` and ``from_n_best`` at ``osm[:, :, -1]``.
 
+    Raises
+    ------
+    ValueError
+        If ``n_best`` is greater than the number of indices per point
+        or if ``navigation_mask`` does not have the map shape.
+
     Notes
     -----
     If the set :math:`S_{r,c}` is the ranked list of best matching
@@ -90,63 +104,177 @@ def orientation_similarity_map(
                 \#(S_{r,c} \cap S_{r,c+1})
             \right).
 
+    The ranked list in each point is sorted once. The cardinalities of
+    the intersections for all n in ``[from_n_best, n_best]`` are then
+    found from one merge of the sorted lists of two points, by counting
+    each common index for all n greater than the largest of its two
+    ranks. Map rows are compared in parallel with Numba.
+
     .. versionchanged:: 0.5
        Default value of ``normalize`` changed to ``False``.
     """
     simulation_indices = xmap.prop[simulation_indices_prop]
-    nav_size, keep_n = simulation_indices.shape
+    keep_n = simulation_indices.shape[1]
 
     if n_best is None:
         n_best = keep_n
     elif n_best > keep_n:
         raise ValueError(f"n_best {n_best} cannot be greater than keep_n {keep_n}")
 
-    data_shape = xmap.shape
-    flat_index_map = np.arange(nav_size).reshape(data_shape)
-
     if from_n_best is None:
         from_n_best = n_best
 
-    osm = np.zeros(data_shape + (n_best - from_n_best + 1,), dtype=np.float32)
-
     if footprint is None:
         footprint = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]])
 
-    for i, n in enumerate(range(n_best, from_n_best - 1, -1)):
-        match_indices = simulation_indices[:, :n]
-        osm[:, :, i] = generic_filter(
-            flat_index_map,
-            lambda v: _orientation_similarity_per_pixel(
-                v, center_index, match_indices, n, normalize
-            ),
-            footprint=footprint,
-            mode="constant",
-            cval=-1,
-            output=np.float32,
-        )
+    # Map of indices into the points in the data, -1 for points to skip
+    data_shape = xmap.shape
+    index_map = np.full(data_shape, -1, dtype=np.int64)
+    index_map.reshape((-1, data_shape[-1]))[xmap.row, xmap.col] = np.arange(xmap.size)
+    if navigation_mask is not None:
+        if navigation_mask.shape != data_shape:
+            raise ValueError(
+                f"The navigation mask shape {navigation_mask.shape} and the crystal map "
+                f"shape {data_shape} must be equal"
+            )
+        index_map[navigation_mask] = -1
+
+    # Neighbour offsets relative to the central point in the footprint
+    coordinates = np.column_stack(np.nonzero(footprint))
+    offsets = coordinates - coordinates[center_index]
+    offsets = offsets[np.any(offsets != 0, axis=1)]
+
+    # Sort the ranked lists once, keeping the rank of each index
+    ranks = np.argsort(simulation_indices[:, :n_best], axis=1, kind="stable")
+    sorted_indices = np.take_along_axis(simulation_indices, ranks, axis=1)
+
+    osm = _orientation_similarity_map(
+        index_map.reshape((-1, data_shape[-1])),
+        sorted_indices.astype(np.int64),
+        ranks.astype(np.int64),
+        offsets.astype(np.int64),
+        n_best,
+        from_n_best,
+        normalize,
+    )
+    osm = osm.reshape(data_shape + (n_best - from_n_best + 1,))
 
     return osm.squeeze()
 
 
-def _orientation_similarity_per_pixel(
-    v: np.ndarray, center_index: int, match_indices: np.ndarray, n: int, normalize: bool
+@njit(cache=True, nogil=True, parallel=True)
+def _orientation_similarity_map(
+    index_map: np.ndarray,
+    sorted_indices: np.ndarray,
+    ranks: np.ndarray,
+    offsets: np.ndarray,
+    n_best: int,
+    from_n_best: int,
+    normalize: bool,
 ) -> np.ndarray:
-    # v are indices picked out with the footprint from flat_index_map
-    v = v.astype(int)
-    center_value = v[center_index]
-    # Filter only true neighbours, -1 out of image and not include
-    # itself
-    neighbours = v[np.where((v != -1) & (v != center_value))]
+    """Return orientation similarity maps for n in
+    ``[from_n_best, n_best]``, in parallel over the map rows.
 
-    # Cardinality of the intersection between a and b
-    number_of_equal_matches_to_its_neighbours = [
-        len(np.intersect1d(match_indices[center_value], mi))
-        for mi in match_indices[neighbours]
-    ]
+    Parameters
+    ----------
+    index_map
+        2D map of indices into the sorted lists, -1 for points to skip.
+    sorted_indices
+        Sorted lists of the ``n_best`` best matching indices per point.
+    ranks
+        Rank of each index in the sorted lists.
+    offsets
+        Row and column offsets of the neighbours to compare with.
+    n_best
+        Largest number of ranked indices to compare.
+    from_n_best
+        Smallest number of ranked indices to compare.
+    normalize
+        Whether to divide the number of equal indices by n.
 
-    os_i = np.nanmean(number_of_equal_matches_to_its_neighbours)
+    Returns
+    -------
+    osm
+        Orientation similarity maps of shape ``index_map.shape`` +
+        ``(n_best - from_n_best + 1,)``, with ``n_best`` first, NaN for
+        points to skip and points without neighbours.
+    """
+    n_rows, n_cols = index_map.shape
+    n_maps = n_best - from_n_best + 1
+    osm = np.full((n_rows, n_cols, n_maps), np.nan, dtype=np.float32)
+
+    for r in nb.prange(n_rows):
+        counts = np.zeros(n_best, dtype=np.int64)
+        sums = np.zeros(n_maps, dtype=np.float64)
+        for c in range(n_cols):
+            i = index_map[r, c]
+            if i == -1:
+                continue
+
+            sums[:] = 0
+            n_neighbours = 0
+            for k in range(offsets.shape[0]):
+                rn = r + offsets[k, 0]
+                cn = c + offsets[k, 1]
+                if rn < 0 or rn >= n_rows or cn < 0 or cn >= n_cols:
+                    continue
+                j = index_map[rn, cn]
+                if j == -1:
+                    continue
+                n_neighbours += 1
+
+                counts[:] = 0
+                _count_common_indices(
+                    sorted_indices[i], ranks[i], sorted_indices[j], ranks[j], counts
+                )
 
-    if normalize:
-        os_i /= n
+                # Common indices with both ranks below n are in the
+                # intersection of the n best indices
+                n_common = 0
+                for m in range(n_best):
+                    n_common += counts[m]
+                    if m + 1 >= from_n_best:
+                        sums[n_best - m - 1] += n_common
 
-    return os_i
+            if n_neighbours == 0:
+                continue
+
+            for k in range(n_maps):
+                value = sums[k] / n_neighbours
+                if normalize:
+                    value /= n_best - k
+                osm[r, c, k] = value
+
+    return osm
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _count_common_indices(
+    indices1: np.ndarray,
+    ranks1: np.ndarray,
+    indices2: np.ndarray,
+    ranks2: np.ndarray,
+    counts: np.ndarray,
+) -> None:
+    """Count the indices common to two sorted lists in place, by the
+    largest of the ranks of each index in the two lists.
+
+    Repeated indices are counted once, with their lowest rank.
+    """
+    n1 = indices1.size
+    n2 = indices2.size
+    i1 = 0
+    i2 = 0
+    while i1 < n1 and i2 < n2:
+        value1 = indices1[i1]
+        value2 = indices2[i2]
+        if value1 < value2:
+            i1 += 1
+        elif value1 > value2:
+            i2 += 1
+        else:
+            counts[max(ranks1[i1], ranks2[i2])] += 1
+            while i1 < n1 and indices1[i1] == value1:
+                i1 += 1
+            while i2 < n2 and indices2[i2] == value2:
+                i2 += 1
@@ -41,6 +41,26 @@ SUPPORTED_OPTIMIZATION_METHODS = {
         "supports_bounds": True,
         "package": "nlopt",
     },
+    "ld_lbfgs": {
+        "type": "local",
+        "supports_bounds": True,
+        "package": "nlopt",
+    },
+    "ld_mma": {
+        "type": "local",
+        "supports_bounds": True,
+        "package": "nlopt",
+    },
+    "ld_slsqp": {
+        "type": "local",
+        "supports_bounds": True,
+        "package": "nlopt",
+    },
+    "batched_neldermead": {
+        "type": "local",
+        "supports_bounds": True,
+        "package": "kikuchipy",
+    },
     # Global
     "basinhopping": {
         "type": "global",
@@ -64,3 +84,7 @@ SUPPORTED_OPTIMIZATION_METHODS = {
     },
 }
 # fmt: on
+
+# SciPy minimize() methods which are passed the analytic gradient of the
+# objective function
+SCIPY_GRADIENT_METHODS = ["cg", "bfgs", "newton-cg", "l-bfgs-b", "tnc", "slsqp"]
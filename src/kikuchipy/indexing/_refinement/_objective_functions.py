@@ -22,14 +22,17 @@ and simulated patterns.
 
 import numpy as np
 
-from kikuchipy._utils._gnonomic_bounds import get_gnomonic_bounds
-from kikuchipy._utils.numba import rotation_from_euler
+from kikuchipy._utils.numba import rotation_from_euler, rotation_from_euler_derivatives
 from kikuchipy.indexing.similarity_metrics._normalized_cross_correlation import (
+    _ncc_single_patterns_1d_exp_centered_with_gradient,
     _ncc_single_patterns_1d_float32_exp_centered,
 )
 from kikuchipy.signals.util._master_pattern import (
-    _get_direction_cosines_for_fixed_pc,
+    _get_direction_cosines_derivatives_from_basis,
+    _get_direction_cosines_from_basis,
+    _project_single_pattern_from_cube_map,
     _project_single_pattern_from_master_pattern,
+    _project_single_pattern_from_master_pattern_with_gradient,
 )
 
 
@@ -53,23 +56,16 @@ def _refine_orientation_objective_function(x: np.ndarray, *args) -> float:
             6. Master pattern scale
             7. Squared norm of centered experimental pattern as 32-bit
                float
+            8. Cube map lookup table of the master pattern (optional).
+               If given, patterns are projected from this instead of
+               from the master pattern.
 
     Returns
     -------
         Normalized cross-correlation score.
     """
-    simulated = _project_single_pattern_from_master_pattern(
-        rotation=rotation_from_euler(*x),
-        direction_cosines=args[1],
-        master_upper=args[2],
-        master_lower=args[3],
-        npx=args[4],
-        npy=args[5],
-        scale=args[6],
-        rescale=False,
-        out_min=0,  # Required, but not used here
-        out_max=1,  # Required, but not used here
-        dtype_out=np.float32,
+    simulated = _project_simulated_pattern(
+        rotation_from_euler(*x), args[1], args[2:7], args[8:]
     )
     return 1 - _ncc_single_patterns_1d_float32_exp_centered(args[0], simulated, args[7])
 
@@ -92,44 +88,22 @@ def _refine_pc_objective_function(x: np.ndarray, *args) -> float:
             4. Number of master pattern columns
             5. Number of master pattern rows
             6. Master pattern scale
-            7. 1D signal mask
-            8. Number of detector rows
-            9. Number of detector columns
-            10. Orientation matrix detector to sample coordinates
-            11. Squared norm of centered experimental pattern as 32-bit
+            7. PC independent part of unnormalized direction cosines
+            8. Derivatives of unnormalized direction cosines with
+               respect to the PC parameters
+            9. Squared norm of centered experimental pattern as 32-bit
                 float
+            10. Cube map lookup table of the master pattern (optional).
+                If given, patterns are projected from this instead of
+                from the master pattern.
 
     Returns
     -------
         Normalized cross-correlation score.
     """
-    gn_bds = get_gnomonic_bounds(args[8], args[9], x[0], x[1], x[2])
-
-    dc = _get_direction_cosines_for_fixed_pc(
-        gnomonic_bounds=gn_bds,
-        pcz=x[2],
-        nrows=args[8],
-        ncols=args[9],
-        om_detector_to_sample=args[10],
-        signal_mask=args[7],
-    )
-
-    simulated = _project_single_pattern_from_master_pattern(
-        rotation=args[1],
-        direction_cosines=dc,
-        master_upper=args[2],
-        master_lower=args[3],
-        npx=args[4],
-        npy=args[5],
-        scale=args[6],
-        rescale=False,
-        out_min=0,  # Required, but not used here
-        out_max=1,  # Required, but not used here
-        dtype_out=np.float32,
-    )
-    return 1 - _ncc_single_patterns_1d_float32_exp_centered(
-        args[0], simulated, args[11]
-    )
+    dc = _get_direction_cosines_from_basis(args[7], args[8], x[0], x[1], x[2])
+    simulated = _project_simulated_pattern(args[1], dc, args[2:7], args[10:])
+    return 1 - _ncc_single_patterns_1d_float32_exp_centered(args[0], simulated, args[9])
 
 
 def _refine_orientation_pc_objective_function(x: np.ndarray, *args) -> float:
@@ -150,41 +124,193 @@ def _refine_orientation_pc_objective_function(x: np.ndarray, *args) -> float:
             3. Number of master pattern columns
             4. Number of master pattern rows
             5. Master pattern scale
-            6. 1D signal mask
-            7. Number of detector rows
-            8. Number of detector columns
-            9. Orientation matrix detector to sample coordinates
-            10. Squared norm of centered experimental pattern as 32-bit
+            6. PC independent part of unnormalized direction cosines
+            7. Derivatives of unnormalized direction cosines with
+               respect to the PC parameters
+            8. Squared norm of centered experimental pattern as 32-bit
                 float
+            9. Cube map lookup table of the master pattern (optional).
+               If given, patterns are projected from this instead of
+               from the master pattern.
 
     Returns
     -------
         normalized cross-correlation score.
     """
-    gn_bds = get_gnomonic_bounds(args[7], args[8], x[3], x[4], x[5])
-
-    dc = _get_direction_cosines_for_fixed_pc(
-        gnomonic_bounds=gn_bds,
-        pcz=x[5],
-        nrows=args[7],
-        ncols=args[8],
-        om_detector_to_sample=args[9],
-        signal_mask=args[6],
+    dc = _get_direction_cosines_from_basis(args[6], args[7], x[3], x[4], x[5])
+    simulated = _project_simulated_pattern(
+        rotation_from_euler(*x[:3]), dc, args[1:6], args[9:]
     )
+    return 1 - _ncc_single_patterns_1d_float32_exp_centered(args[0], simulated, args[8])
+
 
-    simulated = _project_single_pattern_from_master_pattern(
-        rotation=rotation_from_euler(*x[:3]),
-        direction_cosines=dc,
-        master_upper=args[1],
-        master_lower=args[2],
-        npx=args[3],
-        npy=args[4],
-        scale=args[5],
+def _project_simulated_pattern(
+    rotation: np.ndarray,
+    direction_cosines: np.ndarray,
+    master_pattern_data: tuple,
+    lookup_table: tuple,
+) -> np.ndarray:
+    """Return a simulated pattern projected from the cube map lookup
+    table if ``lookup_table`` holds one, otherwise from the master
+    pattern hemispheres, shape and scale in ``master_pattern_data``.
+    """
+    if lookup_table:
+        return _project_single_pattern_from_cube_map(
+            rotation=rotation,
+            direction_cosines=direction_cosines,
+            cube_map=lookup_table[0],
+            rescale=False,
+            out_min=0,  # Required, but not used here
+            out_max=1,  # Required, but not used here
+            dtype_out=np.float32,
+        )
+    master_upper, master_lower, npx, npy, scale = master_pattern_data
+    return _project_single_pattern_from_master_pattern(
+        rotation=rotation,
+        direction_cosines=direction_cosines,
+        master_upper=master_upper,
+        master_lower=master_lower,
+        npx=npx,
+        npy=npy,
+        scale=scale,
         rescale=False,
         out_min=0,  # Required, but not used here
         out_max=1,  # Required, but not used here
         dtype_out=np.float32,
     )
-    return 1 - _ncc_single_patterns_1d_float32_exp_centered(
-        args[0], simulated, args[10]
+
+
+# ------------------ Objective functions with gradient ---------------- #
+
+
+def _refine_orientation_objective_function_with_gradient(
+    x: np.ndarray, *args
+) -> tuple[float, np.ndarray]:
+    """Objective function to be minimized when optimizing an orientation
+    (Euler angles), returned together with its gradient.
+
+    Parameters
+    ----------
+    x
+        1D array containing the Euler angles (phi1, Phi, phi2).
+    *args
+        Tuple of fixed parameters, as in
+        :func:`_refine_orientation_objective_function`.
+
+    Returns
+    -------
+        One minus the normalized cross-correlation score and its
+        derivatives with respect to the Euler angles.
+    """
+    simulated, simulated_gradient = (
+        _project_single_pattern_from_master_pattern_with_gradient(
+            rotation=rotation_from_euler(*x),
+            rotation_derivatives=rotation_from_euler_derivatives(*x),
+            direction_cosines=args[1],
+            direction_cosines_derivatives=np.zeros((0,) + args[1].shape),
+            master_upper=args[2],
+            master_lower=args[3],
+            npx=args[4],
+            npy=args[5],
+            scale=args[6],
+        )
+    )
+    ncc, ncc_gradient = _ncc_single_patterns_1d_exp_centered_with_gradient(
+        args[0], simulated, simulated_gradient, args[7]
+    )
+    return 1 - ncc, -ncc_gradient
+
+
+def _refine_pc_objective_function_with_gradient(
+    x: np.ndarray, *args
+) -> tuple[float, np.ndarray]:
+    """Objective function to be minimized when optimizing projection
+    center (PC) parameters PCx, PCy, and PCz, returned together with its
+    gradient.
+
+    Parameters
+    ----------
+    x
+        1D array containing the current PC parameters (PCx, PCy, PCz).
+    *args
+        Tuple of fixed parameters, as in
+        :func:`_refine_pc_objective_function`.
+
+    Returns
+    -------
+        One minus the normalized cross-correlation score and its
+        derivatives with respect to the PC parameters.
+    """
+    dc, dc_derivatives = _get_direction_cosines_and_derivatives(x, args[7], args[8])
+    simulated, simulated_gradient = (
+        _project_single_pattern_from_master_pattern_with_gradient(
+            rotation=args[1],
+            rotation_derivatives=np.zeros((0, 4)),
+            direction_cosines=dc,
+            direction_cosines_derivatives=dc_derivatives,
+            master_upper=args[2],
+            master_lower=args[3],
+            npx=args[4],
+            npy=args[5],
+            scale=args[6],
+        )
+    )
+    ncc, ncc_gradient = _ncc_single_patterns_1d_exp_centered_with_gradient(
+        args[0], simulated, simulated_gradient, args[9]
+    )
+    return 1 - ncc, -ncc_gradient
+
+
+def _refine_orientation_pc_objective_function_with_gradient(
+    x: np.ndarray, *args
+) -> tuple[float, np.ndarray]:
+    """Objective function to be minimized when optimizing orientations
+    and projection center (PC) parameters PCx, PCy, and PCz, returned
+    together with its gradient.
+
+    Parameters
+    ----------
+    x
+        1D array containing the Euler angle triplet (phi1, Phi, phi2)
+        and PC parameters (PCx, PCy, PCz).
+    *args
+        Tuple of fixed parameters, as in
+        :func:`_refine_orientation_pc_objective_function`.
+
+    Returns
+    -------
+        One minus the normalized cross-correlation score and its
+        derivatives with respect to the Euler angles and PC parameters.
+    """
+    dc, dc_derivatives = _get_direction_cosines_and_derivatives(x[3:], args[6], args[7])
+    simulated, simulated_gradient = (
+        _project_single_pattern_from_master_pattern_with_gradient(
+            rotation=rotation_from_euler(*x[:3]),
+            rotation_derivatives=rotation_from_euler_derivatives(*x[:3]),
+            direction_cosines=dc,
+            direction_cosines_derivatives=dc_derivatives,
+            master_upper=args[1],
+            master_lower=args[2],
+            npx=args[3],
+            npy=args[4],
+            scale=args[5],
+        )
+    )
+    ncc, ncc_gradient = _ncc_single_patterns_1d_exp_centered_with_gradient(
+        args[0], simulated, simulated_gradient, args[8]
+    )
+    return 1 - ncc, -ncc_gradient
+
+
+def _get_direction_cosines_and_derivatives(
+    pc: np.ndarray, offset: np.ndarray, pc_derivatives: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return direction cosines for a projection center (PC) and their
+    derivatives with respect to the PC parameters.
+    """
+    pcx, pcy, pcz = pc
+    dc = _get_direction_cosines_from_basis(offset, pc_derivatives, pcx, pcy, pcz)
+    dc_derivatives = _get_direction_cosines_derivatives_from_basis(
+        dc, offset, pc_derivatives, pcx, pcy, pcz
     )
+    return dc, dc_derivatives
@@ -31,7 +31,10 @@ from orix.crystal_map import CrystalMap, Phase, PhaseList, create_coordinate_arr
 from orix.quaternion import Rotation
 import scipy.optimize
 
-from kikuchipy.indexing._refinement import SUPPORTED_OPTIMIZATION_METHODS
+from kikuchipy.indexing._refinement import (
+    SCIPY_GRADIENT_METHODS,
+    SUPPORTED_OPTIMIZATION_METHODS,
+)
 from kikuchipy.indexing._refinement._solvers import (
     _refine_orientation_pc_solver_nlopt,
     _refine_orientation_pc_solver_scipy,
@@ -39,10 +42,16 @@ from kikuchipy.indexing._refinement._solvers import (
     _refine_orientation_solver_scipy,
     _refine_pc_solver_nlopt,
     _refine_pc_solver_scipy,
+    _refine_solver_batched,
 )
 from kikuchipy.pattern import rescale_intensity
 from kikuchipy.signals.util._crystal_map import _get_indexed_points_in_data_in_xmap
-from kikuchipy.signals.util._master_pattern import _get_direction_cosines_from_detector
+from kikuchipy.signals.util._master_pattern import (
+    _get_cube_map_from_master_pattern,
+    _get_direction_cosines_basis,
+    _get_direction_cosines_from_basis,
+    _get_direction_cosines_from_detector,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from kikuchipy.constants import installed
@@ -352,6 +361,7 @@ def _refine_orientation(
     maxeval: int | None = None,
     compute: bool = True,
     navigation_mask: np.ndarray | None = None,
+    lookup_table: bool = False,
 ) -> CrystalMap:
     ref = _RefinementSetup(
         mode="ori",
@@ -368,6 +378,7 @@ def _refine_orientation(
         points_to_refine=points_to_refine,
         signal_mask=signal_mask,
         pseudo_symmetry_ops=pseudo_symmetry_ops,
+        lookup_table=lookup_table,
     )
 
     # Get bounds on control variables. If a trust region is not passed,
@@ -376,11 +387,11 @@ def _refine_orientation(
     ref.solver_kwargs["trust_region_passed"] = trust_region is not None
 
     if ref.unique_pc:
-        # Patterns have been indexed with varying PCs, so we re-compute
-        # the direction cosines for every pattern during refinement.
-        # Since we're iterating over (n patterns, x parameters, 1) in
-        # each Dask array, we need the PC arrays to stay 3D (hence the
-        # 'weird' slicing).
+        # Patterns have been indexed with varying PCs, so we compute the
+        # direction cosines for every pattern during refinement, from
+        # the parts which are the same for all PCs. Since we're iterating
+        # over (n patterns, x parameters, 1) in each Dask array, we need
+        # the PC arrays to stay 3D (hence the 'weird' slicing).
         pc = ref.pc_array
         pcx = pc[:, :, 0:1]
         pcy = pc[:, :, 1:2]
@@ -395,10 +406,12 @@ def _refine_orientation(
             pcx,
             pcy,
             pcz,
-            nrows=detector.nrows,
-            ncols=detector.ncols,
-            om_detector_to_sample=(~detector.sample_to_detector).to_matrix().squeeze(),
-            signal_mask=signal_mask,
+            direction_cosines_basis=_get_direction_cosines_basis(
+                detector.nrows,
+                detector.ncols,
+                (~detector.sample_to_detector).to_matrix().squeeze(),
+                signal_mask,
+            ),
             solver_kwargs=ref.solver_kwargs,
             n_pseudo_symmetry_ops=ref.n_pseudo_symmetry_ops,
             **ref.map_blocks_kwargs,
@@ -415,7 +428,6 @@ def _refine_orientation(
             lower_bounds,
             upper_bounds,
             direction_cosines=dc,
-            signal_mask=signal_mask,
             solver_kwargs=ref.solver_kwargs,
             n_pseudo_symmetry_ops=ref.n_pseudo_symmetry_ops,
             **ref.map_blocks_kwargs,
@@ -444,20 +456,16 @@ def _refine_orientation_chunk_scipy(
     pcx: np.ndarray | None = None,
     pcy: np.ndarray | None = None,
     pcz: np.ndarray | None = None,
-    signal_mask: np.ndarray | None = None,
     solver_kwargs: dict | None = None,
     direction_cosines: np.ndarray | None = None,
-    nrows: int | None = None,
-    ncols: int | None = None,
-    om_detector_to_sample: np.ndarray | None = None,
+    direction_cosines_basis: tuple[np.ndarray, np.ndarray] | None = None,
     n_pseudo_symmetry_ops: int = 0,
 ):
     """Refine orientations from patterns in one dask array chunk using
     *SciPy*.
 
-    Note that ``signal_mask`` and ``solver_kwargs`` are required. They
-    are set to ``None`` to enable use of this function in
-    :func:`~dask.array.Array.map_blocks`.
+    Note that ``solver_kwargs`` is required. It is set to ``None`` to
+    enable use of this function in :func:`~dask.array.Array.map_blocks`.
     """
     nav_size = patterns.shape[0]
     value_size = 5
@@ -468,33 +476,17 @@ def _refine_orientation_chunk_scipy(
     # SciPy requires a sequence of (min, max) for each control variable
     bounds = np.stack((lower_bounds, upper_bounds), axis=lower_bounds.ndim)
 
-    if direction_cosines is None:
-        for i in range(nav_size):
-            results[i] = _refine_orientation_solver_scipy(
-                pattern=patterns[i, 0],
-                rotation=rotations[i],
-                bounds=bounds[i],
-                pcx=float(pcx[i, 0, 0]),
-                pcy=float(pcy[i, 0, 0]),
-                pcz=float(pcz[i, 0, 0]),
-                nrows=nrows,
-                ncols=ncols,
-                om_detector_to_sample=om_detector_to_sample,
-                signal_mask=signal_mask,
-                n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
-                **solver_kwargs,
-            )
-    else:
-        for i in range(nav_size):
-            results[i] = _refine_orientation_solver_scipy(
-                pattern=patterns[i, 0],
-                rotation=rotations[i],
-                bounds=bounds[i],
-                direction_cosines=direction_cosines,
-                signal_mask=signal_mask,
-                n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
-                **solver_kwargs,
-            )
+    for i in range(nav_size):
+        results[i] = _refine_orientation_solver_scipy(
+            pattern=patterns[i, 0],
+            rotation=rotations[i],
+            bounds=bounds[i],
+            direction_cosines=_get_pattern_direction_cosines(
+                i, pcx, pcy, pcz, direction_cosines, direction_cosines_basis
+            ),
+            n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
+            **solver_kwargs,
+        )
 
     return results
 
@@ -508,19 +500,16 @@ def _refine_orientation_chunk_nlopt(
     pcy: np.ndarray | None = None,
     pcz: np.ndarray | None = None,
     opt: "nlopt.opt | None" = None,
-    signal_mask: np.ndarray | None = None,
     solver_kwargs: dict | None = None,
     direction_cosines: np.ndarray | None = None,
-    nrows: int | None = None,
-    ncols: int | None = None,
-    om_detector_to_sample: np.ndarray | None = None,
+    direction_cosines_basis: tuple[np.ndarray, np.ndarray] | None = None,
     n_pseudo_symmetry_ops: int = 0,
 ):
     """Refine orientations from patterns in one dask array chunk using
     *NLopt*.
 
-    Note that ``signal_mask``, ``solver_kwargs`` and ``opt`` are
-    required. They are set to ``None`` to enable use of this function in
+    Note that ``solver_kwargs`` and ``opt`` are required. They are set
+    to ``None`` to enable use of this function in
     :func:`~dask.array.Array.map_blocks`.
     """
     # Copy optimizer
@@ -534,39 +523,79 @@ def _refine_orientation_chunk_nlopt(
         value_size += 1
     results = np.empty((nav_size, value_size), dtype=np.float64)
 
+    for i in range(nav_size):
+        results[i] = _refine_orientation_solver_nlopt(
+            opt=opt,
+            pattern=patterns[i, 0],
+            rotation=rotations[i],
+            lower_bounds=lower_bounds[i],
+            upper_bounds=upper_bounds[i],
+            direction_cosines=_get_pattern_direction_cosines(
+                i, pcx, pcy, pcz, direction_cosines, direction_cosines_basis
+            ),
+            n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
+            **solver_kwargs,
+        )
+
+    return results
+
+
+def _refine_orientation_chunk_batched(
+    patterns: np.ndarray,
+    rotations: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    pcx: np.ndarray | None = None,
+    pcy: np.ndarray | None = None,
+    pcz: np.ndarray | None = None,
+    solver_kwargs: dict | None = None,
+    direction_cosines: np.ndarray | None = None,
+    direction_cosines_basis: tuple[np.ndarray, np.ndarray] | None = None,
+    n_pseudo_symmetry_ops: int = 0,
+):
+    """Refine orientations from all patterns in one dask array chunk
+    in one call to the batched Nelder-Mead solver.
+
+    Note that ``solver_kwargs`` is required. It is set to ``None`` to
+    enable use of this function in :func:`~dask.array.Array.map_blocks`.
+    """
     if direction_cosines is None:
-        for i in range(nav_size):
-            results[i] = _refine_orientation_solver_nlopt(
-                opt=opt,
-                pattern=patterns[i, 0],
-                rotation=rotations[i],
-                lower_bounds=lower_bounds[i],
-                upper_bounds=upper_bounds[i],
-                signal_mask=signal_mask,
-                pcx=float(pcx[i, 0, 0]),
-                pcy=float(pcy[i, 0, 0]),
-                pcz=float(pcz[i, 0, 0]),
-                nrows=nrows,
-                ncols=ncols,
-                om_detector_to_sample=om_detector_to_sample,
-                n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
-                **solver_kwargs,
-            )
+        pc = np.concatenate([pcx[:, 0], pcy[:, 0], pcz[:, 0]], axis=1)
     else:
-        for i in range(nav_size):
-            results[i] = _refine_orientation_solver_nlopt(
-                opt=opt,
-                pattern=patterns[i, 0],
-                rotation=rotations[i],
-                lower_bounds=lower_bounds[i],
-                upper_bounds=upper_bounds[i],
-                signal_mask=signal_mask,
-                direction_cosines=direction_cosines,
-                n_pseudo_symmetry_ops=n_pseudo_symmetry_ops,
-                **solver_kwargs,
-            )
+        pc = None
+    return _refine_solver_batched(
+        mode="ori",
+        patterns=patterns[:, 0],
+        x0=rotations,
+        lower_bounds=lower_bounds,
+        upper_bounds=upper_bounds,
+        direction_cosines=direction_cosines,
+        pc=pc,
+        direction_cosines_basis=direction_cosines_basis,
+        **solver_kwargs,
+    )
 
-    return results
+
+def _get_pattern_direction_cosines(
+    i: int,
+    pcx: np.ndarray | None,
+    pcy: np.ndarray | None,
+    pcz: np.ndarray | None,
+    direction_cosines: np.ndarray | None,
+    direction_cosines_basis: tuple[np.ndarray, np.ndarray] | None,
+) -> np.ndarray:
+    """Return direction cosines used when refining the orientation of
+    pattern ``i`` in one dask array chunk.
+
+    If ``direction_cosines`` is not given, they are computed from
+    ``direction_cosines_basis`` and the pattern's PC.
+    """
+    if direction_cosines is not None:
+        return direction_cosines
+    offset, pc_derivatives = direction_cosines_basis
+    return _get_direction_cosines_from_basis(
+        offset, pc_derivatives, pcx[i, 0, 0], pcy[i, 0, 0], pcz[i, 0, 0]
+    )
 
 
 # ------------------------------ Refine PC --------------------------- #
@@ -589,6 +618,7 @@ def _refine_pc(
     maxeval: int | None = None,
     compute: bool = True,
     navigation_mask: np.ndarray | None = None,
+    lookup_table: bool = False,
 ) -> tuple[np.ndarray, "EBSDDetector", np.ndarray]:
     ref = _RefinementSetup(
         mode="pc",
@@ -605,6 +635,7 @@ def _refine_pc(
         points_to_refine=points_to_refine,
         signal_mask=signal_mask,
         pseudo_symmetry_ops=rotations_ps,
+        lookup_table=lookup_table,
     )
 
     # Get bounds on control variables. If a trust region is not passed,
@@ -697,6 +728,28 @@ def _refine_pc_chunk_nlopt(
     return results
 
 
+def _refine_pc_chunk_batched(
+    patterns: np.ndarray,
+    rotations: np.ndarray,
+    pc: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    solver_kwargs: dict,
+) -> np.ndarray:
+    """Refine projection centers using all patterns in one dask array
+    chunk in one call to the batched Nelder-Mead solver.
+    """
+    return _refine_solver_batched(
+        mode="pc",
+        patterns=patterns,
+        x0=pc[:, np.newaxis],
+        lower_bounds=lower_bounds[:, np.newaxis],
+        upper_bounds=upper_bounds[:, np.newaxis],
+        rotations=rotations,
+        **solver_kwargs,
+    )
+
+
 # ---------------------- Refine orientation and PC ------------------- #
 
 
@@ -717,6 +770,7 @@ def _refine_orientation_pc(
     maxeval: int | None = None,
     compute: bool = True,
     navigation_mask: np.ndarray | None = None,
+    lookup_table: bool = False,
 ) -> tuple[CrystalMap, "EBSDDetector"]:
     """See the docstring of
     :meth:`kikuchipy.signals.EBSD.refine_orientation_projection_center`.
@@ -736,6 +790,7 @@ def _refine_orientation_pc(
         maxeval=maxeval,
         signal_mask=signal_mask,
         pseudo_symmetry_ops=pseudo_symmetry_ops,
+        lookup_table=lookup_table,
     )
 
     # Stack Euler angles and PC parameters into one array of shape:
@@ -843,6 +898,27 @@ def _refine_orientation_pc_chunk_nlopt(
     return results
 
 
+def _refine_orientation_pc_chunk_batched(
+    patterns: np.ndarray,
+    rot_pc: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    solver_kwargs: dict | None = None,
+    n_pseudo_symmetry_ops: int = 0,
+) -> np.ndarray:
+    """Refine orientations and projection centers using all patterns in
+    one dask array chunk in one call to the batched Nelder-Mead solver.
+    """
+    return _refine_solver_batched(
+        mode="ori_pc",
+        patterns=patterns[:, 0],
+        x0=rot_pc,
+        lower_bounds=lower_bounds,
+        upper_bounds=upper_bounds,
+        **solver_kwargs,
+    )
+
+
 # ------------------------- Refinement setup ------------------------- #
 
 
@@ -893,6 +969,9 @@ class _RefinementSetup:
     pseudo_symmetry_ops
         See docstring of e.g.
         :meth:`~kikuchipy.signals.EBSD.refine_orientation`.
+    lookup_table
+        See docstring of e.g.
+        :meth:`~kikuchipy.signals.EBSD.refine_orientation`.
     """
 
     mode: str
@@ -909,8 +988,10 @@ class _RefinementSetup:
     optimization_type: str
     package: str
     supports_bounds: bool = False
+    gradient_based: bool = False
     # Fixed parameters
     fixed_parameters: tuple
+    cube_map: np.ndarray | None = None
     # Arguments to pass to Dask and to solver functions
     chunk_func: Callable
     map_blocks_kwargs: dict = {}
@@ -932,6 +1013,7 @@ class _RefinementSetup:
         maxeval: int | None = None,
         signal_mask: np.ndarray | None = None,
         pseudo_symmetry_ops: Rotation | None = None,
+        lookup_table: bool = False,
     ):
         """Set up EBSD refinement."""
         self.mode = mode
@@ -944,13 +1026,21 @@ class _RefinementSetup:
             maxeval=maxeval,
         )
 
+        if lookup_table and self.gradient_based:
+            raise ValueError(
+                "A lookup table cannot be used with gradient-based methods, since "
+                "the gradient is computed from the master pattern directly"
+            )
+
         self.set_fixed_parameters(
             master_pattern=master_pattern,
             energy=energy,
             signal_mask=signal_mask,
             detector=detector,
+            lookup_table=lookup_table,
         )
         self.solver_kwargs["fixed_parameters"] = self.fixed_parameters
+        self.solver_kwargs["cube_map"] = self.cube_map
         self.solver_kwargs["rescale"] = patterns.dtype == np.float32
 
         # Chunks for navigation size, pseudo-symmetry operators and
@@ -1016,21 +1106,24 @@ class _RefinementSetup:
         )
 
         # Have no idea how this can happen, but it does in tests...
-        if self.package == "scipy" and "opt" in self.map_blocks_kwargs:
+        if self.package != "nlopt" and "opt" in self.map_blocks_kwargs:
             del self.map_blocks_kwargs["opt"]
 
         chunk_funcs = {
             "ori": {
                 "nlopt": _refine_orientation_chunk_nlopt,
                 "scipy": _refine_orientation_chunk_scipy,
+                "kikuchipy": _refine_orientation_chunk_batched,
             },
             "pc": {
                 "nlopt": _refine_pc_chunk_nlopt,
                 "scipy": _refine_pc_chunk_scipy,
+                "kikuchipy": _refine_pc_chunk_batched,
             },
             "ori_pc": {
                 "nlopt": _refine_orientation_pc_chunk_nlopt,
                 "scipy": _refine_orientation_pc_chunk_scipy,
+                "kikuchipy": _refine_orientation_pc_chunk_batched,
             },
         }
         self.chunk_func = chunk_funcs[self.mode][self.package]
@@ -1056,7 +1149,8 @@ class _RefinementSetup:
         initial_step: float | int | tuple[float, float] | None = None,
         maxeval: int | None = None,
     ) -> None:
-        """Set *NLopt* or *SciPy* optimization parameters.
+        """Set *NLopt*, *SciPy* or batched Nelder-Mead optimization
+        parameters.
 
         Parameters
         ----------
@@ -1123,7 +1217,31 @@ class _RefinementSetup:
                 self.maxeval = maxeval
 
             self.method_name = method_upper
+            self.gradient_based = method.startswith("ld_")
             self.map_blocks_kwargs["opt"] = opt
+        elif self.package == "kikuchipy":
+            if initial_step is not None:
+                initial_step = np.atleast_1d(initial_step).astype(np.float64)
+                n_initial_steps = {"ori": 1, "pc": 1, "ori_pc": 2}
+                if initial_step.size != n_initial_steps[self.mode]:
+                    raise ValueError(
+                        "The initial step must be a single number when refining "
+                        "orientations or PCs and a list of two numbers when refining "
+                        "both"
+                    )
+                self.initial_step = list(np.repeat(initial_step, 3))
+                # Euler angles are optimized in radians
+                if self.mode != "pc":
+                    initial_step[0] = np.deg2rad(initial_step[0])
+                initial_step = np.repeat(initial_step, 3)
+
+            self.maxeval = maxeval
+            self.method_name = "Nelder-Mead"
+            self.solver_kwargs = {
+                "rtol": rtol,
+                "maxeval": maxeval,
+                "initial_step": initial_step,
+            }
         else:
             if method_kwargs is None:
                 method_kwargs = {}
@@ -1139,6 +1257,21 @@ class _RefinementSetup:
             if method == "basinhopping" and "minimizer_kwargs" not in method_kwargs:
                 method_kwargs["minimizer_kwargs"] = {}
 
+            # Use the analytic gradient with gradient-based local methods
+            if method == "minimize":
+                kw = method_kwargs
+            else:
+                kw = method_kwargs.get("minimizer_kwargs", {})
+            if (
+                "jac" not in kw
+                and str(kw.get("method", "")).lower() in SCIPY_GRADIENT_METHODS
+            ):
+                kw["jac"] = True
+            self.gradient_based = (
+                method_kwargs.get("jac") is True
+                or method_kwargs.get("minimizer_kwargs", {}).get("jac") is True
+            )
+
             method = getattr(scipy.optimize, method)
             self.solver_kwargs = {"method": method, "method_kwargs": method_kwargs}
 
@@ -1148,6 +1281,7 @@ class _RefinementSetup:
         master_pattern: "EBSDMasterPattern",
         energy: int | float,
         signal_mask: np.ndarray | None = None,
+        lookup_table: bool = False,
     ) -> None:
         """Set fixed parameters to pass to the objective function.
 
@@ -1165,16 +1299,31 @@ class _RefinementSetup:
         signal_mask
             See docstring of e.g.
             :meth:`~kikuchipy.signals.EBSD.refine_orientation`.
+        lookup_table
+            See docstring of e.g.
+            :meth:`~kikuchipy.signals.EBSD.refine_orientation`.
         """
         params = _get_master_pattern_data(master_pattern, energy)
 
+        # The lookup table is computed once here and passed on to every
+        # evaluation of the objective function
+        if lookup_table:
+            mpu, mpl, npx, npy, scale = params
+            self.cube_map = _get_cube_map_from_master_pattern(
+                mpu, mpl, npx, npy, scale, npx
+            )
+        else:
+            self.cube_map = None
+
         if self.mode in ["pc", "ori_pc"]:
+            # Direction cosines are updated from these parts in every
+            # evaluation of the objective function
             nrows, ncols = detector.shape
-            params += (
-                signal_mask,
+            params += _get_direction_cosines_basis(
                 nrows,
                 ncols,
                 (~detector.sample_to_detector).to_matrix().squeeze(),
+                signal_mask,
             )
 
         self.fixed_parameters = params
@@ -1260,7 +1409,9 @@ class _RefinementSetup:
         info
             Important refinement impormation.
         """
-        package_name = {"scipy": "SciPy", "nlopt": "NLopt"}[self.package]
+        package_name = {"scipy": "SciPy", "nlopt": "NLopt", "kikuchipy": "kikuchipy"}[
+            self.package
+        ]
         info = (
             "Refinement information:\n"
             f"  Method: {self.method_name} ({self.optimization_type}) from {package_name}"
@@ -1276,8 +1427,11 @@ class _RefinementSetup:
                 f"{self.solver_kwargs['method_kwargs']}"
             )
         else:
-            opt = self.map_blocks_kwargs["opt"]
-            info += f"\n  Relative tolerance: {opt.get_ftol_rel()}"
+            if self.package == "nlopt":
+                rtol = self.map_blocks_kwargs["opt"].get_ftol_rel()
+                info += f"\n  Relative tolerance: {rtol}"
+            else:
+                info += f"\n  Tolerance: {self.solver_kwargs['rtol']}"
             if self.initial_step:
                 info += f"\n  Initial step(s): {self.initial_step}"
             if self.maxeval:
@@ -1286,6 +1440,9 @@ class _RefinementSetup:
         if self.n_pseudo_symmetry_ops > 0:
             info += f"\n  No. pseudo-symmetry operators: {self.n_pseudo_symmetry_ops}"
 
+        if self.cube_map is not None:
+            info += "\n  Projection from lookup table"
+
         return info
 
 
@@ -25,18 +25,28 @@ from typing import TYPE_CHECKING, Callable
 from numba import njit
 import numpy as np
 
-from kikuchipy._utils._gnonomic_bounds import get_gnomonic_bounds
+from kikuchipy._utils.numba import rotation_from_euler
 from kikuchipy.indexing._refinement import SUPPORTED_OPTIMIZATION_METHODS
 from kikuchipy.indexing._refinement._objective_functions import (
     _refine_orientation_objective_function,
+    _refine_orientation_objective_function_with_gradient,
     _refine_orientation_pc_objective_function,
+    _refine_orientation_pc_objective_function_with_gradient,
     _refine_pc_objective_function,
+    _refine_pc_objective_function_with_gradient,
+)
+from kikuchipy.indexing.similarity_metrics._normalized_cross_correlation import (
+    _ncc_single_patterns_1d_float32_exp_centered,
 )
 from kikuchipy.pattern._pattern import (
     _rescale_without_min_max_1d_float32,
     _zero_mean_sum_square_1d_float32,
 )
-from kikuchipy.signals.util._master_pattern import _get_direction_cosines_for_fixed_pc
+from kikuchipy.signals.util._master_pattern import (
+    _get_direction_cosines_from_basis,
+    _project_single_pattern_from_cube_map,
+    _project_single_pattern_from_master_pattern,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from kikuchipy.constants import installed
@@ -73,24 +83,32 @@ def _prepare_pattern(pattern: np.ndarray, rescale: bool) -> tuple[np.ndarray, fl
 # --------------------------- SciPy solvers -------------------------- #
 
 
+def _get_scipy_objective_function(
+    objective: Callable, objective_with_gradient: Callable, method_kwargs: dict
+) -> Callable:
+    """Return the objective function returning its gradient as well if
+    the *SciPy* method is told so by passing ``jac=True``, either
+    directly or to the local minimizer of a global method.
+    """
+    minimizer_kwargs = method_kwargs.get("minimizer_kwargs", {})
+    if method_kwargs.get("jac") is True or minimizer_kwargs.get("jac") is True:
+        return objective_with_gradient
+    else:
+        return objective
+
+
 def _refine_orientation_solver_scipy(
     pattern: np.ndarray,
     rotation: np.ndarray,
     bounds: np.ndarray,
-    signal_mask: np.ndarray,
+    direction_cosines: np.ndarray,
     rescale: bool,
     method: Callable,
     method_kwargs: dict,
     trust_region_passed: bool,
     fixed_parameters: tuple[np.ndarray, np.ndarray, int, int, float],
-    direction_cosines: np.ndarray | None = None,
-    pcx: float | None = None,
-    pcy: float | None = None,
-    pcz: float | None = None,
-    nrows: int | None = None,
-    ncols: int | None = None,
-    om_detector_to_sample: np.ndarray | None = None,
     n_pseudo_symmetry_ops: int = 0,
+    cube_map: np.ndarray | None = None,
 ) -> (
     tuple[float, int, float, float, float] | tuple[float, int, int, float, float, float]
 ):
@@ -104,10 +122,8 @@ def _refine_orientation_solver_scipy(
         Flattened experimental pattern.
     rotation
         Rodrigues-Frank vector components (Rx, Ry, Rz), unscaled.
-    signal_mask
-        Boolean mask equal to the experimental patterns' detector shape
-        ``(n rows, n columns)``, where only pixels equal to ``False``
-        are matched.
+    direction_cosines
+        Vector array of shape (n pixels, 3) and data type 64-bit floats.
     rescale
         Whether pattern intensities must be rescaled to [-1, 1] and the
         data type set to 32-bit floats.
@@ -119,33 +135,11 @@ def _refine_orientation_solver_scipy(
         list of possible arguments, see the SciPy documentation.
     fixed_parameters
         Fixed parameters used in the projection.
-    direction_cosines
-        Vector array of shape (n pixels, 3) and data type 32-bit floats.
-        If not given, ``pcx``, ``pcy``, ``pcz``, ``nrows``, ``ncols``,
-        ``tilt``, ``azimuthal``, and ``sample_tilt`` must be passed.
-    pcx
-        Projection center (PC) x coordinate. Must be passed if
-        ``direction_cosines`` is not given.
-    pcy
-        PC y coordinate. Must be passed if ``direction_cosines`` is not
-        given.
-    pcz
-        PC z coordinate. Must be passed if ``direction_cosines`` is not
-        given.
-    nrows
-        Number of detector rows. Must be passed if ``direction_cosines``
-        is not given.
-    ncols
-        Number of detector columns. Must be passed if
-        ``direction_cosines`` is not given.
-    om_detector_to_sample
-        Orientation matrix used for transforming from the detector
-        reference frame to the sample reference frame. This is the
-        inverse of EBSDDetector.sample_to_detector expressed as a
-        3x3 numpy array rather than an orix Rotation. Must be passed
-        if ``direction_cosines`` is not given.
     n_pseudo_symmetry_ops
         Number of pseudo-symmetry operators. Default is 0.
+    cube_map
+        Cube map lookup table of the master pattern to project patterns
+        from instead of the master pattern, if given.
 
     Returns
     -------
@@ -158,34 +152,29 @@ def _refine_orientation_solver_scipy(
     """
     pattern, squared_norm = _prepare_pattern(pattern, rescale)
 
-    if direction_cosines is None:
-        gn_bds = get_gnomonic_bounds(nrows, ncols, pcx, pcy, pcz)
-
-        direction_cosines = _get_direction_cosines_for_fixed_pc(
-            gnomonic_bounds=gn_bds,
-            pcz=pcz,
-            nrows=nrows,
-            ncols=ncols,
-            om_detector_to_sample=om_detector_to_sample,
-            signal_mask=signal_mask,
-        )
-
     params = (pattern,) + (direction_cosines,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
     method_name = method.__name__
+    objective = _get_scipy_objective_function(
+        _refine_orientation_objective_function,
+        _refine_orientation_objective_function_with_gradient,
+        method_kwargs,
+    )
 
     if n_pseudo_symmetry_ops == 0:
         if method_name == "minimize":
             if trust_region_passed:
                 method_kwargs["bounds"] = bounds[0]
             res = method(
-                fun=_refine_orientation_objective_function,
+                fun=objective,
                 x0=rotation[0],
                 args=params,
                 **method_kwargs,
             )
         elif SUPPORTED_OPTIMIZATION_METHODS[method_name]["supports_bounds"]:
             res = method(
-                func=_refine_orientation_objective_function,
+                func=objective,
                 args=params,
                 bounds=bounds[0],
                 **method_kwargs,
@@ -193,7 +182,7 @@ def _refine_orientation_solver_scipy(
         else:  # Is always "basinhopping", due to prior check of method name
             method_kwargs["minimizer_kwargs"].update(args=params)
             res = method(
-                func=_refine_orientation_objective_function,
+                func=objective,
                 x0=rotation[0],
                 **method_kwargs,
             )
@@ -210,14 +199,14 @@ def _refine_orientation_solver_scipy(
                 if trust_region_passed:
                     method_kwargs["bounds"] = bounds[i]
                 res = method(
-                    fun=_refine_orientation_objective_function,
+                    fun=objective,
                     x0=rotation[i],
                     args=params,
                     **method_kwargs,
                 )
             elif SUPPORTED_OPTIMIZATION_METHODS[method_name]["supports_bounds"]:
                 res = method(
-                    func=_refine_orientation_objective_function,
+                    func=objective,
                     args=params,
                     bounds=bounds[i],
                     **method_kwargs,
@@ -225,7 +214,7 @@ def _refine_orientation_solver_scipy(
             else:  # Is always "basinhopping", due to prior check of method name
                 method_kwargs["minimizer_kwargs"].update(args=params)
                 res = method(
-                    func=_refine_orientation_objective_function,
+                    func=objective,
                     x0=rotation[i],
                     **method_kwargs,
                 )
@@ -253,6 +242,7 @@ def _refine_pc_solver_scipy(
     method_kwargs: dict,
     fixed_parameters: tuple,
     trust_region_passed: bool,
+    cube_map: np.ndarray | None = None,
 ) -> tuple[float, int, float, float, float]:
     """Maximize the similarity between an experimental pattern and a
     projected simulated pattern by optimizing the projection center (PC)
@@ -280,6 +270,9 @@ def _refine_pc_solver_scipy(
         Fixed parameters used in the projection.
     trust_region_passed
         Whether ``trust_region`` was passed.
+    cube_map
+        Cube map lookup table of the master pattern to project patterns
+        from instead of the master pattern, if given.
 
     Returns
     -------
@@ -293,20 +286,27 @@ def _refine_pc_solver_scipy(
     pattern, squared_norm = _prepare_pattern(pattern, rescale)
 
     params = (pattern,) + (rotation,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
     method_name = method.__name__
+    objective = _get_scipy_objective_function(
+        _refine_pc_objective_function,
+        _refine_pc_objective_function_with_gradient,
+        method_kwargs,
+    )
 
     if method_name == "minimize":
         if trust_region_passed:
             method_kwargs["bounds"] = bounds
         res = method(
-            fun=_refine_pc_objective_function,
+            fun=objective,
             x0=pc,
             args=params,
             **method_kwargs,
         )
     elif SUPPORTED_OPTIMIZATION_METHODS[method_name]["supports_bounds"]:
         res = method(
-            func=_refine_pc_objective_function,
+            func=objective,
             args=params,
             bounds=bounds,
             **method_kwargs,
@@ -314,7 +314,7 @@ def _refine_pc_solver_scipy(
     else:  # Is always "basinhopping", due to prior check of method name
         method_kwargs["minimizer_kwargs"].update(args=params)
         res = method(
-            func=_refine_pc_objective_function,
+            func=objective,
             x0=pc,
             **method_kwargs,
         )
@@ -336,6 +336,7 @@ def _refine_orientation_pc_solver_scipy(
     fixed_parameters: tuple,
     trust_region_passed: bool,
     n_pseudo_symmetry_ops: int = 0,
+    cube_map: np.ndarray | None = None,
 ) -> (
     tuple[float, int, float, float, float, float, float, float]
     | tuple[float, int, int, float, float, float, float, float, float]
@@ -366,6 +367,9 @@ def _refine_orientation_pc_solver_scipy(
     trust_region_passed
         Whether `trust_region` was passed to the public refinement
         method.
+    cube_map
+        Cube map lookup table of the master pattern to project patterns
+        from instead of the master pattern, if given.
 
     Returns
     -------
@@ -382,21 +386,28 @@ def _refine_orientation_pc_solver_scipy(
     pattern, squared_norm = _prepare_pattern(pattern, rescale)
 
     params = (pattern,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
     method_name = method.__name__
+    objective = _get_scipy_objective_function(
+        _refine_orientation_pc_objective_function,
+        _refine_orientation_pc_objective_function_with_gradient,
+        method_kwargs,
+    )
 
     if n_pseudo_symmetry_ops == 0:
         if method_name == "minimize":
             if trust_region_passed:
                 method_kwargs["bounds"] = bounds[0]
             res = method(
-                fun=_refine_orientation_pc_objective_function,
+                fun=objective,
                 x0=rot_pc[0],
                 args=params,
                 **method_kwargs,
             )
         elif SUPPORTED_OPTIMIZATION_METHODS[method_name]["supports_bounds"]:
             res = method(
-                func=_refine_orientation_pc_objective_function,
+                func=objective,
                 args=params,
                 bounds=bounds[0],
                 **method_kwargs,
@@ -404,7 +415,7 @@ def _refine_orientation_pc_solver_scipy(
         else:  # Is always "basinhopping", due to prior check of method name
             method_kwargs["minimizer_kwargs"].update(args=params)
             res = method(
-                func=_refine_orientation_pc_objective_function,
+                func=objective,
                 x0=rot_pc[0],
                 **method_kwargs,
             )
@@ -421,14 +432,14 @@ def _refine_orientation_pc_solver_scipy(
                 if trust_region_passed:
                     method_kwargs["bounds"] = bounds[i]
                 res = method(
-                    fun=_refine_orientation_pc_objective_function,
+                    fun=objective,
                     x0=rot_pc[i],
                     args=params,
                     **method_kwargs,
                 )
             elif SUPPORTED_OPTIMIZATION_METHODS[method_name]["supports_bounds"]:
                 res = method(
-                    func=_refine_orientation_pc_objective_function,
+                    func=objective,
                     args=params,
                     bounds=bounds[i],
                     **method_kwargs,
@@ -436,7 +447,7 @@ def _refine_orientation_pc_solver_scipy(
             else:  # Is always "basinhopping", due to prior check of method name
                 method_kwargs["minimizer_kwargs"].update(args=params)
                 res = method(
-                    func=_refine_orientation_pc_objective_function,
+                    func=objective,
                     x0=rot_pc[i],
                     **method_kwargs,
                 )
@@ -457,47 +468,51 @@ def _refine_orientation_pc_solver_scipy(
 # --------------------------- NLopt solvers -------------------------- #
 
 
+def _get_nlopt_objective_function(
+    objective: Callable, objective_with_gradient: Callable, params: tuple
+) -> Callable:
+    """Return the objective function in the form expected by *NLopt*,
+    filling in the gradient if the algorithm asks for it.
+    """
+
+    def nlopt_objective(x: np.ndarray, grad: np.ndarray) -> float:
+        if grad.size > 0:
+            value, grad[:] = objective_with_gradient(x, *params)
+            return value
+        else:
+            return objective(x, *params)
+
+    return nlopt_objective
+
+
 def _refine_orientation_solver_nlopt(
     opt: "nlopt.opt",
     pattern: np.ndarray,
     rotation: np.ndarray,
     lower_bounds: np.ndarray,
     upper_bounds: np.ndarray,
-    signal_mask: np.ndarray,
+    direction_cosines: np.ndarray,
     rescale: bool,
     trust_region_passed: bool,
     fixed_parameters: tuple[np.ndarray, np.ndarray, int, int, float],
-    direction_cosines: np.ndarray | None = None,
-    pcx: float | None = None,
-    pcy: float | None = None,
-    pcz: float | None = None,
-    nrows: int | None = None,
-    ncols: int | None = None,
-    om_detector_to_sample: np.ndarray | None = None,
     n_pseudo_symmetry_ops: int = 0,
+    cube_map: np.ndarray | None = None,
 ) -> (
     tuple[float, int, float, float, float] | tuple[float, int, int, float, float, float]
 ):
     pattern, squared_norm = _prepare_pattern(pattern, rescale)
 
-    # Get direction cosines if a unique PC per pattern is used
-    if direction_cosines is None:
-        gn_bds = get_gnomonic_bounds(nrows, ncols, pcx, pcy, pcz)
-
-        direction_cosines = _get_direction_cosines_for_fixed_pc(
-            gnomonic_bounds=gn_bds,
-            pcz=pcz,
-            nrows=nrows,
-            ncols=ncols,
-            om_detector_to_sample=om_detector_to_sample,
-            signal_mask=signal_mask,
-        )
-
     # Combine tuple of fixed parameters passed to the objective function
     params = (pattern,) + (direction_cosines,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
 
     opt.set_min_objective(
-        lambda x, grad: _refine_orientation_objective_function(x, *params)
+        _get_nlopt_objective_function(
+            _refine_orientation_objective_function,
+            _refine_orientation_objective_function_with_gradient,
+            params,
+        )
     )
 
     if n_pseudo_symmetry_ops == 0:
@@ -542,17 +557,26 @@ def _refine_pc_solver_nlopt(
     rescale: bool,
     fixed_parameters: tuple,
     trust_region_passed: bool,
+    cube_map: np.ndarray | None = None,
 ) -> tuple[float, int, float, float, float]:
     pattern, squared_norm = _prepare_pattern(pattern, rescale)
 
     # Combine tuple of fixed parameters passed to the objective function
     params = (pattern,) + (rotation,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
 
     # Prepare NLopt optimizer
     if trust_region_passed:
         opt.set_lower_bounds(lower_bounds)
         opt.set_upper_bounds(upper_bounds)
-    opt.set_min_objective(lambda x, grad: _refine_pc_objective_function(x, *params))
+    opt.set_min_objective(
+        _get_nlopt_objective_function(
+            _refine_pc_objective_function,
+            _refine_pc_objective_function_with_gradient,
+            params,
+        )
+    )
 
     # Run optimization and extract optimized Euler angles and PC values
     # and the optimized normalized cross-correlation (NCC) score
@@ -573,6 +597,7 @@ def _refine_orientation_pc_solver_nlopt(
     fixed_parameters: tuple,
     trust_region_passed: bool,
     n_pseudo_symmetry_ops: int = 0,
+    cube_map: np.ndarray | None = None,
 ) -> (
     tuple[float, int, float, float, float, float, float, float]
     | tuple[float, int, int, float, float, float, float, float, float]
@@ -581,9 +606,15 @@ def _refine_orientation_pc_solver_nlopt(
 
     # Combine tuple of fixed parameters passed to the objective function
     params = (pattern,) + fixed_parameters + (squared_norm,)
+    if cube_map is not None:
+        params += (cube_map,)
 
     opt.set_min_objective(
-        lambda x, grad: _refine_orientation_pc_objective_function(x, *params)
+        _get_nlopt_objective_function(
+            _refine_orientation_pc_objective_function,
+            _refine_orientation_pc_objective_function_with_gradient,
+            params,
+        )
     )
 
     if n_pseudo_symmetry_ops == 0:
@@ -616,3 +647,399 @@ def _refine_orientation_pc_solver_nlopt(
         phi1, Phi, phi2, pcx, pcy, pcz = eu_pc_all[best_idx]
 
         return ncc, num_evals, phi1, Phi, phi2, pcx, pcy, pcz, best_idx
+
+
+# -------------------- Batched Nelder-Mead solver -------------------- #
+
+# Modes of the batched solver
+_BATCHED_MODES = {"ori": 0, "pc": 1, "ori_pc": 2}
+
+
+def _refine_solver_batched(
+    mode: str,
+    patterns: np.ndarray,
+    x0: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    rescale: bool,
+    trust_region_passed: bool,
+    fixed_parameters: tuple,
+    rtol: float,
+    maxeval: int | None,
+    initial_step: np.ndarray | None,
+    rotations: np.ndarray | None = None,
+    direction_cosines: np.ndarray | None = None,
+    pc: np.ndarray | None = None,
+    direction_cosines_basis: tuple[np.ndarray, np.ndarray] | None = None,
+    cube_map: np.ndarray | None = None,
+) -> np.ndarray:
+    """Maximize the similarity between all experimental patterns in a
+    chunk and projected simulated patterns with the Nelder-Mead
+    simplex algorithm, all in one Numba accelerated call.
+
+    Parameters
+    ----------
+    mode
+        Either ``"ori"``, ``"pc"`` or ``"ori_pc"``.
+    patterns
+        Flattened experimental patterns of shape (n, n_pixels).
+    x0
+        Starting points of shape (n, n_starts, n_variables), one per
+        pseudo-symmetry operator (including the identity). Euler angles
+        in radians and/or PC parameters.
+    lower_bounds, upper_bounds
+        Bounds on the control variables of the same shape as ``x0``.
+        Only used if ``trust_region_passed`` is ``True``.
+    rescale
+        Whether pattern intensities must be rescaled to [-1, 1].
+    trust_region_passed
+        Whether to restrict the control variables to the bounds.
+    fixed_parameters
+        Fixed parameters used in the projection.
+    rtol
+        Absolute tolerance of the score and the control variables
+        used as convergence criteria.
+    maxeval
+        Maximum number of function evaluations per starting point. If
+        not given, it is 200 times the number of control variables.
+    initial_step
+        Initial step size per control variable. If not given, the
+        initial simplex is set up as in SciPy's Nelder-Mead
+        implementation.
+    rotations
+        Quaternions of shape (n, 4). Must be given if ``mode="pc"``.
+    direction_cosines
+        Direction cosines of shape (n_pixels, 3) used in all
+        projections. If ``mode="ori"``, either these or ``pc`` and
+        ``direction_cosines_basis`` must be given.
+    pc
+        PC per pattern of shape (n, 3). Direction cosines are then
+        computed for one pattern at a time from
+        ``direction_cosines_basis``. Only used if ``mode="ori"`` and
+        ``direction_cosines`` is not given.
+    direction_cosines_basis
+        Parts of the direction cosines which are independent of and
+        linear in the PC. Only used together with ``pc``.
+    cube_map
+        Cube map lookup table of the master pattern to project patterns
+        from instead of the master pattern, if given.
+
+    Returns
+    -------
+    results
+        Array with the best score, number of function evaluations and
+        control variables per pattern, and the index of the best
+        starting point if there are more than one.
+    """
+    n, n_starts, n_variables = x0.shape
+    mpu, mpl, npx, npy, scale = fixed_parameters[:5]
+    pc_per_pattern = mode == "ori" and direction_cosines is None
+    if pc_per_pattern:
+        dc_offset, dc_pc_derivatives = direction_cosines_basis
+        direction_cosines = np.zeros((1, 3))
+    elif mode == "ori":
+        dc_offset = np.zeros((1, 3))
+        dc_pc_derivatives = np.zeros((3, 3))
+    else:
+        dc_offset, dc_pc_derivatives = fixed_parameters[5:]
+        direction_cosines = np.zeros((1, 3))
+    if not pc_per_pattern:
+        pc = np.zeros((n, 3))
+    if mode != "pc":
+        rotations = np.zeros((n, 4))
+    use_cube_map = cube_map is not None
+    if not use_cube_map:
+        cube_map = np.zeros((6, 3, 3), dtype=np.float32)
+
+    if maxeval is None:
+        maxeval = 200 * n_variables
+    if initial_step is None:
+        initial_step = np.zeros(n_variables)
+
+    results = _refine_nelder_mead_batched(
+        mode=_BATCHED_MODES[mode],
+        patterns=patterns,
+        x0=np.ascontiguousarray(x0, dtype=np.float64),
+        lower_bounds=np.ascontiguousarray(lower_bounds, dtype=np.float64),
+        upper_bounds=np.ascontiguousarray(upper_bounds, dtype=np.float64),
+        use_bounds=trust_region_passed,
+        rescale=rescale,
+        tol=float(rtol),
+        maxeval=int(maxeval),
+        initial_step=np.asarray(initial_step, dtype=np.float64),
+        rotations=np.ascontiguousarray(rotations, dtype=np.float64),
+        direction_cosines=np.ascontiguousarray(direction_cosines, dtype=np.float64),
+        pc=np.ascontiguousarray(pc, dtype=np.float64),
+        pc_per_pattern=pc_per_pattern,
+        master_upper=mpu,
+        master_lower=mpl,
+        npx=int(npx),
+        npy=int(npy),
+        scale=float(scale),
+        dc_offset=np.ascontiguousarray(dc_offset, dtype=np.float64),
+        dc_pc_derivatives=np.ascontiguousarray(dc_pc_derivatives, dtype=np.float64),
+        cube_map=cube_map,
+        use_cube_map=use_cube_map,
+    )
+    if n_starts == 1:
+        results = results[:, :-1]
+    return results
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _objective_batched(
+    x: np.ndarray,
+    mode: int,
+    pattern: np.ndarray,
+    squared_norm: float,
+    rotation: np.ndarray,
+    direction_cosines: np.ndarray,
+    params: tuple,
+) -> float:
+    """Return one minus the normalized cross-correlation between an
+    experimental pattern and a pattern projected with the control
+    variables ``x``.
+
+    ``params`` is a tuple of the master pattern hemispheres, their
+    shape and scale, the parts of the direction cosines which are
+    independent of and linear in the PC, the cube map lookup table of
+    the master pattern and whether to project patterns from the latter.
+    """
+    (
+        master_upper,
+        master_lower,
+        npx,
+        npy,
+        scale,
+        dc_offset,
+        dc_pc_derivatives,
+        cube_map,
+        use_cube_map,
+    ) = params
+    if mode == 0:
+        rotation = rotation_from_euler(x[0], x[1], x[2])
+    elif mode == 1:
+        direction_cosines = _get_direction_cosines_from_basis(
+            dc_offset, dc_pc_derivatives, x[0], x[1], x[2]
+        )
+    else:
+        rotation = rotation_from_euler(x[0], x[1], x[2])
+        direction_cosines = _get_direction_cosines_from_basis(
+            dc_offset, dc_pc_derivatives, x[3], x[4], x[5]
+        )
+    if use_cube_map:
+        simulated = _project_single_pattern_from_cube_map(
+            rotation=rotation,
+            direction_cosines=direction_cosines,
+            cube_map=cube_map,
+            rescale=False,
+            out_min=0,  # Required, but not used here
+            out_max=1,  # Required, but not used here
+            dtype_out=np.float32,
+        )
+    else:
+        simulated = _project_single_pattern_from_master_pattern(
+            rotation=rotation,
+            direction_cosines=direction_cosines,
+            master_upper=master_upper,
+            master_lower=master_lower,
+            npx=npx,
+            npy=npy,
+            scale=scale,
+            rescale=False,
+            out_min=0,  # Required, but not used here
+            out_max=1,  # Required, but not used here
+            dtype_out=np.float32,
+        )
+    return 1 - _ncc_single_patterns_1d_float32_exp_centered(
+        pattern, simulated, squared_norm
+    )
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _refine_nelder_mead_batched(
+    mode: int,
+    patterns: np.ndarray,
+    x0: np.ndarray,
+    lower_bounds: np.ndarray,
+    upper_bounds: np.ndarray,
+    use_bounds: bool,
+    rescale: bool,
+    tol: float,
+    maxeval: int,
+    initial_step: np.ndarray,
+    rotations: np.ndarray,
+    direction_cosines: np.ndarray,
+    pc: np.ndarray,
+    pc_per_pattern: bool,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+    dc_offset: np.ndarray,
+    dc_pc_derivatives: np.ndarray,
+    cube_map: np.ndarray,
+    use_cube_map: bool,
+) -> np.ndarray:
+    """Minimize the objective function for each pattern and starting
+    point with the Nelder-Mead simplex algorithm.
+
+    The algorithm and its default parameters follow SciPy's
+    implementation in :func:`scipy.optimize.minimize`. Vertices outside
+    the bounds are clipped to the bounds if ``use_bounds`` is ``True``.
+
+    Returns
+    -------
+    results
+        Array of shape (n, n_variables + 3) with the best score, number
+        of function evaluations, control variables and starting point
+        index per pattern. As for the other solvers, the number of
+        function evaluations is that of the best starting point only.
+    """
+    n, n_starts, n_variables = x0.shape
+    rho, chi, psi, sigma = 1.0, 2.0, 0.5, 0.5
+
+    params = (
+        master_upper,
+        master_lower,
+        npx,
+        npy,
+        scale,
+        dc_offset,
+        dc_pc_derivatives,
+        cube_map,
+        use_cube_map,
+    )
+
+    results = np.zeros((n, n_variables + 3), dtype=np.float64)
+    sim = np.zeros((n_variables + 1, n_variables), dtype=np.float64)
+    fsim = np.zeros(n_variables + 1, dtype=np.float64)
+    xbar = np.zeros(n_variables, dtype=np.float64)
+
+    for i in range(n):
+        pattern, squared_norm = _prepare_pattern(patterns[i], rescale)
+        if pc_per_pattern:
+            dc = _get_direction_cosines_from_basis(
+                dc_offset, dc_pc_derivatives, pc[i, 0], pc[i, 1], pc[i, 2]
+            )
+        else:
+            dc = direction_cosines
+        rotation = rotations[i]
+
+        best_f = np.inf
+        for j in range(n_starts):
+            lower = lower_bounds[i, j]
+            upper = upper_bounds[i, j]
+
+            # Initial simplex
+            for k in range(n_variables + 1):
+                sim[k] = x0[i, j]
+            for k in range(n_variables):
+                if initial_step[k] != 0:
+                    sim[k + 1, k] += initial_step[k]
+                elif sim[k + 1, k] != 0:
+                    sim[k + 1, k] *= 1.05
+                else:
+                    sim[k + 1, k] = 0.00025
+            nfev = 0
+            for k in range(n_variables + 1):
+                if use_bounds:
+                    sim[k] = np.minimum(np.maximum(sim[k], lower), upper)
+                fsim[k] = _objective_batched(
+                    sim[k], mode, pattern, squared_norm, rotation, dc, params
+                )
+                nfev += 1
+
+            while nfev < maxeval:
+                order = np.argsort(fsim)
+                sim[:] = sim[order]
+                fsim[:] = fsim[order]
+
+                if (
+                    np.max(np.abs(sim[1:] - sim[0])) <= tol
+                    and np.max(np.abs(fsim[1:] - fsim[0])) <= tol
+                ):
+                    break
+
+                xbar[:] = 0
+                for k in range(n_variables):
+                    xbar += sim[k]
+                xbar /= n_variables
+
+                # Reflection
+                xr = (1 + rho) * xbar - rho * sim[-1]
+                if use_bounds:
+                    xr = np.minimum(np.maximum(xr, lower), upper)
+                fxr = _objective_batched(
+                    xr, mode, pattern, squared_norm, rotation, dc, params
+                )
+                nfev += 1
+
+                shrink = False
+                if fxr < fsim[0]:
+                    # Expansion
+                    xe = (1 + rho * chi) * xbar - rho * chi * sim[-1]
+                    if use_bounds:
+                        xe = np.minimum(np.maximum(xe, lower), upper)
+                    fxe = _objective_batched(
+                        xe, mode, pattern, squared_norm, rotation, dc, params
+                    )
+                    nfev += 1
+                    if fxe < fxr:
+                        sim[-1] = xe
+                        fsim[-1] = fxe
+                    else:
+                        sim[-1] = xr
+                        fsim[-1] = fxr
+                elif fxr < fsim[-2]:
+                    sim[-1] = xr
+                    fsim[-1] = fxr
+                elif fxr < fsim[-1]:
+                    # Outside contraction
+                    xc = (1 + psi * rho) * xbar - psi * rho * sim[-1]
+                    if use_bounds:
+                        xc = np.minimum(np.maximum(xc, lower), upper)
+                    fxc = _objective_batched(
+                        xc, mode, pattern, squared_norm, rotation, dc, params
+                    )
+                    nfev += 1
+                    if fxc <= fxr:
+                        sim[-1] = xc
+                        fsim[-1] = fxc
+                    else:
+                        shrink = True
+                else:
+                    # Inside contraction
+                    xcc = (1 - psi) * xbar + psi * sim[-1]
+                    if use_bounds:
+                        xcc = np.minimum(np.maximum(xcc, lower), upper)
+                    fxcc = _objective_batched(
+                        xcc, mode, pattern, squared_norm, rotation, dc, params
+                    )
+                    nfev += 1
+                    if fxcc < fsim[-1]:
+                        sim[-1] = xcc
+                        fsim[-1] = fxcc
+                    else:
+                        shrink = True
+
+                if shrink:
+                    for k in range(1, n_variables + 1):
+                        sim[k] = sim[0] + sigma * (sim[k] - sim[0])
+                        if use_bounds:
+                            sim[k] = np.minimum(np.maximum(sim[k], lower), upper)
+                        fsim[k] = _objective_batched(
+                            sim[k], mode, pattern, squared_norm, rotation, dc, params
+                        )
+                        nfev += 1
+
+            k_best = np.argmin(fsim)
+            if fsim[k_best] < best_f:
+                best_f = fsim[k_best]
+                results[i, 0] = 1 - fsim[k_best]
+                results[i, 1] = nfev
+                results[i, 2 : 2 + n_variables] = sim[k_best]
+                results[i, -1] = j
+
+    return results
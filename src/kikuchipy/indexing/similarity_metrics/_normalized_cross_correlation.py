@@ -225,6 +225,50 @@ def _ncc_single_patterns_1d_float32_exp_centered(
     )
 
 
+@njit(cache=True, nogil=True, fastmath=True)
+def _ncc_single_patterns_1d_exp_centered_with_gradient(
+    exp: np.ndarray,
+    sim: np.ndarray,
+    sim_gradient: np.ndarray,
+    exp_squared_norm: float,
+) -> tuple[float, np.ndarray]:
+    """Return the normalized cross-correlation (NCC) coefficient
+    between two 1D patterns and its derivatives with respect to a number
+    of control variables.
+
+    Parameters
+    ----------
+    exp
+        1D array of shape (n_pixels,) already centered.
+    sim
+        1D array of shape (n_pixels,).
+    sim_gradient
+        Derivatives of the simulated pattern intensities with respect to
+        the control variables, of shape (n_variables, n_pixels).
+    exp_squared_norm
+        Squared norm of experimental pattern.
+
+    Returns
+    -------
+    ncc
+        NCC coefficient as 64-bit float.
+    ncc_gradient
+        Derivatives of the NCC coefficient of shape (n_variables,).
+    """
+    sim_centered = sim - np.mean(sim)
+    sim_squared_norm = np.sum(np.square(sim_centered))
+    norm = np.sqrt(exp_squared_norm * sim_squared_norm)
+    ncc = np.sum(exp * sim_centered) / norm
+
+    # Derivative of the NCC coefficient with respect to each simulated
+    # intensity. The terms from the mean cancel since both patterns are
+    # centered.
+    dncc_dsim = exp / norm - ncc * sim_centered / sim_squared_norm
+    ncc_gradient = np.dot(sim_gradient, dncc_dsim)
+
+    return ncc, ncc_gradient
+
+
 def _zero_mean_normalize_patterns_numpy(patterns: np.ndarray) -> np.ndarray:
     patterns_mean = np.mean(patterns, axis=1, keepdims=True)
     patterns -= patterns_mean
@@ -0,0 +1,357 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+import dask.array as da
+import numpy as np
+
+from kikuchipy.indexing.similarity_metrics._normalized_cross_correlation import (
+    NormalizedCrossCorrelationMetric,
+)
+
+
+class PCANormalizedCrossCorrelationMetric(NormalizedCrossCorrelationMetric):
+    r"""Similarity metric implementing an approximate normalized
+    cross-correlation (NCC) computed in a reduced basis fitted to the
+    dictionary, as in principal component analysis (PCA) dictionary
+    indexing.
+
+    Experimental and dictionary patterns are first prepared as in
+    :class:`~kikuchipy.indexing.NormalizedCrossCorrelationMetric`. A
+    truncated basis of :attr:`n_components` vectors is then fitted to
+    the prepared dictionary patterns by a singular value decomposition
+    (SVD). All patterns are projected onto this basis, and the dot
+    products of the projected patterns approximate the NCC scores at a
+    fraction of the cost. For each experimental pattern, the
+    :attr:`n_candidates` dictionary patterns with the highest
+    approximate scores are re-scored with the exact NCC score.
+
+    The scores of dictionary patterns which are not among the candidates
+    are set to ``-inf``, so :attr:`n_candidates` must be at least as
+    high as the number of best matches to keep.
+
+    In :meth:`~kikuchipy.signals.EBSD.dictionary_indexing`, the basis is
+    fitted to patterns evenly spaced in the whole dictionary with
+    :meth:`fit_basis_to_dictionary` before matching, also when the
+    dictionary is matched in multiple iterations. A basis fitted this
+    way is fitted anew in every call, while a basis set via
+    :attr:`basis` is kept. When calling :meth:`match` directly, the
+    basis is fitted to the dictionary patterns passed if not set.
+
+    The default number of components and candidates recovers the best
+    matches of the exact NCC metric when indexing the
+    :func:`~kikuchipy.data.nickel_ebsd_small` patterns with a dictionary
+    sampled with a 4 degree resolution. Fewer components or candidates
+    are faster, at the risk of missing the best match.
+
+    See :class:`~kikuchipy.indexing.SimilarityMetric` for the
+    description of the other initialization parameters and the list of
+    attributes.
+
+    Parameters
+    ----------
+    n_components
+        Number of basis vectors to match patterns with. Default is 400.
+    n_candidates
+        Number of best matching dictionary patterns per experimental
+        pattern to re-score with the exact NCC. Default is 200.
+    """
+
+    def __init__(
+        self,
+        n_experimental_patterns: int | None = None,
+        n_dictionary_patterns: int | None = None,
+        navigation_mask: np.ndarray | None = None,
+        signal_mask: np.ndarray | None = None,
+        dtype: str | np.dtype | type = "float32",
+        rechunk: bool = False,
+        n_components: int = 400,
+        n_candidates: int = 200,
+    ) -> None:
+        """Create a similarity metric matching experimental and
+        simulated EBSD patterns in a reduced basis.
+        """
+        super().__init__(
+            n_experimental_patterns=n_experimental_patterns,
+            n_dictionary_patterns=n_dictionary_patterns,
+            navigation_mask=navigation_mask,
+            signal_mask=signal_mask,
+            dtype=dtype,
+            rechunk=rechunk,
+        )
+        self._n_components = n_components
+        self._n_candidates = n_candidates
+        self._basis = None
+        self._basis_is_fitted = False
+
+    def __repr__(self) -> str:
+        string = super().__repr__()
+        string += (
+            f", n components: {self.n_components}, n candidates: {self.n_candidates}"
+        )
+        return string
+
+    @property
+    def signal_mask(self) -> np.ndarray:
+        """Return or set the boolean mask equal to the experimental
+        patterns' detector shape ``(s rows, s columns)``.
+
+        Setting this resets :attr:`basis` if it was fitted by the
+        metric.
+
+        Parameters
+        ----------
+        value
+            Signal mask where pixels set to ``False`` are matched.
+        """
+        return self._signal_mask
+
+    @signal_mask.setter
+    def signal_mask(self, value: np.ndarray) -> None:
+        """Set the boolean mask equal to the experimental patterns'
+        detector shape ``(s rows, s columns)``.
+        """
+        self._signal_mask = value
+        if self._basis_is_fitted:
+            self.basis = None
+
+    @property
+    def n_components(self) -> int:
+        """Return or set the number of basis vectors to match patterns
+        with.
+
+        Setting this resets :attr:`basis`.
+
+        Parameters
+        ----------
+        value
+            Number of basis vectors.
+        """
+        return self._n_components
+
+    @n_components.setter
+    def n_components(self, value: int) -> None:
+        """Set the number of basis vectors to match patterns with."""
+        self._n_components = value
+        self._basis = None
+
+    @property
+    def n_candidates(self) -> int:
+        """Return or set the number of best matching dictionary patterns
+        per experimental pattern to re-score with the exact NCC.
+
+        Parameters
+        ----------
+        value
+            Number of candidates.
+        """
+        return self._n_candidates
+
+    @n_candidates.setter
+    def n_candidates(self, value: int) -> None:
+        """Set the number of best matching dictionary patterns per
+        experimental pattern to re-score with the exact NCC.
+        """
+        self._n_candidates = value
+
+    @property
+    def basis(self) -> np.ndarray | None:
+        """Return or set the basis of shape ``(n_components, n_pixels)``
+        to match patterns in.
+
+        A basis set here is not fitted anew to the dictionary in
+        :meth:`~kikuchipy.signals.EBSD.dictionary_indexing`.
+
+        Parameters
+        ----------
+        value
+            Orthonormal basis vectors, one per row. The number of
+            columns must equal the number of unmasked pixels.
+        """
+        return self._basis
+
+    @basis.setter
+    def basis(self, value: np.ndarray | None) -> None:
+        """Set the basis to match patterns in."""
+        if value is not None:
+            value = np.asarray(value, dtype=self.dtype)
+        self._basis = value
+        self._basis_is_fitted = False
+
+    def fit_basis(self, patterns: np.ndarray | da.Array) -> None:
+        """Fit a truncated basis to prepared dictionary patterns.
+
+        At most ``max(1000, 10 * n_components)`` patterns evenly spaced
+        along the first axis are used.
+
+        Parameters
+        ----------
+        patterns
+            Prepared dictionary patterns of shape
+            ``(n_patterns, n_pixels)``.
+        """
+        n_patterns = patterns.shape[0]
+        n_fit = min(n_patterns, max(1000, 10 * self.n_components))
+        idx = np.linspace(0, n_patterns - 1, n_fit).round().astype(int)
+        sample = patterns[idx]
+        if isinstance(sample, da.Array):
+            sample = sample.compute()
+        sample = np.asarray(sample, dtype=np.float64)
+
+        _, _, vt = np.linalg.svd(sample, full_matrices=False)
+        n_components = min(self.n_components, vt.shape[0])
+        self.basis = vt[:n_components]
+        self._basis_is_fitted = True
+
+    def fit_basis_to_dictionary(
+        self, dictionary: np.ndarray | da.Array, keep_n: int | None = None
+    ) -> None:
+        """Fit a truncated basis to patterns evenly spaced in the whole
+        dictionary, unless :attr:`basis` is set by the user.
+
+        At most ``max(1000, 10 * n_components)`` patterns are prepared
+        with :meth:`prepare_dictionary` and passed to
+        :meth:`fit_basis`.
+
+        Parameters
+        ----------
+        dictionary
+            Dictionary patterns of shape ``(n_patterns, n_pixels)``,
+            not prepared. Must support indexing with an integer array
+            along the first axis.
+        keep_n
+            Number of best matches to keep per experimental pattern. If
+            given, it cannot exceed :attr:`n_candidates`.
+
+        Raises
+        ------
+        ValueError
+            If ``keep_n`` is greater than :attr:`n_candidates`.
+        """
+        if keep_n is not None and keep_n > self.n_candidates:
+            raise ValueError(
+                f"The number of best matches to keep, {keep_n}, cannot be greater "
+                f"than the number of candidates {self.n_candidates}"
+            )
+        if self.basis is not None and not self._basis_is_fitted:
+            return
+
+        n_patterns = dictionary.shape[0]
+        n_fit = min(n_patterns, max(1000, 10 * self.n_components))
+        idx = np.linspace(0, n_patterns - 1, n_fit).round().astype(int)
+        self.fit_basis(self.prepare_dictionary(dictionary[idx]))
+
+    def match(
+        self,
+        experimental: np.ndarray | da.Array,
+        dictionary: np.ndarray | da.Array,
+    ) -> da.Array:
+        """Match all experimental patterns to all dictionary patterns
+        in the reduced basis and return their similarities.
+
+        The basis is fitted to the dictionary patterns if
+        :attr:`basis` is not set.
+
+        Parameters
+        ----------
+        experimental
+            Experimental patterns.
+        dictionary
+            Dictionary patterns.
+
+        Returns
+        -------
+        scores
+            Exact normalized cross-correlation scores of the best
+            candidates per experimental pattern, ``-inf`` otherwise.
+        """
+        if self.basis is None:
+            self.fit_basis(dictionary)
+        basis = self.basis
+        if basis.shape[1] != dictionary.shape[1]:
+            raise ValueError(
+                f"The basis has {basis.shape[1]} pixels per vector, but the patterns "
+                f"have {dictionary.shape[1]}. Set `basis` to None to fit a new basis"
+            )
+
+        experimental = da.asarray(experimental)
+        dictionary = da.asarray(dictionary).rechunk((-1, -1))
+        dictionary_reduced = da.matmul(dictionary, basis.T.astype(dictionary.dtype))
+
+        return da.blockwise(
+            _match_in_reduced_basis,
+            "im",
+            experimental,
+            "ik",
+            dictionary,
+            "mk",
+            dictionary_reduced,
+            "mj",
+            concatenate=True,
+            dtype=self.dtype,
+            basis=basis,
+            n_candidates=self.n_candidates,
+        )
+
+
+def _match_in_reduced_basis(
+    experimental: np.ndarray,
+    dictionary: np.ndarray,
+    dictionary_reduced: np.ndarray,
+    basis: np.ndarray,
+    n_candidates: int,
+) -> np.ndarray:
+    """Return exact similarities of the best candidates found in the
+    reduced basis per experimental pattern, and ``-inf`` otherwise.
+
+    Parameters
+    ----------
+    experimental
+        Prepared experimental patterns of shape (n, n_pixels).
+    dictionary
+        Prepared dictionary patterns of shape (m, n_pixels).
+    dictionary_reduced
+        Dictionary patterns projected onto the basis, of shape
+        (m, n_components).
+    basis
+        Basis of shape (n_components, n_pixels).
+    n_candidates
+        Number of candidates to re-score per experimental pattern.
+
+    Returns
+    -------
+    similarities
+        Array of shape (n, m).
+    """
+    experimental_reduced = experimental @ basis.T
+    similarities_approx = experimental_reduced @ dictionary_reduced.T
+
+    n, m = similarities_approx.shape
+    n_candidates = min(n_candidates, m)
+    if n_candidates < m:
+        candidates = np.argpartition(-similarities_approx, n_candidates - 1, axis=1)[
+            :, :n_candidates
+        ]
+    else:
+        candidates = np.tile(np.arange(m), (n, 1))
+
+    similarities = np.full((n, m), -np.inf, dtype=experimental.dtype)
+    rows = np.arange(n)
+    for j in range(n_candidates):
+        idx = candidates[:, j]
+        similarities[rows, idx] = np.sum(experimental * dictionary[idx], axis=1)
+
+    return similarities
@@ -422,7 +422,8 @@ def _save(
             )
 
         _ensure_directory(filename)
-        is_file = os.path.isfile(filename)
+        # Zarr stores are directories
+        is_file = os.path.exists(filename)
 
         # Check if we are to add signal to an already existing h5ebsd file
         if writer["name"] == "kikuchipy_h5ebsd" and overwrite is not True and is_file:
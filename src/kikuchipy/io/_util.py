@@ -48,7 +48,7 @@ def _get_input_bool(question: str, warning: str) -> bool:
 
 
 def _overwrite(fname: Path | str) -> bool:
-    if Path(fname).is_file():
+    if Path(fname).exists():
         return _get_input_bool(
             f"Overwrite {fname!r} (y/n)?\n",
             (
@@ -34,6 +34,7 @@
     emsoft_ecp_master_pattern
     emsoft_tkd_master_pattern
     kikuchipy_h5ebsd
+    kikuchipy_zarr
     nordif
     nordif_calibration_patterns
     oxford_binary
@@ -0,0 +1,186 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Generic, private functions for reading patterns stored one after
+the other in binary files.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import dask.array as da
+import numpy as np
+
+from kikuchipy.signals.util._dask import get_chunking
+
+
+def _read_patterns(
+    filename: str | Path,
+    offsets: np.ndarray,
+    data_shape: tuple[int, ...],
+    dtype: np.dtype | type,
+    stride: int,
+    lazy: bool = False,
+    n_threads: int | None = 1,
+) -> np.ndarray | da.Array:
+    """Return patterns read from a binary file in chunks.
+
+    Chunks of whole patterns along the navigation dimensions are
+    determined by :func:`~kikuchipy.signals.util.get_chunking`. Each
+    chunk is read from the byte range spanning its patterns only, see
+    :func:`_read_chunk`.
+
+    Parameters
+    ----------
+    filename
+        Path to the binary file.
+    offsets
+        File byte position of the first pixel of each pattern, in the
+        navigation shape ``data_shape[:-2]``.
+    data_shape
+        Shape of the returned array, with the navigation dimensions
+        first and the two signal dimensions last.
+    dtype
+        Data type of the patterns in the file.
+    stride
+        Number of bytes from the start of one pattern to the start of
+        the next in the file, including any pattern headers and
+        footers. All offsets must be a multiple of this apart.
+    lazy
+        Whether to return a :class:`dask.array.Array` reading chunks
+        from file when computed instead of a :class:`numpy.ndarray`.
+        Default is False.
+    n_threads
+        Number of threads to read patterns with if ``lazy=False``.
+        Default is 1, reading all patterns with one copy from a memory
+        map of the file. If more than one, patterns are read in parts
+        of the chunk size in parallel, at the cost of an extra copy per
+        part. If None, the default of
+        :class:`~concurrent.futures.ThreadPoolExecutor` is used.
+
+    Returns
+    -------
+    data
+        Patterns of shape ``data_shape``.
+    """
+    nav_dim = len(data_shape) - 2
+    sig_shape = tuple(data_shape[nav_dim:])
+    offsets = np.asarray(offsets, dtype=np.int64).reshape(data_shape[:nav_dim])
+    chunks = get_chunking(
+        data_shape=data_shape, nav_dim=nav_dim, sig_dim=2, dtype=dtype
+    )
+    kwargs = dict(
+        filename=str(filename),
+        sig_shape=sig_shape,
+        pattern_dtype=dtype,
+        stride=stride,
+    )
+
+    if lazy:
+        offsets = da.from_array(offsets, chunks=chunks[:nav_dim])
+        return da.map_blocks(
+            _read_chunk,
+            offsets,
+            new_axis=(nav_dim, nav_dim + 1),
+            chunks=chunks,
+            dtype=dtype,
+            meta=np.array((), dtype=dtype),
+            **kwargs,
+        )
+
+    if n_threads == 1:
+        return _read_chunk(offsets, **kwargs)
+
+    # Read the same number of patterns per thread as in a chunk, but
+    # consecutive in navigation order so that patterns can be copied
+    # into a view of the returned array
+    n_patterns = offsets.size
+    n_per_chunk = int(np.prod([c[0] for c in chunks[:nav_dim]]))
+    offsets = offsets.ravel()
+    data = np.empty((n_patterns,) + sig_shape, dtype=dtype)
+
+    def read_into_data(start: int) -> None:
+        end = min(start + n_per_chunk, n_patterns)
+        _read_chunk(offsets[start:end], out=data[start:end], **kwargs)
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        # Consume the iterator to raise potential errors
+        _ = list(executor.map(read_into_data, range(0, n_patterns, n_per_chunk)))
+
+    return data.reshape(data_shape)
+
+
+def _read_chunk(
+    offsets: np.ndarray,
+    filename: str,
+    sig_shape: tuple[int, int],
+    pattern_dtype: np.dtype | type,
+    stride: int,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Return patterns read from a binary file.
+
+    Only the byte range spanning the patterns is memory mapped.
+
+    Parameters
+    ----------
+    offsets
+        File byte position of the first pixel of each pattern, in the
+        navigation shape of the chunk.
+    filename
+        Path to the binary file.
+    sig_shape
+        Shape of each pattern.
+    pattern_dtype
+        Data type of the patterns.
+    stride
+        Number of bytes from the start of one pattern to the start of
+        the next.
+    out
+        Array of shape ``offsets.shape + sig_shape`` to copy the
+        patterns into.
+
+    Returns
+    -------
+    patterns
+        Patterns of shape ``offsets.shape + sig_shape``.
+    """
+    dtype = np.dtype(pattern_dtype)
+    sig_shape = tuple(sig_shape)
+    n_bytes = int(np.prod(sig_shape)) * dtype.itemsize
+
+    first = int(offsets.min())
+    n_records = (int(offsets.max()) - first) // stride + 1
+    buffer = np.memmap(
+        filename,
+        dtype=np.uint8,
+        mode="r",
+        offset=first,
+        shape=((n_records - 1) * stride + n_bytes,),
+    )
+    records = np.ndarray(
+        shape=(n_records,) + sig_shape,
+        dtype=dtype,
+        buffer=buffer,
+        strides=(stride, sig_shape[1] * dtype.itemsize, dtype.itemsize),
+    )
+
+    patterns = records[(offsets - first) // stride]
+    if out is not None:
+        out[:] = patterns
+
+    return patterns
@@ -26,6 +26,8 @@ import dask.array as da
 import h5py
 import numpy as np
 
+from kikuchipy.constants import installed
+
 __all__ = ["_dict2hdf5group", "_hdf5group2dict", "H5EBSDReader"]
 
 
@@ -140,6 +142,10 @@ class H5EBSDReader(abc.ABC):
     supported_manufacturers = ["bruker nano", "edax", "kikuchipy", "oxford instruments"]
 
     def __init__(self, filename: str | Path, **kwargs) -> None:
+        if installed["hdf5plugin"]:
+            # Register compression filters, e.g. Blosc, with HDF5
+            import hdf5plugin  # noqa: F401
+
         self.filename = str(filename)
         self.file = h5py.File(filename, **kwargs)
         self.scan_groups = self.get_scan_groups()
@@ -24,16 +24,16 @@ from pathlib import Path
 from typing import BinaryIO
 import warnings
 
-import dask.array as da
 import numpy as np
 
-from kikuchipy.signals.util._dask import get_chunking
+from kikuchipy.io.plugins._binary import _read_patterns
 
 
 def file_reader(
     filename: str | Path,
     nav_shape: tuple[int, int] | None = None,
     lazy: bool = False,
+    n_threads: int | None = 1,
 ) -> list[dict]:
     """Read EBSD patterns from an EDAX binary UP1/2 file.
 
@@ -55,6 +55,10 @@ def file_reader(
     lazy
         Read the data lazily without actually reading the data from disk
         until required. Default is False.
+    n_threads
+        Number of threads to read patterns with if ``lazy=False``.
+        Default is 1. If None, the number of threads is chosen by
+        :class:`~concurrent.futures.ThreadPoolExecutor`.
 
     Returns
     -------
@@ -82,7 +86,7 @@ def file_reader(
     """
     with open(filename, mode="rb") as f:
         reader = EDAXBinaryFileReader(f)
-        scan = reader.read_scan(nav_shape, lazy)
+        scan = reader.read_scan(nav_shape, lazy, n_threads)
     return [scan]
 
 
@@ -152,7 +156,10 @@ class EDAXBinaryFileReader:
         }
 
     def read_scan(
-        self, nav_shape: tuple[int, int] | None = None, lazy: bool = False
+        self,
+        nav_shape: tuple[int, int] | None = None,
+        lazy: bool = False,
+        n_threads: int | None = 1,
     ) -> dict:
         """Return a dictionary with scan information and patterns.
 
@@ -163,6 +170,9 @@ class EDAXBinaryFileReader:
             None.
         lazy
             Whether to reader patterns lazily. Default is False.
+        n_threads
+            Number of threads to read patterns with if ``lazy=False``.
+            Default is 1.
 
         Returns
         -------
@@ -189,21 +199,18 @@ class EDAXBinaryFileReader:
         ndim = len(data_shape)
         nav_dim = ndim - 2
 
-        data = np.memmap(
+        n_bytes = sy * sx * np.dtype(self.dtype).itemsize
+        offsets = header["pattern_offset"] + n_bytes * np.arange(ny * nx)
+        data = _read_patterns(
             self.file.name,
+            offsets=offsets,
+            data_shape=data_shape,
             dtype=self.dtype,
-            shape=data_shape,
-            mode="c",
-            offset=header["pattern_offset"],
+            stride=n_bytes,
+            lazy=lazy,
+            n_threads=n_threads,
         )
 
-        if lazy:
-            data = da.from_array(data)
-            chunks = get_chunking(
-                data_shape=data_shape, nav_dim=nav_dim, sig_dim=2, dtype=self.dtype
-            )
-            data = data.rechunk(chunks)
-
         units = ["um"] * ndim
         scales = [header["dy"], header["dx"]] + [1, 1][:nav_dim]
         axes_names = ["y", "x"][-nav_dim:] + ["dy", "dx"]
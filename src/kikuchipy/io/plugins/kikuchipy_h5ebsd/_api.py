@@ -30,10 +30,12 @@ from orix.io.plugins.orix_hdf5 import crystalmap2dict, dict2crystalmap
 from rsciio.hspy._api import overwrite_dataset
 
 from kikuchipy import __version__ as kikuchipy_version
+from kikuchipy.constants import installed
 from kikuchipy.detectors.ebsd_detector import EBSDDetector
 from kikuchipy.io._util import _get_input_variable
 from kikuchipy.io.plugins._h5ebsd import H5EBSDReader, _dict2hdf5group, _hdf5group2dict
 from kikuchipy.signals.util._crystal_map import _xmap_is_compatible_with_signal
+from kikuchipy.signals.util._dask import get_chunking
 
 if TYPE_CHECKING:  # pragma: no cover
     from kikuchipy.signals.ebsd import EBSD, LazyEBSD
@@ -364,15 +366,97 @@ class KikuchipyH5EBSDWriter:
             xmap = CrystalMap.empty(shape=(ny, nx), step_sizes=(dy, dx))
         return crystalmap2dict(xmap)
 
-    def write(self, scan_number: int = 1, **kwargs) -> None:
+    def get_patterns_chunks(
+        self,
+        chunk_shape: int | None = None,
+        chunk_bytes: int | float | str | None = None,
+    ) -> tuple[int, int, int] | None:
+        """Return chunks of the patterns dataset of shape
+        ``(n patterns, sy, sx)``, or *None* if neither *chunk_shape*
+        nor *chunk_bytes* is given.
+
+        The number of patterns per chunk is the number of patterns in a
+        navigation chunk returned by
+        :func:`~kikuchipy.signals.util.get_chunking`. If this is at
+        least the number of map columns, it is rounded down to a whole
+        number of map rows, so that stored chunks are aligned with
+        navigation chunks of the reshaped patterns on reading.
+
+        Parameters
+        ----------
+        chunk_shape
+            Shape of navigation chunks passed on to
+            :func:`~kikuchipy.signals.util.get_chunking`.
+        chunk_bytes
+            Number of bytes in each chunk passed on to
+            :func:`~kikuchipy.signals.util.get_chunking`. Default
+            there is 30e6, i.e. 30 MB.
+
+        Returns
+        -------
+        chunks
+            Chunks of the patterns dataset.
+        """
+        if chunk_shape is None and chunk_bytes is None:
+            return None
+        (ny, nx, sy, sx), _ = self.data_shape_scale
+        kw = dict(chunk_shape=chunk_shape)
+        if chunk_bytes is not None:
+            kw["chunk_bytes"] = chunk_bytes
+        chunks = get_chunking(signal=self.signal, **kw)
+        nav_dim = self.signal.axes_manager.navigation_dimension
+        n_per_chunk = int(np.prod([c[0] for c in chunks[:nav_dim]]))
+        n_per_chunk = min(n_per_chunk, ny * nx)
+        if n_per_chunk >= nx:
+            n_per_chunk -= n_per_chunk % nx
+        return n_per_chunk, sy, sx
+
+    def write(
+        self,
+        scan_number: int = 1,
+        compression: str | None = None,
+        compression_opts: int | None = None,
+        shuffle: bool = False,
+        chunk_shape: int | None = None,
+        chunk_bytes: int | float | str | None = None,
+        **kwargs,
+    ) -> None:
         """Write an :class:`~kikuchipy.signals.EBSD` to file.
 
         The file is closed after writing.
 
+        Patterns of a lazy signal are written chunk by chunk with
+        :func:`dask.array.store`, so that the full dataset is never
+        held in memory.
+
         Parameters
         ----------
         scan_number
             Scan number in the file, e.g. "Scan 1" (default).
+        compression
+            Compression filter of the patterns dataset, either
+            ``"gzip"``, ``"lzf"`` or ``"blosc"``. Default is no
+            compression. Blosc (with the Zstandard compressor) requires
+            :doc:`hdf5plugin <hdf5plugin:index>` both for writing and
+            reading.
+        compression_opts
+            Compression level of ``"gzip"`` (0-9, default 4) or
+            ``"blosc"`` (0-9, default 5). Not used with ``"lzf"``.
+        shuffle
+            Whether to apply the byte shuffle filter to the patterns
+            before compression. Default is False. Usually improves
+            compression of patterns with more than one byte per pixel.
+        chunk_shape
+            Shape of navigation chunks passed on to
+            :func:`~kikuchipy.signals.util.get_chunking` to determine
+            the number of patterns per chunk in the patterns dataset.
+            See :meth:`get_patterns_chunks`. If neither this nor
+            *chunk_bytes* is given, the chunks of a lazy signal are
+            used, or chunks are determined by RosettaSciIO for a
+            non-lazy signal.
+        chunk_bytes
+            Number of bytes in each chunk passed on to
+            :func:`~kikuchipy.signals.util.get_chunking`.
         **kwargs
             Keyword arguments passed to
             :meth:`h5py.Group.require_dataset`.
@@ -380,8 +464,16 @@ class KikuchipyH5EBSDWriter:
         Raises
         ------
         ValueError
-            If the file exists but *scan_number* is *None* or *False*.
+            If the file exists but *scan_number* is *None* or *False*,
+            or if an unknown compression filter is given.
+        ImportError
+            If ``compression="blosc"`` but hdf5plugin is not installed.
         """
+        patterns_kwargs = _get_compression_kwargs(
+            compression, compression_opts, shuffle
+        )
+        chunks = self.get_patterns_chunks(chunk_shape, chunk_bytes)
+
         if self.file_exists:
             valid_scan_number = self.get_valid_scan_number(scan_number)
         else:
@@ -400,6 +492,8 @@ class KikuchipyH5EBSDWriter:
             data=self.signal.data.reshape(ny * nx, sy, sx),
             key="patterns",
             signal_axes=(2, 1),
+            chunks=chunks,
+            **patterns_kwargs,
             **kwargs,
         )
 
@@ -463,6 +557,11 @@ def file_writer(
     signal: "EBSD | LazyEBSD",
     add_scan: bool | None = None,
     scan_number: int = 1,
+    compression: str | None = None,
+    compression_opts: int | None = None,
+    shuffle: bool = False,
+    chunk_shape: int | None = None,
+    chunk_bytes: int | float | str | None = None,
     **kwargs,
 ) -> None:
     """Write an :class:`~kikuchipy.signals.EBSD` or
@@ -486,8 +585,77 @@ def file_writer(
     scan_number
         Scan number in name of HDF dataset when writing to an existing,
         but not open, h5ebsd file.
+    compression
+        Compression filter of the patterns dataset, either ``"gzip"``,
+        ``"lzf"`` or ``"blosc"``. Default is no compression. Blosc
+        requires :doc:`hdf5plugin <hdf5plugin:index>`.
+    compression_opts
+        Compression level of ``"gzip"`` (0-9, default 4) or ``"blosc"``
+        (0-9, default 5).
+    shuffle
+        Whether to apply the byte shuffle filter to the patterns before
+        compression. Default is False.
+    chunk_shape
+        Shape of navigation chunks used to determine the number of
+        patterns per chunk in the patterns dataset.
+    chunk_bytes
+        Number of bytes in each chunk of the patterns dataset.
     **kwargs
         Keyword arguments passed to :meth:`h5py.Group.require_dataset`.
+
+    See Also
+    --------
+    KikuchipyH5EBSDWriter.write
     """
     writer = KikuchipyH5EBSDWriter(filename, signal, add_scan)
-    writer.write(scan_number, **kwargs)
+    writer.write(
+        scan_number,
+        compression=compression,
+        compression_opts=compression_opts,
+        shuffle=shuffle,
+        chunk_shape=chunk_shape,
+        chunk_bytes=chunk_bytes,
+        **kwargs,
+    )
+
+
+def _get_compression_kwargs(
+    compression: str | None = None,
+    compression_opts: int | None = None,
+    shuffle: bool = False,
+) -> dict:
+    """Return keyword arguments passed to
+    :meth:`h5py.Group.require_dataset` to compress a dataset.
+    """
+    compressions = [None, "gzip", "lzf", "blosc"]
+    if compression not in compressions:
+        raise ValueError(f"'{compression}' must be either of {compressions}")
+
+    if compression == "blosc":
+        if not installed["hdf5plugin"]:  # pragma: no cover
+            raise ImportError(
+                "`hdf5plugin` is required to write patterns with Blosc compression, "
+                "see the installation guide for more information"
+            )
+        import hdf5plugin
+
+        if compression_opts is None:
+            compression_opts = 5
+        if shuffle:
+            blosc_shuffle = hdf5plugin.Blosc.SHUFFLE
+        else:
+            blosc_shuffle = hdf5plugin.Blosc.NOSHUFFLE
+        return dict(
+            hdf5plugin.Blosc(
+                cname="zstd", clevel=compression_opts, shuffle=blosc_shuffle
+            )
+        )
+
+    kwargs = {}
+    if compression is not None:
+        kwargs["compression"] = compression
+        if compression == "gzip" and compression_opts is not None:
+            kwargs["compression_opts"] = compression_opts
+    if shuffle:
+        kwargs["shuffle"] = True
+    return kwargs
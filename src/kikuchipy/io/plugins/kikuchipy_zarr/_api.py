@@ -0,0 +1,290 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+"""Reader and writer of EBSD data from a kikuchipy Zarr store."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import dask.array as da
+import numpy as np
+from orix.io.plugins.orix_hdf5 import crystalmap2dict, dict2crystalmap
+
+from kikuchipy import __version__ as kikuchipy_version
+from kikuchipy.constants import installed
+from kikuchipy.detectors.ebsd_detector import EBSDDetector
+from kikuchipy.signals.util._crystal_map import _xmap_is_compatible_with_signal
+from kikuchipy.signals.util._dask import get_chunking
+
+if TYPE_CHECKING:  # pragma: no cover
+    import zarr
+
+    from kikuchipy.signals.ebsd import EBSD, LazyEBSD
+
+
+def file_reader(filename: str | Path, lazy: bool = False) -> list[dict]:
+    """Read electron backscatter diffraction patterns, a crystal map,
+    and an EBSD detector from a kikuchipy Zarr store.
+
+    Not meant to be used directly; use :func:`~kikuchipy.load`.
+
+    Parameters
+    ----------
+    filename
+        Path to the Zarr directory store.
+    lazy
+        Open the data lazily without actually reading the data from disk
+        until required. Allows opening arbitrary sized datasets. Default
+        is False. Chunks of the returned Dask array are the chunks of
+        the stored patterns.
+
+    Returns
+    -------
+    scan_dict_list
+        Data, axes, metadata and original metadata.
+
+    Raises
+    ------
+    IOError
+        If the store was not written by kikuchipy.
+    """
+    zarr = _import_zarr()
+
+    root = zarr.open_group(str(filename), mode="r")
+    attrs = dict(root.attrs)
+    if attrs.get("manufacturer") != "kikuchipy" or "patterns" not in root:
+        raise IOError(f"{str(filename)!r} is not a kikuchipy Zarr store")
+
+    patterns = root["patterns"]
+    if lazy:
+        data = da.from_zarr(patterns)
+    else:
+        data = patterns[...]
+
+    scan_dict = {
+        "data": data,
+        "axes": attrs["axes"],
+        "metadata": {
+            "Acquisition_instrument": {"SEM": attrs.get("sem", {})},
+            "General": {
+                "original_filename": Path(filename).name,
+                "title": attrs.get("title", ""),
+            },
+            "Signal": {"signal_type": "EBSD", "record_by": "image"},
+        },
+        "original_metadata": {
+            "manufacturer": attrs["manufacturer"],
+            "version": attrs["version"],
+        },
+    }
+
+    if "static_background" in root:
+        scan_dict["static_background"] = root["static_background"][...]
+
+    if "crystal_map" in root:
+        xmap_dict = _zarrgroup2dict(root["crystal_map"])
+        scan_dict["xmap"] = dict2crystalmap(xmap_dict)
+
+    scan_dict["detector"] = EBSDDetector(pc=root["pc"][...], **attrs["detector"])
+
+    return [scan_dict]
+
+
+def file_writer(
+    filename: str | Path,
+    signal: "EBSD | LazyEBSD",
+    chunk_shape: int | None = None,
+    chunk_bytes: int | float | str = 30e6,
+    cname: str = "zstd",
+    clevel: int = 5,
+) -> None:
+    """Write an :class:`~kikuchipy.signals.EBSD` or
+    :class:`~kikuchipy.signals.LazyEBSD` signal to a kikuchipy Zarr
+    directory store.
+
+    Not meant to be used directly; use
+    :func:`~kikuchipy.signals.EBSD.save`.
+
+    Patterns are stored in chunks of whole patterns, chunked along the
+    navigation dimensions only. Patterns of a lazy signal are rechunked
+    to these chunks and written with :func:`dask.array.store` without a
+    lock. Each chunk is thus written to a separate file by a separate
+    task, so that chunks can be processed and written in parallel by
+    multiple threads, processes or distributed workers.
+
+    Parameters
+    ----------
+    filename
+        Path to the Zarr directory store. Overwritten if it exists.
+    signal
+        Signal instance.
+    chunk_shape
+        Shape of navigation chunks. If not given, this is determined
+        from ``chunk_bytes`` with
+        :func:`~kikuchipy.signals.util.get_chunking`. If not given
+        and the signal is lazy and not chunked in the signal
+        dimensions, the signal's chunks are used.
+    chunk_bytes
+        Number of bytes in each chunk. Default is 30e6, i.e. 30 MB.
+        Only used if ``chunk_shape`` is not given.
+    cname
+        Name of the compressor used by Blosc. Default is ``"zstd"``.
+    clevel
+        Compression level between 0 and 9. Default is 5.
+    """
+    zarr = _import_zarr()
+    from zarr.codecs import BloscCodec
+
+    data = signal.data
+    nav_dim = signal.axes_manager.navigation_dimension
+    sig_dim = signal.axes_manager.signal_dimension
+
+    is_lazy = isinstance(data, da.Array)
+    if chunk_shape is None and is_lazy and data.numblocks[nav_dim:] == (1,) * sig_dim:
+        chunks = data.chunksize
+    else:
+        chunks = get_chunking(
+            signal=signal, chunk_shape=chunk_shape, chunk_bytes=chunk_bytes
+        )
+        chunks = tuple(c[0] for c in chunks)
+
+    root = zarr.open_group(str(filename), mode="w")
+
+    patterns = root.create_array(
+        "patterns",
+        shape=data.shape,
+        chunks=chunks,
+        dtype=data.dtype,
+        compressors=BloscCodec(cname=cname, clevel=clevel, shuffle="bitshuffle"),
+    )
+    if is_lazy:
+        da.store(data.rechunk(chunks), patterns, lock=False)
+    else:
+        patterns[...] = data
+
+    # --- Axes and metadata
+    axes = []
+    for axis in signal.axes_manager._axes:
+        axis_dict = {
+            "name": str(axis.name),
+            "size": int(axis.size),
+            "scale": float(axis.scale),
+            "offset": float(axis.offset),
+            "navigate": bool(axis.navigate),
+        }
+        if isinstance(axis.units, str):
+            axis_dict["units"] = axis.units
+        axes.append(axis_dict)
+    md = signal.metadata.as_dictionary()
+    md_sem = md.get("Acquisition_instrument", {}).get("SEM", {})
+    sem = {
+        "beam_energy": md_sem.get("beam_energy", 0),
+        "magnification": md_sem.get("magnification", 0),
+        "microscope": md_sem.get("microscope", ""),
+        "working_distance": md_sem.get("working_distance", 0),
+    }
+
+    # --- Detector
+    detector = signal.detector
+    root.create_array("pc", data=detector.pc)
+
+    root.attrs.update(
+        {
+            "manufacturer": "kikuchipy",
+            "version": kikuchipy_version,
+            "title": str(md.get("General", {}).get("title", "")),
+            "axes": axes,
+            "sem": _to_json_compatible(sem),
+            "detector": _to_json_compatible(
+                {
+                    "shape": detector.shape,
+                    "px_size": detector.px_size,
+                    "binning": detector.binning,
+                    "tilt": detector.tilt,
+                    "azimuthal": detector.azimuthal,
+                    "twist": detector.twist,
+                    "sample_tilt": detector.sample_tilt,
+                }
+            ),
+        }
+    )
+
+    # --- Static background
+    static_bg = signal.static_background
+    if isinstance(static_bg, da.Array):
+        static_bg = static_bg.compute()
+    if isinstance(static_bg, np.ndarray):
+        root.create_array("static_background", data=static_bg)
+
+    # --- Crystal map
+    xmap = signal.xmap
+    nav_axes = signal.axes_manager.navigation_axes[::-1]
+    if xmap is not None and _xmap_is_compatible_with_signal(xmap, nav_axes):
+        _dict2zarrgroup(crystalmap2dict(xmap), root.create_group("crystal_map"))
+
+
+def _import_zarr() -> Any:
+    if not installed["zarr"]:  # pragma: no cover
+        raise ImportError(
+            "`zarr` is required to read and write Zarr stores, see the installation "
+            "guide for more information"
+        )
+    import zarr
+
+    return zarr
+
+
+def _to_json_compatible(value: Any) -> Any:
+    """Return a value with NumPy scalars and arrays converted to Python
+    scalars and lists, so that it can be stored in Zarr attributes.
+    """
+    if isinstance(value, dict):
+        return {str(k): _to_json_compatible(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_to_json_compatible(v) for v in value]
+    elif isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    else:
+        return value
+
+
+def _dict2zarrgroup(dictionary: dict, group: "zarr.Group") -> None:
+    """Write a dictionary to a Zarr group.
+
+    Nested dictionaries are written to subgroups, arrays with at least
+    one dimension to arrays and all other values to attributes.
+    """
+    for key, val in dictionary.items():
+        if isinstance(val, dict):
+            _dict2zarrgroup(val, group.create_group(key))
+        elif isinstance(val, np.ndarray) and val.ndim > 0:
+            group.create_array(key, data=val)
+        else:
+            group.attrs[key] = _to_json_compatible(val)
+
+
+def _zarrgroup2dict(group: "zarr.Group") -> dict:
+    """Return a dictionary from a Zarr group written by
+    :func:`_dict2zarrgroup`.
+    """
+    dictionary = dict(group.attrs)
+    for key, val in group.members():
+        if isinstance(val, type(group)):
+            dictionary[key] = _zarrgroup2dict(val)
+        else:
+            dictionary[key] = val[...]
+    return dictionary
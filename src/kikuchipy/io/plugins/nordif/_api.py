@@ -25,6 +25,7 @@ import re
 from typing import TYPE_CHECKING
 import warnings
 
+import dask.array as da
 from matplotlib.pyplot import imread
 import numpy as np
 from orix.crystal_map import CrystalMap
@@ -438,17 +439,31 @@ def _get_calibration_pattern_settings(
 def file_writer(filename: str, signal: "EBSD | LazyEBSD") -> None:
     """Write an EBSD signal to a NORDIF binary file.
 
+    Patterns are written in the flyback order of the navigation axes,
+    which is the C order of the data array. Patterns of a non-lazy
+    signal are written with one buffered write. Patterns of a lazy
+    signal are computed and written chunk by chunk into a memory map of
+    the file with :func:`dask.array.store`.
+
     Parameters
     ----------
     filename
-        Full path of HDF file.
+        Full path of NORDIF binary file.
     signal
         Signal instance.
     """
-    with open(filename, "wb") as file:
-        if signal._lazy:
-            for pattern in signal._iterate_signal(iterpath="flyback"):
-                np.array(pattern.flatten()).tofile(file)
-        else:
-            for pattern in signal._iterate_signal(iterpath="flyback"):
-                pattern.flatten().tofile(file)
+    data = signal.data
+    if isinstance(data, da.Array):
+        target = np.memmap(filename, dtype=data.dtype, mode="w+", shape=data.shape)
+        da.store(data, target, lock=False)
+        target.flush()
+        del target
+    else:
+        with open(filename, "wb") as file:
+            if data.ndim > 2 and not data.flags.c_contiguous:
+                # Write one navigation row at a time to avoid copying
+                # the full array
+                for data_row in data:
+                    np.ascontiguousarray(data_row).tofile(file)
+            else:
+                np.ascontiguousarray(data).tofile(file)
@@ -28,16 +28,17 @@ from pathlib import Path
 import struct
 from typing import BinaryIO
 
-import dask
 import dask.array as da
 import numpy as np
 
-from kikuchipy.signals.util._dask import get_chunking
+from kikuchipy.io.plugins._binary import _read_patterns
 
 _logger = logging.getLogger(__name__)
 
 
-def file_reader(filename: str | Path, lazy: bool = False) -> list[dict]:
+def file_reader(
+    filename: str | Path, lazy: bool = False, n_threads: int | None = 1
+) -> list[dict]:
     """Read EBSD patterns from an Oxford Instruments' binary .ebsp file.
 
     Only uncompressed patterns can be read. If only non-indexed patterns
@@ -52,6 +53,10 @@ def file_reader(filename: str | Path, lazy: bool = False) -> list[dict]:
     lazy
         Read the data lazily without actually reading the data from disk
         until required. Default is False.
+    n_threads
+        Number of threads to read patterns with if ``lazy=False``.
+        Default is 1. If None, the number of threads is chosen by
+        :class:`~concurrent.futures.ThreadPoolExecutor`.
 
     Returns
     -------
@@ -65,7 +70,7 @@ def file_reader(filename: str | Path, lazy: bool = False) -> list[dict]:
     """
     with open(filename, mode="rb") as f:
         obf = OxfordBinaryFileReader(f)
-        scan = obf.get_scan(lazy=lazy)
+        scan = obf.get_scan(lazy=lazy, n_threads=n_threads)
     return [scan]
 
 
@@ -371,17 +376,26 @@ class OxfordBinaryFileReader:
             self.pattern_footer_size = 0
         return list(footer_dtype)
 
-    def get_patterns(self, lazy: bool) -> np.ndarray | da.Array:
+    def get_patterns(
+        self, lazy: bool, n_threads: int | None = 1
+    ) -> np.ndarray | da.Array:
         """Return the EBSD patterns in the file.
 
-        The patterns are read from the memory map. They are sorted into
-        their correct navigation (map) position if necessary.
+        The patterns are read in chunks of whole patterns determined by
+        :func:`~kikuchipy.signals.util.get_chunking`. They are sorted
+        into their correct navigation (map) position if necessary. For
+        each chunk, only the byte range spanning its patterns in the
+        file is memory mapped, and the patterns are gathered from this
+        map in navigation order with one indexing operation.
 
         Parameters
         ----------
         lazy
             Whether to return a :class:`numpy.ndarray` or
             :class:`dask.array.Array`.
+        n_threads
+            Number of threads to read patterns with if ``lazy=False``.
+            Default is 1.
 
         Returns
         -------
@@ -389,28 +403,25 @@ class OxfordBinaryFileReader:
             EBSD patterns of shape (n navigation rows, n navigation
             columns, n signal rows, n signal columns).
         """
-        data = self.memmap["pattern"]
-        if lazy:
-            data = da.from_array(data)
-
-        is_sorted = np.allclose(np.diff(self.pattern_order), 1)
-        if not is_sorted and self.all_patterns_present:
-            data = data[self.pattern_order]
-
-        if data.shape != self.data_shape:
-            with dask.config.set(**{"array.slicing.split_large_chunks": False}):
-                data = data.reshape(self.data_shape)
-
-        if lazy:
-            chunks = get_chunking(
-                data_shape=self.data_shape,
-                nav_dim=len(self.navigation_shape),
-                sig_dim=2,
-                dtype=self.dtype,
+        stride = self.n_bytes + self.pattern_header_size + self.pattern_footer_size
+        if self.all_patterns_present:
+            # Patterns in map order
+            pattern_starts = self.pattern_starts
+        else:
+            # Patterns in file order
+            pattern_starts = self.first_pattern_position + stride * np.arange(
+                self.n_patterns_present
             )
-            data = data.rechunk(chunks)
 
-        return data
+        return _read_patterns(
+            self.file.name,
+            offsets=pattern_starts + self.pattern_header_size,
+            data_shape=self.data_shape,
+            dtype=self.dtype,
+            stride=stride,
+            lazy=lazy,
+            n_threads=n_threads,
+        )
 
     def get_single_pattern_footer(self, offset: int) -> np.ndarray:
         """Return a single pattern footer with pattern beam positions.
@@ -466,7 +477,7 @@ class OxfordBinaryFileReader:
             # a positive number (byte position)
             return 0
 
-    def get_scan(self, lazy: bool) -> dict:
+    def get_scan(self, lazy: bool, n_threads: int | None = 1) -> dict:
         """Return a dictionary with the necessary information to
         initialize an :class:`~kikuchipy.signals.EBSD` instance.
 
@@ -475,13 +486,16 @@ class OxfordBinaryFileReader:
         lazy
             Whether to return the EBSD patterns as a
             :class:`numpy.ndarray` or :class:`dask.array.Array`.
+        n_threads
+            Number of threads to read patterns with if ``lazy=False``.
+            Default is 1.
 
         Returns
         -------
         scan
             Dictionary of axes, data, metadata and original metadata.
         """
-        data = self.get_patterns(lazy=lazy)
+        data = self.get_patterns(lazy=lazy, n_threads=n_threads)
 
         units = [self.scan_unit] * 4
         scales = self.step_sizes + [1, 1]
@@ -27,7 +27,13 @@ import numpy as np
 from scipy.ndimage import correlate
 
 from kikuchipy.filters.window import Window
-from kikuchipy.pattern._pattern import _rescale_with_min_max, rescale_intensity
+from kikuchipy.pattern._pattern import (
+    _remove_dynamic_background,
+    _remove_static_background_divide,
+    _remove_static_background_subtract,
+    _rescale_with_min_max,
+    rescale_intensity,
+)
 
 
 def get_dynamic_background(
@@ -162,3 +168,116 @@ def _rescale_neighbour_averaged_patterns(
             pattern_i, imin, imax, omin, omax
         )
     return rescaled_patterns
+
+
+def _preprocess_patterns(
+    patterns: np.ndarray,
+    window_sums: np.ndarray | None = None,
+    static_bg: np.ndarray | None = None,
+    static_operation: str = "subtract",
+    scale_bg: bool = False,
+    filter_func: Callable | None = None,
+    dynamic_operation: str = "subtract",
+    filter_kwargs: dict | None = None,
+    window: np.ndarray | None = None,
+    omin: float = 0,
+    omax: float = 255,
+    dtype_out: np.dtype = np.uint8,
+    out_min: float = 0,
+    out_max: float = 255,
+) -> np.ndarray:
+    """Remove the static and dynamic background from a chunk of
+    patterns, average them with their neighbours and rescale them, in
+    one pass.
+
+    All intermediate patterns are kept as float32 in a chunk-local
+    buffer. Intermediate intensities are rescaled to [omin, omax] as
+    done by the separate EBSD methods, but the patterns are only cast to
+    ``dtype_out`` after the last step.
+
+    Parameters
+    ----------
+    patterns
+        Chunk of patterns with the signal dimensions last.
+    window_sums
+        Sum of averaging window coefficients per pattern, with singleton
+        signal dimensions. Only used if ``window`` is given.
+    static_bg
+        Static background pattern of data type float32. If not given,
+        the static background is not removed.
+    static_operation
+        Either ``"subtract"`` or ``"divide"``.
+    scale_bg
+        Whether to scale the static background to each pattern's
+        intensity range before removal.
+    filter_func
+        Function to generate the dynamic background with. If not given,
+        the dynamic background is not removed.
+    dynamic_operation
+        Either ``"subtract"`` or ``"divide"``.
+    filter_kwargs
+        Keyword arguments passed to ``filter_func``.
+    window
+        Averaging window with singleton signal dimensions. If not given,
+        patterns are not averaged.
+    omin, omax
+        Intensity range of intermediate patterns.
+    dtype_out
+        Data type of the output patterns.
+    out_min, out_max
+        Intensity range of the output patterns.
+
+    Returns
+    -------
+    processed_patterns
+        Processed patterns of data type ``dtype_out``.
+    """
+    if static_operation == "subtract":
+        static_func = _remove_static_background_subtract
+    else:
+        static_func = _remove_static_background_divide
+    if filter_kwargs is None:
+        filter_kwargs = {}
+
+    buffer = np.empty(patterns.shape, dtype=np.float32)
+    for nav_idx in np.ndindex(patterns.shape[:-2]):
+        pattern = patterns[nav_idx].astype(np.float32)
+        if static_bg is not None:
+            pattern = static_func(pattern, static_bg, np.float32, omin, omax, scale_bg)
+        if filter_func is not None:
+            pattern = _remove_dynamic_background(
+                pattern,
+                filter_func,
+                dynamic_operation,
+                np.float32,
+                omin,
+                omax,
+                **filter_kwargs,
+            )
+        buffer[nav_idx] = pattern
+
+    if window is not None:
+        buffer = correlate(buffer, weights=window, mode="constant")
+        return _rescale_neighbour_averaged_patterns(
+            buffer, window_sums, dtype_out, out_min, out_max
+        )
+    else:
+        return _rescale_patterns(buffer, dtype_out, out_min, out_max)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rescale_patterns(
+    patterns: np.ndarray, dtype_out: np.dtype, omin: float, omax: float
+) -> np.ndarray:
+    """Rescale each pattern to fill the intensity range [omin, omax]
+    and cast to ``dtype_out``.
+    """
+    rescaled_patterns = np.zeros(patterns.shape, dtype=dtype_out)
+    for nav_idx in np.ndindex(patterns.shape[:-2]):
+        pattern_i = patterns[nav_idx]
+        imin = np.min(pattern_i)
+        imax = np.max(pattern_i)
+        rescaled_patterns[nav_idx] = _rescale_with_min_max(
+            pattern_i, imin, imax, omin, omax
+        )
+    return rescaled_patterns
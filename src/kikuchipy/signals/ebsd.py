@@ -46,13 +46,25 @@ from kikuchipy.constants import installed, pyopencl_context_available
 from kikuchipy.detectors.ebsd_detector import EBSDDetector
 from kikuchipy.filters.fft_barnes import _fft_filter, _fft_filter_setup
 from kikuchipy.filters.window import Window
-from kikuchipy.indexing._dictionary_indexing import _dictionary_indexing
+from kikuchipy.indexing._dictionary_cache import (
+    _DictionaryCache,
+    _get_dictionary_cache_key,
+)
+from kikuchipy.indexing._dictionary_indexing import (
+    _dictionary_indexing,
+    _dictionary_indexing_multiple_phases,
+    _ProjectedDictionary,
+)
+from kikuchipy.indexing._hierarchical_indexing import (
+    _hierarchical_dictionary_indexing,
+)
 from kikuchipy.indexing._hough_indexing import (
     _hough_indexing,
     _indexer_is_compatible_with_kikuchipy,
     _optimize_pc,
     _phase_lists_are_compatible,
 )
+from kikuchipy.indexing._inverted_file_index import InvertedFileIndex
 from kikuchipy.indexing._refinement._refinement import (
     _refine_orientation,
     _refine_orientation_pc,
@@ -65,7 +77,7 @@ from kikuchipy.indexing.similarity_metrics._normalized_dot_product import (
     NormalizedDotProductMetric,
 )
 from kikuchipy.indexing.similarity_metrics._similarity_metric import SimilarityMetric
-from kikuchipy.io._io import _save
+from kikuchipy.io._io import _save, load
 from kikuchipy.pattern._pattern import (
     _downsample2d,
     _dynamic_background_frequency_space_setup,
@@ -76,7 +88,11 @@ from kikuchipy.pattern._pattern import (
     fft_filter,
     fft_frequency_vectors,
 )
-from kikuchipy.pattern.chunk import _average_neighbour_patterns, get_dynamic_background
+from kikuchipy.pattern.chunk import (
+    _average_neighbour_patterns,
+    _preprocess_patterns,
+    get_dynamic_background,
+)
 from kikuchipy.pattern.chunk import fft_filter as fft_filter_chunk
 from kikuchipy.signals._kikuchipy_signal import KikuchipySignal2D, LazyKikuchipySignal2D
 from kikuchipy.signals.util._crystal_map import (
@@ -433,6 +449,8 @@ class EBSD(KikuchipySignal2D):
         show_progressbar: bool | None = None,
         inplace: bool = True,
         lazy_output: bool | None = None,
+        filename: str | Path | None = None,
+        save_kwargs: dict | None = None,
     ) -> EBSD | LazyEBSD | None:
         """Remove the static background.
 
@@ -464,6 +482,16 @@ class EBSD(KikuchipySignal2D):
             Whether the returned signal is lazy. If not given this
             follows from the current signal. Can only be ``True`` if
             ``inplace=False``.
+        filename
+            Name of a file to write the processed signal to. If given,
+            patterns are processed and written to file one chunk at a
+            time, and a lazy signal reading from the new file is
+            returned. Requires ``inplace=False``. The file format is
+            determined from the extension as in :meth:`save`, and is
+            kikuchipy's h5ebsd format if no extension is given.
+        save_kwargs
+            Keyword arguments passed to :meth:`save` if ``filename`` is
+            given, e.g. ``compression="gzip"`` or ``overwrite=True``.
 
         Returns
         -------
@@ -503,6 +531,10 @@ class EBSD(KikuchipySignal2D):
         """
         if lazy_output and inplace:
             raise ValueError("'lazy_output=True' requires 'inplace=False'")
+        if filename is not None:
+            if inplace:
+                raise ValueError("'filename' requires 'inplace=False'")
+            lazy_output = True
 
         dtype = np.float32  # During processing
         dtype_out = self.data.dtype.type
@@ -556,6 +588,8 @@ class EBSD(KikuchipySignal2D):
                 operation_func, inplace=False, lazy_output=lazy_output, **map_kw
             )
             s_out._set_custom_attributes(attrs)
+            if filename is not None:
+                s_out = _save_and_load_lazy(s_out, filename, save_kwargs)
             return s_out
 
     def remove_dynamic_background(
@@ -567,6 +601,8 @@ class EBSD(KikuchipySignal2D):
         show_progressbar: bool | None = None,
         inplace: bool = True,
         lazy_output: bool | None = None,
+        filename: str | Path | None = None,
+        save_kwargs: dict | None = None,
         **kwargs,
     ) -> EBSD | LazyEBSD | None:
         """Remove the dynamic background.
@@ -602,6 +638,16 @@ class EBSD(KikuchipySignal2D):
             Whether the returned signal is lazy. If not given this
             follows from the current signal. Can only be ``True`` if
             ``inplace=False``.
+        filename
+            Name of a file to write the processed signal to. If given,
+            patterns are processed and written to file one chunk at a
+            time, and a lazy signal reading from the new file is
+            returned. Requires ``inplace=False``. The file format is
+            determined from the extension as in :meth:`save`, and is
+            kikuchipy's h5ebsd format if no extension is given.
+        save_kwargs
+            Keyword arguments passed to :meth:`save` if ``filename`` is
+            given, e.g. ``compression="gzip"`` or ``overwrite=True``.
         **kwargs
             Keyword arguments passed to the Gaussian blurring function
             determined from ``filter_domain``.
@@ -630,6 +676,10 @@ class EBSD(KikuchipySignal2D):
         """
         if lazy_output and inplace:
             raise ValueError("'lazy_output=True' requires 'inplace=False'")
+        if filename is not None:
+            if inplace:
+                raise ValueError("'filename' requires 'inplace=False'")
+            lazy_output = True
 
         if std is None:
             std = self.axes_manager.signal_shape[0] / 8
@@ -679,6 +729,8 @@ class EBSD(KikuchipySignal2D):
         else:
             s_out = self.map(map_func, inplace=False, lazy_output=lazy_output, **map_kw)
             s_out._set_custom_attributes(attrs)
+            if filename is not None:
+                s_out = _save_and_load_lazy(s_out, filename, save_kwargs)
             return s_out
 
     def get_dynamic_background(
@@ -796,6 +848,8 @@ class EBSD(KikuchipySignal2D):
         show_progressbar: bool | None = None,
         inplace: bool = True,
         lazy_output: bool | None = None,
+        filename: str | Path | None = None,
+        save_kwargs: dict | None = None,
     ) -> EBSD | LazyEBSD | None:
         """Filter patterns in the frequency domain.
 
@@ -835,6 +889,16 @@ class EBSD(KikuchipySignal2D):
             Whether the returned signal is lazy. If not given this
             follows from the current signal. Can only be ``True`` if
             ``inplace=False``.
+        filename
+            Name of a file to write the processed signal to. If given,
+            patterns are processed and written to file one chunk at a
+            time, and a lazy signal reading from the new file is
+            returned. Requires ``inplace=False``. The file format is
+            determined from the extension as in :meth:`save`, and is
+            kikuchipy's h5ebsd format if no extension is given.
+        save_kwargs
+            Keyword arguments passed to :meth:`save` if ``filename`` is
+            given, e.g. ``compression="gzip"`` or ``overwrite=True``.
 
         Returns
         -------
@@ -865,6 +929,10 @@ class EBSD(KikuchipySignal2D):
         """
         if lazy_output and inplace:
             raise ValueError("'lazy_output=True' requires 'inplace=False'")
+        if filename is not None:
+            if inplace:
+                raise ValueError("'filename' requires 'inplace=False'")
+            lazy_output = True
 
         dtype_out = self.data.dtype.type
         dtype = np.float32
@@ -924,6 +992,8 @@ class EBSD(KikuchipySignal2D):
             pbar.unregister()
 
         if s_out:
+            if filename is not None:
+                s_out = _save_and_load_lazy(s_out, filename, save_kwargs)
             return s_out
 
     def average_neighbour_patterns(
@@ -933,6 +1003,8 @@ class EBSD(KikuchipySignal2D):
         show_progressbar: bool | None = None,
         inplace: bool = True,
         lazy_output: bool | None = None,
+        filename: str | Path | None = None,
+        save_kwargs: dict | None = None,
         **kwargs,
     ) -> EBSD | LazyEBSD | None:
         """Average patterns with its neighbours within a window.
@@ -974,6 +1046,16 @@ class EBSD(KikuchipySignal2D):
             Whether the returned signal is lazy. If not given this
             follows from the current signal. Can only be ``True`` if
             ``inplace=False``.
+        filename
+            Name of a file to write the processed signal to. If given,
+            patterns are processed and written to file one chunk at a
+            time, and a lazy signal reading from the new file is
+            returned. Requires ``inplace=False``. The file format is
+            determined from the extension as in :meth:`save`, and is
+            kikuchipy's h5ebsd format if no extension is given.
+        save_kwargs
+            Keyword arguments passed to :meth:`save` if ``filename`` is
+            given, e.g. ``compression="gzip"`` or ``overwrite=True``.
         **kwargs
             Keyword arguments passed to the available window type listed
             in :func:`~scipy.signal.windows.get_window`. If not given,
@@ -992,13 +1074,16 @@ class EBSD(KikuchipySignal2D):
         """
         if lazy_output and inplace:
             raise ValueError("'lazy_output=True' requires 'inplace=False'")
+        if filename is not None:
+            if inplace:
+                raise ValueError("'filename' requires 'inplace=False'")
+            lazy_output = True
 
         if isinstance(window, Window) and window.is_valid:
             averaging_window = copy.copy(window)
         else:
             averaging_window = Window(window=window, shape=window_shape, **kwargs)
 
-        nav_shape = self._navigation_shape_rc
         window_shape = averaging_window.shape
         if window_shape in [(1,), (1, 1)]:
             # Do nothing if a window of shape (1,) or (1, 1) is passed
@@ -1007,49 +1092,14 @@ class EBSD(KikuchipySignal2D):
                 "therefore performed"
             )
             return
-        elif len(nav_shape) > len(window_shape):
-            averaging_window = averaging_window.reshape(window_shape + (1,))
-
-        # Get sum of window data for each pattern, to normalize with
-        # after correlation
-        window_sums = correlate(
-            input=np.ones(nav_shape, dtype=int),
-            weights=averaging_window,
-            mode="constant",
-        )
-
-        # Add signal dimensions to window array to enable its use with
-        # Dask's map_overlap()
-        sig_dim = self.axes_manager.signal_dimension
-        averaging_window = averaging_window.reshape(
-            averaging_window.shape + (1,) * sig_dim
-        )
 
         # Create dask array of signal patterns and do processing on this
         if self._lazy:
             old_chunks = self.data.chunks
         dask_array = get_dask_array(signal=self, chunk_bytes=8e6, rechunk=True)
 
-        # Add signal dimensions to array be able to use with Dask's
-        # map_overlap()
-        nav_dim = self.axes_manager.navigation_dimension
-        for i in range(sig_dim):
-            window_sums = np.expand_dims(window_sums, axis=window_sums.ndim)
-        window_sums = da.from_array(
-            window_sums, chunks=dask_array.chunks[:nav_dim] + (1,) * sig_dim
-        )
-
-        # Create overlap between chunks to enable correlation with the
-        # window using Dask's map_overlap()
-        window_dim = averaging_window.ndim
-        overlap_depth = {}
-        for i in range(nav_dim):
-            if i < window_dim and dask_array.chunks[i][0] < dask_array.shape[i]:
-                overlap_depth[i] = (window_shape[i] // 2) + 1
-            else:
-                overlap_depth[i] = 1
-        overlap_depth.update(
-            {i: 0 for i in self.axes_manager.signal_indices_in_array[::-1]}
+        averaging_window, window_sums, overlap_depth = self._prepare_averaging_window(
+            averaging_window, dask_array
         )
 
         dtype_out = self.data.dtype
@@ -1094,6 +1144,270 @@ class EBSD(KikuchipySignal2D):
             pbar.unregister()
 
         if s_out:
+            if filename is not None:
+                s_out = _save_and_load_lazy(s_out, filename, save_kwargs)
+            return s_out
+
+    def preprocess(
+        self,
+        static_operation: str | None = "subtract",
+        static_bg: np.ndarray | da.Array | None = None,
+        scale_bg: bool = False,
+        dynamic_operation: str | None = "subtract",
+        filter_domain: str = "frequency",
+        std: int | float | None = None,
+        truncate: int | float = 4.0,
+        window: str | np.ndarray | da.Array | Window | None = None,
+        window_shape: tuple[int, ...] = (3, 3),
+        dtype_out: str | np.dtype | type | None = None,
+        show_progressbar: bool | None = None,
+        inplace: bool = True,
+        lazy_output: bool | None = None,
+        filename: str | Path | None = None,
+        save_kwargs: dict | None = None,
+        **kwargs,
+    ) -> EBSD | LazyEBSD | None:
+        """Remove the static and dynamic background, average patterns
+        with their neighbours and rescale their intensities in one pass
+        over the data.
+
+        This gives the same result as calling
+        :meth:`remove_static_background`,
+        :meth:`remove_dynamic_background`,
+        :meth:`average_neighbour_patterns` and
+        :meth:`rescale_intensity` in sequence, except that intermediate
+        patterns are not rounded to the signal's data type. The steps
+        are applied to one chunk of patterns at a time, keeping
+        intermediate patterns as float32 in memory only for that chunk.
+        The patterns are thus read and written only once, and each
+        intermediate result is not stored for the full dataset.
+
+        Parameters
+        ----------
+        static_operation
+            Whether to ``"subtract"`` (default) or ``"divide"`` by the
+            static background pattern. If ``None``, the static
+            background is not removed.
+        static_bg
+            Static background pattern. If not given, the background is
+            obtained from the ``EBSD.static_background`` property.
+        scale_bg
+            Whether to scale the static background pattern to each
+            individual pattern's data range before removal. Default is
+            ``False``.
+        dynamic_operation
+            Whether to ``"subtract"`` (default) or ``"divide"`` by the
+            dynamic background pattern. If ``None``, the dynamic
+            background is not removed.
+        filter_domain
+            Whether to obtain the dynamic background by applying a
+            Gaussian convolution filter in the ``"frequency"`` (default)
+            or ``"spatial"`` domain.
+        std
+            Standard deviation of the Gaussian window of the dynamic
+            background. If None (default), it is set to width/8.
+        truncate
+            Truncate the Gaussian window at this many standard
+            deviations. Default is ``4.0``.
+        window
+            Averaging window passed to
+            :meth:`average_neighbour_patterns`. If not given (default),
+            patterns are not averaged with their neighbours.
+        window_shape
+            Shape of averaging window. Not used if a custom window or
+            :class:`~kikuchipy.filters.Window` is passed to ``window``.
+            Default is ``(3, 3)``.
+        dtype_out
+            Data type of the processed patterns. Intensities are
+            rescaled to fill this data type's range. If not given, the
+            signal's data type is used.
+        show_progressbar
+            Whether to show a progressbar. If not given, the value of
+            :obj:`hyperspy.api.preferences.General.show_progressbar`
+            is used.
+        inplace
+            Whether to operate on the current signal or return a new
+            one. Default is ``True``.
+        lazy_output
+            Whether the returned signal is lazy. If not given this
+            follows from the current signal. Can only be ``True`` if
+            ``inplace=False``.
+        filename
+            Name of a file to write the processed signal to. If given,
+            patterns are processed and written to file one chunk at a
+            time, and a lazy signal reading from the new file is
+            returned. Requires ``inplace=False``. The file format is
+            determined from the extension as in :meth:`save`, and is
+            kikuchipy's h5ebsd format if no extension is given.
+        save_kwargs
+            Keyword arguments passed to :meth:`save` if ``filename`` is
+            given, e.g. ``compression="gzip"`` or ``overwrite=True``.
+        **kwargs
+            Keyword arguments passed to the averaging window type listed
+            in :func:`~scipy.signal.windows.get_window`. A window
+            requiring a ``std`` parameter, like ``"gaussian"``, must be
+            passed as a :class:`~kikuchipy.filters.Window`.
+
+        Returns
+        -------
+        s_out
+            Processed signal, returned if ``inplace=False``. Whether it
+            is lazy is determined from ``lazy_output``.
+
+        See Also
+        --------
+        remove_static_background, remove_dynamic_background,
+        average_neighbour_patterns, rescale_intensity
+
+        Examples
+        --------
+        Remove the static and dynamic background and average each
+        pattern with its nearest neighbours
+
+        >>> import kikuchipy as kp
+        >>> s = kp.data.nickel_ebsd_small()
+        >>> s.preprocess(dynamic_operation="divide", window="circular")
+        """
+        if lazy_output and inplace:
+            raise ValueError("'lazy_output=True' requires 'inplace=False'")
+        if filename is not None:
+            if inplace:
+                raise ValueError("'filename' requires 'inplace=False'")
+            lazy_output = True
+
+        operations = ["subtract", "divide"]
+        for operation in [static_operation, dynamic_operation]:
+            if operation is not None and operation not in operations:
+                raise ValueError(f"'{operation}' must be either of {operations}")
+
+        # Intermediate patterns are rescaled to the input data type
+        # range, as done by the separate methods
+        dtype = self.data.dtype.type
+        omin, omax = dtype_range[dtype]
+        if dtype_out is None:
+            dtype_out = dtype
+        else:
+            dtype_out = np.dtype(dtype_out).type
+        out_min, out_max = dtype_range[dtype_out]
+
+        preprocess_kw = {
+            "static_operation": static_operation,
+            "dynamic_operation": dynamic_operation,
+            "scale_bg": scale_bg,
+            "omin": omin,
+            "omax": omax,
+            "dtype_out": dtype_out,
+            "out_min": out_min,
+            "out_max": out_max,
+        }
+
+        if static_operation is not None:
+            if static_bg is None:
+                static_bg = self.static_background
+                if not isinstance(static_bg, (np.ndarray, da.Array)):
+                    raise ValueError("`EBSD.static_background` is not a valid array")
+            if isinstance(static_bg, da.Array):
+                static_bg = static_bg.compute()
+            if dtype != static_bg.dtype:
+                raise ValueError(
+                    f"Static background dtype_out {static_bg.dtype} is not the same "
+                    f"as pattern dtype_out {dtype}"
+                )
+            pat_shape = self._signal_shape_rc
+            bg_shape = static_bg.shape
+            if bg_shape != pat_shape:
+                raise ValueError(
+                    f"Signal {pat_shape} and static background {bg_shape} shapes are "
+                    "not the same"
+                )
+            preprocess_kw["static_bg"] = static_bg.astype(np.float32)
+
+        if dynamic_operation is not None:
+            if std is None:
+                std = self.axes_manager.signal_shape[0] / 8
+            filter_kwargs = {}
+            if filter_domain == "frequency":
+                filter_func = _fft_filter
+                (
+                    filter_kwargs["fft_shape"],
+                    filter_kwargs["window_shape"],
+                    filter_kwargs["transfer_function"],
+                    filter_kwargs["offset_before_fft"],
+                    filter_kwargs["offset_after_ifft"],
+                ) = _dynamic_background_frequency_space_setup(
+                    pattern_shape=self._signal_shape_rc,
+                    std=std,
+                    truncate=truncate,
+                )
+            elif filter_domain == "spatial":
+                filter_func = gaussian_filter
+                filter_kwargs["sigma"] = std
+                filter_kwargs["truncate"] = truncate
+            else:
+                filter_domains = ["frequency", "spatial"]
+                raise ValueError(f"{filter_domain} must be either of {filter_domains}")
+            preprocess_kw["filter_func"] = filter_func
+            preprocess_kw["filter_kwargs"] = filter_kwargs
+
+        if self._lazy:
+            old_chunks = self.data.chunks
+        dask_array = get_dask_array(signal=self, chunk_bytes=8e6, rechunk=True)
+
+        if window is not None:
+            if isinstance(window, Window) and window.is_valid:
+                averaging_window = copy.copy(window)
+            else:
+                averaging_window = Window(window=window, shape=window_shape, **kwargs)
+            averaging_window, window_sums, overlap_depth = (
+                self._prepare_averaging_window(averaging_window, dask_array)
+            )
+            processed_patterns = da.overlap.map_overlap(
+                _preprocess_patterns,
+                dask_array,
+                window_sums,
+                window=averaging_window,
+                dtype=dtype_out,
+                depth=overlap_depth,
+                boundary="none",
+                **preprocess_kw,
+            )
+        else:
+            processed_patterns = dask_array.map_blocks(
+                _preprocess_patterns, dtype=dtype_out, **preprocess_kw
+            )
+
+        return_lazy = lazy_output or (lazy_output is None and self._lazy)
+        register_pbar = show_progressbar or (
+            show_progressbar is None and hs.preferences.General.show_progressbar
+        )
+        if not return_lazy and register_pbar:
+            pbar = ProgressBar()
+            pbar.register()
+
+        attrs = self._get_custom_attributes()
+        if inplace:
+            if not return_lazy and dtype_out == dtype:
+                processed_patterns.store(self.data, compute=True)
+            elif not return_lazy:
+                self.data = processed_patterns.compute()
+            else:
+                self.data = processed_patterns.rechunk(old_chunks)
+            self._set_custom_attributes(attrs)
+            s_out = None
+        else:
+            s_out = LazyEBSD(processed_patterns, **attrs)
+            if not return_lazy:
+                s_out.compute()
+
+        # Don't sink
+        gc.collect()
+
+        if not return_lazy and register_pbar:
+            pbar.unregister()
+
+        if s_out:
+            if filename is not None:
+                s_out = _save_and_load_lazy(s_out, filename, save_kwargs)
             return s_out
 
     def downsample(
@@ -1589,6 +1903,7 @@ class EBSD(KikuchipySignal2D):
         verbose: int = 1,
         return_index_data: bool = False,
         return_band_data: bool = False,
+        n_processes: int = 1,
     ) -> (
         CrystalMap
         | tuple[CrystalMap, np.ndarray]
@@ -1619,7 +1934,8 @@ class EBSD(KikuchipySignal2D):
             Number of patterns to index at a time. Default is the
             minimum of 528 or the number of patterns in the signal.
             Increasing the chunksize may give faster indexing but
-            increases memory use.
+            increases memory use. Patterns of a lazy signal are read
+            into memory one chunk at a time.
         verbose
             Which information to print from PyEBSDIndex. Options are
             0 - no output, 1 - timings (default), 2 - timings and the
@@ -1632,6 +1948,10 @@ class EBSD(KikuchipySignal2D):
         return_band_data
             Whether to return the band data array returned from
             ``EBSDIndexer.index_pats()``. Default is ``False``.
+        n_processes
+            Number of processes to index chunks of patterns in, each
+            with a copy of the ``indexer``. Default is 1, meaning
+            patterns are indexed in this process.
 
         Returns
         -------
@@ -1650,9 +1970,16 @@ class EBSD(KikuchipySignal2D):
         :ref:`dependencies` for further details.
 
         This wrapper of PyEBSDIndex is meant for convenience more than
-        speed. It uses the GPU if :mod:`pyopencl` is installed, but only
-        uses a single thread. If you need the fastest indexing, refer to
-        the PyEBSDIndex documentation for multi-threading and more.
+        speed. It uses the GPU if :mod:`pyopencl` is installed. Patterns
+        of a lazy signal, or all patterns if ``n_processes`` is greater
+        than 1, are indexed one chunk at a time while the next chunk is
+        read in a separate thread. With more than one process, up to
+        ``n_processes`` chunks are indexed at a time on the CPU, so the
+        number of processes should not exceed the number of CPU cores.
+        Processes are started with the "spawn" method, so calls in a
+        script must be placed under ``if __name__ == "__main__":``.
+        If you need the fastest indexing, refer to the PyEBSDIndex
+        documentation for distributed indexing and more.
         """
         if not installed["pyebsdindex"]:  # pragma: no cover
             raise ValueError(
@@ -1660,13 +1987,6 @@ class EBSD(KikuchipySignal2D):
                 "pip install pyebsdindex. See "
                 "https://kikuchipy.org/en/stable/user/installation.html for details"
             )
-        if self._lazy and not pyopencl_context_available:  # pragma: no cover
-            raise ValueError(
-                "Hough indexing of lazy signals must use PyOpenCL, which must be able "
-                "to create a context. See https://documen.tician.de/pyopencl/misc.html "
-                "for details"
-            )
-
         am = self.axes_manager
         nav_shape = am.navigation_shape[::-1]
         nav_size = int(np.prod(nav_shape))
@@ -1682,7 +2002,7 @@ class EBSD(KikuchipySignal2D):
         # Prepare patterns
         chunksize = min(chunksize, max(am.navigation_size, 1))
         patterns = self.data.reshape((-1,) + sig_shape)
-        if self._lazy:  # pragma: no cover
+        if self._lazy:
             patterns = patterns.rechunk({0: chunksize, 1: -1, 2: -1})
 
         xmap, index_data, band_data = _hough_indexing(
@@ -1693,6 +2013,7 @@ class EBSD(KikuchipySignal2D):
             indexer=indexer,
             chunksize=chunksize,
             verbose=verbose,
+            n_processes=n_processes,
         )
 
         xmap.scan_unit = _get_navigation_axes_unit(am)
@@ -1712,6 +2033,7 @@ class EBSD(KikuchipySignal2D):
         indexer: "EBSDIndexer",
         batch: bool = False,
         method: str = "Nelder-Mead",
+        n_processes: int = 1,
         **kwargs,
     ) -> "EBSDDetector":
         """Return a detector with one projection center (PC) per
@@ -1736,6 +2058,13 @@ class EBSD(KikuchipySignal2D):
         method
             Which optimization method to use, either ``"Nelder-Mead"``
             from SciPy (default) or ``"PSO"`` (particle swarm).
+        n_processes
+            Number of processes to optimize PCs in if ``batch=True``,
+            each with a copy of the ``indexer``. Default is 1, meaning
+            PCs are optimized one pattern at a time in this process.
+            If greater than 1, the PC of each pattern is still
+            optimized independently, but patterns are split into parts
+            optimized in parallel. Not used if ``batch=False``.
         **kwargs
             Keyword arguments passed on to PyEBSDIndex' optimization
             method (depending on the chosen ``method``).
@@ -1751,6 +2080,18 @@ class EBSD(KikuchipySignal2D):
         -----
         Requires :mod:`pyebsdindex` to be installed. See
         :ref:`dependencies` for further details.
+
+        Optimizing one PC per pattern with ``batch=True`` and
+        ``n_processes`` greater than 1 is useful when fitting a plane
+        or projective transformation to PCs of patterns extracted from
+        a grid on the sample, e.g. with :meth:`extract_grid`. The
+        returned detector can then be passed on to
+        :meth:`~kikuchipy.detectors.EBSDDetector.fit_pc` or
+        :meth:`~kikuchipy.detectors.EBSDDetector.extrapolate_pc`. Parts
+        of patterns of a lazy signal are read before being sent to a
+        process, so PyOpenCL is not required in this case. Processes
+        are started with the "spawn" method, so calls in a script must
+        be placed under ``if __name__ == "__main__":``.
         """
         if not installed["pyebsdindex"]:  # pragma: no cover
             raise ValueError(
@@ -1758,7 +2099,10 @@ class EBSD(KikuchipySignal2D):
                 "pip install pyebsdindex. See "
                 "https://kikuchipy.org/en/stable/user/installation.html for details"
             )
-        if self._lazy and not pyopencl_context_available:  # pragma: no cover
+        in_processes = batch and n_processes > 1
+        if (
+            self._lazy and not in_processes and not pyopencl_context_available
+        ):  # pragma: no cover
             raise ValueError(
                 "Hough indexing of lazy signals must use PyOpenCL, which must be able "
                 "to create a context. See https://documen.tician.de/pyopencl/misc.html "
@@ -1799,6 +2143,7 @@ class EBSD(KikuchipySignal2D):
             indexer=indexer,
             batch=batch,
             method=method,
+            n_processes=n_processes,
             **kwargs,
         )
 
@@ -1816,7 +2161,7 @@ class EBSD(KikuchipySignal2D):
 
     def dictionary_indexing(
         self,
-        dictionary: EBSD,
+        dictionary: EBSD | EBSDMasterPattern | list[EBSD | EBSDMasterPattern],
         metric: SimilarityMetric | str = "ncc",
         keep_n: int = 20,
         n_per_iteration: int | None = None,
@@ -1824,6 +2169,12 @@ class EBSD(KikuchipySignal2D):
         signal_mask: np.ndarray | None = None,
         rechunk: bool = False,
         dtype: str | np.dtype | type | None = None,
+        rotations: Rotation | list[Rotation] | None = None,
+        detector: EBSDDetector | None = None,
+        energy: int | float | None = None,
+        cache_dir: str | Path | None = None,
+        cache_size: int | str = "20 GB",
+        index: InvertedFileIndex | None = None,
     ) -> CrystalMap:
         """Index patterns by matching each pattern to a dictionary of
         simulated patterns of known orientations
@@ -1834,7 +2185,18 @@ class EBSD(KikuchipySignal2D):
         dictionary
             One EBSD signal with dictionary patterns. The signal must
             have a 1D navigation axis, an :attr:`xmap` property with
-            crystal orientations set, and equal detector shape.
+            crystal orientations set, and equal detector shape. Can also
+            be an EBSD master pattern in the square Lambert projection,
+            in which case dictionary patterns are projected from it for
+            ``rotations`` onto ``detector`` in small tiles during
+            matching, without keeping the full dictionary in memory.
+            Can also be a list of signals and/or master patterns, one
+            per phase. Each chunk of experimental patterns is then
+            loaded and prepared only once and matched to all
+            dictionaries, and a multi phase crystal map is returned.
+            In this case, dictionaries which are not in memory are read
+            or projected once per experimental chunk, so in-memory
+            dictionaries or a ``cache_dir`` are recommended.
         metric
             Similarity metric, by default ``"ncc"`` (normalized
             cross-correlation). ``"ndp"`` (normalized dot product) is
@@ -1854,7 +2216,9 @@ class EBSD(KikuchipySignal2D):
             dictionary is a ``LazyEBSD`` signal, it is equal to the
             chunk size of the first pattern array axis, while if if is
             an ``EBSD`` signal, it is set equal to the number of
-            dictionary patterns, yielding only one iteration. This
+            dictionary patterns, yielding only one iteration. If the
+            dictionary is a master pattern, it is set so that each
+            iteration holds about 30 MB of projected patterns. This
             parameter can be increased to use less memory during
             indexing, but this will increase the computation time.
         navigation_mask
@@ -1884,6 +2248,49 @@ class EBSD(KikuchipySignal2D):
             will then be used instead. ``"float32"`` and ``"float64"``
             are allowed for the available ``"ncc"`` and ``"ndp"``
             metrics.
+        rotations
+            Crystal rotations to project dictionary patterns for. Must
+            be given if ``dictionary`` is a master pattern, and is
+            ignored otherwise. If ``dictionary`` is a list, this can be
+            a list of as many rotations, e.g. one per phase's
+            fundamental zone.
+        detector
+            EBSD detector with one projection center describing the
+            detector-sample geometry to project dictionary patterns
+            with. Its shape must be equal to the signal's detector
+            shape. Must be given if ``dictionary`` is a master pattern,
+            and is ignored otherwise.
+        energy
+            Acceleration voltage, in kV, of the master pattern to
+            project dictionary patterns from. If not given, the highest
+            energy is used. Only used if ``dictionary`` is a master
+            pattern.
+        cache_dir
+            Directory to cache dictionary patterns projected from a
+            master pattern in, after they are prepared for matching by
+            ``metric`` (masked and normalized). The cached patterns are
+            identified by the master pattern, ``energy``, ``detector``,
+            ``rotations``, ``metric`` and ``signal_mask``, and are
+            reused in later calls instead of projecting them again.
+            Cached patterns are only reused if ``n_per_iteration`` is
+            also the same. Patterns not in the cache are written to it
+            in small tiles as they are projected, so memory use is
+            bounded as without caching. If not given (default),
+            patterns are not cached. Only used if ``dictionary`` is a
+            master pattern.
+        cache_size
+            Maximum size of ``cache_dir``, by default ``"20 GB"``. When
+            it is exceeded, the least recently used dictionaries are
+            removed. Either a number of bytes or a string like
+            ``"500 MB"``.
+        index
+            Approximate nearest neighbour index fitted to the dictionary
+            patterns. If given, each experimental pattern is only
+            matched to the dictionary patterns in the index clusters
+            most similar to it, instead of to all dictionary patterns.
+            The index must be fitted with the same ``metric`` and
+            ``signal_mask``, and ``dictionary`` must then be a signal.
+            If ``signal_mask`` is not given, the index' mask is used.
 
         Returns
         -------
@@ -1892,7 +2299,12 @@ class EBSD(KikuchipySignal2D):
             sorted best matching orientations in the dictionary. The
             corresponding best scores and indices into the dictionary
             are stored in the ``xmap.prop`` dictionary as ``"scores"``
-            and ``"simulation_indices"``.
+            and ``"simulation_indices"``. If ``dictionary`` is a list,
+            the single phase results are merged as in
+            :func:`~kikuchipy.indexing.merge_crystal_maps`, with the
+            merged scores and simulation indices of all phases also
+            stored as ``"merged_scores"`` and
+            ``"merged_simulation_indices"``.
 
         See Also
         --------
@@ -1902,6 +2314,7 @@ class EBSD(KikuchipySignal2D):
         kikuchipy.indexing.SimilarityMetric
         kikuchipy.indexing.NormalizedCrossCorrelationMetric
         kikuchipy.indexing.NormalizedDotProductMetric
+        kikuchipy.indexing.InvertedFileIndex
         kikuchipy.indexing.merge_crystal_maps :
             Merge multiple single phase crystal maps into one multi
             phase map.
@@ -1909,14 +2322,36 @@ class EBSD(KikuchipySignal2D):
             Calculate an orientation similarity map.
         """
         am_exp = self.axes_manager
-        am_dict = dictionary.axes_manager
-        dict_size = am_dict.navigation_size
 
-        if n_per_iteration is None:
-            if isinstance(dictionary.data, da.Array):
-                n_per_iteration = dictionary.data.chunksize[0]
-            else:
-                n_per_iteration = dict_size
+        if index is not None and not isinstance(dictionary, EBSD):
+            raise ValueError(
+                "`dictionary` must be an EBSD signal when `index` is given"
+            )
+
+        if isinstance(dictionary, (list, tuple)):
+            if not isinstance(rotations, (list, tuple)):
+                rotations = [rotations] * len(dictionary)
+            elif len(rotations) != len(dictionary):
+                raise ValueError(
+                    "`rotations` must be a list of as many rotations as there are "
+                    "dictionaries"
+                )
+            dictionaries = list(dictionary)
+        else:
+            rotations = [rotations]
+            dictionaries = [dictionary]
+
+        dict_data = []
+        dict_xmaps = []
+        dict_n_per_iteration = []
+        for dictionary_i, rotations_i in zip(dictionaries, rotations):
+            dict_data_i, dict_xmap_i, n_per_iteration_i = self._get_dictionary_data(
+                dictionary_i, rotations_i, detector, energy, n_per_iteration
+            )
+            dict_data.append(dict_data_i)
+            dict_xmaps.append(dict_xmap_i)
+            dict_n_per_iteration.append(n_per_iteration_i)
+        dict_size = dict_xmaps[0].size
 
         nav_shape_exp = am_exp.navigation_shape[::-1]
         if navigation_mask is not None:
@@ -1937,36 +2372,263 @@ class EBSD(KikuchipySignal2D):
             if not isinstance(signal_mask, np.ndarray):
                 raise ValueError("The signal mask must be a NumPy array")
 
+        if index is not None:
+            if index.size != dict_size:
+                raise ValueError(
+                    f"The index size {index.size} and the number of dictionary "
+                    f"patterns {dict_size} must be identical"
+                )
+            metric_name = metric if isinstance(metric, str) else type(metric)
+            index_metric = {
+                "ncc": NormalizedCrossCorrelationMetric,
+                "ndp": NormalizedDotProductMetric,
+            }[index.metric_name]
+            if metric_name not in [index.metric_name, index_metric]:
+                raise ValueError(
+                    f"The index was fitted with the '{index.metric_name}' metric, "
+                    f"which must be used for indexing"
+                )
+            if signal_mask is None:
+                signal_mask = index.signal_mask
+            elif index.signal_mask is None or not np.array_equal(
+                signal_mask, index.signal_mask
+            ):
+                raise ValueError("The index was fitted with another signal mask")
+
+        metrics = []
+        caches = []
+        for i, dict_data_i in enumerate(dict_data):
+            # Each dictionary needs its own metric since the metric
+            # knows the number of dictionary patterns
+            metric_i = copy.deepcopy(metric) if len(dict_data) > 1 else metric
+            metric_i = self._prepare_metric(
+                metric_i,
+                navigation_mask,
+                signal_mask,
+                dtype,
+                rechunk,
+                dict_xmaps[i].size,
+            )
+            metrics.append(metric_i)
+
+            if cache_dir is not None and isinstance(dict_data_i, _ProjectedDictionary):
+                cache = _DictionaryCache(
+                    path=cache_dir,
+                    key=_get_dictionary_cache_key(dict_data_i, metric_i),
+                    max_size=cache_size,
+                )
+            else:
+                cache = None
+            caches.append(cache)
+
+        step_sizes = tuple(a.scale for a in am_exp.navigation_axes[::-1])
+        with dask.config.set(**{"array.slicing.split_large_chunks": False}):
+            if len(dict_data) > 1:
+                xmap = _dictionary_indexing_multiple_phases(
+                    experimental=self.data,
+                    experimental_nav_shape=am_exp.navigation_shape[::-1],
+                    dictionaries=dict_data,
+                    step_sizes=step_sizes,
+                    dictionary_xmaps=dict_xmaps,
+                    keep_n=keep_n,
+                    n_per_iteration=dict_n_per_iteration,
+                    metrics=metrics,
+                    caches=caches,
+                )
+            else:
+                xmap = _dictionary_indexing(
+                    experimental=self.data,
+                    experimental_nav_shape=am_exp.navigation_shape[::-1],
+                    dictionary=dict_data[0],
+                    step_sizes=step_sizes,
+                    dictionary_xmap=dict_xmaps[0],
+                    keep_n=keep_n,
+                    n_per_iteration=dict_n_per_iteration[0],
+                    metric=metrics[0],
+                    cache=caches[0],
+                    index=index,
+                )
+
+        xmap.scan_unit = _get_navigation_axes_unit(am_exp)
+
+        return xmap
+
+    def hierarchical_dictionary_indexing(
+        self,
+        master_pattern: EBSDMasterPattern,
+        rotations: Rotation,
+        detector: EBSDDetector,
+        resolutions: list[float] | tuple[float, ...],
+        energy: int | float | None = None,
+        keep_n: int = 5,
+        binning: int = 1,
+        n_per_iteration: int | None = None,
+        navigation_mask: np.ndarray | None = None,
+        signal_mask: np.ndarray | None = None,
+        rechunk: bool = False,
+    ) -> CrystalMap:
+        """Index patterns by matching each pattern to a coarse
+        dictionary of simulated patterns, and then to local orientation
+        samplings of increasing resolution around the best matches.
+
+        First, dictionary indexing is done as in
+        :meth:`dictionary_indexing` with patterns projected from
+        ``master_pattern`` for the coarse sampling ``rotations``,
+        possibly at a binned detector resolution. For each pattern, the
+        ``keep_n`` best matches are then re-scored against local
+        orientation samplings around them at full resolution, projected
+        from the master pattern on the fly. The ``keep_n`` best
+        orientations of one level are the centers of the samplings of
+        the next. Since only orientations close to the best matches are
+        sampled, the final angular resolution is much finer than is
+        possible with a uniform sampling of the same cost.
+
+        Parameters
+        ----------
+        master_pattern
+            Master pattern in the square Lambert projection to project
+            patterns from.
+        rotations
+            Coarse sampling of crystal rotations to match all patterns
+            to, e.g. a uniform sampling of the phase's fundamental zone.
+        detector
+            EBSD detector with one projection center describing the
+            detector-sample geometry. Its shape must be equal to the
+            signal's detector shape.
+        resolutions
+            Angular resolutions in degrees, with the resolution of
+            ``rotations`` first, followed by the resolutions of the
+            local samplings, in decreasing order. Each local sampling
+            covers all rotations within the previous resolution of its
+            center. For example, ``[4, 1, 0.25]`` refines the best
+            matches of a 4 degree sampling in two levels.
+        energy
+            Acceleration voltage, in kV, of the master pattern to
+            project patterns from. If not given, the highest energy is
+            used.
+        keep_n
+            Number of best matches to keep at each level. Default is 5.
+        binning
+            Factor to bin patterns and the detector by when matching to
+            the coarse dictionary. Default is 1 (no binning). The
+            detector shape must be divisible by this factor.
+        n_per_iteration
+            Number of coarse dictionary patterns to compare to all
+            experimental patterns in each indexing iteration. If not
+            given, it is set so that each iteration holds about 30 MB
+            of projected patterns.
+        navigation_mask
+            A boolean mask equal to the signal's navigation (map) shape,
+            where only patterns equal to ``False`` are indexed. If not
+            given, all patterns are indexed.
+        signal_mask
+            A boolean mask equal to the experimental patterns' detector
+            shape, where only pixels equal to ``False`` are matched. If
+            not given, all pixels are used.
+        rechunk
+            Whether to allow rechunking of experimental patterns before
+            matching. Default is ``False``.
+
+        Returns
+        -------
+        xmap
+            A crystal map with ``keep_n`` rotations per point with the
+            sorted best matching orientations. The corresponding
+            normalized cross-correlation scores are stored in the
+            ``xmap.prop`` dictionary as ``"scores"``, and the indices
+            into ``rotations`` of the coarse matches they were refined
+            from as ``"simulation_indices"``.
+
+        See Also
+        --------
+        dictionary_indexing
+        refine_orientation
+
+        Notes
+        -----
+        Patterns are matched with the normalized cross-correlation
+        (NCC) metric at all levels.
+        """
+        am_exp = self.axes_manager
+        nav_shape_exp = am_exp.navigation_shape[::-1]
         sig_shape_exp = am_exp.signal_shape[::-1]
-        sig_shape_dict = am_dict.signal_shape[::-1]
-        if sig_shape_exp != sig_shape_dict:
+
+        resolutions = list(resolutions)
+        if len(resolutions) < 2 or not np.all(np.diff(resolutions) < 0):
             raise ValueError(
-                f"Experimental {sig_shape_exp} and dictionary {sig_shape_dict} signal "
-                "shapes must be identical"
+                "`resolutions` must have at least two angular resolutions in "
+                "decreasing order"
             )
+        if sig_shape_exp[0] % binning or sig_shape_exp[1] % binning:
+            raise ValueError(
+                f"Detector shape {sig_shape_exp} must be divisible by `binning` "
+                f"{binning}"
+            )
+
+        sig_shape_coarse = (sig_shape_exp[0] // binning, sig_shape_exp[1] // binning)
+        detector_coarse = detector.deepcopy()
+        detector_coarse.shape = sig_shape_coarse
+        detector_coarse.binning *= binning
+
+        # Validate master pattern, rotations and detector
+        _, _, n_per_iteration_coarse = self._get_dictionary_data(
+            master_pattern, rotations, detector, energy, None
+        )
+        if n_per_iteration is None:
+            n_per_iteration = n_per_iteration_coarse
 
-        dict_xmap = dictionary.xmap
-        if dict_xmap is None or dict_xmap.shape != (dict_size,):
+        if navigation_mask is not None and navigation_mask.shape != nav_shape_exp:
             raise ValueError(
-                "Dictionary signal must have a non-empty `EBSD.xmap` attribute of equal"
-                " size as the number of dictionary patterns, and both the signal and "
-                "crystal map must have only one navigation dimension"
+                f"The navigation mask shape {navigation_mask.shape} and the "
+                f"signal's navigation shape {nav_shape_exp} must be identical"
             )
 
+        experimental_coarse = self.data
+        signal_mask_coarse = signal_mask
+        if binning > 1:
+            binned_shape = self.data.shape[:-2] + (
+                sig_shape_coarse[0],
+                binning,
+                sig_shape_coarse[1],
+                binning,
+            )
+            experimental_coarse = experimental_coarse.reshape(binned_shape)
+            experimental_coarse = experimental_coarse.astype(np.float32).mean(
+                axis=(-3, -1)
+            )
+            if signal_mask is not None:
+                signal_mask_coarse = signal_mask.reshape(
+                    (sig_shape_coarse[0], binning, sig_shape_coarse[1], binning)
+                ).any(axis=(1, 3))
+
         metric = self._prepare_metric(
-            metric, navigation_mask, signal_mask, dtype, rechunk, dict_size
+            "ncc", navigation_mask, signal_mask, "float32", rechunk, rotations.size
+        )
+        metric_coarse = self._prepare_metric(
+            "ncc",
+            navigation_mask,
+            signal_mask_coarse,
+            "float32",
+            rechunk,
+            rotations.size,
         )
 
         with dask.config.set(**{"array.slicing.split_large_chunks": False}):
-            xmap = _dictionary_indexing(
+            xmap = _hierarchical_dictionary_indexing(
                 experimental=self.data,
-                experimental_nav_shape=am_exp.navigation_shape[::-1],
-                dictionary=dictionary.data,
+                experimental_coarse=experimental_coarse,
+                experimental_nav_shape=nav_shape_exp,
                 step_sizes=tuple(a.scale for a in am_exp.navigation_axes[::-1]),
-                dictionary_xmap=dictionary.xmap,
+                master_pattern=master_pattern,
+                rotations=rotations,
+                detector=detector,
+                detector_coarse=detector_coarse,
+                energy=energy,
+                resolutions=resolutions,
                 keep_n=keep_n,
                 n_per_iteration=n_per_iteration,
                 metric=metric,
+                metric_coarse=metric_coarse,
             )
 
         xmap.scan_unit = _get_navigation_axes_unit(am_exp)
@@ -1991,6 +2653,7 @@ class EBSD(KikuchipySignal2D):
         compute: bool = True,
         rechunk: bool = True,
         chunk_kwargs: dict | None = None,
+        lookup_table: bool = False,
     ) -> CrystalMap | da.Array:
         r"""Refine orientations by searching orientation space around
         the best indexed solution using fixed projection centers.
@@ -2014,6 +2677,11 @@ class EBSD(KikuchipySignal2D):
               Powell etc.).
             - Nelder-Mead via `nlopt.LN_NELDERMEAD
               <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#nelder-mead-simplex>`_
+            - Gradient-based L-BFGS, MMA and SLSQP via `nlopt.LD_LBFGS,
+              nlopt.LD_MMA and nlopt.LD_SLSQP
+              <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#local-gradient-based-optimization>`_
+            - Nelder-Mead of all patterns in a chunk in one compiled
+              function call (``"batched_neldermead"``)
         - Global optimization:
             - :func:`~scipy.optimize.differential_evolution`
             - :func:`~scipy.optimize.dual_annealing`
@@ -2061,18 +2729,32 @@ class EBSD(KikuchipySignal2D):
         method
             Name of the :mod:`scipy.optimize` or *NLopt* optimization
             method, among ``"minimize"``, ``"differential_evolution"``,
-            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"`` and
-            ``"ln_neldermead"`` (from *NLopt*). Default is
+            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"``,
+            ``"ln_neldermead"``, ``"ld_lbfgs"``, ``"ld_mma"`` and
+            ``"ld_slsqp"`` (from *NLopt*) and ``"batched_neldermead"``.
+            The gradient-based *NLopt* methods (``"ld_*"``) use the
+            analytic gradient of the objective function. Default is
             ``"minimize"``, which by default performs local optimization
             with the Nelder-Mead method, unless another ``"minimize"``
-            method is passed to ``method_kwargs``.
+            method is passed to ``method_kwargs``. With
+            ``"batched_neldermead"``, all patterns in a chunk are
+            refined with the Nelder-Mead method in one compiled function
+            call instead of one *SciPy* call per pattern, which removes
+            the Python overhead per function evaluation. It gives the
+            same results as ``"minimize"`` with the default Nelder-Mead
+            method.
         method_kwargs
             Keyword arguments passed to the :mod:`scipy.optimize`
             ``method``. For example, to perform refinement with the
             modified Powell algorithm from *SciPy*, pass
             ``method="minimize"`` and
-            ``method_kwargs=dict(method="Powell")``. Not used if
-            ``method="LN_NELDERMEAD"``.
+            ``method_kwargs=dict(method="Powell")``. Gradient-based
+            methods, e.g. ``method_kwargs=dict(method="L-BFGS-B")``, are
+            passed the analytic gradient of the objective function
+            unless ``jac`` is given, which usually requires far fewer
+            pattern projections than the default Nelder-Mead method.
+            Not used with *NLopt* methods or
+            ``method="batched_neldermead"``.
         trust_region
             List of three +/- angular deviations in degrees used to
             determine the bound constraints on the three Euler angles
@@ -2083,17 +2765,21 @@ class EBSD(KikuchipySignal2D):
             :math:`\phi_2 \in [0, 360]` in radians.
         initial_step
             A single initial step size for all Euler angle, in degrees.
-            Only used if ``method="LN_NELDERMEAD"``. If not given, this
-            is not set for the *NLopt* optimizer.
+            Only used with *NLopt* methods or
+            ``method="batched_neldermead"``. If not given, this is not
+            set for the *NLopt* optimizer, while the batched optimizer
+            uses a step of 5% of each starting value, as *SciPy*.
         rtol
             Stop optimization of a pattern when the difference in NCC
             score between two iterations is below this value (relative
-            tolerance). Default is ``1e-4``. Only used if
-            ``method="LN_NELDERMEAD"``.
+            tolerance). Default is ``1e-4``. Only used with
+            *NLopt* methods or ``method="batched_neldermead"``,
+            where the latter uses it as the absolute tolerance of both
+            the score and the control variables.
         maxeval
             Stop optimization of a pattern when the number of function
-            evaluations exceeds this value, e.g. ``100``. Only used if
-            ``method="LN_NELDERMEAD"``.
+            evaluations exceeds this value, e.g. ``100``. Only used with
+            *NLopt* methods or ``method="batched_neldermead"``.
         compute
             Whether to refine now (``True``) or later (``False``).
             Default is ``True``. See :meth:`~dask.array.Array.compute`
@@ -2111,6 +2797,16 @@ class EBSD(KikuchipySignal2D):
             refinement is returned from
             :func:`~kikuchipy.signals.util.get_dask_array` in a single
             chunk.
+        lookup_table
+            Whether to project simulated patterns from a cube map lookup
+            table of the master pattern instead of from the master
+            pattern directly. The lookup table is computed once, after
+            which each projection requires less work per pixel. The
+            intensities differ slightly from the ones projected
+            directly, see
+            :meth:`~kikuchipy.signals.EBSDMasterPattern.get_patterns`.
+            Cannot be used with gradient-based methods. Default is
+            ``False``.
 
         Returns
         -------
@@ -2172,6 +2868,7 @@ class EBSD(KikuchipySignal2D):
             maxeval=maxeval,
             compute=compute,
             navigation_mask=navigation_mask,
+            lookup_table=lookup_table,
         )
 
     def refine_projection_center(
@@ -2191,6 +2888,7 @@ class EBSD(KikuchipySignal2D):
         compute: bool = True,
         rechunk: bool = True,
         chunk_kwargs: dict | None = None,
+        lookup_table: bool = False,
     ) -> tuple[np.ndarray, EBSDDetector, np.ndarray] | da.Array:
         """Refine projection centers by searching the parameter space
         using fixed orientations.
@@ -2212,6 +2910,11 @@ class EBSD(KikuchipySignal2D):
               Powell etc.).
             - Nelder-Mead via `nlopt.LN_NELDERMEAD
               <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#nelder-mead-simplex>`_
+            - Gradient-based L-BFGS, MMA and SLSQP via `nlopt.LD_LBFGS,
+              nlopt.LD_MMA and nlopt.LD_SLSQP
+              <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#local-gradient-based-optimization>`_
+            - Nelder-Mead of all patterns in a chunk in one compiled
+              function call (``"batched_neldermead"``)
         - Global optimization:
             - :func:`~scipy.optimize.differential_evolution`
             - :func:`~scipy.optimize.dual_annealing`
@@ -2252,18 +2955,32 @@ class EBSD(KikuchipySignal2D):
         method
             Name of the :mod:`scipy.optimize` or *NLopt* optimization
             method, among ``"minimize"``, ``"differential_evolution"``,
-            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"`` and
-            ``"ln_neldermead"`` (from *NLopt*). Default is
+            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"``,
+            ``"ln_neldermead"``, ``"ld_lbfgs"``, ``"ld_mma"`` and
+            ``"ld_slsqp"`` (from *NLopt*) and ``"batched_neldermead"``.
+            The gradient-based *NLopt* methods (``"ld_*"``) use the
+            analytic gradient of the objective function. Default is
             ``"minimize"``, which by default performs local optimization
             with the Nelder-Mead method, unless another ``"minimize"``
-            method is passed to ``method_kwargs``.
+            method is passed to ``method_kwargs``. With
+            ``"batched_neldermead"``, all patterns in a chunk are
+            refined with the Nelder-Mead method in one compiled function
+            call instead of one *SciPy* call per pattern, which removes
+            the Python overhead per function evaluation. It gives the
+            same results as ``"minimize"`` with the default Nelder-Mead
+            method.
         method_kwargs
             Keyword arguments passed to the :mod:`scipy.optimize`
             ``method``. For example, to perform refinement with the
             modified Powell algorithm from *SciPy*, pass
             ``method="minimize"`` and
-            ``method_kwargs=dict(method="Powell")``. Not used if
-            ``method="LN_NELDERMEAD"``.
+            ``method_kwargs=dict(method="Powell")``. Gradient-based
+            methods, e.g. ``method_kwargs=dict(method="L-BFGS-B")``, are
+            passed the analytic gradient of the objective function
+            unless ``jac`` is given, which usually requires far fewer
+            pattern projections than the default Nelder-Mead method.
+            Not used with *NLopt* methods or
+            ``method="batched_neldermead"``.
         trust_region
             List of three +/- deviations in the range [0, 1] used to
             determine the bounds constraints on the PC parameters per
@@ -2273,16 +2990,19 @@ class EBSD(KikuchipySignal2D):
             [-2, 2].
         initial_step
             A single initial step size for all PC parameters in the
-            range [0, 1]. Only used if ``method="LN_NELDERMEAD"``.
+            range [0, 1]. Only used with *NLopt* methods or
+            ``method="batched_neldermead"``.
         rtol
             Stop optimization of a pattern when the difference in NCC
             score between two iterations is below this value (relative
-            tolerance). Default is ``1e-4``. Only used if
-            ``method="LN_NELDERMEAD"``.
+            tolerance). Default is ``1e-4``. Only used with
+            *NLopt* methods or ``method="batched_neldermead"``,
+            where the latter uses it as the absolute tolerance of both
+            the score and the control variables.
         maxeval
             Stop optimization of a pattern when the number of function
-            evaluations exceeds this value, e.g. ``100``. Only used if
-            ``method="LN_NELDERMEAD"``.
+            evaluations exceeds this value, e.g. ``100``. Only used with
+            *NLopt* methods or ``method="batched_neldermead"``.
         compute
             Whether to refine now (``True``) or later (``False``).
             Default is ``True``. See :meth:`~dask.array.Array.compute`
@@ -2300,6 +3020,16 @@ class EBSD(KikuchipySignal2D):
             refinement is returned from
             :func:`~kikuchipy.signals.util.get_dask_array` in a single
             chunk.
+        lookup_table
+            Whether to project simulated patterns from a cube map lookup
+            table of the master pattern instead of from the master
+            pattern directly. The lookup table is computed once, after
+            which each projection requires less work per pixel. The
+            intensities differ slightly from the ones projected
+            directly, see
+            :meth:`~kikuchipy.signals.EBSDMasterPattern.get_patterns`.
+            Cannot be used with gradient-based methods. Default is
+            ``False``.
 
         Returns
         -------
@@ -2361,6 +3091,7 @@ class EBSD(KikuchipySignal2D):
             maxeval=maxeval,
             compute=compute,
             navigation_mask=navigation_mask,
+            lookup_table=lookup_table,
         )
 
     def refine_orientation_projection_center(
@@ -2381,6 +3112,7 @@ class EBSD(KikuchipySignal2D):
         compute: bool = True,
         rechunk: bool = True,
         chunk_kwargs: dict | None = None,
+        lookup_table: bool = False,
     ) -> tuple[CrystalMap, EBSDDetector] | da.Array:
         r"""Refine orientations and projection centers simultaneously by
         searching the orientation and PC parameter space.
@@ -2404,6 +3136,11 @@ class EBSD(KikuchipySignal2D):
               Powell etc.).
             - Nelder-Mead via `nlopt.LN_NELDERMEAD
               <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#nelder-mead-simplex>`_
+            - Gradient-based L-BFGS, MMA and SLSQP via `nlopt.LD_LBFGS,
+              nlopt.LD_MMA and nlopt.LD_SLSQP
+              <https://nlopt.readthedocs.io/en/latest/NLopt_Algorithms/#local-gradient-based-optimization>`_
+            - Nelder-Mead of all patterns in a chunk in one compiled
+              function call (``"batched_neldermead"``)
         - Global optimization:
             - :func:`~scipy.optimize.differential_evolution`
             - :func:`~scipy.optimize.dual_annealing`
@@ -2453,18 +3190,32 @@ class EBSD(KikuchipySignal2D):
         method
             Name of the :mod:`scipy.optimize` or *NLopt* optimization
             method, among ``"minimize"``, ``"differential_evolution"``,
-            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"`` and
-            ``"ln_neldermead"`` (from *NLopt*). Default is
+            ``"dual_annealing"``, ``"basinhopping"``, ``"shgo"``,
+            ``"ln_neldermead"``, ``"ld_lbfgs"``, ``"ld_mma"`` and
+            ``"ld_slsqp"`` (from *NLopt*) and ``"batched_neldermead"``.
+            The gradient-based *NLopt* methods (``"ld_*"``) use the
+            analytic gradient of the objective function. Default is
             ``"minimize"``, which by default performs local optimization
             with the Nelder-Mead method, unless another ``"minimize"``
-            method is passed to ``method_kwargs``.
+            method is passed to ``method_kwargs``. With
+            ``"batched_neldermead"``, all patterns in a chunk are
+            refined with the Nelder-Mead method in one compiled function
+            call instead of one *SciPy* call per pattern, which removes
+            the Python overhead per function evaluation. It gives the
+            same results as ``"minimize"`` with the default Nelder-Mead
+            method.
         method_kwargs
             Keyword arguments passed to the :mod:`scipy.optimize`
             ``method``. For example, to perform refinement with the
             modified Powell algorithm from *SciPy*, pass
             ``method="minimize"`` and
-            ``method_kwargs=dict(method="Powell")``. Not used if
-            ``method="LN_NELDERMEAD"``.
+            ``method_kwargs=dict(method="Powell")``. Gradient-based
+            methods, e.g. ``method_kwargs=dict(method="L-BFGS-B")``, are
+            passed the analytic gradient of the objective function
+            unless ``jac`` is given, which usually requires far fewer
+            pattern projections than the default Nelder-Mead method.
+            Not used with *NLopt* methods or
+            ``method="batched_neldermead"``.
         trust_region
             List of three +/- angular deviations in degrees as bound
             constraints on the three Euler angles and three +/-
@@ -2478,16 +3229,19 @@ class EBSD(KikuchipySignal2D):
         initial_step
             A list of two initial step sizes to use, one in degrees for
             all Euler angles and one in the range [0, 1] for all PC
-            parameters. Only used if ``method="LN_NELDERMEAD"``.
+            parameters. Only used with *NLopt* methods or
+            ``method="batched_neldermead"``.
         rtol
             Stop optimization of a pattern when the difference in NCC
             score between two iterations is below this value (relative
-            tolerance). Only used if ``method="LN_NELDERMEAD"``. If not
-            given, this is set to ``1e-4``.
+            tolerance). Only used with *NLopt* methods or
+            ``method="batched_neldermead"``, where the latter uses it as
+            the absolute tolerance of both the score and the control
+            variables. If not given, this is set to ``1e-4``.
         maxeval
             Stop optimization of a pattern when the number of function
-            evaluations exceeds this value, e.g. ``100``. Only used if
-            ``method="LN_NELDERMEAD"``.
+            evaluations exceeds this value, e.g. ``100``. Only used with
+            *NLopt* methods or ``method="batched_neldermead"``.
         compute
             Whether to refine now (``True``) or later (``False``).
             Default is ``True``. See :meth:`~dask.array.Array.compute`
@@ -2505,6 +3259,16 @@ class EBSD(KikuchipySignal2D):
             refinement is returned from
             :func:`~kikuchipy.signals.util.get_dask_array` in a single
             chunk.
+        lookup_table
+            Whether to project simulated patterns from a cube map lookup
+            table of the master pattern instead of from the master
+            pattern directly. The lookup table is computed once, after
+            which each projection requires less work per pixel. The
+            intensities differ slightly from the ones projected
+            directly, see
+            :meth:`~kikuchipy.signals.EBSDMasterPattern.get_patterns`.
+            Cannot be used with gradient-based methods. Default is
+            ``False``.
 
         Returns
         -------
@@ -2579,6 +3343,7 @@ class EBSD(KikuchipySignal2D):
             maxeval=maxeval,
             compute=compute,
             navigation_mask=navigation_mask,
+            lookup_table=lookup_table,
         )
 
     # ------ Methods overwritten from hyperspy.signals.Signal2D ------ #
@@ -2611,6 +3376,7 @@ class EBSD(KikuchipySignal2D):
             * h5, hdf5, or h5ebsd: kikuchipy's specification of the
               h5ebsd format
             * dat: NORDIF's binary format
+            * zarr: kikuchipy's Zarr directory store format
             * hspy: HyperSpy's HDF5 format
             * zspy: HyperSpy's zarr format
 
@@ -3035,6 +3801,122 @@ class EBSD(KikuchipySignal2D):
 
         return patterns, signal_mask
 
+    def _get_dictionary_data(
+        self,
+        dictionary: EBSD | EBSDMasterPattern,
+        rotations: Rotation | None,
+        detector: EBSDDetector | None,
+        energy: int | float | None,
+        n_per_iteration: int | None,
+    ) -> tuple[np.ndarray | da.Array | _ProjectedDictionary, CrystalMap, int]:
+        """Return the dictionary patterns to match experimental
+        patterns to, their crystal map and the number of dictionary
+        patterns to match per iteration.
+
+        A ``ValueError`` is raised if the dictionary is incompatible
+        with the experimental patterns.
+
+        Parameters
+        ----------
+        dictionary
+            Dictionary signal with one navigation dimension and an
+            :attr:`xmap` of equal size, or a master pattern to project
+            dictionary patterns from.
+        rotations
+            Rotations to project dictionary patterns for. Must be given
+            if ``dictionary`` is a master pattern, otherwise not used.
+        detector
+            Detector with one projection center to project dictionary
+            patterns onto. Must be given if ``dictionary`` is a master
+            pattern, otherwise not used.
+        energy
+            Energy of the master pattern to project from. Only used if
+            ``dictionary`` is a master pattern.
+        n_per_iteration
+            Number of dictionary patterns to match per iteration. If
+            not given, this is the chunk size of a lazy dictionary
+            signal, all patterns of an in-memory dictionary signal, or
+            determined by :func:`~kikuchipy.signals.util.get_chunking`
+            for a master pattern.
+
+        Returns
+        -------
+        dict_data
+            Dictionary patterns, either the signal's data or a
+            ``_ProjectedDictionary`` projecting patterns from the master
+            pattern when indexed.
+        dict_xmap
+            Crystal map with the dictionary rotations and phase.
+        n_per_iteration
+            Number of dictionary patterns to match per iteration.
+        """
+        sig_shape_exp = self.axes_manager.signal_shape[::-1]
+
+        if isinstance(dictionary, EBSD):
+            am_dict = dictionary.axes_manager
+            dict_size = am_dict.navigation_size
+
+            if n_per_iteration is None:
+                if isinstance(dictionary.data, da.Array):
+                    n_per_iteration = dictionary.data.chunksize[0]
+                else:
+                    n_per_iteration = dict_size
+
+            sig_shape_dict = am_dict.signal_shape[::-1]
+            if sig_shape_exp != sig_shape_dict:
+                raise ValueError(
+                    f"Experimental {sig_shape_exp} and dictionary {sig_shape_dict} "
+                    "signal shapes must be identical"
+                )
+
+            dict_xmap = dictionary.xmap
+            if dict_xmap is None or dict_xmap.shape != (dict_size,):
+                raise ValueError(
+                    "Dictionary signal must have a non-empty `EBSD.xmap` attribute of "
+                    "equal size as the number of dictionary patterns, and both the "
+                    "signal and crystal map must have only one navigation dimension"
+                )
+            dict_data = dictionary.data
+        else:
+            if rotations is None or detector is None:
+                raise ValueError(
+                    "`rotations` and `detector` must be given when `dictionary` is a "
+                    "master pattern"
+                )
+            dictionary._is_suitable_for_projection(raise_if_not=True)
+            if detector.navigation_shape != (1,):
+                raise ValueError(
+                    "`detector` must have exactly one projection center when "
+                    "projecting dictionary patterns during indexing"
+                )
+            if sig_shape_exp != detector.shape:
+                raise ValueError(
+                    f"Experimental {sig_shape_exp} and detector {detector.shape} "
+                    "shapes must be identical"
+                )
+
+            dict_size = rotations.size
+            if n_per_iteration is None:
+                chunks = get_chunking(
+                    data_shape=(dict_size, detector.size),
+                    nav_dim=1,
+                    sig_dim=1,
+                    dtype=np.float32,
+                )
+                n_per_iteration = chunks[0][0]
+
+            dict_xmap = CrystalMap(
+                rotations=rotations.flatten(), phase_list=PhaseList(dictionary.phase)
+            )
+            dict_data = _ProjectedDictionary(
+                master_pattern=dictionary,
+                rotations=rotations,
+                detector=detector,
+                energy=energy,
+            )
+
+        return dict_data, dict_xmap, n_per_iteration
+
     def _prepare_metric(
         self,
         metric: SimilarityMetric | str,
@@ -3076,6 +3958,59 @@ class EBSD(KikuchipySignal2D):
 
         return metric
 
+    def _prepare_averaging_window(
+        self, averaging_window: Window, dask_array: da.Array
+    ) -> tuple[Window, da.Array, dict]:
+        """Return the averaging window and the window coefficient sums
+        per pattern with added signal dimensions, and the overlap depth
+        between chunks, for averaging patterns in a Dask array with
+        their neighbours using :func:`dask.array.map_overlap`.
+        """
+        nav_shape = self._navigation_shape_rc
+        window_shape = averaging_window.shape
+        if len(nav_shape) > len(window_shape):
+            averaging_window = averaging_window.reshape(window_shape + (1,))
+            window_shape = averaging_window.shape
+
+        # Get sum of window data for each pattern, to normalize with
+        # after correlation
+        window_sums = correlate(
+            input=np.ones(nav_shape, dtype=int),
+            weights=averaging_window,
+            mode="constant",
+        )
+
+        # Add signal dimensions to window array to enable its use with
+        # Dask's map_overlap()
+        sig_dim = self.axes_manager.signal_dimension
+        averaging_window = averaging_window.reshape(
+            averaging_window.shape + (1,) * sig_dim
+        )
+
+        # Add signal dimensions to array be able to use with Dask's
+        # map_overlap()
+        nav_dim = self.axes_manager.navigation_dimension
+        for i in range(sig_dim):
+            window_sums = np.expand_dims(window_sums, axis=window_sums.ndim)
+        window_sums = da.from_array(
+            window_sums, chunks=dask_array.chunks[:nav_dim] + (1,) * sig_dim
+        )
+
+        # Create overlap between chunks to enable correlation with the
+        # window using Dask's map_overlap()
+        window_dim = averaging_window.ndim
+        overlap_depth = {}
+        for i in range(nav_dim):
+            if i < window_dim and dask_array.chunks[i][0] < dask_array.shape[i]:
+                overlap_depth[i] = (window_shape[i] // 2) + 1
+            else:
+                overlap_depth[i] = 1
+        overlap_depth.update(
+            {i: 0 for i in self.axes_manager.signal_indices_in_array[::-1]}
+        )
+
+        return averaging_window, window_sums, overlap_depth
+
     @staticmethod
     def _get_sum_signal(
         signal, out_signal_axes: list | None = None
@@ -3374,3 +4309,36 @@ def _get_navigation_axes_unit(axes_manager: AxesManager) -> str:
         if scan_unit_hs != "<undefined>":
             scan_unit = scan_unit_hs
     return scan_unit
+
+
+def _save_and_load_lazy(
+    signal: LazyEBSD, filename: str | Path, save_kwargs: dict | None = None
+) -> LazyEBSD:
+    """Write a lazy signal to file chunk by chunk and return a lazy
+    signal reading from the new file.
+
+    Parameters
+    ----------
+    signal
+        Lazy signal to write.
+    filename
+        Name of file to write to. If no extension is given, the signal
+        is written to kikuchipy's h5ebsd format.
+    save_kwargs
+        Keyword arguments passed to :meth:`EBSD.save`.
+
+    Returns
+    -------
+    signal_out
+        Lazy signal with data read from the new file.
+    """
+    filename = Path(filename)
+    if filename.suffix == "":
+        filename = filename.with_suffix(".h5")
+    if save_kwargs is None:
+        save_kwargs = {}
+    signal.save(filename, **save_kwargs)
+    if filename.suffix[1:].lower() in ["hspy", "zspy"]:
+        return hs.load(filename, lazy=True)
+    else:
+        return load(filename, lazy=True)
@@ -209,7 +209,10 @@ def _get_chunk_overlap_depth(window, axes_manager, chunksize: tuple) -> dict:
     sig_dim = axes_manager.signal_dimension
     nav_shape = axes_manager.navigation_shape[::-1]
     is_chunked = ~np.equal(chunksize[:-sig_dim], nav_shape)
-    overlap_depth = {i: n for i, n in enumerate(window.n_neighbours) if is_chunked[i]}
+    # Windows of even size have more neighbours before the origin than
+    # after it
+    n_neighbours = np.maximum(window.origin, window.n_neighbours)
+    overlap_depth = {i: int(n) for i, n in enumerate(n_neighbours) if is_chunked[i]}
     return overlap_depth
 
 
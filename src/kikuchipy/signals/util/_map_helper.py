@@ -19,171 +19,70 @@
 and their neighbours in a map of a 1D or 2D navigation shape.
 """
 
-from typing import Callable
-
 import numpy as np
-from scipy.ndimage import generic_filter
 
 from kikuchipy.filters.window import Window
-from kikuchipy.pattern._pattern import _normalize, _zero_mean
 
 # This private module is tested indirectly via the EBSD methods
 # get_average_neighbour_dot_product_map() and
 # get_neighbour_dot_product_matrices()
 
 
-def _map_helper(
-    patterns: np.ndarray,
-    map_function: Callable,
-    window: np.ndarray | Window,
-    nav_shape: tuple,
-    dtype_out: np.dtype | type = np.float32,
-    **kwargs,
-) -> np.ndarray:
-    """Return output of :func:`scipy.ndimage.generic_filter` after
-    wrapping the `map_function` to apply at each element of
-    `flat_index_map`.
-
-    The generic filter function will be applied at each navigation
-    point.
-
-    Parameters
-    ----------
-    patterns
-        Pattern chunk.
-    map_function
-        :func:`_neighbour_dot_products`.
-    window
-        Window defining the pattern neighbours to calculate the dot
-        product with.
-    nav_shape
-        Navigation shape of pattern chunk.
-    dtype_out
-        Output array data dtype.
-    kwargs
-        Keyword arguments passed to `map_function`.
-
-    Returns
-    -------
-    numpy.ndarray
-        The generic filter output.
-    """
-    # Array in the original navigation shape of indices into the
-    # flattened navigation axis
-    flat_index_map = np.arange(np.prod(nav_shape)).reshape(nav_shape)
-
-    def wrapped_map_function(indices):
-        # `indices` contain the indices to be picked out with window
-        # from `flat_index_map`
-        return map_function(
-            patterns=patterns,
-            indices=indices.astype(int),
-            nav_shape=nav_shape,
-            dtype_out=dtype_out,
-            **kwargs,
-        )
-
-    return generic_filter(
-        flat_index_map,
-        wrapped_map_function,
-        footprint=window,
-        mode="constant",
-        cval=-1,
-        output=None if "output" in kwargs else dtype_out,
-    )
-
-
-def _neighbour_dot_products(
+def _get_neighbour_dot_product_matrices(
     patterns: np.ndarray,
-    indices: np.ndarray,
-    nav_shape: tuple,
+    window: Window,
+    sig_dim: int,
     sig_size: int,
-    dtype_out: np.dtype,
-    center_index: int,
     zero_mean: bool,
     normalize: bool,
-    flat_window_truthy_indices: np.ndarray | None = None,
-    output: np.ndarray | None = None,
-) -> float | int | np.ndarray:
-    """Return either an average of a dot product matrix between a
-    pattern and it's neighbours, or the matrix.
+    dtype_out: np.dtype,
+) -> np.ndarray:
+    """Return  a 4D array of a pattern chunk's navigation shape, and a
+    matrix of dot products between a pattern and its neighbours within a
+    window in each navigation point in that chunk.
 
     Parameters
     ----------
     patterns
         Pattern chunk.
-    indices
-        Flat array of indices into `patterns`.
-    nav_shape
-        Navigation shape of `patterns`.
+    window
+        Window defining the neighbours to calculate the average with.
+    sig_dim
+        Number of signal dimensions.
     sig_size
-        Size of the signal, i.e. pattern or detector pixels.
-    dtype_out
-        Data type of the output dot product matrix and also of the
-        patterns prior to dot product calculation.
-    center_index
-        Index into `patterns` for the current pattern to calculate the
-        dot products for.
+        Number of pattern pixels.
     zero_mean
-        Whether to center the pattern intensities by subtracting the
-        mean intensity to get an average intensity of zero,
-        individually.
+        Whether to subtract the mean of each pattern individually to
+        center the intensities about zero before calculating the
+        dot products.
     normalize
         Whether to normalize the pattern intensities to a standard
         deviation of 1 before calculating the dot products. This
         operation is performed after centering the intensities if
         `zero_mean` is True.
-    flat_window_truthy_indices
-        Flat array of indices into `patterns` for the navigation points
-        to calculate dot products with. If None (default), the function
-        assumes that both `output` and this parameter is None, and that
-        the `output` array of dot products is to be updated inplace.
-    output
-        A continually, inplace updated 4D array containing the dot
-        product matrices.
-    """
-    # Flat navigation index corresponding to the origin of the window,
-    # i.e. into `patterns`, i.e. the current navigation point for which
-    # to calculate the dot product with it's neighbours
-    pat_idx = indices[center_index]
-
-    # Indices into `indices` of neighbours to compute dot product with,
-    # excluding neighbours outside the map and itself
-    neighbour_idx = np.where((indices != pat_idx) & (indices != -1))[0]
-    neighbours = indices[neighbour_idx]
-    neighbours = np.unravel_index(neighbours, nav_shape)
-    # Flat array of neighbour patterns
-    neighbour_patterns = patterns[neighbours].astype(dtype_out)
-    neighbour_patterns = neighbour_patterns.reshape((-1, sig_size))
-
-    # Flat pattern corresponding to the window origin, i.e. the current
-    # navigation point to average
-    pattern = patterns[np.unravel_index(pat_idx, nav_shape)]
-    pattern = pattern.squeeze().flatten().astype(dtype_out)
-
-    # Pre-process pattern intensities
-    if zero_mean:
-        pattern = _zero_mean(pattern, axis=0)
-        neighbour_patterns = _zero_mean(neighbour_patterns, axis=1)
-    if normalize:
-        pattern = _normalize(pattern, axis=0)
-        neighbour_patterns = _normalize(neighbour_patterns, axis=1)
-
-    # Calculate the dot products
-    dot_products = neighbour_patterns @ pattern
+    dtype_out
+        Data type of output map.
 
-    if output is None:
-        return np.nanmean(dot_products)
-    else:
-        center_value = (pattern**2).sum()
-        output[pat_idx][flat_window_truthy_indices[center_index]] = center_value
-        output[pat_idx][flat_window_truthy_indices[neighbour_idx]] = dot_products
-        # Output variable is modified in place, but `_map_helper()`
-        # expects a (in this case discarded) returned value
-        return 1
+    Returns
+    -------
+    dp_matrices
+        Dot products between each pattern and its neighbours in a chunk
+        of patterns, NaN for neighbours outside the chunk or where the
+        window coefficient is zero.
+    """
+    dp_matrices = _neighbour_dot_products(
+        patterns,
+        window=window,
+        sig_dim=sig_dim,
+        sig_size=sig_size,
+        zero_mean=zero_mean,
+        normalize=normalize,
+        dtype_out=dtype_out,
+    )
+    return dp_matrices.astype(dtype_out, copy=False)
 
 
-def _get_neighbour_dot_product_matrices(
+def _get_average_dot_product_map(
     patterns: np.ndarray,
     window: Window,
     sig_dim: int,
@@ -192,9 +91,7 @@ def _get_neighbour_dot_product_matrices(
     normalize: bool,
     dtype_out: np.dtype,
 ) -> np.ndarray:
-    """Return  a 4D array of a pattern chunk's navigation shape, and a
-    matrix of dot products between a pattern and its neighbours within a
-    window in each navigation point in that chunk.
+    """Return the average dot product map for a chunk of patterns.
 
     Parameters
     ----------
@@ -221,38 +118,27 @@ def _get_neighbour_dot_product_matrices(
     Returns
     -------
     adp
-        Map of the average dot product between each pattern and its
-        neighbours in a chunk of patterns.
+        Average dot product map for the chunk of patterns.
     """
-    # Get a flat boolean window, a boolean array with True for True
-    # window coefficients, and the index of this window's origin
-    (boolean_window, flat_window_truthy_indices, center_index) = _setup_window_indices(
-        window=window
-    )
-
-    nav_shape = patterns.shape[:-sig_dim]
-    output = np.empty((np.prod(nav_shape), window.size), dtype=dtype_out)
-    output[:] = np.nan
-
-    _map_helper(
+    dp_matrices = _neighbour_dot_products(
         patterns,
-        _neighbour_dot_products,
-        window=boolean_window,
-        nav_shape=nav_shape,
+        window=window,
+        sig_dim=sig_dim,
         sig_size=sig_size,
-        center_index=center_index,
-        flat_window_truthy_indices=flat_window_truthy_indices,
         zero_mean=zero_mean,
         normalize=normalize,
-        output=output,
+        dtype_out=dtype_out,
     )
 
-    output = output.reshape(nav_shape + window.shape)
+    # Exclude the dot product of each pattern with itself
+    nav_dim = dp_matrices.ndim - window.ndim
+    dp_matrices[(slice(None),) * nav_dim + window.origin] = np.nan
+    adp = np.nanmean(dp_matrices, axis=tuple(range(nav_dim, dp_matrices.ndim)))
 
-    return output
+    return adp.astype(dtype_out, copy=False)
 
 
-def _get_average_dot_product_map(
+def _neighbour_dot_products(
     patterns: np.ndarray,
     window: Window,
     sig_dim: int,
@@ -261,64 +147,95 @@ def _get_average_dot_product_map(
     normalize: bool,
     dtype_out: np.dtype,
 ) -> np.ndarray:
-    """Return the average dot product map for a chunk of patterns.
+    """Return a matrix of dot products between each pattern in a chunk
+    and its neighbours within a window.
+
+    Patterns are centered and normalized once. The dot products with
+    the neighbours at one window offset are then calculated for all
+    patterns at once as a batched inner product between the patterns
+    and a view of the patterns shifted by this offset. Dot products for
+    the opposite offset are the same, shifted the other way, and are
+    only calculated once.
 
     Parameters
     ----------
     patterns
         Pattern chunk.
     window
-        Window defining the neighbours to calculate the average with.
+        Window defining the neighbours to calculate the dot products
+        with. Neighbours where the window coefficient is zero are
+        skipped.
     sig_dim
         Number of signal dimensions.
     sig_size
         Number of pattern pixels.
     zero_mean
-        Whether to subtract the mean of each pattern individually to
-        center the intensities about zero before calculating the
-        dot products.
+        Whether to center the pattern intensities by subtracting the
+        mean intensity to get an average intensity of zero,
+        individually.
     normalize
         Whether to normalize the pattern intensities to a standard
         deviation of 1 before calculating the dot products. This
         operation is performed after centering the intensities if
         `zero_mean` is True.
     dtype_out
-        Data type of output map.
+        Data type of the output. Dot products are calculated in this
+        data type if it is a floating point type of at least single
+        precision, otherwise in single or double precision.
 
     Returns
     -------
-    adp
-        Average dot product map for the chunk of patterns.
+    dp_matrices
+        Array of the chunk's navigation shape and the window shape with
+        dot products, NaN for neighbours outside the chunk or where the
+        window coefficient is zero. Dot products of the patterns with
+        themselves are found at the window origin.
     """
-    # Get a flat boolean window and the index of this window's origin
-    boolean_window, _, center_index = _setup_window_indices(window=window)
-
-    adp = _map_helper(
-        patterns,
-        _neighbour_dot_products,
-        window=boolean_window,
-        nav_shape=patterns.shape[:-sig_dim],
-        sig_size=sig_size,
-        dtype_out=dtype_out,
-        center_index=center_index,
-        zero_mean=zero_mean,
-        normalize=normalize,
-    )
-
-    return adp
-
-
-def _setup_window_indices(window: Window) -> tuple[np.ndarray, np.ndarray, int]:
-    # Index of window origin in flattened window
-    flat_window_origin = np.ravel_multi_index(window.origin, window.shape)
+    nav_shape = patterns.shape[:-sig_dim]
+    dtype = np.result_type(dtype_out, np.float32)
+    patterns = patterns.reshape(nav_shape + (sig_size,)).astype(dtype)
 
-    # Make window flat with boolean values
-    boolean_window = window.copy().astype(bool)
-    flat_window = boolean_window.flatten()
+    # Pre-process pattern intensities in place
+    if zero_mean:
+        patterns -= np.nanmean(patterns, axis=-1, keepdims=True)
+    if normalize:
+        patterns /= np.sqrt(_inner(patterns, patterns))[..., np.newaxis]
+
+    dp_matrices = np.full(nav_shape + window.shape, np.nan, dtype=dtype)
+
+    # Dot products per window offset, and the slices of the patterns
+    # these are the dot products with the neighbour of
+    calculated = {}
+    origin = window.origin
+    for coordinate in zip(*np.nonzero(window)):
+        offset = tuple(int(i - j) for i, j in zip(coordinate, origin))
+        opposite = tuple(-i for i in offset)
+        if opposite in calculated:
+            dot_products, slices = calculated[opposite]
+        else:
+            slices, slices_neighbours = _get_shifted_slices(nav_shape, offset)
+            dot_products = _inner(patterns[slices], patterns[slices_neighbours])
+            calculated[offset] = (dot_products, slices_neighbours)
+        dp_matrices[slices + coordinate] = dot_products
+
+    return dp_matrices
+
+
+def _get_shifted_slices(
+    nav_shape: tuple[int, ...], offset: tuple[int, ...]
+) -> tuple[tuple[slice, ...], tuple[slice, ...]]:
+    """Return slices into a navigation shape of the points with a
+    neighbour at an offset within the shape, and slices of these
+    neighbours.
+    """
+    slices = []
+    slices_neighbours = []
+    for n, i in zip(nav_shape, offset):
+        slices.append(slice(max(0, -i), max(0, n - max(0, i))))
+        slices_neighbours.append(slice(max(0, i), max(0, n + min(0, i))))
+    return tuple(slices), tuple(slices_neighbours)
 
-    # Index of window origin in boolean array with only True values
-    flat_window_truthy_indices = np.nonzero(flat_window)[0]
-    center_index = np.where(flat_window_truthy_indices == flat_window_origin)
-    center_index = center_index[0][0]
 
-    return boolean_window, flat_window_truthy_indices, center_index
+def _inner(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Return inner products of two arrays along the last axis."""
+    return np.einsum("...i,...i->...", a, b)
@@ -64,7 +64,11 @@ import numba as nb
 from numba import njit
 import numpy as np
 
-from kikuchipy._utils.numba import rotate_vector
+from kikuchipy._utils.numba import (
+    rotate_vector,
+    rotation_to_matrix,
+    rotation_to_matrix_derivative,
+)
 from kikuchipy.pattern._pattern import _rescale_with_min_max
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -319,6 +323,7 @@ def _project_patterns_from_master_pattern_with_fixed_pc(
     out_min: int | float,
     out_max: int | float,
     dtype_out: np.dtype | type | None = np.float32,
+    cube_map: np.ndarray | None = None,
 ) -> np.ndarray:
     """Return one or more simulated EBSD patterns projected from a
     master pattern with a fixed projection center (PC).
@@ -350,6 +355,10 @@ def _project_patterns_from_master_pattern_with_fixed_pc(
     dtype_out
         NumPy data type of the returned patterns, by default 32-bit
         float.
+    cube_map
+        Cube map lookup table of the master pattern returned from
+        :func:`_get_cube_map_from_master_pattern`. If given, patterns
+        are projected from this instead of from the master pattern.
 
     Returns
     -------
@@ -365,26 +374,39 @@ def _project_patterns_from_master_pattern_with_fixed_pc(
     n = rotations.shape[0]
     simulated = np.zeros((n, direction_cosines.shape[0]), dtype=dtype_out)
     for i in range(n):
-        simulated[i] = _project_single_pattern_from_master_pattern(
-            rotation=rotations[i],
-            direction_cosines=direction_cosines,
-            master_upper=master_upper,
-            master_lower=master_lower,
-            npx=npx,
-            npy=npy,
-            scale=scale,
-            rescale=rescale,
-            out_min=out_min,
-            out_max=out_max,
-            dtype_out=dtype_out,
-        )
+        if cube_map is None:
+            simulated[i] = _project_single_pattern_from_master_pattern(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                master_upper=master_upper,
+                master_lower=master_lower,
+                npx=npx,
+                npy=npy,
+                scale=scale,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+        else:
+            simulated[i] = _project_single_pattern_from_cube_map(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                cube_map=cube_map,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
     return simulated
 
 
 @njit(cache=True, nogil=True, fastmath=True)
 def _project_patterns_from_master_pattern_with_varying_pc(
     rotations: np.ndarray,
-    direction_cosines: np.ndarray,
+    pc: np.ndarray,
+    dc_offset: np.ndarray,
+    dc_pc_derivatives: np.ndarray,
     master_upper: np.ndarray,
     master_lower: np.ndarray,
     npx: int,
@@ -394,6 +416,7 @@ def _project_patterns_from_master_pattern_with_varying_pc(
     out_min: int | float,
     out_max: int | float,
     dtype_out: np.dtype | type | None = np.float32,
+    cube_map: np.ndarray | None = None,
 ) -> np.ndarray:
     """Return simulated EBSD patterns projected from a master pattern
     with varying projection centers (PCs).
@@ -402,9 +425,16 @@ def _project_patterns_from_master_pattern_with_varying_pc(
     ----------
     rotations
         2D array of quaternions of shape (n, 4) for a given chunk.
-    direction_cosines
-        Sets of direction cosines (unit vectors) between detector and
-        sample of shape (n, m pixels, 3) (the PC), one set per rotation.
+    pc
+        2D array of PCs (PCx, PCy, PCz) of shape (n, 3), one per
+        rotation.
+    dc_offset
+        PC independent part of the unnormalized direction cosines, as
+        returned from :func:`_get_direction_cosines_basis`.
+    dc_pc_derivatives
+        Derivatives of the unnormalized direction cosines with respect
+        to the PC parameters, as returned from
+        :func:`_get_direction_cosines_basis`.
     master_upper
         Upper hemisphere of the master pattern.
     master_lower
@@ -425,6 +455,10 @@ def _project_patterns_from_master_pattern_with_varying_pc(
     dtype_out
         NumPy data type of the returned patterns, by default 32-bit
         float.
+    cube_map
+        Cube map lookup table of the master pattern returned from
+        :func:`_get_cube_map_from_master_pattern`. If given, patterns
+        are projected from this instead of from the master pattern.
 
     Returns
     -------
@@ -436,23 +470,195 @@ def _project_patterns_from_master_pattern_with_varying_pc(
     -----
     This function is optimized with Numba, so care must be taken with
     array shapes and data types.
+
+    The direction cosines are computed for one pattern at a time, so
+    that memory use is independent of the number of patterns.
     """
     n = rotations.shape[0]
-    simulated = np.zeros((n, direction_cosines.shape[1]), dtype=dtype_out)
+    simulated = np.zeros((n, dc_offset.shape[0]), dtype=dtype_out)
     for i in range(n):
-        simulated[i] = _project_single_pattern_from_master_pattern(
-            rotation=rotations[i],
-            direction_cosines=direction_cosines[i],
-            master_upper=master_upper,
-            master_lower=master_lower,
-            npx=npx,
-            npy=npy,
-            scale=scale,
-            rescale=rescale,
-            out_min=out_min,
-            out_max=out_max,
-            dtype_out=dtype_out,
+        direction_cosines = _get_direction_cosines_from_basis(
+            dc_offset, dc_pc_derivatives, pc[i, 0], pc[i, 1], pc[i, 2]
+        )
+        if cube_map is None:
+            simulated[i] = _project_single_pattern_from_master_pattern(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                master_upper=master_upper,
+                master_lower=master_lower,
+                npx=npx,
+                npy=npy,
+                scale=scale,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+        else:
+            simulated[i] = _project_single_pattern_from_cube_map(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                cube_map=cube_map,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+    return simulated
+
+
+def _project_patterns_from_master_pattern_in_parallel(
+    rotations: np.ndarray,
+    *args,
+    num_threads: int,
+    varying_pc: bool = False,
+    **kwargs,
+) -> np.ndarray:
+    """Return simulated EBSD patterns projected from a master pattern
+    in parallel over the rotations using Numba threads.
+
+    Meant to be used in :func:`~dask.array.map_blocks` when there is
+    only one chunk, so that Dask and Numba threads do not compete.
+
+    Parameters
+    ----------
+    rotations
+        2D array of quaternions of shape (n, 4) for a given chunk.
+    *args
+        PCs if ``varying_pc=True``.
+    num_threads
+        Number of Numba threads to use. Set explicitly since the number
+        of threads set with :func:`numba.set_num_threads` is local to
+        the thread setting it and Dask computes in other threads.
+    varying_pc
+        Whether to use
+        :func:`_project_patterns_from_master_pattern_with_varying_pc_parallel`
+        instead of
+        :func:`_project_patterns_from_master_pattern_with_fixed_pc_parallel`.
+        Default is ``False``.
+    **kwargs
+        Keyword arguments passed to the projection function.
+
+    Returns
+    -------
+    simulated
+        2D array of simulated patterns with flattened navigation and
+        signal dimensions.
+    """
+    if varying_pc:
+        func = _project_patterns_from_master_pattern_with_varying_pc_parallel
+    else:
+        func = _project_patterns_from_master_pattern_with_fixed_pc_parallel
+    nb.set_num_threads(num_threads)
+    return func(rotations, *args, **kwargs)
+
+
+@njit(cache=True, nogil=True, fastmath=True, parallel=True)
+def _project_patterns_from_master_pattern_with_fixed_pc_parallel(
+    rotations: np.ndarray,
+    direction_cosines: np.ndarray,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+    rescale: bool,
+    out_min: int | float,
+    out_max: int | float,
+    dtype_out: np.dtype | type | None = np.float32,
+    cube_map: np.ndarray | None = None,
+) -> np.ndarray:
+    """Return one or more simulated EBSD patterns projected from a
+    master pattern with a fixed projection center (PC), in parallel
+    over the rotations.
+
+    See :func:`_project_patterns_from_master_pattern_with_fixed_pc` for
+    the description of the parameters.
+    """
+    n = rotations.shape[0]
+    simulated = np.zeros((n, direction_cosines.shape[0]), dtype=dtype_out)
+    for i in nb.prange(n):
+        if cube_map is None:
+            simulated[i] = _project_single_pattern_from_master_pattern(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                master_upper=master_upper,
+                master_lower=master_lower,
+                npx=npx,
+                npy=npy,
+                scale=scale,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+        else:
+            simulated[i] = _project_single_pattern_from_cube_map(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                cube_map=cube_map,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+    return simulated
+
+
+@njit(cache=True, nogil=True, fastmath=True, parallel=True)
+def _project_patterns_from_master_pattern_with_varying_pc_parallel(
+    rotations: np.ndarray,
+    pc: np.ndarray,
+    dc_offset: np.ndarray,
+    dc_pc_derivatives: np.ndarray,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+    rescale: bool,
+    out_min: int | float,
+    out_max: int | float,
+    dtype_out: np.dtype | type | None = np.float32,
+    cube_map: np.ndarray | None = None,
+) -> np.ndarray:
+    """Return simulated EBSD patterns projected from a master pattern
+    with varying projection centers (PCs), in parallel over the
+    rotations.
+
+    See :func:`_project_patterns_from_master_pattern_with_varying_pc`
+    for the description of the parameters.
+    """
+    n = rotations.shape[0]
+    simulated = np.zeros((n, dc_offset.shape[0]), dtype=dtype_out)
+    for i in nb.prange(n):
+        direction_cosines = _get_direction_cosines_from_basis(
+            dc_offset, dc_pc_derivatives, pc[i, 0], pc[i, 1], pc[i, 2]
         )
+        if cube_map is None:
+            simulated[i] = _project_single_pattern_from_master_pattern(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                master_upper=master_upper,
+                master_lower=master_lower,
+                npx=npx,
+                npy=npy,
+                scale=scale,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
+        else:
+            simulated[i] = _project_single_pattern_from_cube_map(
+                rotation=rotations[i],
+                direction_cosines=direction_cosines,
+                cube_map=cube_map,
+                rescale=rescale,
+                out_min=out_min,
+                out_max=out_max,
+                dtype_out=dtype_out,
+            )
     return simulated
 
 
@@ -538,6 +744,287 @@ def _project_single_pattern_from_master_pattern(
     return pattern.astype(dtype_out)
 
 
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_direction_cosines_basis(
+    nrows: int,
+    ncols: int,
+    om_detector_to_sample: np.ndarray,
+    signal_mask: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the parts of the unnormalized direction cosines which are
+    independent of and linear in the projection center (PC).
+
+    Before normalization, the direction cosine of the pixel in row
+    ``r`` and column ``c`` is the vector ``(ncols / nrows *
+    ((c + 0.5) / ncols - PCx), PCy - (r + 0.5) / nrows, PCz)`` rotated
+    to the sample reference frame. Direction cosines for any PC can
+    thus be updated from these parts with
+    :func:`_get_direction_cosines_from_basis` at a fraction of the cost
+    of computing them from scratch.
+
+    Parameters
+    ----------
+    nrows
+        Number of detector rows.
+    ncols
+        Number of detector columns.
+    om_detector_to_sample
+        Orientation matrix transforming vectors from the detector to
+        the sample reference frame.
+    signal_mask
+        1D signal mask with ``True`` values for pixels to get direction
+        cosines for.
+
+    Returns
+    -------
+    offset
+        PC independent part of shape (n_pixels, 3).
+    pc_derivatives
+        Derivatives with respect to PCx, PCy and PCz, one per row,
+        which are the same for all pixels.
+    """
+    aspect_ratio = ncols / nrows
+    idx_1d = np.arange(nrows * ncols)[signal_mask]
+    rows = idx_1d // ncols
+    cols = np.mod(idx_1d, ncols)
+
+    n_pixels = idx_1d.size
+    offset = np.zeros((n_pixels, 3), dtype=np.float64)
+    for i in range(n_pixels):
+        x = aspect_ratio * (cols[i] + 0.5) / ncols
+        y = -(rows[i] + 0.5) / nrows
+        for j in range(3):
+            offset[i, j] = x * om_detector_to_sample[0, j] + (
+                y * om_detector_to_sample[1, j]
+            )
+
+    pc_derivatives = np.zeros((3, 3), dtype=np.float64)
+    pc_derivatives[0] = -aspect_ratio * om_detector_to_sample[0]
+    pc_derivatives[1] = om_detector_to_sample[1]
+    pc_derivatives[2] = om_detector_to_sample[2]
+
+    return offset, pc_derivatives
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_direction_cosines_from_basis(
+    offset: np.ndarray,
+    pc_derivatives: np.ndarray,
+    pcx: float,
+    pcy: float,
+    pcz: float,
+) -> np.ndarray:
+    """Return direction cosines for a projection center (PC) from the
+    parts returned from :func:`_get_direction_cosines_basis`.
+
+    Returns
+    -------
+    r_g_array
+        Direction cosines of shape (n_pixels, 3) and data type of 64-bit
+        floats.
+    """
+    pc = (pcx, pcy, pcz)
+    shift = np.zeros(3, dtype=np.float64)
+    for k in range(3):
+        shift += pc[k] * pc_derivatives[k]
+
+    n_pixels = offset.shape[0]
+    r_g_array = np.zeros((n_pixels, 3), dtype=np.float64)
+    for i in range(n_pixels):
+        x = offset[i, 0] + shift[0]
+        y = offset[i, 1] + shift[1]
+        z = offset[i, 2] + shift[2]
+        norm = np.sqrt(x**2 + y**2 + z**2)
+        r_g_array[i, 0] = x / norm
+        r_g_array[i, 1] = y / norm
+        r_g_array[i, 2] = z / norm
+
+    return r_g_array
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_direction_cosines_derivatives_from_basis(
+    direction_cosines: np.ndarray,
+    offset: np.ndarray,
+    pc_derivatives: np.ndarray,
+    pcx: float,
+    pcy: float,
+    pcz: float,
+) -> np.ndarray:
+    """Return the derivatives of direction cosines returned from
+    :func:`_get_direction_cosines_from_basis` with respect to the
+    projection center (PC) parameters.
+
+    Returns
+    -------
+    derivatives
+        Derivatives with respect to PCx, PCy and PCz, of shape
+        (3, n_pixels, 3).
+    """
+    pc = (pcx, pcy, pcz)
+    shift = np.zeros(3, dtype=np.float64)
+    for k in range(3):
+        shift += pc[k] * pc_derivatives[k]
+
+    n_pixels = offset.shape[0]
+    derivatives = np.zeros((3, n_pixels, 3), dtype=np.float64)
+    for i in range(n_pixels):
+        norm = np.sqrt(np.sum(np.square(offset[i] + shift)))
+        w = direction_cosines[i]
+        for k in range(3):
+            dv = pc_derivatives[k]
+            w_dot_dv = w[0] * dv[0] + w[1] * dv[1] + w[2] * dv[2]
+            for m in range(3):
+                derivatives[k, i, m] = (dv[m] - w[m] * w_dot_dv) / norm
+
+    return derivatives
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _project_single_pattern_from_master_pattern_with_gradient(
+    rotation: np.ndarray,
+    rotation_derivatives: np.ndarray,
+    direction_cosines: np.ndarray,
+    direction_cosines_derivatives: np.ndarray,
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return a single 1D EBSD pattern projected from a master pattern
+    and its derivatives with respect to a number of control variables.
+
+    The derivatives are found by the chain rule through the rotation,
+    the square Lambert projection and the bi-linear interpolation in
+    the master pattern.
+
+    Parameters
+    ----------
+    rotation
+        Array of one quaternion of shape (4,).
+    rotation_derivatives
+        Derivatives of the quaternion with respect to the first control
+        variables, of shape (m, 4). May be empty.
+    direction_cosines
+        Set of direction cosines (unit vectors) between detector and
+        sample of shape (n_pixels, 3).
+    direction_cosines_derivatives
+        Derivatives of the direction cosines with respect to the last
+        control variables, of shape (k, n_pixels, 3). May be empty.
+    master_upper
+        Upper hemisphere of the master pattern.
+    master_lower
+        Lower hemisphere of the master pattern.
+    npx
+        Number of pixels in the x-direction on the master pattern.
+    npy
+        Number of pixels in the y-direction on the master pattern.
+    scale
+        Factor to scale up from square Lambert projection to the master
+        pattern.
+
+    Returns
+    -------
+    pattern
+        1D simulated EBSD pattern of 64-bit floats.
+    gradient
+        Derivatives of the pattern intensities of shape
+        (m + k, n_pixels).
+
+    Notes
+    -----
+    The derivatives are not defined where the rotated direction cosines
+    are parallel to the z axis, and are set to zero there.
+    """
+    dc_rotated = rotate_vector(rotation, direction_cosines)
+
+    (nii, nij, niip, nijp, di, dj, dim, djm) = _get_lambert_interpolation_parameters(
+        v=dc_rotated, npx=npx, npy=npy, scale=scale
+    )
+
+    n_rot = rotation_derivatives.shape[0]
+    n_dc = direction_cosines_derivatives.shape[0]
+    n_pixels = direction_cosines.shape[0]
+
+    om = rotation_to_matrix(rotation)
+    dom = np.zeros((n_rot, 3, 3), dtype=np.float64)
+    for k in range(n_rot):
+        dom[k] = rotation_to_matrix_derivative(rotation, rotation_derivatives[k])
+
+    # Factor from the square Lambert projection to master pattern pixels
+    factor = scale / SQRT_PI_HALF
+
+    pattern = np.zeros(n_pixels, dtype=np.float64)
+    gradient = np.zeros((n_rot + n_dc, n_pixels), dtype=np.float64)
+    dv = np.zeros(3, dtype=np.float64)
+    for i in range(n_pixels):
+        x, y, z = dc_rotated[i]
+        if z >= 0:
+            mp = master_upper
+        else:
+            mp = master_lower
+
+        # fmt: off
+        pattern[i] = _get_pixel_from_master_pattern(
+            mp, nii[i], nij[i], niip[i], nijp[i], di[i], dj[i], dim[i], djm[i]
+        )
+        # fmt: on
+
+        # Derivatives of intensity with respect to the master pattern
+        # row and column coordinates
+        dint_di = (mp[niip[i], nij[i]] - mp[nii[i], nij[i]]) * djm[i] + (
+            mp[niip[i], nijp[i]] - mp[nii[i], nijp[i]]
+        ) * dj[i]
+        dint_dj = (mp[nii[i], nijp[i]] - mp[nii[i], nij[i]]) * dim[i] + (
+            mp[niip[i], nijp[i]] - mp[niip[i], nij[i]]
+        ) * di[i]
+
+        # Derivatives of the square Lambert coordinates (X, Y) with
+        # respect to the rotated vector (x, y, z)
+        abs_z = np.abs(z)
+        xy_squared = x**2 + y**2
+        if abs_z >= 1 or xy_squared == 0:
+            continue
+        sqrt_z = np.sqrt(2 * (1 - abs_z))
+        dsqrt_z = -np.sign(z) / sqrt_z
+        if np.abs(y) <= np.abs(x):
+            sign_x = np.sign(x)
+            dlx_dx = 0.0
+            dlx_dy = 0.0
+            dlx_dz = sign_x * SQRT_PI_OVER_2 * dsqrt_z
+            dly_dx = -sign_x * sqrt_z * TWO_OVER_SQRT_PI * y / xy_squared
+            dly_dy = sign_x * sqrt_z * TWO_OVER_SQRT_PI * x / xy_squared
+            dly_dz = sign_x * TWO_OVER_SQRT_PI * np.arctan(y / x) * dsqrt_z
+        else:
+            sign_y = np.sign(y)
+            dlx_dx = sign_y * sqrt_z * TWO_OVER_SQRT_PI * y / xy_squared
+            dlx_dy = -sign_y * sqrt_z * TWO_OVER_SQRT_PI * x / xy_squared
+            dlx_dz = sign_y * TWO_OVER_SQRT_PI * np.arctan(x / y) * dsqrt_z
+            dly_dx = 0.0
+            dly_dy = 0.0
+            dly_dz = sign_y * SQRT_PI_OVER_2 * dsqrt_z
+
+        # Derivatives of intensity with respect to the rotated vector,
+        # with X along columns and Y along rows
+        dint_dx = factor * (dint_di * dly_dx + dint_dj * dlx_dx)
+        dint_dy = factor * (dint_di * dly_dy + dint_dj * dlx_dy)
+        dint_dz = factor * (dint_di * dly_dz + dint_dj * dlx_dz)
+
+        for k in range(n_rot + n_dc):
+            if k < n_rot:
+                m = dom[k]
+                v = direction_cosines[i]
+            else:
+                m = om
+                v = direction_cosines_derivatives[k - n_rot, i]
+            for ii in range(3):
+                dv[ii] = m[ii, 0] * v[0] + m[ii, 1] * v[1] + m[ii, 2] * v[2]
+            gradient[k, i] = dint_dx * dv[0] + dint_dy * dv[1] + dint_dz * dv[2]
+
+    return pattern, gradient
+
+
 @nb.jit("float64[:, :](float64[:, :])", nogil=True, cache=True, nopython=True)
 def _vector2lambert(v: np.ndarray) -> np.ndarray:
     """Lambert projection of vector(s) :cite:`callahan2013dynamical`.
@@ -668,10 +1155,11 @@ def _get_lambert_interpolation_parameters(
         nij_i = dtype(j_this + scale)
         niip_i = nii_i + 1
         nijp_i = nij_i + 1
-        if niip_i > npx:
-            niip_i = nii_i  # pragma: no cover
-        if nijp_i > npy:
-            nijp_i = nij_i  # pragma: no cover
+        # Vectors on the equator map to the last row or column
+        if niip_i >= npx:
+            niip_i = nii_i
+        if nijp_i >= npy:
+            nijp_i = nij_i
         if nii_i < 0:
             nii_i = niip_i  # pragma: no cover
         if nij_i < 0:
@@ -769,3 +1257,202 @@ def _lambert2vector(x: np.ndarray, y: np.ndarray) -> np.ndarray:
                 cart[i] = [q * np.cos(qq), q * np.sin(qq), 1 - 2 * xi**2 / np.pi]
 
     return cart
+
+
+# -------------------- Cube map lookup table ------------------------- #
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_cube_map_from_master_pattern(
+    master_upper: np.ndarray,
+    master_lower: np.ndarray,
+    npx: int,
+    npy: int,
+    scale: float,
+    size: int,
+) -> np.ndarray:
+    """Return a cube map lookup table of master pattern intensities.
+
+    Each of the six faces of a cube centered on the unit sphere is
+    sampled on a regular grid of ``size`` x ``size`` points, and the
+    intensity at each point is interpolated from the master pattern in
+    the square Lambert projection. Each face has a border of one point
+    sampled just outside the face, so that bi-linear interpolation
+    within a face never needs points from neighbouring faces.
+
+    Parameters
+    ----------
+    master_upper
+        Upper hemisphere of the master pattern.
+    master_lower
+        Lower hemisphere of the master pattern.
+    npx
+        Number of pixels in the x-direction on the master pattern.
+    npy
+        Number of pixels in the y-direction on the master pattern.
+    scale
+        Factor to scale up from square Lambert projection to the master
+        pattern.
+    size
+        Number of grid points along each edge of a face.
+
+    Returns
+    -------
+    cube_map
+        Intensities of shape (6, size + 2, size + 2) as 32-bit floats.
+        Faces are ordered +x, -x, +y, -y, +z, -z. See
+        :func:`_get_pixel_from_cube_map` for the face coordinates.
+    """
+    n = size + 2
+    coordinates = (2 * np.arange(n) - 1) / size - 1
+
+    cube_map = np.zeros((6, n, n), dtype=np.float32)
+    v = np.zeros((n * n, 3), dtype=np.float64)
+    for face in range(6):
+        axis = face // 2
+        sign = 1 - 2 * (face % 2)
+        for a in range(n):
+            for b in range(n):
+                k = a * n + b
+                u = coordinates[a]
+                w = coordinates[b]
+                if axis == 0:
+                    v[k, 0], v[k, 1], v[k, 2] = sign, u, w
+                elif axis == 1:
+                    v[k, 0], v[k, 1], v[k, 2] = u, sign, w
+                else:
+                    v[k, 0], v[k, 1], v[k, 2] = u, w, sign
+
+        (nii, nij, niip, nijp, di, dj, dim, djm) = (
+            _get_lambert_interpolation_parameters(v=v, npx=npx, npy=npy, scale=scale)
+        )
+
+        for a in range(n):
+            for b in range(n):
+                k = a * n + b
+                # fmt: off
+                if v[k, 2] >= 0:
+                    cube_map[face, a, b] = _get_pixel_from_master_pattern(
+                        master_upper,
+                        nii[k], nij[k], niip[k], nijp[k], di[k], dj[k], dim[k], djm[k]
+                    )
+                else:
+                    cube_map[face, a, b] = _get_pixel_from_master_pattern(
+                        master_lower,
+                        nii[k], nij[k], niip[k], nijp[k], di[k], dj[k], dim[k], djm[k]
+                    )
+                # fmt: on
+
+    return cube_map
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _get_pixel_from_cube_map(
+    cube_map: np.ndarray, x: float, y: float, z: float
+) -> float:
+    """Return an intensity from a cube map lookup table using bi-linear
+    interpolation.
+
+    The vector (x, y, z) does not have to be normalized. It is projected
+    onto the face of the cube it points to, with face coordinates (y, z)
+    on the x faces, (x, z) on the y faces and (x, y) on the z faces.
+
+    Notes
+    -----
+    This function is optimized with Numba, so care must be taken with
+    array shapes and data types.
+    """
+    abs_x = abs(x)
+    abs_y = abs(y)
+    abs_z = abs(z)
+    if abs_x >= abs_y and abs_x >= abs_z:
+        face = 0 if x >= 0 else 1
+        u = y / abs_x
+        w = z / abs_x
+    elif abs_y >= abs_z:
+        face = 2 if y >= 0 else 3
+        u = x / abs_y
+        w = z / abs_y
+    else:
+        face = 4 if z >= 0 else 5
+        u = x / abs_z
+        w = y / abs_z
+
+    # Continuous indices into the face including its border
+    size = cube_map.shape[1] - 2
+    half_size = 0.5 * size
+    ti = (u + 1) * half_size + 0.5
+    tj = (w + 1) * half_size + 0.5
+    i = min(max(int(ti), 0), size)
+    j = min(max(int(tj), 0), size)
+    di = ti - i
+    dj = tj - j
+
+    return (
+        cube_map[face, i, j] * (1 - di) * (1 - dj)
+        + cube_map[face, i + 1, j] * di * (1 - dj)
+        + cube_map[face, i, j + 1] * (1 - di) * dj
+        + cube_map[face, i + 1, j + 1] * di * dj
+    )
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _project_single_pattern_from_cube_map(
+    rotation: np.ndarray,
+    direction_cosines: np.ndarray,
+    cube_map: np.ndarray,
+    rescale: bool,
+    out_min: int | float,
+    out_max: int | float,
+    dtype_out: type | None = np.float32,
+) -> np.ndarray:
+    """Return a single pattern projected from a cube map lookup table of
+    a master pattern.
+
+    Parameters
+    ----------
+    rotation
+        Quaternion of shape (4,).
+    direction_cosines
+        Direction cosines (unit vectors) between detector and sample of
+        shape (n pixels, 3).
+    cube_map
+        Lookup table returned from
+        :func:`_get_cube_map_from_master_pattern`.
+    rescale
+        Whether to rescale pattern intensities.
+    out_min
+        Minimum intensity of output pattern.
+    out_max
+        Maximum intensity of output pattern.
+    dtype_out
+        NumPy data type of the returned pattern, by default 32-bit
+        float.
+
+    Returns
+    -------
+    pattern
+        1D simulated pattern of the given data type.
+
+    Notes
+    -----
+    This function is optimized with Numba, so care must be taken with
+    array shapes and data types.
+    """
+    om = rotation_to_matrix(rotation)
+    n_pixels = direction_cosines.shape[0]
+    pattern = np.zeros(n_pixels, dtype=np.float64)
+    for i in range(n_pixels):
+        dx, dy, dz = direction_cosines[i]
+        x = om[0, 0] * dx + om[0, 1] * dy + om[0, 2] * dz
+        y = om[1, 0] * dx + om[1, 1] * dy + om[1, 2] * dz
+        z = om[2, 0] * dx + om[2, 1] * dy + om[2, 2] * dz
+        pattern[i] = _get_pixel_from_cube_map(cube_map, x, y, z)
+
+    # Potentially rescale pattern intensities to desired data type
+    if rescale:
+        pattern = _rescale_with_min_max(
+            pattern, np.min(pattern), np.max(pattern), out_min, out_max
+        )
+
+    return pattern.astype(dtype_out)
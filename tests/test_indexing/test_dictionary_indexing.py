@@ -15,12 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
+from pathlib import Path
+
 import dask.array as da
 import numpy as np
-from orix.crystal_map import CrystalMap
+from orix.crystal_map import CrystalMap, PhaseList
+from orix.quaternion import Rotation
 import pytest
 
 import kikuchipy as kp
+from kikuchipy.indexing._dictionary_cache import (
+    _DictionaryCache,
+    _get_dictionary_cache_key,
+)
+from kikuchipy.indexing._dictionary_indexing import (
+    _merge_top_k_inplace,
+    _ProjectedDictionary,
+)
 
 
 class TestDictionaryIndexing:
@@ -178,3 +189,245 @@ class TestDictionaryIndexing:
         assert xmap1.rotations_per_point == 1
         assert xmap2.size == 1
         assert xmap2.rotations_per_point == s_dict.xmap.size
+
+    @pytest.mark.parametrize("n_per_iteration", [1, 2, 4])
+    def test_dictionary_indexing_n_per_iteration_equal_results(
+        self, dummy_signal, n_per_iteration
+    ):
+        """Merging best matches per dictionary chunk gives the same
+        result as matching the full dictionary at once.
+        """
+        s_dict = kp.signals.EBSD(dummy_signal.data.reshape(-1, 3, 3))
+        s_dict.axes_manager[0].name = "x"
+        s_dict.xmap = CrystalMap.empty((9,))
+        xmap1 = dummy_signal.dictionary_indexing(s_dict, keep_n=5)
+        xmap2 = dummy_signal.dictionary_indexing(
+            s_dict, keep_n=5, n_per_iteration=n_per_iteration
+        )
+        assert np.allclose(xmap1.scores, xmap2.scores)
+        assert np.all(xmap2.scores[:, :-1] >= xmap2.scores[:, 1:])
+        assert np.all(xmap2.simulation_indices[:, 0] == np.arange(9))
+
+
+class TestMergeTopK:
+    @pytest.mark.parametrize("sign", [1, -1])
+    def test_merge_top_k_inplace(self, sign):
+        rng = np.random.default_rng(42)
+        n, keep_n, n_chunk, n_chunks = 10, 5, 3, 4
+        all_scores = rng.random((n, n_chunk * n_chunks), dtype=np.float32)
+
+        scores = np.full((n, keep_n), -sign * np.inf, dtype=np.float32)
+        simulation_indices = np.zeros((n, keep_n), dtype=np.int32)
+        for i in range(n_chunks):
+            start = i * n_chunk
+            scores_i = all_scores[:, start : start + n_chunk]
+            indices_i = np.tile(np.arange(n_chunk, dtype=np.int32), (n, 1))
+            _merge_top_k_inplace(
+                scores, simulation_indices, scores_i, indices_i, start, sign
+            )
+
+        idx = np.argsort(-sign * all_scores, axis=1)[:, :keep_n]
+        assert np.array_equal(simulation_indices, idx)
+        assert np.allclose(scores, np.take_along_axis(all_scores, idx, axis=1))
+
+
+class TestDictionaryIndexingFromMasterPattern:
+    def test_dictionary_indexing_from_master_pattern(self):
+        """Projecting dictionary patterns during indexing gives the same
+        result as indexing with a dictionary signal.
+        """
+        s = kp.data.nickel_ebsd_small()
+        s.remove_static_background()
+        s.remove_dynamic_background()
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        det = kp.detectors.EBSDDetector(
+            shape=s.axes_manager.signal_shape[::-1],
+            pc=[0.421, 0.7794, 0.5049],
+            sample_tilt=70,
+            convention="tsl",
+        )
+        rot = Rotation.from_euler(np.radians([[0, 0, 0], [10, 20, 30]]))
+        rot = Rotation(np.concatenate([rot.data, s.xmap.rotations[:3].data]))
+        s_dict = mp.get_patterns(rot, det, energy=20, compute=True)
+
+        xmap1 = s.dictionary_indexing(s_dict, keep_n=3)
+        xmap2 = s.dictionary_indexing(
+            mp, keep_n=3, n_per_iteration=2, rotations=rot, detector=det, energy=20
+        )
+        assert np.allclose(xmap1.scores, xmap2.scores, atol=1e-5)
+        assert np.array_equal(xmap1.simulation_indices, xmap2.simulation_indices)
+        assert np.allclose(xmap1.rotations.data, xmap2.rotations.data)
+        assert xmap2.phases[0].name == mp.phase.name
+
+        xmap3 = s.dictionary_indexing(mp, keep_n=3, rotations=rot, detector=det)
+        assert np.allclose(xmap1.scores, xmap3.scores, atol=1e-5)
+
+    def test_dictionary_indexing_from_master_pattern_cache(self, tmpdir):
+        s = kp.data.nickel_ebsd_small()
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        det = kp.detectors.EBSDDetector(
+            shape=(60, 60), pc=[0.421, 0.7794, 0.5049], sample_tilt=70
+        )
+        rot = s.xmap.rotations.flatten()
+        kw = dict(rotations=rot, detector=det, keep_n=2, n_per_iteration=4)
+
+        xmap1 = s.dictionary_indexing(mp, **kw)
+        xmap2 = s.dictionary_indexing(mp, cache_dir=tmpdir, **kw)
+        dirs = [d for d in Path(tmpdir).iterdir()]
+        assert len(dirs) == 1
+        tiles = sorted(dirs[0].glob("tile_*.npy"))
+        assert [t.name for t in tiles] == [
+            "tile_0_4.npy",
+            "tile_4_8.npy",
+            "tile_8_9.npy",
+        ]
+
+        # Patterns are read from the cache
+        xmap3 = s.dictionary_indexing(mp, cache_dir=tmpdir, **kw)
+        assert np.allclose(xmap1.scores, xmap2.scores)
+        assert np.allclose(xmap1.scores, xmap3.scores)
+        assert np.array_equal(xmap1.simulation_indices, xmap3.simulation_indices)
+
+        # Another metric gives another dictionary, and the least
+        # recently used one is removed if the cache is too large
+        _ = s.dictionary_indexing(
+            mp, metric="ndp", cache_dir=tmpdir, cache_size=1, **kw
+        )
+        dirs2 = [d for d in Path(tmpdir).iterdir()]
+        assert len(dirs2) == 1
+        assert dirs2[0] != dirs[0]
+
+    def test_dictionary_cache_set_tile(self, tmpdir):
+        cache = _DictionaryCache(tmpdir, "abc", max_size="1 MB")
+        assert cache.get_tile(0, 10) is None
+
+        patterns = np.arange(60, dtype=np.float32).reshape((10, 6))
+        cache.set_tile(0, 10, da.from_array(patterns, chunks=(3, -1)))
+        cache.set_tile(10, 20, patterns)
+        for start in [0, 10]:
+            tile = cache.get_tile(start, start + 10)
+            assert isinstance(tile, np.memmap)
+            assert np.array_equal(tile, patterns)
+        assert not list(Path(tmpdir, "abc").glob("*.tmp"))
+
+    def test_dictionary_cache_key(self):
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        det = kp.detectors.EBSDDetector(shape=(10, 10))
+        rot = Rotation.identity(2)
+        metric = kp.indexing.NormalizedCrossCorrelationMetric()
+
+        d1 = _ProjectedDictionary(mp, rot, det)
+        key1 = _get_dictionary_cache_key(d1, metric)
+        assert key1 == _get_dictionary_cache_key(d1, metric)
+
+        det2 = det.deepcopy()
+        det2.pcx = 0.4
+        d2 = _ProjectedDictionary(mp, rot, det2)
+        assert key1 != _get_dictionary_cache_key(d2, metric)
+
+        metric.signal_mask = np.zeros(det.shape, dtype=bool)
+        assert key1 != _get_dictionary_cache_key(d1, metric)
+
+    def test_dictionary_indexing_from_master_pattern_raises(self):
+        s = kp.data.nickel_ebsd_small()
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        rot = Rotation.identity(2)
+        det = kp.detectors.EBSDDetector(shape=(60, 60))
+
+        with pytest.raises(ValueError, match="`rotations` and `detector` must be "):
+            _ = s.dictionary_indexing(mp, rotations=rot)
+        det2 = kp.detectors.EBSDDetector(shape=(60, 60), pc=np.full((2, 3), 0.5))
+        with pytest.raises(ValueError, match="`detector` must have exactly one "):
+            _ = s.dictionary_indexing(mp, rotations=rot, detector=det2)
+        det3 = kp.detectors.EBSDDetector(shape=(50, 60))
+        with pytest.raises(ValueError, match=r"Experimental \(60, 60\) and detector "):
+            _ = s.dictionary_indexing(mp, rotations=rot, detector=det3)
+        mp_stereo = kp.data.nickel_ebsd_master_pattern_small()
+        with pytest.raises(NotImplementedError, match="Master pattern must be in "):
+            _ = s.dictionary_indexing(mp_stereo, rotations=rot, detector=det)
+
+
+class TestDictionaryIndexingMultiplePhases:
+    @pytest.mark.parametrize("lazy, with_mask", [(False, False), (True, True)])
+    def test_dictionary_indexing_multiple_phases(self, lazy, with_mask):
+        """Indexing with multiple dictionaries in one pass gives the
+        same result as merging single phase maps.
+        """
+        s = kp.data.nickel_ebsd_small()
+        s.remove_static_background()
+        s.remove_dynamic_background()
+
+        rot = s.xmap.rotations.flatten()
+        phase1 = s.xmap.phases[0].deepcopy()
+        phase1.name = "a"
+        phase2 = phase1.deepcopy()
+        phase2.name = "b"
+        s_dict1 = kp.signals.EBSD(s.data.reshape((-1, 60, 60)))
+        s_dict1.axes_manager[0].name = "x"
+        s_dict1.xmap = CrystalMap(rot, phase_list=PhaseList(phase1))
+        # Second phase with flipped patterns
+        s_dict2 = kp.signals.EBSD(s_dict1.data[:, ::-1].copy())
+        s_dict2.axes_manager[0].name = "x"
+        s_dict2.xmap = CrystalMap(rot, phase_list=PhaseList(phase2))
+
+        navigation_mask = None
+        if with_mask:
+            navigation_mask = np.zeros((3, 3), dtype=bool)
+            navigation_mask[0, 0] = True
+        if lazy:
+            s = s.as_lazy()
+            s.data = s.data.rechunk((1, 3, -1, -1))
+
+        kw = dict(keep_n=3, n_per_iteration=4, navigation_mask=navigation_mask)
+        xmap1 = s.dictionary_indexing(s_dict1, **kw)
+        xmap2 = s.dictionary_indexing(s_dict2, **kw)
+        xmap_ref = kp.indexing.merge_crystal_maps(
+            [xmap1, xmap2], simulation_indices_prop="simulation_indices"
+        )
+
+        xmap = s.dictionary_indexing([s_dict1, s_dict2], **kw)
+        assert xmap.phases.names == xmap_ref.phases.names
+        assert np.array_equal(xmap.phase_id, xmap_ref.phase_id)
+        assert np.allclose(xmap.rotations.data, xmap_ref.rotations.data, equal_nan=True)
+        for name in [
+            "scores",
+            "simulation_indices",
+            "merged_scores",
+            "merged_simulation_indices",
+        ]:
+            assert np.allclose(
+                xmap.prop[name], xmap_ref.prop[name], atol=1e-6, equal_nan=True
+            )
+        assert xmap.scan_unit == xmap_ref.scan_unit
+
+    def test_dictionary_indexing_multiple_master_patterns(self):
+        s = kp.data.nickel_ebsd_small()
+        s.remove_static_background()
+        s.remove_dynamic_background()
+        mp1 = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        mp2 = mp1.deepcopy()
+        mp2.phase = mp1.phase.deepcopy()
+        mp2.phase.name = "ni2"
+        det = kp.detectors.EBSDDetector(
+            shape=(60, 60),
+            pc=[0.421, 0.7794, 0.5049],
+            sample_tilt=70,
+            convention="tsl",
+        )
+        rot1 = s.xmap.rotations.flatten()
+        rot2 = Rotation.identity(2)
+
+        kw = dict(detector=det, keep_n=2)
+        xmap1 = s.dictionary_indexing(mp1, rotations=rot1, **kw)
+        xmap2 = s.dictionary_indexing(mp2, rotations=rot2, **kw)
+        xmap_ref = kp.indexing.merge_crystal_maps(
+            [xmap1, xmap2], simulation_indices_prop="simulation_indices"
+        )
+
+        xmap = s.dictionary_indexing([mp1, mp2], rotations=[rot1, rot2], **kw)
+        assert xmap.phases.names == xmap_ref.phases.names
+        assert np.array_equal(xmap.phase_id, xmap_ref.phase_id)
+        assert np.allclose(xmap.merged_scores, xmap_ref.merged_scores, atol=1e-6)
+
+        with pytest.raises(ValueError, match="`rotations` must be a list of as many "):
+            _ = s.dictionary_indexing([mp1, mp2], rotations=[rot1], **kw)
@@ -24,8 +24,22 @@ from orix.quaternion import Rotation
 import pytest
 
 import kikuchipy as kp
+from kikuchipy._utils.numba import rotation_from_euler
+from kikuchipy.indexing._refinement._objective_functions import (
+    _refine_orientation_objective_function,
+    _refine_orientation_objective_function_with_gradient,
+    _refine_orientation_pc_objective_function,
+    _refine_orientation_pc_objective_function_with_gradient,
+    _refine_pc_objective_function,
+    _refine_pc_objective_function_with_gradient,
+)
+from kikuchipy.indexing._refinement._refinement import _get_master_pattern_data
 from kikuchipy.indexing._refinement._solvers import _prepare_pattern
 from kikuchipy.signals.util._crystal_map import _equal_phase
+from kikuchipy.signals.util._master_pattern import (
+    _get_direction_cosines_basis,
+    _get_direction_cosines_from_detector,
+)
 
 
 class EBSDRefineTestSetup:
@@ -258,6 +272,52 @@ class TestEBSDRefine(EBSDRefineTestSetup):
                 initial_step=[1, 1, 1],
             )
 
+    def test_refine_raises_initial_step_batched(
+        self, dummy_signal, get_single_phase_xmap
+    ):
+        s = dummy_signal
+        nav_shape = s._navigation_shape_rc
+        xmap = get_single_phase_xmap(
+            nav_shape=nav_shape,
+            rotations_per_point=1,
+            step_sizes=tuple(a.scale for a in s.axes_manager.navigation_axes)[::-1],
+        )
+        det = kp.detectors.EBSDDetector(shape=s._signal_shape_rc)
+
+        with pytest.raises(
+            ValueError, match="The initial step must be a single number"
+        ):
+            _ = s.refine_orientation(
+                xmap=xmap,
+                master_pattern=self.mp,
+                energy=20,
+                detector=det,
+                method="batched_neldermead",
+                initial_step=[1, 1],
+            )
+
+    def test_refine_raises_lookup_table_gradient(
+        self, dummy_signal, get_single_phase_xmap
+    ):
+        s = dummy_signal
+        nav_shape = s._navigation_shape_rc
+        xmap = get_single_phase_xmap(
+            nav_shape=nav_shape,
+            rotations_per_point=1,
+            step_sizes=tuple(a.scale for a in s.axes_manager.navigation_axes)[::-1],
+        )
+        det = kp.detectors.EBSDDetector(shape=s._signal_shape_rc)
+
+        with pytest.raises(ValueError, match="A lookup table cannot be used with "):
+            _ = s.refine_orientation(
+                xmap=xmap,
+                master_pattern=self.mp,
+                energy=20,
+                detector=det,
+                method_kwargs=dict(method="L-BFGS-B"),
+                lookup_table=True,
+            )
+
     def test_refine_single_point(self, dummy_signal, get_single_phase_xmap):
         am = dummy_signal.axes_manager
         xmap = get_single_phase_xmap(
@@ -369,6 +429,85 @@ class TestEBSDRefine(EBSDRefineTestSetup):
             )
 
 
+class TestObjectiveFunctionGradient(EBSDRefineTestSetup):
+    def setup_method(self):
+        s = self.nickel_ebsd_small
+        det = s.detector.deepcopy()
+        det.pc = det.pc_average + 0.005
+        self.det = det
+        mp = kp.data.nickel_ebsd_master_pattern_small(energy=20, projection="lambert")
+        self.fixed_parameters = _get_master_pattern_data(mp, 20)
+        pattern = s.data[0, 0].ravel().astype("float32")
+        self.pattern, self.squared_norm = _prepare_pattern(pattern, True)
+        self.euler = s.xmap.rotations[0].to_euler().squeeze() + 0.01
+        self.pc = det.pc[0].astype(np.float64)
+        self.pc_parameters = _get_direction_cosines_basis(
+            det.nrows,
+            det.ncols,
+            (~det.sample_to_detector).to_matrix().squeeze(),
+            np.ones(det.size, dtype=bool),
+        )
+
+    @staticmethod
+    def finite_difference_gradient(func, x, args, h):
+        gradient = np.zeros(x.size)
+        for i in range(x.size):
+            step = np.zeros(x.size)
+            step[i] = h
+            gradient[i] = (func(x + step, *args) - func(x - step, *args)) / (2 * h)
+        return gradient
+
+    def test_refine_orientation_objective_function_with_gradient(self):
+        dc = _get_direction_cosines_from_detector(self.det)
+        args = (self.pattern, dc) + self.fixed_parameters + (self.squared_norm,)
+        x = self.euler
+
+        value, gradient = _refine_orientation_objective_function_with_gradient(x, *args)
+        assert np.isclose(value, _refine_orientation_objective_function(x, *args))
+        assert gradient.shape == (3,)
+        gradient_fd = self.finite_difference_gradient(
+            _refine_orientation_objective_function, x, args, 1e-4
+        )
+        assert np.allclose(gradient, gradient_fd, rtol=0.02, atol=0.05)
+
+    def test_refine_pc_objective_function_with_gradient(self):
+        rot = rotation_from_euler(*self.euler)
+        args = (
+            (self.pattern, rot)
+            + self.fixed_parameters
+            + self.pc_parameters
+            + (self.squared_norm,)
+        )
+        x = self.pc
+
+        value, gradient = _refine_pc_objective_function_with_gradient(x, *args)
+        assert np.isclose(value, _refine_pc_objective_function(x, *args))
+        assert gradient.shape == (3,)
+        gradient_fd = self.finite_difference_gradient(
+            _refine_pc_objective_function, x, args, 1e-5
+        )
+        assert np.allclose(gradient, gradient_fd, rtol=0.02, atol=0.05)
+
+    def test_refine_orientation_pc_objective_function_with_gradient(self):
+        args = (
+            (self.pattern,)
+            + self.fixed_parameters
+            + self.pc_parameters
+            + (self.squared_norm,)
+        )
+        x = np.concatenate([self.euler, self.pc])
+
+        value, gradient = _refine_orientation_pc_objective_function_with_gradient(
+            x, *args
+        )
+        assert np.isclose(value, _refine_orientation_pc_objective_function(x, *args))
+        assert gradient.shape == (6,)
+        gradient_fd = self.finite_difference_gradient(
+            _refine_orientation_pc_objective_function, x, args, 1e-5
+        )
+        assert np.allclose(gradient, gradient_fd, rtol=0.02, atol=0.05)
+
+
 class TestEBSDRefineOrientation(EBSDRefineTestSetup):
     @pytest.mark.parametrize(
         "ebsd_with_axes_and_random_data, detector, method_kwargs, trust_region",
@@ -596,6 +735,123 @@ class TestEBSDRefineOrientation(EBSDRefineTestSetup):
         )
         assert xmap_ref.scores.mean() > s.xmap.scores.mean()
 
+    def test_refine_orientation_nickel_ebsd_small_gradient(self):
+        """Gradient-based minimization with the analytic gradient should
+        converge to the same scores as Nelder-Mead with fewer function
+        evaluations.
+        """
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        xmap = s.xmap.deepcopy()
+        rot_offset = Rotation.from_axes_angles([1, 1, 0], np.deg2rad(1.5))
+        xmap._rotations = rot_offset * xmap._rotations
+
+        ref_kw = dict(
+            xmap=xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+            trust_region=[3, 3, 3],
+        )
+        xmap_ref1 = s.refine_orientation(**ref_kw)
+        method_kwargs = dict(method="L-BFGS-B")
+        xmap_ref2 = s.refine_orientation(method_kwargs=method_kwargs, **ref_kw)
+        assert method_kwargs["jac"] is True
+        assert np.allclose(xmap_ref2.scores, xmap_ref1.scores, atol=1e-3)
+        assert xmap_ref2.num_evals.mean() < xmap_ref1.num_evals.mean()
+
+    @pytest.mark.skipif(
+        not kp.constants.installed["nlopt"], reason="NLopt is not installed"
+    )
+    def test_refine_orientation_nickel_ebsd_small_gradient_nlopt(self):
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        xmap_ref = s.refine_orientation(
+            xmap=s.xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+            method="LD_LBFGS",
+            trust_region=[2, 2, 2],
+        )
+        assert np.allclose(xmap_ref.scores, s.xmap.scores, atol=1e-3)
+
+    def test_refine_orientation_nickel_ebsd_small_batched(self):
+        """Batched Nelder-Mead should give the same results as SciPy's
+        Nelder-Mead, with varying and fixed PCs.
+        """
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        det = s.detector
+        det2 = det.deepcopy()
+        det2.pc = det2.pc_average
+        for detector, trust_region in [(det, None), (det2, [2, 2, 2])]:
+            ref_kw = dict(
+                xmap=s.xmap,
+                detector=detector,
+                master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                    energy=energy, projection="lambert"
+                ),
+                energy=energy,
+                signal_mask=signal_mask,
+                trust_region=trust_region,
+            )
+            xmap_ref1 = s.refine_orientation(**ref_kw)
+            xmap_ref2 = s.refine_orientation(method="batched_neldermead", **ref_kw)
+            assert np.allclose(xmap_ref2.scores, xmap_ref1.scores, atol=1e-4)
+
+        xmap_ref3 = s.refine_orientation(
+            method="batched_neldermead", initial_step=1, maxeval=20, **ref_kw
+        )
+        assert xmap_ref3.num_evals.max() <= 21
+
+    def test_refine_orientation_nickel_ebsd_small_lookup_table(self):
+        """Projecting from a lookup table should give almost the same
+        scores as projecting from the master pattern directly.
+        """
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        ref_kw = dict(
+            xmap=s.xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+        )
+        xmap_ref1 = s.refine_orientation(**ref_kw)
+        for method in ["minimize", "batched_neldermead"]:
+            xmap_ref2 = s.refine_orientation(method=method, lookup_table=True, **ref_kw)
+            assert np.allclose(xmap_ref2.scores, xmap_ref1.scores, atol=5e-3)
+            assert np.allclose(
+                xmap_ref2.rotations.angle_with(xmap_ref1.rotations, degrees=True),
+                0,
+                atol=0.2,
+            )
+
     @pytest.mark.skipif(
         not kp.constants.installed["nlopt"], reason="NLopt is not installed"
     )
@@ -677,6 +933,11 @@ class TestEBSDRefineOrientation(EBSDRefineTestSetup):
             **ref_kw,
         )
 
+        # Batched Nelder-Mead
+        xmap_ref2 = s.refine_orientation(method="batched_neldermead", **ref_kw)
+        assert np.allclose(xmap_ref2.scores, xmap_ref.scores, atol=1e-4)
+        assert np.allclose(xmap_ref2.pseudo_symmetry_index, [0, 0, 0, 0, 0, 1, 0, 0, 0])
+
     def test_refine_orientation_not_indexed_case1(
         self, dummy_signal, get_single_phase_xmap
     ):
@@ -955,6 +1216,63 @@ class TestEBSDRefinePC(EBSDRefineTestSetup):
         assert isinstance(det_ref, kp.detectors.EBSDDetector)
         assert num_evals_ref.shape == xmap.shape
 
+    def test_refine_projection_center_batched(self):
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        ref_kw = dict(
+            xmap=s.xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+        )
+        scores_ref1, det_ref1, _ = s.refine_projection_center(**ref_kw)
+        scores_ref2, det_ref2, _ = s.refine_projection_center(
+            method="batched_neldermead", **ref_kw
+        )
+        assert np.allclose(scores_ref2, scores_ref1, atol=1e-4)
+        assert np.allclose(det_ref2.pc, det_ref1.pc, atol=1e-3)
+
+        scores_ref3, _, num_evals_ref3 = s.refine_projection_center(
+            method="batched_neldermead",
+            trust_region=[0.01, 0.01, 0.01],
+            initial_step=0.005,
+            maxeval=30,
+            **ref_kw,
+        )
+        assert np.all(scores_ref3 >= s.xmap.get_map_data("scores") - 1e-3)
+        assert num_evals_ref3.max() <= 31
+
+    def test_refine_projection_center_lookup_table(self):
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        ref_kw = dict(
+            xmap=s.xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+        )
+        scores_ref1, det_ref1, _ = s.refine_projection_center(**ref_kw)
+        for method in ["minimize", "batched_neldermead"]:
+            scores_ref2, det_ref2, _ = s.refine_projection_center(
+                method=method, lookup_table=True, **ref_kw
+            )
+            assert np.allclose(scores_ref2, scores_ref1, atol=5e-3)
+            assert np.allclose(det_ref2.pc, det_ref1.pc, atol=2e-3)
+
     def test_refine_projection_center_not_compute(
         self,
         dummy_signal,
@@ -1142,6 +1460,30 @@ class TestEBSDRefineOrientationPC(EBSDRefineTestSetup):
         # Should ideally be (9, 8) with better use of map_blocks()
         assert dask_array.shape == (9, 1)
 
+    def test_refine_orientation_projection_center_lookup_table(self):
+        s = self.nickel_ebsd_small
+
+        energy = 20
+        signal_mask = kp.filters.Window("circular", s._signal_shape_rc)
+        signal_mask = ~signal_mask.astype(bool)
+
+        ref_kw = dict(
+            xmap=s.xmap,
+            detector=s.detector,
+            master_pattern=kp.data.nickel_ebsd_master_pattern_small(
+                energy=energy, projection="lambert"
+            ),
+            energy=energy,
+            signal_mask=signal_mask,
+        )
+        xmap_ref1, det_ref1 = s.refine_orientation_projection_center(**ref_kw)
+        for method in ["minimize", "batched_neldermead"]:
+            xmap_ref2, det_ref2 = s.refine_orientation_projection_center(
+                method=method, lookup_table=True, **ref_kw
+            )
+            assert np.allclose(xmap_ref2.scores, xmap_ref1.scores, atol=5e-3)
+            assert np.allclose(det_ref2.pc, det_ref1.pc, atol=2e-3)
+
     @pytest.mark.skipif(
         not kp.constants.installed["nlopt"], reason="NLopt is not installed"
     )
@@ -1225,6 +1567,16 @@ class TestEBSDRefineOrientationPC(EBSDRefineTestSetup):
             **ref_kw,
         )
 
+        # Batched Nelder-Mead
+        xmap_ref2, det_ref2 = s.refine_orientation_projection_center(
+            method="batched_neldermead",
+            trust_region=[2, 2, 2, 0.05, 0.05, 0.05],
+            **ref_kw,
+        )
+        assert np.allclose(xmap_ref2.scores, xmap_ref.scores, atol=1e-4)
+        assert np.allclose(det_ref2.pc, det_ref.pc, atol=1e-3)
+        assert np.allclose(xmap_ref2.pseudo_symmetry_index, [0, 0, 0, 0, 0, 1, 0, 0, 0])
+
     def test_refine_orientation_pc_not_indexed_case1(
         self, dummy_signal, get_single_phase_xmap
     ):
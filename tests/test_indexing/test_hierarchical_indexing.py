@@ -0,0 +1,125 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+from orix.quaternion import Rotation
+import pytest
+
+import kikuchipy as kp
+from kikuchipy.indexing._hierarchical_indexing import (
+    _get_local_rotation_offsets,
+    _get_local_rotations,
+)
+
+
+class TestHierarchicalDictionaryIndexing:
+    def setup_method(self):
+        s = kp.data.nickel_ebsd_small()
+        s.remove_static_background()
+        s.remove_dynamic_background()
+        self.s = s
+        self.mp = kp.data.nickel_ebsd_master_pattern_small(
+            projection="lambert", energy=20
+        )
+        self.det = kp.detectors.EBSDDetector(
+            shape=(60, 60),
+            pc=[0.421, 0.7794, 0.5049],
+            sample_tilt=70,
+            convention="tsl",
+        )
+        # Coarse dictionary of rotations 3 degrees away from the ones
+        # in the data
+        rot = s.xmap.rotations.flatten()
+        offset = Rotation.from_axes_angles([1, 1, 0], 3, degrees=True)
+        self.rot_coarse = offset * rot
+
+    @pytest.mark.parametrize("binning", [1, 2])
+    def test_hierarchical_dictionary_indexing(self, binning):
+        s = self.s
+        kw = dict(detector=self.det, energy=20, keep_n=2)
+        xmap1 = s.dictionary_indexing(self.mp, rotations=self.rot_coarse, **kw)
+        xmap2 = s.hierarchical_dictionary_indexing(
+            self.mp, self.rot_coarse, resolutions=[4, 1], binning=binning, **kw
+        )
+        assert xmap2.shape == xmap1.shape
+        assert xmap2.rotations_per_point == 2
+        assert np.all(xmap2.scores[:, :-1] >= xmap2.scores[:, 1:])
+        assert xmap2.simulation_indices.dtype == np.int32
+        assert np.all(xmap2.simulation_indices < self.rot_coarse.size)
+        if binning == 1:
+            # Refined orientations match better than the coarse ones
+            assert np.all(xmap2.scores[:, 0] >= xmap1.scores[:, 0])
+            assert xmap2.scan_unit == xmap1.scan_unit
+
+    def test_hierarchical_dictionary_indexing_masks(self):
+        nav_mask = np.zeros((3, 3), dtype=bool)
+        nav_mask[0] = True
+        sig_mask = np.zeros((60, 60), dtype=bool)
+        sig_mask[:10] = True
+        xmap = self.s.hierarchical_dictionary_indexing(
+            self.mp,
+            self.rot_coarse,
+            self.det,
+            resolutions=[2, 1],
+            energy=20,
+            keep_n=1,
+            binning=2,
+            navigation_mask=nav_mask,
+            signal_mask=sig_mask,
+        )
+        assert np.array_equal(xmap.is_in_data, ~nav_mask.ravel())
+        assert xmap.scores.shape == (6,)
+        assert xmap.simulation_indices.shape == (6,)
+
+    def test_hierarchical_dictionary_indexing_raises(self):
+        s = self.s
+        with pytest.raises(ValueError, match="`resolutions` must have at least two "):
+            _ = s.hierarchical_dictionary_indexing(
+                self.mp, self.rot_coarse, self.det, resolutions=[1, 2]
+            )
+        with pytest.raises(ValueError, match=r"Detector shape \(60, 60\) must be "):
+            _ = s.hierarchical_dictionary_indexing(
+                self.mp, self.rot_coarse, self.det, resolutions=[2, 1], binning=7
+            )
+        with pytest.raises(ValueError, match="The navigation mask shape"):
+            _ = s.hierarchical_dictionary_indexing(
+                self.mp,
+                self.rot_coarse,
+                self.det,
+                resolutions=[2, 1],
+                navigation_mask=np.zeros((2, 3), dtype=bool),
+            )
+
+
+class TestLocalRotations:
+    def test_get_local_rotation_offsets(self):
+        offsets = _get_local_rotation_offsets(1, 3)
+        angles = Rotation(offsets).angle
+        assert np.isclose(np.rad2deg(angles.max()), 3)
+        assert np.sum(np.isclose(angles, 0)) == 1
+        # Grid of rotation vectors with spacing 1 degree within 3
+        # degrees
+        assert offsets.shape == (123, 4)
+
+    def test_get_local_rotations(self):
+        centers = Rotation.random((2, 3)).data
+        offsets = _get_local_rotation_offsets(1, 2)
+        rotations = _get_local_rotations(centers, offsets)
+        assert rotations.shape == (2, 3 * offsets.shape[0], 4)
+        rotations_orix = Rotation(centers).outer(Rotation(offsets))
+        rotations_orix = rotations_orix.reshape(2, -1)
+        assert np.allclose(Rotation(rotations).angle_with(rotations_orix), 0, atol=1e-6)
@@ -0,0 +1,138 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+import dask.array as da
+import numpy as np
+from orix.crystal_map import CrystalMap
+import pytest
+
+import kikuchipy as kp
+
+
+@pytest.fixture
+def dictionary_patterns():
+    rng = np.random.default_rng(42)
+    return rng.random((200, 5, 5), dtype=np.float32)
+
+
+class TestInvertedFileIndex:
+    def test_repr(self, dictionary_patterns):
+        index = kp.indexing.InvertedFileIndex(n_clusters=10, n_probe=2)
+        assert (
+            repr(index) == "InvertedFileIndex: not fitted, n clusters: 10, n probe: 2"
+        )
+        index.fit(dictionary_patterns)
+        assert repr(index) == (
+            "InvertedFileIndex: 200 patterns, metric: ncc, n clusters: 10, n probe: 2"
+        )
+
+    @pytest.mark.parametrize("metric", ["ncc", "ndp"])
+    def test_search_all_clusters_is_exact(self, dictionary_patterns, metric):
+        rng = np.random.default_rng(0)
+        exp = rng.random((20, 5, 5), dtype=np.float32)
+        index = kp.indexing.InvertedFileIndex(n_clusters=10, random_state=0)
+        index.fit(da.from_array(dictionary_patterns), metric=metric)
+        assert index.size == 200
+        assert index.offsets[-1] == 200
+        assert np.array_equal(np.sort(index.simulation_indices), np.arange(200))
+
+        metric_class = {
+            "ncc": kp.indexing.NormalizedCrossCorrelationMetric,
+            "ndp": kp.indexing.NormalizedDotProductMetric,
+        }[metric]
+        m = metric_class(20, 200)
+        exp_prepared = m.prepare_experimental(exp).compute()
+        scores_exact = m(exp, dictionary_patterns).compute()
+        idx_exact = np.argsort(-scores_exact, axis=1)[:, :5]
+
+        idx, scores = index.search(exp_prepared, keep_n=5, n_probe=10)
+        assert np.array_equal(idx, idx_exact)
+        assert np.allclose(scores, np.take_along_axis(scores_exact, idx, 1), atol=1e-5)
+
+        # Fewer probed clusters give a subset of the candidates, but
+        # exact scores
+        idx2, scores2 = index.search(exp_prepared, keep_n=5, n_probe=1)
+        is_found = np.isfinite(scores2)
+        assert np.allclose(
+            scores2[is_found],
+            np.take_along_axis(scores_exact, idx2, 1)[is_found],
+            atol=1e-5,
+        )
+
+    def test_save_load(self, dictionary_patterns, tmp_path):
+        signal_mask = np.zeros((5, 5), dtype=bool)
+        signal_mask[0, 0] = True
+        index = kp.indexing.InvertedFileIndex(n_clusters=4, n_probe=3)
+        index.fit(dictionary_patterns, metric="ndp", signal_mask=signal_mask)
+        fname = tmp_path / "index.npz"
+        index.save(fname)
+
+        index2 = kp.indexing.InvertedFileIndex.load(fname)
+        assert repr(index2) == repr(index)
+        assert np.array_equal(index2.signal_mask, signal_mask)
+        for name in ["centroids", "patterns", "simulation_indices", "offsets"]:
+            assert np.array_equal(getattr(index2, name), getattr(index, name))
+
+    def test_raises(self, dictionary_patterns):
+        index = kp.indexing.InvertedFileIndex()
+        with pytest.raises(ValueError, match="The index must be fitted with `fit"):
+            index.search(np.ones((1, 25)), keep_n=1)
+        with pytest.raises(ValueError, match="The index must be fitted with `fit"):
+            index.save("index.npz")
+        with pytest.raises(ValueError, match="'a' must be either of "):
+            index.fit(dictionary_patterns, metric="a")
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric()
+        with pytest.raises(ValueError, match="must be either of "):
+            index.fit(dictionary_patterns, metric=metric)
+
+
+class TestDictionaryIndexingWithIndex:
+    def test_dictionary_indexing(self, dummy_signal):
+        s_dict = kp.signals.EBSD(dummy_signal.data.reshape(-1, 3, 3))
+        s_dict.axes_manager[0].name = "x"
+        s_dict.xmap = CrystalMap.empty((9,))
+        index = kp.indexing.InvertedFileIndex(n_clusters=3, n_probe=3)
+        index.fit(s_dict.data)
+
+        xmap1 = dummy_signal.dictionary_indexing(s_dict, keep_n=2)
+        xmap2 = dummy_signal.dictionary_indexing(s_dict, keep_n=2, index=index)
+        assert np.allclose(xmap1.scores, xmap2.scores)
+        assert np.array_equal(xmap1.simulation_indices, xmap2.simulation_indices)
+
+    def test_dictionary_indexing_raises(self, dummy_signal):
+        s_dict = kp.signals.EBSD(dummy_signal.data.reshape(-1, 3, 3))
+        s_dict.axes_manager[0].name = "x"
+        s_dict.xmap = CrystalMap.empty((9,))
+        index = kp.indexing.InvertedFileIndex(n_clusters=3)
+        index.fit(s_dict.data[:8])
+        with pytest.raises(ValueError, match="The index size 8 and the number of "):
+            _ = dummy_signal.dictionary_indexing(s_dict, index=index)
+
+        index.fit(s_dict.data, metric="ndp")
+        with pytest.raises(ValueError, match="The index was fitted with the 'ndp' "):
+            _ = dummy_signal.dictionary_indexing(s_dict, index=index)
+        with pytest.raises(ValueError, match="The index was fitted with another "):
+            _ = dummy_signal.dictionary_indexing(
+                s_dict,
+                metric="ndp",
+                signal_mask=np.zeros((3, 3), dtype=bool),
+                index=index,
+            )
+
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        with pytest.raises(ValueError, match="`dictionary` must be an EBSD signal "):
+            _ = dummy_signal.dictionary_indexing(mp, index=index)
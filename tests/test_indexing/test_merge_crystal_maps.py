@@ -684,3 +684,83 @@ class TestMergeCrystalMaps:
             np.deg2rad([60, 30, 30, 60, 60, 30, 60, 30, 30]),
         )
         assert np.allclose(xmap_ab["indexed"].scores, [3, 2, 3, 1, 5, 4, 4, 2, 1])
+
+    def test_not_indexed_navigation_masks(self):
+        xmap_a = CrystalMap.empty((2, 3))
+        xmap_a.phases.add_not_indexed()
+        xmap_a.phases[0].name = "a"
+        xmap_a.prop["scores"] = np.array([2, 2, 0, 3, 0, 4], dtype=float)
+        xmap_a[np.array([0, 0, 1, 0, 1, 0], dtype=bool)].phase_id = -1
+
+        # Map of the two points not indexed in the first map, where only
+        # the second point is indexed
+        xmap_b = CrystalMap.empty((2, 1))
+        xmap_b.phases.add_not_indexed()
+        xmap_b.phases[0].name = "b"
+        xmap_b.prop["scores"] = np.array([1, 5], dtype=float)
+        xmap_b[np.array([1, 0], dtype=bool)].phase_id = -1
+        nav_mask_b = np.array([[1, 1, 0], [1, 0, 1]], dtype=bool)
+
+        xmap_ab = kp.indexing.merge_crystal_maps(
+            [xmap_a, xmap_b], navigation_masks=[None, nav_mask_b]
+        )
+        assert np.allclose(xmap_ab.phase_id, [0, 0, -1, 0, 1, 0])
+
+    @pytest.mark.parametrize("rot_per_point", [1, 5])
+    def test_best_only(self, get_single_phase_xmap, rot_per_point):
+        xmaps = []
+        for i, name in enumerate(["a", "b", "c"]):
+            xmap = get_single_phase_xmap(
+                nav_shape=(4, 5),
+                rotations_per_point=rot_per_point,
+                prop_names=["scores", "sim_idx"],
+                name=name,
+                phase_id=i,
+            )
+            xmap.prop["scores"] = np.random.random(xmap.prop["scores"].shape)
+            xmaps.append(xmap)
+
+        xmap1 = kp.indexing.merge_crystal_maps(xmaps, simulation_indices_prop="sim_idx")
+        xmap2 = kp.indexing.merge_crystal_maps(
+            xmaps, simulation_indices_prop="sim_idx", best_only=True
+        )
+
+        assert xmap2.rotations_per_point == 1
+        assert np.allclose(xmap1.phase_id, xmap2.phase_id)
+        assert xmap1.phases.names == xmap2.phases.names
+        assert list(xmap2.prop.keys()) == ["scores", "sim_idx"]
+        if rot_per_point > 1:
+            assert np.allclose(xmap1.rotations.data[:, 0], xmap2.rotations.data)
+            assert np.allclose(xmap1.scores[:, 0], xmap2.scores)
+            assert np.allclose(xmap1.sim_idx[:, 0], xmap2.sim_idx)
+        else:
+            assert np.allclose(xmap1.rotations.data, xmap2.rotations.data)
+            assert np.allclose(xmap1.scores, xmap2.scores)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 20])
+    def test_chunk_size(self, get_single_phase_xmap, chunk_size):
+        xmaps = []
+        nav_masks = []
+        for i, name in enumerate(["a", "b"]):
+            xmap = get_single_phase_xmap(
+                nav_shape=(4, 5),
+                rotations_per_point=3,
+                prop_names=["scores", "sim_idx"],
+                name=name,
+                phase_id=i,
+            )
+            xmap.prop["scores"] = np.random.random(xmap.prop["scores"].shape)
+            nav_mask = np.random.random((4, 5)) > 0.7
+            xmaps.append(xmap[~nav_mask.ravel()])
+            nav_masks.append(nav_mask)
+
+        kwargs = dict(
+            simulation_indices_prop="sim_idx", navigation_masks=nav_masks, mean_n_best=2
+        )
+        xmap1 = kp.indexing.merge_crystal_maps(xmaps, **kwargs)
+        xmap2 = kp.indexing.merge_crystal_maps(xmaps, chunk_size=chunk_size, **kwargs)
+
+        assert np.allclose(xmap1.phase_id, xmap2.phase_id)
+        assert np.allclose(xmap1.rotations.data, xmap2.rotations.data, equal_nan=True)
+        for name in ["scores", "sim_idx", "merged_scores", "merged_sim_idx"]:
+            assert np.allclose(xmap1.prop[name], xmap2.prop[name], equal_nan=True)
@@ -62,3 +62,76 @@ class TestOrientationSimilarityMap:
             xmap, simulation_indices_prop=sim_idx_prop, from_n_best=2
         )
         assert osm.shape == (10, 10, 4)
+
+    def test_from_n_best_brute_force(self):
+        rng = np.random.default_rng()
+        si = rng.integers(0, 20, (6 * 7, 8))
+        y, x = np.indices((6, 7))
+        xmap = CrystalMap(
+            rotations=Rotation(np.ones((42, 4))),
+            prop={"simulation_indices": si},
+            x=x.ravel(),
+            y=y.ravel(),
+        )
+        footprint = np.ones((3, 3))
+        osm = kp.indexing.orientation_similarity_map(
+            xmap, from_n_best=1, normalize=True, footprint=footprint, center_index=4
+        )
+        assert osm.shape == (6, 7, 8)
+
+        si = si.reshape((6, 7, 8))
+        for r, c in [(0, 0), (3, 4), (5, 6)]:
+            for k, n in enumerate(range(8, 0, -1)):
+                n_equal = []
+                for rn in range(max(r - 1, 0), min(r + 2, 6)):
+                    for cn in range(max(c - 1, 0), min(c + 2, 7)):
+                        if (rn, cn) != (r, c):
+                            equal = np.intersect1d(si[r, c, :n], si[rn, cn, :n])
+                            n_equal.append(equal.size)
+                assert np.isclose(osm[r, c, k], np.mean(n_equal) / n)
+
+    def test_navigation_mask(self):
+        si = np.tile(np.arange(5), (100, 1))
+        si[[11, 12]] = np.arange(5, 10)
+        xmap = CrystalMap(
+            rotations=Rotation(np.zeros((100, 4))),
+            prop={"simulation_indices": si},
+            x=np.tile(np.arange(10), 10),
+            y=np.repeat(np.arange(10), 10),
+        )
+        nav_mask = np.zeros((10, 10), dtype=bool)
+        nav_mask[1, 1] = True
+
+        osm = kp.indexing.orientation_similarity_map(xmap, navigation_mask=nav_mask)
+        assert np.isnan(osm[1, 1])
+        assert np.isclose(osm[1, 2], 0)
+        assert np.isclose(osm[0, 1], 5)
+        assert np.isclose(osm[0, 2], 5 * 2 / 3)
+
+        with pytest.raises(ValueError, match="The navigation mask shape "):
+            _ = kp.indexing.orientation_similarity_map(
+                xmap, navigation_mask=nav_mask[:, :5]
+            )
+
+    def test_points_not_in_data(self):
+        xmap = CrystalMap(
+            rotations=Rotation(np.zeros((12, 4))),
+            prop={"simulation_indices": np.tile(np.arange(5), (12, 1))},
+            x=np.tile(np.arange(4), 3),
+            y=np.repeat(np.arange(3), 4),
+        )
+        is_in_data = np.ones(12, dtype=bool)
+        is_in_data[5] = False
+        osm = kp.indexing.orientation_similarity_map(xmap[is_in_data])
+        assert osm.shape == (3, 4)
+        assert np.isnan(osm[1, 1])
+        assert np.allclose(np.delete(osm.ravel(), 5), 5)
+
+    def test_1d_map(self):
+        xmap = CrystalMap(
+            rotations=Rotation(np.zeros((10, 4))),
+            prop={"simulation_indices": np.tile(np.arange(5), (10, 1))},
+            x=np.arange(10),
+        )
+        osm = kp.indexing.orientation_similarity_map(xmap, n_best=3)
+        assert np.allclose(osm, np.full(10, 3))
@@ -16,6 +16,8 @@
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+from orix.crystal_map import CrystalMap
+from orix.sampling import get_sample_fundamental
 import pytest
 
 import kikuchipy as kp
@@ -39,6 +41,137 @@ class TestSimilarityMetric:
         )
 
 
+class TestPCANormalizedCrossCorrelationMetric:
+    def test_metric_repr(self):
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            1, 1, n_components=5, n_candidates=2
+        )
+        assert repr(metric) == (
+            "PCANormalizedCrossCorrelationMetric: float32, greater is better, "
+            "rechunk: False, navigation mask: False, signal mask: False, "
+            "n components: 5, n candidates: 2"
+        )
+
+    def test_match_all_components_equals_ncc(self):
+        """Using all components and candidates gives exact NCC scores."""
+        rng = np.random.default_rng(42)
+        exp = rng.random((10, 5, 5), dtype=np.float32)
+        sim = rng.random((20, 5, 5), dtype=np.float32)
+
+        ncc = kp.indexing.NormalizedCrossCorrelationMetric(10, 20)
+        pca = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            10, 20, n_components=25, n_candidates=20
+        )
+        scores1 = ncc(exp, sim).compute()
+        scores2 = pca(exp, sim).compute()
+        assert np.allclose(scores1, scores2, atol=1e-5)
+        assert pca.basis.shape == (20, 25)
+        assert pca.basis.dtype == np.float32
+
+    def test_match_candidates(self):
+        rng = np.random.default_rng(42)
+        exp = rng.random((10, 25), dtype=np.float32)
+        sim = rng.random((20, 25), dtype=np.float32)
+
+        ncc = kp.indexing.NormalizedCrossCorrelationMetric(10, 20)
+        pca = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            10, 20, n_components=5, n_candidates=3
+        )
+        scores1 = ncc(exp, sim).compute()
+        scores2 = pca(exp, sim).compute()
+
+        # Only candidates are re-scored, and with the exact score
+        is_candidate = np.isfinite(scores2)
+        assert np.all(is_candidate.sum(axis=1) == 3)
+        assert np.allclose(scores1[is_candidate], scores2[is_candidate], atol=1e-5)
+
+        # Setting the number of components resets the basis
+        assert pca.basis.shape == (5, 25)
+        pca.n_components = 4
+        assert pca.basis is None
+
+    def test_dictionary_indexing(self, dummy_signal):
+        s_dict = kp.signals.EBSD(dummy_signal.data.reshape(-1, 3, 3))
+        s_dict.axes_manager[0].name = "x"
+        s_dict.xmap = CrystalMap.empty((9,))
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            n_components=9, n_candidates=2
+        )
+        xmap = dummy_signal.dictionary_indexing(
+            s_dict, metric=metric, keep_n=2, n_per_iteration=4
+        )
+        assert np.allclose(xmap.scores[:, 0], 1)
+        assert np.all(xmap.simulation_indices[:, 0] == np.arange(9))
+
+    def test_dictionary_indexing_keep_n_raises(self, dummy_signal):
+        s_dict = kp.signals.EBSD(dummy_signal.data.reshape(-1, 3, 3))
+        s_dict.axes_manager[0].name = "x"
+        s_dict.xmap = CrystalMap.empty((9,))
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            n_components=9, n_candidates=2
+        )
+        with pytest.raises(ValueError, match="The number of best matches to keep, "):
+            _ = dummy_signal.dictionary_indexing(s_dict, metric=metric, keep_n=3)
+
+    def test_fit_basis_to_dictionary(self):
+        rng = np.random.default_rng(42)
+        sim = rng.random((20, 5, 5), dtype=np.float32)
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            n_components=5, n_candidates=3
+        )
+        metric.fit_basis_to_dictionary(sim.reshape((20, -1)))
+        assert metric.basis.shape == (5, 25)
+
+        # Setting a signal mask resets a fitted basis
+        signal_mask = np.zeros((5, 5), dtype=bool)
+        signal_mask[0] = True
+        metric.signal_mask = signal_mask
+        assert metric.basis is None
+        metric.fit_basis_to_dictionary(sim.reshape((20, -1)))
+        assert metric.basis.shape == (5, 20)
+
+        # A basis set by the user is kept
+        basis = np.eye(20, dtype=np.float32)[:5]
+        metric.basis = basis
+        metric.signal_mask = None
+        metric.fit_basis_to_dictionary(sim.reshape((20, -1)))
+        assert np.array_equal(metric.basis, basis)
+
+        # ... but must match the number of pixels
+        metric.n_experimental_patterns = 10
+        metric.n_dictionary_patterns = 20
+        exp = rng.random((10, 5, 5), dtype=np.float32)
+        with pytest.raises(ValueError, match="The basis has 20 pixels per vector, "):
+            _ = metric(exp, sim)
+
+    def test_dictionary_indexing_equals_ncc(self):
+        """The best matches on real patterns are the same as with the
+        exact NCC metric, also when matching the dictionary in multiple
+        iterations with a signal mask.
+        """
+        s = kp.data.nickel_ebsd_small()
+        s.remove_static_background()
+        s.remove_dynamic_background()
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        det = s.detector.deepcopy()
+        det.pc = det.pc_average
+        rot = get_sample_fundamental(6, point_group=mp.phase.point_group)
+        s_dict = mp.get_patterns(rot, det, energy=20, compute=True)
+
+        metric = kp.indexing.PCANormalizedCrossCorrelationMetric(
+            n_components=100, n_candidates=50
+        )
+        signal_mask = np.zeros(det.shape, dtype=bool)
+        signal_mask[:10] = True
+        for mask in [None, signal_mask]:
+            xmap1 = s.dictionary_indexing(s_dict, keep_n=1, signal_mask=mask)
+            xmap2 = s.dictionary_indexing(
+                s_dict, metric=metric, keep_n=1, n_per_iteration=1000, signal_mask=mask
+            )
+            assert np.array_equal(xmap1.simulation_indices, xmap2.simulation_indices)
+            assert np.allclose(xmap1.scores, xmap2.scores, atol=1e-5)
+
+
 class TestNumbaAcceleratedMetrics:
     def test_ncc_single_patterns_1d_float32(self):
         exp = np.linspace(0, 0.5, 100, dtype=np.float32)
@@ -82,3 +82,8 @@ class TestEDAXBinaryReader:
         """Test navigation shape when not hex."""
         s = kp.load(edax_binary_file.name)
         assert s._navigation_shape_rc == (2, 3)
+
+    def test_load_threads(self, edax_binary_path):
+        s = kp.data.nickel_ebsd_small()
+        s1 = kp.load(edax_binary_path / "edax_binary.up1", n_threads=2)
+        assert np.allclose(s1.data, s.data.reshape((-1, 60, 60)))
@@ -365,3 +365,76 @@ class TestKikuchipyH5EBSD:
         repr_str_list = repr(writer).split(" ")
         assert repr_str_list[0] == "KikuchipyH5EBSDWriter:"
         assert repr_str_list[1][-11:] == "patterns.h5"
+
+    @pytest.mark.parametrize(
+        "compression, compression_opts, shuffle",
+        [(None, None, False), ("gzip", 9, True), ("lzf", None, True)],
+    )
+    def test_save_compression(
+        self, save_path_hdf5, compression, compression_opts, shuffle
+    ):
+        s = kp.data.nickel_ebsd_small()
+        s.save(
+            save_path_hdf5,
+            compression=compression,
+            compression_opts=compression_opts,
+            shuffle=shuffle,
+        )
+        with h5py.File(save_path_hdf5) as f:
+            dset = f["Scan 1/EBSD/Data/patterns"]
+            assert dset.compression == compression
+            assert dset.shuffle == shuffle
+            if compression_opts is not None:
+                assert dset.compression_opts == compression_opts
+        s2 = kp.load(save_path_hdf5)
+        assert np.allclose(s.data, s2.data)
+
+    @pytest.mark.skipif(
+        not kp.constants.installed["hdf5plugin"], reason="hdf5plugin is not installed"
+    )
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_save_compression_blosc(self, save_path_hdf5, lazy):
+        s = kp.data.nickel_ebsd_small(lazy=lazy)
+        s.save(save_path_hdf5, compression="blosc", shuffle=True)
+        with h5py.File(save_path_hdf5) as f:
+            filters = f["Scan 1/EBSD/Data/patterns"]._filters
+        assert "32001" in filters
+        s2 = kp.load(save_path_hdf5, lazy=lazy)
+        assert np.allclose(s.data, s2.data)
+
+    def test_save_compression_raises(self, save_path_hdf5):
+        s = kp.data.nickel_ebsd_small()
+        with pytest.raises(ValueError, match="'zip' must be either of "):
+            s.save(save_path_hdf5, compression="zip")
+
+    @pytest.mark.parametrize(
+        "chunk_shape, chunk_bytes, desired_chunks",
+        [
+            (None, None, None),
+            (1, None, (1, 60, 60)),
+            (2, None, (3, 60, 60)),
+            (None, 8 * 3600, (3, 60, 60)),
+            (100, None, (9, 60, 60)),
+        ],
+    )
+    def test_save_chunks(
+        self, save_path_hdf5, chunk_shape, chunk_bytes, desired_chunks
+    ):
+        s = kp.data.nickel_ebsd_small()
+        s.save(save_path_hdf5, chunk_shape=chunk_shape, chunk_bytes=chunk_bytes)
+        with h5py.File(save_path_hdf5) as f:
+            chunks = f["Scan 1/EBSD/Data/patterns"].chunks
+        if desired_chunks is not None:
+            assert chunks == desired_chunks
+
+        s2 = kp.load(save_path_hdf5, lazy=True)
+        assert np.allclose(s.data, s2.data.compute())
+
+    def test_save_chunks_lazy(self, save_path_hdf5):
+        s = kp.signals.LazyEBSD(da.zeros((10, 20, 30, 30), dtype="uint8", chunks=7))
+        s.save(save_path_hdf5, chunk_shape=5, compression="gzip")
+        with h5py.File(save_path_hdf5) as f:
+            assert f["Scan 1/EBSD/Data/patterns"].chunks == (20, 30, 30)
+        s2 = kp.load(save_path_hdf5, lazy=True)
+        assert s2.data.chunksize == (1, 20, 30, 30)
+        assert np.all(s2.data.compute() == 0)
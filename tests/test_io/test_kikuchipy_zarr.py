@@ -0,0 +1,109 @@
+# Copyright 2019-2024 The kikuchipy developers
+#
+# This file is part of kikuchipy.
+#
+# kikuchipy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# kikuchipy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.
+
+import dask
+import dask.array as da
+import numpy as np
+import pytest
+
+import kikuchipy as kp
+
+pytestmark = pytest.mark.skipif(
+    not kp.constants.installed["zarr"], reason="zarr is not installed"
+)
+
+
+class TestKikuchipyZarr:
+    def test_read_write(self, kikuchipy_h5ebsd_path, tmp_path):
+        s = kp.load(kikuchipy_h5ebsd_path / "patterns.h5")
+        fname = tmp_path / "patterns.zarr"
+        s.save(fname)
+        assert fname.is_dir()
+
+        s2 = kp.load(fname)
+        assert isinstance(s2, kp.signals.EBSD)
+        assert np.allclose(s2.data, s.data)
+        assert s2.data.dtype == s.data.dtype
+        assert s2.axes_manager.shape == s.axes_manager.shape
+        for ax, ax2 in zip(s.axes_manager._axes, s2.axes_manager._axes):
+            assert ax2.name == ax.name
+            assert np.isclose(ax2.scale, ax.scale)
+            assert ax2.units == ax.units
+        assert s2.metadata.General.title == s.metadata.General.title
+        assert np.allclose(s2.static_background, s.static_background)
+        assert np.allclose(s2.detector.pc, s.detector.pc)
+        assert s2.detector.sample_tilt == s.detector.sample_tilt
+        assert s2.detector.binning == s.detector.binning
+        assert np.allclose(s2.xmap.rotations.data, s.xmap.rotations.data)
+        assert s2.xmap.phases.names == s.xmap.phases.names
+
+    @pytest.mark.parametrize("nav_slice", [(0, 0), (slice(None), 0)])
+    def test_read_write_nav_dim(self, kikuchipy_h5ebsd_path, tmp_path, nav_slice):
+        s = kp.load(kikuchipy_h5ebsd_path / "patterns.h5").inav[nav_slice]
+        fname = tmp_path / "patterns.zarr"
+        s.save(fname)
+        s2 = kp.load(fname)
+        assert s2.axes_manager.shape == s.axes_manager.shape
+        assert np.allclose(s2.data, s.data)
+
+    def test_read_lazy(self, kikuchipy_h5ebsd_path, tmp_path):
+        s = kp.load(kikuchipy_h5ebsd_path / "patterns.h5")
+        fname = tmp_path / "patterns.zarr"
+        s.save(fname, chunk_shape=2)
+
+        s2 = kp.load(fname, lazy=True)
+        assert isinstance(s2, kp.signals.LazyEBSD)
+        # Chunks of the Dask array are the stored chunks
+        assert s2.data.chunksize == (2, 2, 60, 60)
+        assert np.allclose(s2.data.compute(), s.data)
+
+    def test_write_lazy(self, tmp_path):
+        data = np.arange(4 * 5 * 6 * 7, dtype=np.uint16).reshape((4, 5, 6, 7))
+        s = kp.signals.LazyEBSD(da.from_array(data, chunks=(3, 2, 6, 7)))
+
+        # Chunks of the signal are used if it is not chunked in the
+        # signal dimensions, and data is written by multiple processes
+        fname = tmp_path / "patterns.zarr"
+        with dask.config.set(scheduler="processes", num_workers=2):
+            s.save(fname)
+        s2 = kp.load(fname, lazy=True)
+        assert s2.data.chunksize == (3, 2, 6, 7)
+        assert np.allclose(s2.data.compute(), data)
+
+        s3 = kp.signals.LazyEBSD(da.from_array(data, chunks=(4, 5, 3, 7)))
+        fname2 = tmp_path / "patterns2.zarr"
+        s3.save(fname2, chunk_shape=2, clevel=9)
+        s4 = kp.load(fname2, lazy=True)
+        assert s4.data.chunksize == (2, 2, 6, 7)
+        assert np.allclose(s4.data.compute(), data)
+
+    def test_overwrite(self, kikuchipy_h5ebsd_path, tmp_path):
+        s = kp.load(kikuchipy_h5ebsd_path / "patterns.h5")
+        fname = tmp_path / "patterns.zarr"
+        s.save(fname)
+        s.inav[0, 0].save(fname, overwrite=False)
+        assert kp.load(fname).axes_manager.shape == s.axes_manager.shape
+        s.inav[0, 0].save(fname, overwrite=True)
+        assert kp.load(fname).axes_manager.shape == (60, 60)
+
+    def test_read_raises(self, tmp_path):
+        import zarr
+
+        fname = tmp_path / "not_kikuchipy.zarr"
+        zarr.open_group(str(fname), mode="w").attrs["manufacturer"] = "someone"
+        with pytest.raises(IOError, match="is not a kikuchipy Zarr store"):
+            _ = kp.load(fname)
@@ -378,3 +378,18 @@ class TestNORDIF:
         cut_data = np.pad(cut_data, pw, mode="constant")
         cut_data = cut_data.reshape(scan_size_reloaded + pattern_size)
         assert np.allclose(cut_data, s_reload.data)
+
+    @pytest.mark.parametrize("lazy", [True, False])
+    def test_write_chunks(self, save_path_nordif, lazy):
+        """Ensure patterns are written in flyback order from chunks not
+        spanning whole map rows, and from non-contiguous arrays.
+        """
+        data = np.random.randint(0, 256, (5, 7, 4, 3), dtype=np.uint8)
+        if lazy:
+            s = kp.signals.LazyEBSD(da.from_array(data, chunks=(2, 3, -1, -1)))
+        else:
+            s = kp.signals.EBSD(np.asfortranarray(data))
+            assert not s.data.flags.c_contiguous
+        s.save(save_path_nordif, overwrite=True)
+        data_file = np.fromfile(save_path_nordif, dtype=np.uint8)
+        assert np.array_equal(data_file, data.ravel())
@@ -22,6 +22,7 @@ import numpy as np
 import pytest
 
 import kikuchipy as kp
+from kikuchipy.io.plugins._binary import _read_chunk
 from kikuchipy.io.plugins.oxford_binary._api import OxfordBinaryFileReader
 
 
@@ -142,3 +143,33 @@ class TestOxfordBinaryReader:
             fox = OxfordBinaryFileReader(f)
             assert fox.get_estimated_file_size() == file_size
             assert os.path.getsize(oxford_binary_file.name) == file_size
+
+    @pytest.mark.parametrize(
+        "oxford_binary_file",
+        [((3, 4), (40, 50), np.uint16, 2, False, True)],
+        indirect=["oxford_binary_file"],
+    )
+    @pytest.mark.parametrize("lazy, n_threads", [(True, 1), (False, 1), (False, 2)])
+    def test_read_unsorted(self, oxford_binary_file, lazy, n_threads):
+        """Ensure patterns stored unsorted are read in chunks into their
+        correct navigation position.
+        """
+        s = kp.load(oxford_binary_file.name, lazy=lazy, n_threads=n_threads)
+        data = np.arange(12 * 2000, dtype=np.uint16).reshape((3, 4, 40, 50))
+        if lazy:
+            assert s.data.chunks == ((3,), (4,), (40,), (50,))
+            s.compute()
+        assert np.array_equal(s.data, data)
+
+    def test_read_chunk(self, oxford_binary_path):
+        """Ensure a chunk of patterns not stored one after the other is
+        read correctly.
+        """
+        with open(oxford_binary_path / "patterns.ebsp", mode="rb") as f:
+            fox = OxfordBinaryFileReader(f)
+        stride = fox.n_bytes + fox.pattern_header_size + fox.pattern_footer_size
+        offsets = fox.pattern_starts.reshape((3, 3)) + fox.pattern_header_size
+
+        patterns = _read_chunk(offsets[1:, :2], str(f.name), (60, 60), "uint8", stride)
+        s = kp.data.nickel_ebsd_small()
+        assert np.array_equal(patterns, s.data[1:, :2])
@@ -528,6 +528,22 @@ class TestRemoveStaticBackgroundEBSD:
         s4 = s3.remove_static_background(inplace=False, lazy_output=False)
         assert isinstance(s4, kp.signals.EBSD)
 
+    def test_filename(self, dummy_signal, tmp_path):
+        s2 = dummy_signal.remove_static_background(inplace=False)
+
+        fname = tmp_path / "static.h5"
+        s3 = dummy_signal.remove_static_background(
+            inplace=False, filename=fname, save_kwargs={"compression": "gzip"}
+        )
+        assert isinstance(s3, kp.signals.LazyEBSD)
+        assert fname.is_file()
+        assert np.allclose(s3.data.compute(), s2.data)
+        assert np.allclose(s3.static_background, dummy_signal.static_background)
+        assert np.allclose(s3.detector.pc, dummy_signal.detector.pc)
+
+        with pytest.raises(ValueError, match="'filename' requires 'inplace=False'"):
+            dummy_signal.remove_static_background(filename=fname)
+
 
 class TestRemoveDynamicBackgroundEBSD:
     @pytest.mark.parametrize(
@@ -1701,6 +1717,150 @@ class TestAverageNeighbourPatternsEBSD:
         s4 = s3.average_neighbour_patterns(inplace=False, lazy_output=False)
         assert isinstance(s4, kp.signals.EBSD)
 
+    def test_filename(self, dummy_signal, tmp_path):
+        s2 = dummy_signal.average_neighbour_patterns(inplace=False)
+
+        # Written to h5ebsd if no extension is given
+        s3 = dummy_signal.average_neighbour_patterns(
+            inplace=False, filename=tmp_path / "averaged"
+        )
+        assert isinstance(s3, kp.signals.LazyEBSD)
+        assert (tmp_path / "averaged.h5").is_file()
+        assert np.allclose(s3.data.compute(), s2.data)
+
+        s4 = s3.remove_dynamic_background(
+            inplace=False, filename=tmp_path / "averaged_dynamic.hspy"
+        )
+        assert isinstance(s4, kp.signals.LazyEBSD)
+        s5 = s2.remove_dynamic_background(inplace=False)
+        assert np.allclose(s4.data.compute(), s5.data)
+
+        with pytest.raises(ValueError, match="'filename' requires 'inplace=False'"):
+            dummy_signal.average_neighbour_patterns(filename=tmp_path / "a.h5")
+
+
+class TestPreprocessEBSD:
+    @pytest.mark.parametrize(
+        "static_operation, dynamic_operation, window",
+        [
+            ("subtract", "subtract", "circular"),
+            ("divide", "divide", None),
+            (None, "subtract", "rectangular"),
+            ("subtract", None, None),
+        ],
+    )
+    def test_preprocess(
+        self, dummy_signal, static_operation, dynamic_operation, window
+    ):
+        s_ref = dummy_signal.deepcopy()
+        if static_operation is not None:
+            s_ref.remove_static_background(static_operation)
+        if dynamic_operation is not None:
+            s_ref.remove_dynamic_background(dynamic_operation, std=1)
+        if window is not None:
+            s_ref.average_neighbour_patterns(window)
+
+        s = dummy_signal.deepcopy()
+        s.preprocess(
+            static_operation, std=1, dynamic_operation=dynamic_operation, window=window
+        )
+        assert s.data.dtype == s_ref.data.dtype
+        # Intermediate patterns are not truncated to integers, and the
+        # differences are stretched by the rescaling in each step
+        assert np.allclose(s.data.astype(int), s_ref.data, atol=4)
+
+    def test_preprocess_dtype_out(self, dummy_signal):
+        s_ref = dummy_signal.deepcopy()
+        s_ref.change_dtype("float32")
+        s_ref.rescale_intensity(dtype_out=np.float32)
+
+        s = dummy_signal.preprocess(
+            static_operation=None,
+            dynamic_operation=None,
+            dtype_out=np.float32,
+            inplace=False,
+        )
+        assert s.data.dtype == np.float32
+        assert np.allclose(s.data, s_ref.data, atol=1e-6)
+
+    def test_preprocess_spatial(self, dummy_signal):
+        s = dummy_signal.deepcopy()
+        s.remove_dynamic_background(filter_domain="spatial", std=1)
+        s2 = dummy_signal.preprocess(
+            static_operation=None,
+            filter_domain="spatial",
+            std=1,
+            inplace=False,
+        )
+        assert np.allclose(s2.data.astype(int), s.data, atol=1)
+
+    def test_preprocess_raises(self, dummy_signal):
+        with pytest.raises(ValueError, match="'multiply' must be either of "):
+            dummy_signal.preprocess(static_operation="multiply")
+        with pytest.raises(ValueError, match="'multiply' must be either of "):
+            dummy_signal.preprocess(dynamic_operation="multiply")
+        with pytest.raises(ValueError, match="wiener must be either of "):
+            dummy_signal.preprocess(filter_domain="wiener")
+        with pytest.raises(ValueError, match="Static background dtype_out"):
+            dummy_signal.preprocess(static_bg=np.ones((3, 3), dtype=np.uint16))
+        with pytest.raises(ValueError, match="Signal \\(3, 3\\) and static"):
+            dummy_signal.preprocess(static_bg=np.ones((3, 4), dtype=np.uint8))
+
+        # Circumvent setter of static_background
+        dummy_signal._static_background = None
+        with pytest.raises(ValueError, match="`EBSD.static_background` is not a"):
+            dummy_signal.preprocess()
+
+    def test_inplace(self, dummy_signal):
+        # Current signal is unaffected
+        s2 = dummy_signal.deepcopy()
+        s3 = s2.preprocess(window="circular", inplace=False)
+        assert np.allclose(dummy_signal.data, s2.data)
+
+        # Custom properties carry over
+        assert isinstance(s3, kp.signals.EBSD)
+        assert np.allclose(s3.static_background, dummy_signal.static_background)
+        assert np.allclose(s3.detector.pc, dummy_signal.detector.pc)
+        assert np.allclose(s3.xmap.rotations.data, dummy_signal.xmap.rotations.data)
+
+        # Operating on current signal gives same result as output
+        s2.preprocess(window="circular")
+        assert np.allclose(s3.data, s2.data)
+        assert np.allclose(s2.detector.pc, dummy_signal.detector.pc)
+
+        # Operating on lazy signal returns lazy signal, also with
+        # patterns split into several chunks
+        s4 = kp.signals.LazyEBSD(
+            da.from_array(dummy_signal.data, chunks=(1, 1, -1, -1)),
+            static_background=dummy_signal.static_background,
+        )
+        s5 = s4.preprocess(window="circular", inplace=False)
+        assert isinstance(s5, kp.signals.LazyEBSD)
+        s5.compute()
+        assert np.allclose(s5.data, s2.data)
+
+        s4.preprocess(window="circular")
+        assert isinstance(s4.data, da.Array)
+        assert s4.data.chunks == ((1, 1, 1), (1, 1, 1), (3,), (3,))
+
+        # Changing the data type
+        s6 = dummy_signal.deepcopy()
+        s6.preprocess(dtype_out=np.float32)
+        assert s6.data.dtype == np.float32
+
+    def test_lazy_output(self, dummy_signal):
+        with pytest.raises(
+            ValueError, match="'lazy_output=True' requires 'inplace=False'"
+        ):
+            _ = dummy_signal.preprocess(lazy_output=True)
+
+        s2 = dummy_signal.preprocess(inplace=False, lazy_output=True)
+        assert isinstance(s2, kp.signals.LazyEBSD)
+
+        s3 = dummy_signal.as_lazy()
+        s4 = s3.preprocess(inplace=False, lazy_output=False)
+        assert isinstance(s4, kp.signals.EBSD)
+
 
 class TestVirtualBackscatterElectronImaging:
     @pytest.mark.parametrize("out_signal_axes", [None, (0, 1), ("x", "y")])
@@ -2529,6 +2689,38 @@ class TestNeighbourDotProductMatrices:
             dp_matrices[1, 1], desired_dp_matrices11, atol=1e-5, equal_nan=True
         )
 
+    @pytest.mark.parametrize(
+        "window",
+        [
+            kp.filters.Window(window="circular", shape=(3, 3)),
+            kp.filters.Window(window="rectangular", shape=(3, 2)),
+            kp.filters.Window(window="rectangular", shape=(5, 5)),
+        ],
+    )
+    def test_dp_matrices_chunked(self, window):
+        rng = np.random.default_rng()
+        data = rng.random((7, 9, 10, 12), dtype=np.float32)
+        s = kp.signals.LazyEBSD(da.from_array(data, chunks=(3, 4, 10, 12)))
+        dp_matrices = s.get_neighbour_dot_product_matrices(window=window)
+        dp_matrices = dp_matrices.compute().reshape((7, 9) + window.shape)
+        adp = s.get_average_neighbour_dot_product_map(window=window).compute()
+
+        # Brute force
+        patterns = data.reshape((7, 9, -1)) - data.mean(axis=(2, 3))[..., None]
+        patterns /= np.linalg.norm(patterns, axis=-1)[..., None]
+        dp_matrices2 = np.full_like(dp_matrices, np.nan)
+        for r, c in np.ndindex(7, 9):
+            for i, j in zip(*np.nonzero(window)):
+                rn, cn = r + i - window.origin[0], c + j - window.origin[1]
+                if 0 <= rn < 7 and 0 <= cn < 9:
+                    dp_matrices2[r, c, i, j] = patterns[r, c] @ patterns[rn, cn]
+        dp_matrices3 = dp_matrices2.copy()
+        dp_matrices3[:, :, window.origin[0], window.origin[1]] = np.nan
+        adp2 = np.nanmean(dp_matrices3, axis=(2, 3))
+
+        assert np.allclose(dp_matrices, dp_matrices2, atol=1e-6, equal_nan=True)
+        assert np.allclose(adp, adp2, atol=1e-6)
+
     def test_dp_matrices_large(self):
         nav_shape = (250, 137)
         s = kp.signals.LazyEBSD(da.ones(nav_shape + (96, 96), dtype=np.uint8))
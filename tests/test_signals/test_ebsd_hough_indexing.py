@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with kikuchipy. If not, see <http://www.gnu.org/licenses/>.#
 
+import dask.array as da
 from diffpy.structure import Lattice, Structure
 from diffsims.crystallography import ReciprocalLatticeVector
 import numpy as np
@@ -25,7 +26,9 @@ import pytest
 import kikuchipy as kp
 from kikuchipy.indexing._hough_indexing import (
     _get_info_message,
+    _index_patterns_in_chunks,
     _indexer_is_compatible_with_kikuchipy,
+    _optimize_pc_in_processes,
     _phase_lists_are_compatible,
 )
 
@@ -88,14 +91,32 @@ class TestHoughIndexing:
         s = self.signal.as_lazy()
 
         phase_list = self.signal.xmap.phases
-        if kp.constants.pyopencl_context_available:
-            xmap1 = s.hough_indexing(phase_list, self.indexer)
-            xmap2 = self.signal.hough_indexing(phase_list, self.indexer)
-            assert np.allclose(xmap1.rotations.data, xmap2.rotations.data)
-            assert np.allclose(xmap1.fit, xmap2.fit)
-        else:
-            with pytest.raises(ValueError, match="Hough indexing of lazy signals must"):
-                _ = s.hough_indexing(phase_list, self.indexer, verbose=2)
+        kw = dict(return_index_data=True, return_band_data=True)
+        xmap1, index_data1, band_data1 = s.hough_indexing(
+            phase_list, self.indexer, chunksize=4, **kw
+        )
+        xmap2, index_data2, band_data2 = self.signal.hough_indexing(
+            phase_list, self.indexer, **kw
+        )
+        assert np.allclose(xmap1.rotations.data, xmap2.rotations.data)
+        assert np.allclose(xmap1.fit, xmap2.fit)
+        assert index_data1.dtype == index_data2.dtype
+        assert index_data1.shape == index_data2.shape
+        assert np.array_equal(index_data1["phase"], index_data2["phase"])
+        assert band_data1.dtype == band_data2.dtype
+        assert np.array_equal(band_data1, band_data2)
+
+    def test_hough_indexing_processes(self):
+        phase_list = self.signal.xmap.phases
+        xmap1, band_data1 = self.signal.hough_indexing(
+            phase_list, self.indexer, chunksize=4, n_processes=2, return_band_data=True
+        )
+        xmap2, band_data2 = self.signal.hough_indexing(
+            phase_list, self.indexer, return_band_data=True
+        )
+        assert np.allclose(xmap1.rotations.data, xmap2.rotations.data)
+        assert np.allclose(xmap1.fit, xmap2.fit)
+        assert np.array_equal(band_data1, band_data2)
 
     def test_hough_indexing_return_index_data(self):
         phase_list = self.signal.xmap.phases
@@ -364,6 +385,123 @@ class TestPCOptimization:
             with pytest.raises(ValueError, match="Hough indexing of lazy signals must"):
                 _ = s.hough_indexing_optimize_pc(det.pc_average, self.indexer)
 
+    def test_optimize_pc_processes(self):
+        det0 = self.signal.detector
+        pc0 = det0.pc_average
+
+        det = self.signal.hough_indexing_optimize_pc(pc0, self.indexer, batch=True)
+        det2 = self.signal.hough_indexing_optimize_pc(
+            pc0, self.indexer, batch=True, n_processes=2
+        )
+        assert det2.navigation_shape == (3, 3)
+        assert np.allclose(det2.pc, det.pc, atol=1e-3)
+
+        # Patterns of a lazy signal are read in parts
+        s = self.signal.as_lazy()
+        det3 = s.hough_indexing_optimize_pc(
+            pc0, self.indexer, batch=True, n_processes=2
+        )
+        assert np.allclose(det3.pc, det2.pc)
+
+        # Fit a plane to the PCs
+        indices = np.indices(det3.navigation_shape)
+        det_fit = det3.fit_pc(pc_indices=indices, map_indices=indices, plot=False)
+        assert det_fit.navigation_shape == (3, 3)
+
+
+class DummyIndexer:
+    """Indexer returning the sum of each pattern and the x coordinate
+    of its projection center (PC), to test indexing in chunks without
+    PyEBSDIndex.
+    """
+
+    def __init__(self, pc):
+        self.PC = np.asarray(pc)
+        self.calls = []
+
+    def index_pats(self, patsin, verbose, chunksize, PC=None):
+        self.calls.append((patsin.shape[0], verbose, PC))
+        if PC is None:
+            PC = self.PC
+        n = patsin.shape[0]
+        index_data = np.zeros((2, n), dtype=[("fit", "f4"), ("pcx", "f4")])
+        index_data["fit"] = patsin.sum(axis=(1, 2))
+        index_data["pcx"] = np.broadcast_to(PC, (n, 3))[:, 0]
+        band_data = np.zeros((n, 3), dtype=[("max", "f4")])
+        band_data["max"] = patsin.max(axis=(1, 2))[:, None]
+        return index_data, band_data, 0, n
+
+
+class TestIndexPatternsInChunks:
+    @pytest.mark.parametrize(
+        "lazy, chunksize, n_processes", [(True, 3, 1), (False, 4, 2), (True, 10, 3)]
+    )
+    def test_index_patterns_in_chunks(self, lazy, chunksize, n_processes):
+        rng = np.random.default_rng()
+        patterns = rng.random((10, 5, 6), dtype=np.float32)
+        if lazy:
+            patterns_in = da.from_array(patterns, chunks=(chunksize, -1, -1))
+        else:
+            patterns_in = patterns
+        pc = rng.random((10, 3))
+        indexer = DummyIndexer(pc)
+
+        index_data, band_data = _index_patterns_in_chunks(
+            patterns_in, indexer, chunksize, verbose=1, n_processes=n_processes
+        )
+        assert index_data.shape == (2, 10)
+        assert band_data.shape == (10, 3)
+        assert np.allclose(index_data["fit"], patterns.sum(axis=(1, 2)))
+        assert np.allclose(index_data["pcx"], pc[:, 0])
+        assert np.allclose(band_data["max"][:, 0], patterns.max(axis=(1, 2)))
+
+        if n_processes == 1:
+            n_chunks = int(np.ceil(10 / chunksize))
+            assert len(indexer.calls) == n_chunks
+            assert [call[1] for call in indexer.calls] == [1] + [0] * (n_chunks - 1)
+
+    def test_index_patterns_in_chunks_one_pc(self):
+        patterns = np.ones((5, 4, 4))
+        indexer = DummyIndexer([0.4, 0.2, 0.5])
+        index_data, _ = _index_patterns_in_chunks(patterns, indexer, 2, verbose=0)
+        assert np.allclose(index_data["pcx"], 0.4)
+        assert all(call[2] is None for call in indexer.calls)
+
+
+def dummy_optimize(pats, indexer, PC0, batch, scale=1):
+    """PC optimization function returning the initial PC plus the mean
+    intensity of each pattern and the indexer's PC z coordinate, to
+    test optimization in processes without PyEBSDIndex.
+    """
+    assert batch
+    pc = np.zeros((pats.shape[0], 3)) + PC0
+    pc[:, 0] += scale * pats.mean(axis=(1, 2))
+    pc[:, 2] += indexer.PC[2]
+    return pc.squeeze()
+
+
+class TestOptimizePCInProcesses:
+    @pytest.mark.parametrize(
+        "lazy, n_patterns, n_processes", [(False, 9, 2), (True, 10, 2), (False, 1, 3)]
+    )
+    def test_optimize_pc_in_processes(self, lazy, n_patterns, n_processes):
+        rng = np.random.default_rng()
+        patterns = rng.random((n_patterns, 5, 6), dtype=np.float32)
+        if lazy:
+            patterns_in = da.from_array(patterns, chunks=(3, -1, -1))
+        else:
+            patterns_in = patterns
+        pc0 = [0.4, 0.2, 0.5]
+        indexer = DummyIndexer([0, 0, 0.1])
+
+        pc = _optimize_pc_in_processes(
+            dummy_optimize, pc0, patterns_in, indexer, n_processes, scale=2
+        )
+        assert pc.shape == (n_patterns, 3)
+        assert np.allclose(pc[:, 0], 0.4 + 2 * patterns.mean(axis=(1, 2)))
+        assert np.allclose(pc[:, 1], 0.2)
+        assert np.allclose(pc[:, 2], 0.6)
+
 
 @pytest.mark.skipif(
     kp.constants.installed["pyebsdindex"], reason="pyebsdindex is installed"
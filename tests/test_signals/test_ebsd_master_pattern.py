@@ -19,6 +19,7 @@ import dask.array as da
 from diffsims.crystallography import ReciprocalLatticeVector
 from hyperspy._signals.signal2d import Signal2D
 import hyperspy.api as hs
+import numba as nb
 import numpy as np
 from orix.crystal_map import Phase
 from orix.quaternion import Rotation
@@ -31,14 +32,21 @@ from kikuchipy._utils._detector_coordinates import (
 )
 from kikuchipy._utils.numba import rotate_vector
 from kikuchipy.signals.util._master_pattern import (
+    _get_cube_map_from_master_pattern,
+    _get_direction_cosines_basis,
+    _get_direction_cosines_derivatives_from_basis,
     _get_direction_cosines_for_fixed_pc,
     _get_direction_cosines_for_varying_pc,
+    _get_direction_cosines_from_basis,
     _get_direction_cosines_from_detector,
     _get_lambert_interpolation_parameters,
+    _get_pixel_from_cube_map,
     _get_pixel_from_master_pattern,
     _lambert2vector,
+    _project_patterns_from_master_pattern_in_parallel,
     _project_patterns_from_master_pattern_with_fixed_pc,
     _project_patterns_from_master_pattern_with_varying_pc,
+    _project_single_pattern_from_cube_map,
     _project_single_pattern_from_master_pattern,
     _vector2lambert,
 )
@@ -194,6 +202,66 @@ class TestProjectFromLambert:
         tilt=10,
     )
 
+    def test_get_pixel_from_cube_map(self):
+        """Make sure the Numba functions are covered and that every
+        face of the cube map is sampled correctly.
+        """
+        mp = kp.data.nickel_ebsd_master_pattern_small(
+            projection="lambert", hemisphere="both"
+        )
+        mpu, mpl = mp.data
+        npx = mp.axes_manager.signal_shape[0]
+        scale = (npx - 1) / 2
+        cube_map = _get_cube_map_from_master_pattern.py_func(
+            mpu, mpl, npx, npx, scale, 10
+        )
+        assert cube_map.shape == (6, 12, 12)
+        assert cube_map.dtype == np.float32
+
+        cube_map = _get_cube_map_from_master_pattern(mpu, mpl, npx, npx, scale, npx)
+        assert np.all(np.isfinite(cube_map))
+
+        v = np.array(
+            [
+                [1, 0.2, -0.3],
+                [-1, 0.1, 0.5],
+                [0.3, 1, 0.2],
+                [0.1, -1, -0.4],
+                [-0.2, 0.1, 1],
+                [0.3, 0.3, -1],
+            ],
+            dtype=np.float64,
+        )
+        v /= np.linalg.norm(v, axis=1, keepdims=True)
+        lookup = [_get_pixel_from_cube_map.py_func(cube_map, *vi) for vi in v]
+        exact = _project_single_pattern_from_master_pattern(
+            np.array([1, 0, 0, 0], dtype=np.float64),
+            v,
+            mpu,
+            mpl,
+            npx,
+            npx,
+            scale,
+            False,
+            0,
+            1,
+            np.float64,
+        )
+        assert np.allclose(lookup, exact, rtol=0.05)
+
+        pattern = _project_single_pattern_from_cube_map.py_func(
+            np.array([1, 0, 0, 0], dtype=np.float64),
+            v,
+            cube_map,
+            True,
+            0,
+            255,
+            np.uint8,
+        )
+        assert pattern.dtype == np.uint8
+        assert pattern.min() == 0
+        assert pattern.max() == 255
+
     def test_get_direction_cosines(self):
         """Make sure the Numba function is covered."""
         det = self.detector
@@ -221,6 +289,44 @@ class TestProjectFromLambert:
         assert np.allclose(dc, dc2)
         assert np.allclose(dc2, dc3)
 
+    @pytest.mark.parametrize("pc", [(0.5, 0.5, 0.5), (0.42, 0.22, 0.61)])
+    def test_get_direction_cosines_from_basis(self, pc):
+        det = kp.detectors.EBSDDetector(shape=(60, 80), pc=pc, tilt=10)
+        signal_mask = np.ones(det.size, dtype=bool)
+        signal_mask[:100] = False
+        om = (~det.sample_to_detector).to_matrix().squeeze()
+
+        offset, pc_derivatives = _get_direction_cosines_basis.py_func(
+            det.nrows, det.ncols, om, signal_mask
+        )
+        assert offset.shape == (signal_mask.sum(), 3)
+        assert pc_derivatives.shape == (3, 3)
+
+        dc = _get_direction_cosines_from_basis.py_func(
+            offset, pc_derivatives, *det.pc[0]
+        )
+        dc2 = _get_direction_cosines_from_detector(det, signal_mask)
+        assert np.allclose(dc, dc2)
+
+        # Derivatives with respect to PC parameters match finite
+        # differences
+        dc_derivatives = _get_direction_cosines_derivatives_from_basis.py_func(
+            dc, offset, pc_derivatives, *det.pc[0]
+        )
+        h = 1e-6
+        for i in range(3):
+            step = np.zeros(3)
+            step[i] = h
+            dc_plus = _get_direction_cosines_from_basis(
+                offset, pc_derivatives, *(det.pc[0] + step)
+            )
+            dc_minus = _get_direction_cosines_from_basis(
+                offset, pc_derivatives, *(det.pc[0] - step)
+            )
+            assert np.allclose(
+                dc_derivatives[i], (dc_plus - dc_minus) / (2 * h), atol=1e-6
+            )
+
     def test_get_patterns(self, emsoft_ebsd_file):
         emsoft_key = kp.load(emsoft_ebsd_file)
         emsoft_key = emsoft_key.data[0]
@@ -365,6 +471,59 @@ class TestProjectFromLambert:
         assert sim3._navigation_shape_rc == nav_shape
         assert np.allclose(sim1.data[0, 0], sim3.data[0, 0])
 
+    def test_get_patterns_varying_pc_chunked(self):
+        """Patterns projected with varying PCs in multiple chunks are
+        identical to patterns projected with one PC at a time.
+        """
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        rot = Rotation.from_axes_angles([0, 0, 1], np.linspace(0, 0.5, 6))
+        det = kp.detectors.EBSDDetector(
+            shape=(20, 30),
+            pc=np.column_stack(
+                (np.linspace(0.4, 0.6, 6), np.full(6, 0.3), np.linspace(0.5, 0.7, 6))
+            ),
+            tilt=5,
+        )
+        sim = mp.get_patterns(rot, det, chunk_shape=4)
+        assert sim.data.chunks[0] == (4, 2)
+        sim = sim.data.compute()
+
+        for i in range(rot.size):
+            det_i = det.deepcopy()
+            det_i.pc = det.pc[i]
+            sim_i = mp.get_patterns(rot[i], det_i, compute=True)
+            assert np.allclose(sim[i], sim_i.data, atol=1e-6)
+
+    @pytest.mark.parametrize("chunk_shape", [4, 10])
+    def test_get_patterns_lookup_table(self, chunk_shape):
+        """Patterns projected from a cube map lookup table are close to
+        the ones projected directly from the master pattern.
+        """
+        mp = kp.data.nickel_ebsd_master_pattern_small(
+            projection="lambert", hemisphere="both"
+        )
+        rot = Rotation.random(10)
+        det = kp.detectors.EBSDDetector(shape=(30, 40), pc=(0.4, 0.3, 0.5), tilt=5)
+        kwargs = dict(chunk_shape=chunk_shape, compute=True, show_progressbar=False)
+
+        sim = mp.get_patterns(rot, det, **kwargs)
+        sim2 = mp.get_patterns(rot, det, lookup_table=True, **kwargs)
+        assert sim2.data.dtype == sim.data.dtype
+        ncc = kp.indexing.NormalizedCrossCorrelationMetric(10, 10)
+        scores = ncc(sim.data, sim2.data).compute()
+        assert np.all(np.diag(scores) > 0.995)
+        error = np.abs(sim.data - sim2.data) / np.ptp(sim.data)
+        assert error.mean() < 0.005
+
+        # Varying PCs
+        det.pc = np.column_stack(
+            (np.linspace(0.4, 0.6, 10), np.full(10, 0.3), np.full(10, 0.5))
+        )
+        sim3 = mp.get_patterns(rot, det, **kwargs)
+        sim4 = mp.get_patterns(rot, det, lookup_table=True, **kwargs)
+        error = np.abs(sim3.data - sim4.data) / np.ptp(sim3.data)
+        assert error.mean() < 0.005
+
     def test_get_patterns_navigation_shape_raises(self):
         mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
         r = Rotation(np.random.uniform(low=0, high=1, size=(1, 2, 3, 4)))
@@ -424,8 +583,17 @@ class TestProjectFromLambert:
             out_max=2,
         )
 
+        dc_offset, dc_pc_derivatives = _get_direction_cosines_basis(
+            det.nrows,
+            det.ncols,
+            (~det.sample_to_detector).to_matrix().squeeze(),
+            np.ones(det.size, dtype=bool),
+        )
         patterns = _project_patterns_from_master_pattern_with_varying_pc.py_func(
-            direction_cosines=dc, **kwargs
+            pc=det.pc_flattened.astype(np.float64),
+            dc_offset=dc_offset,
+            dc_pc_derivatives=dc_pc_derivatives,
+            **kwargs,
         )
         assert patterns.shape == r.shape + (det.size,)
 
@@ -434,6 +602,60 @@ class TestProjectFromLambert:
         )
         assert patterns2.shape == r.shape + (det.size,)
 
+    def test_project_patterns_from_master_pattern_in_parallel(self):
+        """Parallel projection gives the same patterns as serial
+        projection.
+        """
+        mp = kp.data.nickel_ebsd_master_pattern_small(projection="lambert")
+        r = Rotation.from_axes_angles([1, 1, 0], np.linspace(0, 1, 5))
+        det = self.detector.deepcopy()
+        det.pc = np.column_stack(
+            (np.linspace(0.4, 0.6, 5), np.full(5, 0.5), np.full(5, 0.5))
+        )
+        dc_offset, dc_pc_derivatives = _get_direction_cosines_basis(
+            det.nrows,
+            det.ncols,
+            (~det.sample_to_detector).to_matrix().squeeze(),
+            np.ones(det.size, dtype=bool),
+        )
+        npx, npy = mp.axes_manager.signal_shape
+        kwargs = dict(
+            master_upper=mp.data,
+            master_lower=mp.data,
+            npx=npx,
+            npy=npy,
+            scale=float((npx - 1) / 2),
+            dtype_out=np.float32,
+            rescale=False,
+            out_min=1,
+            out_max=2,
+        )
+        pc = det.pc_flattened.astype(np.float64)
+
+        patterns = _project_patterns_from_master_pattern_with_varying_pc(
+            r.data, pc, dc_offset, dc_pc_derivatives, **kwargs
+        )
+        patterns2 = _project_patterns_from_master_pattern_in_parallel(
+            r.data,
+            pc,
+            dc_offset=dc_offset,
+            dc_pc_derivatives=dc_pc_derivatives,
+            num_threads=nb.get_num_threads(),
+            varying_pc=True,
+            **kwargs,
+        )
+        assert np.allclose(patterns, patterns2)
+
+        dc = _get_direction_cosines_from_basis(dc_offset, dc_pc_derivatives, *pc[0])
+        patterns3 = _project_patterns_from_master_pattern_with_fixed_pc(
+            r.data, dc, **kwargs
+        )
+        patterns4 = _project_patterns_from_master_pattern_in_parallel(
+            r.data, direction_cosines=dc, num_threads=1, **kwargs
+        )
+        assert np.allclose(patterns3, patterns4)
+        assert np.allclose(patterns[0], patterns4[0])
+
     @pytest.mark.parametrize(
         "dtype_out, intensity_range", [(np.float32, (0, 1)), (np.uint8, (0, 255))]
     )
@@ -484,6 +706,14 @@ class TestProjectFromLambert:
         assert np.all(niip >= 0)
         assert np.all(nijp >= 0)
 
+        # Vectors on the equator map to the edges of the projection
+        v = np.array([[1, 0, 0], [0, 1, 0], [-1, 0, 0], [0, -1, 0]], dtype=float)
+        nii, nij, niip, nijp = _get_lambert_interpolation_parameters.py_func(
+            v=v, npx=npx, npy=npy, scale=scale
+        )[:4]
+        assert np.all(niip < npx)
+        assert np.all(nijp < npy)
+
     def test_get_pixel_from_master_pattern(self):
         """Make sure the Numba function is covered."""
         dc = _get_direction_cosines_from_detector(self.detector)
@@ -23,7 +23,11 @@ import kikuchipy as kp
 from kikuchipy._utils.numba import (
     rotate_vector,
     rotation_from_euler,
+    rotation_from_euler_derivatives,
     rotation_from_rodrigues,
+    rotation_multiply,
+    rotation_to_matrix,
+    rotation_to_matrix_derivative,
 )
 from kikuchipy.signals.util._master_pattern import _get_direction_cosines_for_fixed_pc
 
@@ -74,3 +78,54 @@ class TestRotationVectorTools:
 
         assert np.allclose(rot_numba, rot_numba_py)
         assert np.allclose(rot_numba_py, rot_orix)
+
+    def test_rotation_multiply(self):
+        rot1, rot2 = Rotation.from_euler([[1, 2, 3], [3, 2, 1]]).data
+        rot_orix = (Rotation(rot1) * Rotation(rot2)).data.squeeze()
+        rot_numba = rotation_multiply(rot1, rot2)
+        rot_numba_py = rotation_multiply.py_func(rot1, rot2)
+
+        assert np.allclose(rot_numba, rot_numba_py)
+        assert np.allclose(rot_numba_py, rot_orix)
+
+    def test_rotation_from_euler_derivatives(self):
+        h = 1e-6
+        for euler in [np.array([1.0, 2, 3]), np.array([4.0, 0.5, 0.2])]:
+            drot = rotation_from_euler_derivatives(*euler)
+            drot_py = rotation_from_euler_derivatives.py_func(*euler)
+            assert np.allclose(drot, drot_py)
+            for i in range(3):
+                step = np.zeros(3)
+                step[i] = h
+                drot_fd = (
+                    rotation_from_euler(*(euler + step))
+                    - rotation_from_euler(*(euler - step))
+                ) / (2 * h)
+                assert np.allclose(drot[i], drot_fd, atol=1e-6)
+
+    def test_rotation_to_matrix(self):
+        rot = Rotation.from_euler([1, 2, 3]).data.squeeze()
+        om_orix = Rotation(rot).to_matrix().squeeze()
+        om_numba = rotation_to_matrix(rot)
+        om_numba_py = rotation_to_matrix.py_func(rot)
+
+        assert np.allclose(om_numba, om_numba_py)
+        assert np.allclose(om_numba_py, om_orix)
+
+    def test_rotation_to_matrix_derivative(self):
+        euler = np.array([1.0, 2, 3])
+        rot = rotation_from_euler(*euler)
+        drot = rotation_from_euler_derivatives(*euler)
+        h = 1e-6
+        for i in range(3):
+            dom = rotation_to_matrix_derivative(rot, drot[i])
+            dom_py = rotation_to_matrix_derivative.py_func(rot, drot[i])
+            assert np.allclose(dom, dom_py)
+
+            step = np.zeros(3)
+            step[i] = h
+            dom_fd = (
+                rotation_to_matrix(rotation_from_euler(*(euler + step)))
+                - rotation_to_matrix(rotation_from_euler(*(euler - step)))
+            ) / (2 * h)
+            assert np.allclose(dom, dom_fd, atol=1e-6)